@@ -5,7 +5,6 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
 import psycopg2
 from psycopg2 import OperationalError
 from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
 import stripe
 from flask import Flask, jsonify, request, session, make_response
 from google.oauth2 import id_token
@@ -64,6 +63,15 @@ from routes.admin_reports import admin_reports_bp
 from routes.admin_email import admin_email_bp
 from routes.admin_creators import admin_creators_bp
 from content_submission_routes import content_hub_bp
+from services import db_pool
+from services.recommendation_cache import invalidate_creator_recommendations
+from services.subscription_ledger import record_stripe_event
+from services.niche_tags import niche_filter_sql, niche_tags_column_exists
+from services.scrape_jobs import (
+    enqueue_profile_scrape,
+    get_job as get_scrape_job,
+    job_status_payload as scrape_job_status_payload,
+)
 
 # In-house social scrapers for profile image extraction
 try:
@@ -161,6 +169,10 @@ except Exception as e:
     Session(app)
 
 
+# Return pooled DB connections (including leaked ones) when each request ends
+db_pool.init_app(app)
+
+
 # Handle Redis rate limit errors gracefully
 @app.after_request
 def handle_session_errors(response):
@@ -311,6 +323,10 @@ app.register_blueprint(content_hub_bp)
 from media_proxy_routes import media_proxy, persist_social_avatar
 app.register_blueprint(media_proxy)
 
+# Fit scoring reads precomputed brand features; load them without holding up boot
+from services.brand_feature_store import BRAND_FEATURES
+BRAND_FEATURES.warm_async()
+
 _CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://localhost:3001",
@@ -561,12 +577,11 @@ def sync_niche_to_pr_wishlist(creator_id, niche, conn=None):
         if should_close and conn:
             conn.close()
 
-# Database connection
+# Database connection (shared pool; close() returns the connection to the pool)
 def get_db_connection():
     try:
-        conn = psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
-        conn.autocommit = True
-        app.logger.info("🟢 Database connection established")
+        conn = db_pool.get_db_connection(cursor_factory=RealDictCursor, autocommit=True)
+        app.logger.info("🟢 Database connection checked out")
         return conn
     except Exception as e:
         app.logger.error(f"🔥 Database connection error: {str(e)}")
@@ -576,7 +591,7 @@ def release_db_connection(conn):
     try:
         if conn and not conn.closed:
             conn.close()
-            app.logger.info("🟢 Database connection closed")
+            app.logger.info("🟢 Database connection released")
         else:
             app.logger.warning("🔥 Attempted to close invalid or already closed connection")
     except Exception as e:
@@ -2093,6 +2108,8 @@ def complete_profile():
                 sync_niche_to_pr_wishlist(creator_id, interests, conn)
 
         conn.commit()
+        if result:
+            invalidate_creator_recommendations(result['id'])
 
         # Set session
         if not session.get('user_id'):
@@ -2432,6 +2449,114 @@ def onboarding_step1():
         return jsonify({'error': str(e)}), 500
 
 
+def _onboarding_scrape_response(user_id, handle, platform, profile, vision_data):
+    """Validate a finished onboarding scrape, stamp the session proof, build the response."""
+    from services.onboarding_scrape_errors import onboarding_scrape_user_error
+
+    if not profile:
+        app.logger.warning(f"⚠️ Scrape returned no data for @{handle}")
+        return jsonify(onboarding_scrape_user_error(
+            Exception(f"No {platform} data for @{handle}"), handle, platform
+        )), 400
+
+    # Check for private profile (processed profile uses 'is_public')
+    is_public = profile.get('is_public', True)
+    if not is_public:
+        app.logger.warning(f"🔒 Private profile detected: @{handle}")
+        return jsonify(onboarding_scrape_user_error(
+            ValueError(f"Account @{handle} is private"), handle, platform
+        )), 400
+
+    # Get processed fields (normalized by scraper)
+    follower_count = profile.get('follower_count', 0)
+    post_count = profile.get('post_count', 0)
+    latest_post_days_ago = profile.get('latest_post_days_ago', 999)
+
+    # Check if we got meaningful data (private profiles often return 0 posts)
+    if post_count == 0 and follower_count == 0:
+        app.logger.warning(f"⚠️ No data returned for @{handle} - likely private")
+        return jsonify(onboarding_scrape_user_error(
+            ValueError(f"Account @{handle} is private"), handle, platform
+        )), 400
+
+    partial_scrape = bool(profile.get('partial_scrape'))
+
+    # Check for stale data (posts older than 1 year indicates private/inactive account)
+    # Skip when Instagram IP-walled us and we only recovered a partial profile.
+    if latest_post_days_ago > 365 and not partial_scrape:
+        app.logger.warning(f"⚠️ Stale profile data for @{handle} - latest post is {latest_post_days_ago} days old")
+        return jsonify(onboarding_scrape_user_error(
+            Exception(f"Incomplete {platform} profile for @{handle} (missing latest_post)"),
+            handle,
+            platform,
+        )), 400
+
+    # Build summary for frontend
+    # Format follower count for display
+    if follower_count >= 1000000:
+        follower_display = f"{follower_count / 1000000:.1f}M"
+    elif follower_count >= 1000:
+        follower_display = f"{follower_count / 1000:.1f}K"
+    else:
+        follower_display = str(follower_count)
+
+    # Get niche from vision_data or profile
+    analysis = vision_data or {}
+    niche = (analysis.get('primary_niche') or
+             profile.get('primary_niche') or
+             'creator')
+    aesthetic_descriptors = (analysis.get('aesthetic_descriptors') or
+                             profile.get('aesthetic_descriptors') or
+                             [])
+
+    summary = {
+        'follower_count': follower_count,
+        'follower_display': follower_display,
+        'post_count': post_count,
+        'engagement_rate': profile.get('engagement_rate', 0),
+        'niche': niche,
+        'aesthetic_descriptors': aesthetic_descriptors,
+        'latest_post_days_ago': latest_post_days_ago,
+        'partial_scrape': partial_scrape,
+    }
+
+    if partial_scrape:
+        app.logger.warning(
+            f"⚠️ Partial scrape for @{handle}: {follower_count} followers "
+            "(Instagram wall — set IG_PROXY / INSTAGRAM_SESSIONID for full data)"
+        )
+    else:
+        app.logger.info(f"✅ Scrape successful for @{handle}: {follower_count} followers")
+
+    # Proof for step1: client cannot skip scrape or swap in a Pinterest/blog handle.
+    session['onboarding_quality'] = {
+        'handle': handle.lower().lstrip('@'),
+        'platform': platform,
+        'followers': int(follower_count or 0),
+    }
+    session.modified = True
+
+    # Save scraped avatar URL to session for step1 to apply (row doesn't exist yet)
+    avatar_url = (profile.get('avatarUrl') or
+                  profile.get('avatar_url') or
+                  profile.get('profile_pic_url') or '')
+    if avatar_url:
+        hosted = persist_social_avatar(avatar_url, dest_prefix=f"avatars/{user_id}")
+        session['scraped_avatar_url'] = hosted or avatar_url
+        session.modified = True
+        app.logger.info(
+            f"📸 Stored scraped avatar in session for user {user_id} "
+            f"({'rehosted' if hosted and hosted != avatar_url else 'raw'})"
+        )
+
+    return jsonify({
+        'success': True,
+        'profile': profile,
+        'summary': summary,
+        'partial_scrape': partial_scrape,
+    })
+
+
 @app.route('/api/user/onboarding/scrape', methods=['POST', 'OPTIONS'])
 def onboarding_scrape():
     """
@@ -2463,6 +2588,19 @@ def onboarding_scrape():
 
         app.logger.info(f"📱 Onboarding scrape starting for @{handle} on {platform}")
 
+        # async=true: queue the scrape and poll /api/user/onboarding/scrape/status/<job_id>
+        if data.get('async'):
+            job, _ = enqueue_profile_scrape(
+                user_id, handle, platform, skip_minimums=True, reason='onboarding'
+            )
+            return jsonify({
+                'success': True,
+                'background': True,
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'status_url': f"/api/user/onboarding/scrape/status/{job['job_id']}",
+            }), 202
+
         # Import scraper
         from services.creator_profile_scraper import scrape_and_enrich_creator
 
@@ -2481,110 +2619,7 @@ def onboarding_scrape():
         except:
             pass
 
-        from services.onboarding_scrape_errors import onboarding_scrape_user_error
-
-        if not profile:
-            app.logger.warning(f"⚠️ Scrape returned no data for @{handle}")
-            return jsonify(onboarding_scrape_user_error(
-                Exception(f"No {platform} data for @{handle}"), handle, platform
-            )), 400
-
-        # Check for private profile (processed profile uses 'is_public')
-        is_public = profile.get('is_public', True)
-        if not is_public:
-            app.logger.warning(f"🔒 Private profile detected: @{handle}")
-            return jsonify(onboarding_scrape_user_error(
-                ValueError(f"Account @{handle} is private"), handle, platform
-            )), 400
-
-        # Get processed fields (normalized by scraper)
-        follower_count = profile.get('follower_count', 0)
-        post_count = profile.get('post_count', 0)
-        latest_post_days_ago = profile.get('latest_post_days_ago', 999)
-
-        # Check if we got meaningful data (private profiles often return 0 posts)
-        if post_count == 0 and follower_count == 0:
-            app.logger.warning(f"⚠️ No data returned for @{handle} - likely private")
-            return jsonify(onboarding_scrape_user_error(
-                ValueError(f"Account @{handle} is private"), handle, platform
-            )), 400
-
-        partial_scrape = bool(profile.get('partial_scrape'))
-
-        # Check for stale data (posts older than 1 year indicates private/inactive account)
-        # Skip when Instagram IP-walled us and we only recovered a partial profile.
-        if latest_post_days_ago > 365 and not partial_scrape:
-            app.logger.warning(f"⚠️ Stale profile data for @{handle} - latest post is {latest_post_days_ago} days old")
-            return jsonify(onboarding_scrape_user_error(
-                Exception(f"Incomplete {platform} profile for @{handle} (missing latest_post)"),
-                handle,
-                platform,
-            )), 400
-
-        # Build summary for frontend
-        # Format follower count for display
-        if follower_count >= 1000000:
-            follower_display = f"{follower_count / 1000000:.1f}M"
-        elif follower_count >= 1000:
-            follower_display = f"{follower_count / 1000:.1f}K"
-        else:
-            follower_display = str(follower_count)
-
-        # Get niche from vision_data or profile
-        analysis = vision_data or {}
-        niche = (analysis.get('primary_niche') or
-                 profile.get('primary_niche') or
-                 'creator')
-        aesthetic_descriptors = (analysis.get('aesthetic_descriptors') or
-                                 profile.get('aesthetic_descriptors') or
-                                 [])
-
-        summary = {
-            'follower_count': follower_count,
-            'follower_display': follower_display,
-            'post_count': post_count,
-            'engagement_rate': profile.get('engagement_rate', 0),
-            'niche': niche,
-            'aesthetic_descriptors': aesthetic_descriptors,
-            'latest_post_days_ago': latest_post_days_ago,
-            'partial_scrape': partial_scrape,
-        }
-
-        if partial_scrape:
-            app.logger.warning(
-                f"⚠️ Partial scrape for @{handle}: {follower_count} followers "
-                "(Instagram wall — set IG_PROXY / INSTAGRAM_SESSIONID for full data)"
-            )
-        else:
-            app.logger.info(f"✅ Scrape successful for @{handle}: {follower_count} followers")
-
-        # Proof for step1: client cannot skip scrape or swap in a Pinterest/blog handle.
-        session['onboarding_quality'] = {
-            'handle': handle.lower().lstrip('@'),
-            'platform': platform,
-            'followers': int(follower_count or 0),
-        }
-        session.modified = True
-
-        # Save scraped avatar URL to session for step1 to apply (row doesn't exist yet)
-        avatar_url = (profile.get('avatarUrl') or
-                      profile.get('avatar_url') or
-                      profile.get('profile_pic_url') or '')
-        if avatar_url:
-            hosted = persist_social_avatar(avatar_url, dest_prefix=f"avatars/{user_id}")
-            session['scraped_avatar_url'] = hosted or avatar_url
-            session.modified = True
-            app.logger.info(
-                f"📸 Stored scraped avatar in session for user {user_id} "
-                f"({'rehosted' if hosted and hosted != avatar_url else 'raw'})"
-            )
-
-        return jsonify({
-            'success': True,
-            'profile': profile,
-            'summary': summary,
-            'partial_scrape': partial_scrape,
-        })
+        return _onboarding_scrape_response(user_id, handle, platform, profile, vision_data)
 
     except (ValueError, InHouseScrapeError) as e:
         from services.onboarding_scrape_errors import onboarding_scrape_user_error
@@ -2601,6 +2636,34 @@ def onboarding_scrape():
         )), 400
 
 
+@app.route('/api/user/onboarding/scrape/status/<job_id>', methods=['GET'])
+def onboarding_scrape_status(job_id):
+    """
+    Poll an async onboarding scrape. 202 while running; once done, the same
+    validation and response as the synchronous scrape.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+
+    job = get_scrape_job(job_id)
+    if not job or job.get('user_id') != str(user_id):
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    if job['status'] == 'done':
+        result = job.get('result') or {}
+        return _onboarding_scrape_response(
+            user_id, job['handle'], job['platform'], result.get('profile'), result.get('vision')
+        )
+    if job['status'] == 'failed':
+        from services.onboarding_scrape_errors import onboarding_scrape_user_error
+        payload = job.get('error_payload') or onboarding_scrape_user_error(
+            Exception(job.get('error') or 'Scrape failed'), job['handle'], job['platform']
+        )
+        return jsonify(payload), 400
+    return jsonify({'success': True, 'background': True, 'job': scrape_job_status_payload(job)}), 202
+
+
 @app.route('/api/user/onboarding/step2', methods=['POST', 'OPTIONS'])
 def onboarding_step2():
     """
@@ -2692,6 +2755,7 @@ def onboarding_step3():
         creator_id = result['id']
         sync_niche_to_pr_wishlist(creator_id, json.dumps(niches), conn)
         conn.commit()
+        invalidate_creator_recommendations(creator_id)
 
         # Send lifecycle welcome email now that onboarding is complete
         try:
@@ -2988,35 +3052,6 @@ def get_marketplace_creators():
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        # Debug: Check what niche values actually exist and test the filter
-        if niche and niche.lower() != 'all niches':
-            # First, let's see what niche values exist
-            cursor.execute('''
-                SELECT DISTINCT niche, COUNT(*) as count
-                FROM creators
-                WHERE public_profile_enabled = true
-                  AND niche IS NOT NULL
-                  AND niche != ''
-                GROUP BY niche
-                ORDER BY count DESC
-                LIMIT 20
-            ''')
-            sample_niches = cursor.fetchall()
-            app.logger.debug(f"Sample niche values in DB: {[(n['niche'], n['count']) for n in sample_niches]}")
-
-            # Test if any niche contains our search term
-            cursor.execute('''
-                SELECT id, username, niche
-                FROM creators
-                WHERE public_profile_enabled = true
-                  AND niche IS NOT NULL
-                  AND niche != ''
-                  AND niche ILIKE %s
-                LIMIT 5
-            ''', (f'%{niche}%',))
-            test_results = cursor.fetchall()
-            app.logger.debug(f"Test query results for '{niche}': {[(r['id'], r['username'], r['niche']) for r in test_results]}")
-
         # Build query
         where_clauses = []
         params = []
@@ -3025,49 +3060,44 @@ def get_marketplace_creators():
             where_clauses.append('c.public_profile_enabled = true')
 
         if niche and niche.lower() != 'all niches':
-            # Filter by niche. Since niche can be stored in various formats, we'll also check pr_wishlist
-            # which is already mapped to valid PR categories. This gives us better matching.
-            # Escape special characters for LIKE patterns (% and _)
-            niche_escaped = niche.replace('%', '\\%').replace('_', '\\_')
-
-            # Try matching in both niche and pr_wishlist columns
-            where_clauses.append('''
-                (
+            niche_sql, niche_params = (
+                niche_filter_sql(niche) if niche_tags_column_exists(conn) else (None, [])
+            )
+            if niche_sql:
+                # GIN-indexed overlap on the trigger-maintained niche_tags / niche_tokens
+                where_clauses.append(niche_sql)
+                params.extend(niche_params)
+            else:
+                # Pre-migration fallback: match the raw niche column (various formats)
+                # or the pr_wishlist categories
+                niche_escaped = niche.replace('%', '\\%').replace('_', '\\_')
+                where_clauses.append('''
                     (
-                        -- Match in niche column (various formats)
-                        c.niche IS NOT NULL
-                        AND c.niche != ''
-                        AND (
-                            LOWER(TRIM(c.niche)) = LOWER(%s)
-                            OR c.niche ILIKE %s
-                            OR c.niche ILIKE %s
-                            OR c.niche ILIKE %s
+                        (
+                            c.niche IS NOT NULL
+                            AND c.niche != ''
+                            AND (
+                                LOWER(TRIM(c.niche)) = LOWER(%s)
+                                OR c.niche ILIKE %s
+                                OR c.niche ILIKE %s
+                                OR c.niche ILIKE %s
+                            )
                         )
-                    )
-                    OR
-                    (
-                        -- Match in pr_wishlist column (JSONB array of valid categories)
-                        c.pr_wishlist IS NOT NULL
-                        AND c.pr_wishlist::text != '[]'
-                        AND c.pr_wishlist::text != 'null'
-                        AND EXISTS (
-                            SELECT 1
-                            FROM jsonb_array_elements_text(c.pr_wishlist) AS elem
-                            WHERE LOWER(TRIM(elem::text)) = LOWER(%s)
+                        OR
+                        (
+                            c.pr_wishlist IS NOT NULL
+                            AND c.pr_wishlist::text != '[]'
+                            AND c.pr_wishlist::text != 'null'
+                            AND EXISTS (
+                                SELECT 1
+                                FROM jsonb_array_elements_text(c.pr_wishlist) AS elem
+                                WHERE LOWER(TRIM(elem::text)) = LOWER(%s)
+                            )
                         )
                     )
-                )
-            ''')
-            # Match exact value in niche
-            params.append(niche)
-            # Match as substring in niche (handles JSON arrays and single strings)
-            params.append(f'%{niche_escaped}%')
-            # Match with quotes in JSON array
-            params.append(f'%"{niche_escaped}"%')
-            # Match with single quotes
-            params.append(f"%'{niche_escaped}'%")
-            # Match in pr_wishlist (exact category name)
-            params.append(niche)
+                ''')
+                params.extend([niche, f'%{niche_escaped}%', f'%"{niche_escaped}"%',
+                               f"%'{niche_escaped}'%", niche])
 
         if country and country.lower() != 'all locations':
             where_clauses.append('u.country = %s')
@@ -3335,9 +3365,11 @@ def get_marketplace_creators():
 
 
 from services.public_brand_guard import scraper_rate_limit, strip_gated_brand_fields
+from services.public_response_cache import cached_public_response
 
 @app.route('/api/public/brands/<slug>', methods=['GET'])
 @scraper_rate_limit
+@cached_public_response('brand')
 def get_public_brand_by_slug(slug):
     """
     Public endpoint for individual brand pages with SEO optimization
@@ -3594,6 +3626,7 @@ def unlock_brand_access(slug):
 
         conn.commit()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify({
             'applicationUrl': brand['application_url'],
@@ -8042,6 +8075,8 @@ def stripe_webhook():
     except stripe.error.SignatureVerificationError as e:
         return jsonify({"error": "Invalid signature"}), 400
 
+    record_stripe_event(event)
+
     if event['type'] == 'invoice.payment_succeeded':
         invoice = event['data']['object']
         subscription_id = invoice['subscription']
@@ -11,6 +11,7 @@ from urllib.parse import urlparse
 from datetime import datetime
 import os
 import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
 
 content_hub_bp = Blueprint('content_hub', __name__)
 
@@ -54,16 +55,7 @@ _TABLE_READY = False
 
 
 def get_db_connection():
-    url = os.getenv('DATABASE_URL')
-    if url:
-        return psycopg2.connect(url)
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-    )
+    return pooled_db_connection()
 
 
 def ensure_table():
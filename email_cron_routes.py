@@ -5,13 +5,12 @@ Handles automated email campaigns and reminders
 
 from flask import Blueprint, jsonify, request
 import os
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from psycopg2.extras import RealDictCursor
-from jinja2 import Environment, FileSystemLoader
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.mail_transport import lookup_user_id, render_template, send_smtp_message
 
 email_cron_bp = Blueprint('email_cron', __name__, url_prefix='/api/cron')
 
@@ -24,6 +23,24 @@ GLOBAL_EMAIL_COOLDOWN_HOURS = 24  # Minimum hours between ANY emails to same use
 MAX_EMAILS_PER_WEEK = 3  # Maximum emails per week per user
 
 
+def creators_past_cooloff(cursor, creator_ids) -> set:
+    """
+    Set-based check_global_cooloff: the subset of creator_ids that can receive
+    an email now (24h since last email, under the weekly cap). One query.
+    """
+    ids = list({cid for cid in creator_ids if cid is not None})
+    if not ids:
+        return set()
+    cursor.execute("""
+        SELECT id
+        FROM creators
+        WHERE id = ANY(%s)
+          AND (last_any_email_sent IS NULL OR last_any_email_sent < NOW() - INTERVAL '1 hour' * %s)
+          AND COALESCE(emails_sent_this_week, 0) < %s
+    """, (ids, GLOBAL_EMAIL_COOLDOWN_HOURS, MAX_EMAILS_PER_WEEK))
+    return {row['id'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+
+
 def check_global_cooloff(cursor, creator_id: int) -> bool:
     """
     Check if a creator can receive an email based on global cool-off.
@@ -34,17 +51,7 @@ def check_global_cooloff(cursor, creator_id: int) -> bool:
     - Max 1 email per day (24h cooldown)
     - Max 3 emails per week
     """
-    cursor.execute("""
-        SELECT
-            (last_any_email_sent IS NULL OR last_any_email_sent < NOW() - INTERVAL '1 hour' * %s) AS daily_ok,
-            COALESCE(emails_sent_this_week, 0) < %s AS weekly_ok
-        FROM creators
-        WHERE id = %s
-    """, (GLOBAL_EMAIL_COOLDOWN_HOURS, MAX_EMAILS_PER_WEEK, creator_id))
-    row = cursor.fetchone()
-    if not row:
-        return False
-    return bool(row.get('daily_ok')) and bool(row.get('weekly_ok'))
+    return creator_id in creators_past_cooloff(cursor, [creator_id])
 
 
 def mark_email_sent(cursor, conn, creator_id: int, email_type: str = None):
@@ -63,13 +70,7 @@ def mark_email_sent(cursor, conn, creator_id: int, email_type: str = None):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def send_template_email(to_email, template_name, subject, context):
     """
@@ -95,23 +96,9 @@ def send_template_email(to_email, template_name, subject, context):
 
                 uid = context.get('user_id')
 
-                # Fall back: look up user_id by recipient email
+                # Fall back: look up user_id by recipient email (cached, shared pool)
                 if not uid:
-                    try:
-                        _conn = psycopg2.connect(
-                            host=os.getenv('DB_HOST'), port=os.getenv('DB_PORT', 5432),
-                            database=os.getenv('DB_NAME'), user=os.getenv('DB_USER'),
-                            password=os.getenv('DB_PASSWORD'),
-                        )
-                        _cur = _conn.cursor()
-                        _cur.execute("SELECT id FROM users WHERE email = %s LIMIT 1", (to_email.strip().lower(),))
-                        row = _cur.fetchone()
-                        if row:
-                            uid = row[0]
-                        _cur.close()
-                        _conn.close()
-                    except Exception:
-                        pass
+                    uid = lookup_user_id(to_email)
 
                 if uid:
                     token = make_unsubscribe_token(str(uid))
@@ -121,15 +108,9 @@ def send_template_email(to_email, template_name, subject, context):
             except Exception:
                 context = {**context, 'unsubscribe_url': None}
 
-        env = Environment(loader=FileSystemLoader('templates'))
-        template = env.get_template(template_name)
-
-        html_content = template.render(**context)
+        html_content = render_template(template_name, context)
 
-        smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-        smtp_port = int(os.getenv('SMTP_PORT', 587))
         smtp_username = os.getenv('SMTP_USERNAME')
-        smtp_password = os.getenv('SMTP_PASSWORD')
         sender_name = os.getenv('EMAIL_SENDER_NAME', 'NewCollab')
 
         msg = MIMEMultipart('alternative')
@@ -139,10 +120,8 @@ def send_template_email(to_email, template_name, subject, context):
 
         msg.attach(MIMEText(html_content, 'html'))
 
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            server.send_message(msg)
+        # Keep-alive session: a cron run logs in once, not once per reminder
+        send_smtp_message(msg)
 
         return True, None
     except Exception as e:
@@ -1272,10 +1251,11 @@ def pipeline_followup_nudge():
 
         sent_count = 0
         errors = []
+        # Cooldown (daily + weekly limit) for every user in one query
+        allowed = creators_past_cooloff(cursor, creators_pitches.keys())
 
         for creator_id, data in creators_pitches.items():
-            # Check cooldown per user (daily + weekly limit)
-            if not check_global_cooloff(cursor, creator_id):
+            if creator_id not in allowed:
                 continue
 
             pitches = data['pitches']
@@ -2130,12 +2110,13 @@ def send_pool_digest_emails():
 
         sent_count = 0
         skipped_count = 0
+        allowed = creators_past_cooloff(cursor, [r['creator_id'] for r in recipients])
 
         for recipient in recipients:
             creator_id = recipient['creator_id']
 
             # Check global cooloff
-            if not check_global_cooloff(cursor, creator_id):
+            if creator_id not in allowed:
                 skipped_count += 1
                 continue
 
@@ -2192,3 +2173,106 @@ def send_pool_digest_emails():
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# =============================================================================
+# BRAND POPULARITY REFRESH
+# The creator_pipeline trigger keeps brand_popularity_stats current on writes;
+# this re-ages the 30-day window for brands nobody touched recently.
+# =============================================================================
+
+@email_cron_bp.route('/refresh-brand-popularity', methods=['POST'])
+def refresh_brand_popularity_stats():
+    """
+    Recompute brand_popularity_stats for every brand.
+
+    Cron: Hourly
+    """
+    from services.brand_popularity import refresh_brand_popularity
+
+    try:
+        conn = get_db_connection()
+        refreshed = refresh_brand_popularity(conn)
+        conn.close()
+
+        print(f"✅ Refreshed popularity stats for {refreshed} brands")
+
+        return jsonify({
+            'success': True,
+            'refreshed': refreshed
+        }), 200
+
+    except Exception as e:
+        print(f"❌ Error in refresh_brand_popularity_stats: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# =============================================================================
+# REPORT ROLLUPS REFRESH
+# Rolls closed days into report_daily_rollups / report_window_rollups for the
+# founder dashboard and KPI reports. ?full=1 re-rolls all history.
+# =============================================================================
+
+@email_cron_bp.route('/refresh-report-rollups', methods=['POST'])
+def refresh_report_rollups_cron():
+    """
+    Roll yesterday (and the last few re-rolled days) into the report rollups.
+
+    Cron: Daily, shortly after midnight
+    """
+    from services.report_rollups import refresh_report_rollups
+
+    try:
+        full = request.args.get('full') == '1'
+        conn = get_db_connection()
+        result = refresh_report_rollups(conn, full=full)
+        conn.close()
+
+        print(f"✅ Rolled {result['days']} report days (from {result['start']}, through {result['as_of']})")
+
+        return jsonify({'success': True, **result}), 200
+
+    except Exception as e:
+        print(f"❌ Error in refresh_report_rollups_cron: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# =============================================================================
+# SUBSCRIPTIONS LEDGER RECONCILIATION
+# Pages Stripe once a night and corrects the webhook-maintained subscriptions
+# ledger behind founder-dashboard MRR and churn.
+# =============================================================================
+
+@email_cron_bp.route('/reconcile-subscriptions', methods=['POST'])
+def reconcile_subscriptions_cron():
+    """
+    Upsert every Stripe subscription into the ledger; close rows Stripe no longer lists.
+
+    Cron: Daily, overnight
+    """
+    from services.subscription_ledger import reconcile_subscriptions
+
+    try:
+        conn = get_db_connection()
+        try:
+            result = reconcile_subscriptions(conn)
+        finally:
+            conn.close()
+
+        if result.get('skipped'):
+            print(f"⚠️ Subscription reconciliation skipped: {result['skipped']}")
+        else:
+            print(f"✅ Reconciled {result['seen']} Stripe subscriptions "
+                  f"(closed {result['closed']}, linked {result['linked']})")
+
+        return jsonify({'success': True, **result}), 200
+
+    except Exception as e:
+        print(f"❌ Error in reconcile_subscriptions_cron: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -6,17 +6,21 @@ throttling, and feature flags.
 """
 import os
 import json
+import heapq
 import logging
-import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta, date
 from typing import Optional, Dict, Any, List, Tuple
 from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-from jinja2 import Environment, FileSystemLoader
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.feature_flags import EMAIL_FEATURE_FLAGS
+from services.mail_transport import get_template_env, send_smtp_message
+from services.niche_tags import canonical_niches, parse_niches
 from public_routes import make_unsubscribe_token
 
 # ============================================
@@ -39,11 +43,15 @@ MAX_EMAILS_PER_WEEK = 2
 QUIET_HOUR_START = 22
 QUIET_HOUR_END = 6
 
+# Weekly digest runner: worker threads and per-run time budget (cron timeout is ~30s)
+WEEKLY_DIGEST_WORKERS = int(os.getenv('WEEKLY_DIGEST_WORKERS', '4'))
+WEEKLY_DIGEST_TIME_BUDGET = float(os.getenv('WEEKLY_DIGEST_TIME_BUDGET', '25'))
+
 # Template directory
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
 
-# Initialize Jinja2
-jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+# Shared Jinja2 environment (templates compiled once per process)
+jinja_env = get_template_env(TEMPLATE_DIR)
 
 
 # ============================================
@@ -52,7 +60,7 @@ jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
 
 def get_db_connection():
     """Get database connection."""
-    return psycopg2.connect(os.getenv('DATABASE_URL'))
+    return pooled_db_connection()
 
 
 # ============================================
@@ -60,46 +68,18 @@ def get_db_connection():
 # ============================================
 
 def is_feature_enabled(flag_name: str) -> bool:
-    """Check if a feature flag is enabled."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT enabled FROM email_feature_flags WHERE flag_name = %s",
-            (flag_name,)
-        )
-        row = cursor.fetchone()
-        return row[0] if row else False
-    finally:
-        conn.close()
+    """Check if a feature flag is enabled (in-memory snapshot, see services/feature_flags.py)."""
+    return EMAIL_FEATURE_FLAGS.is_enabled(flag_name)
 
 
 def get_all_feature_flags() -> Dict[str, bool]:
-    """Get all feature flags as a dict."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT flag_name, enabled FROM email_feature_flags")
-        return {row[0]: row[1] for row in cursor.fetchall()}
-    finally:
-        conn.close()
+    """Get all feature flags as a dict, read fresh from the table."""
+    return EMAIL_FEATURE_FLAGS.all(fresh=True)
 
 
 def set_feature_flag(flag_name: str, enabled: bool) -> bool:
-    """Set a feature flag value."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """UPDATE email_feature_flags
-               SET enabled = %s, updated_at = NOW()
-               WHERE flag_name = %s""",
-            (enabled, flag_name)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    """Set a feature flag value and invalidate every worker's snapshot."""
+    return EMAIL_FEATURE_FLAGS.set(flag_name, enabled)
 
 
 # ============================================
@@ -439,10 +419,10 @@ def _send_smtp(to_email: str, subject: str, html_content: str) -> Tuple[bool, st
         msg.attach(MIMEText(plain_text, 'plain'))
         msg.attach(MIMEText(html_content, 'html'))
 
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.sendmail(SMTP_USERNAME, to_email, msg.as_string())
+        send_smtp_message(
+            msg, [to_email], host=SMTP_SERVER, port=SMTP_PORT,
+            username=SMTP_USERNAME, password=SMTP_PASSWORD,
+        )
 
         # Generate a pseudo message ID
         message_id = f"<{datetime.now().strftime('%Y%m%d%H%M%S')}.{hash(to_email) % 10000}@newcollab.co>"
@@ -462,121 +442,60 @@ def get_eligible_emails(creator_id: int) -> List[Dict[str, Any]]:
     """
     conn = get_db_connection()
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get creator data with all relevant fields
-        # Use last_login from users table for dormancy detection
-        cursor.execute("""
-            SELECT c.*,
-                   u.email,
-                   EXTRACT(DAY FROM NOW() - c.created_at) as days_since_signup,
-                   EXTRACT(DAY FROM NOW() - COALESCE(u.last_login, c.created_at)) as days_since_login
-            FROM creators c
-            JOIN users u ON c.user_id = u.id
-            WHERE c.id = %s
-        """, (creator_id,))
-        creator = cursor.fetchone()
-
-        if not creator:
+        result = evaluate_eligibility(conn, [creator_id]).get(creator_id)
+        if not result:
             return []
-
-        # Update state
-        state = update_creator_state(creator_id)
-        creator['lifecycle_state'] = state
-
-        # Get all active templates
-        cursor.execute("""
-            SELECT * FROM lifecycle_email_templates
-            WHERE active = true
-            ORDER BY priority DESC
-        """)
-        templates = cursor.fetchall()
-        logging.info(f"[ELIGIBLE] Creator {creator_id}: Found {len(templates)} active templates, state={state}")
-
-        eligible = []
-        skip_reasons = {'feature_flag': [], 'state': [], 'tier': [], 'throttle': [], 'trigger': []}
-
-        for template in templates:
-            slug = template['slug']
-
-            # Debug max_quota_hit specifically
-            if slug == 'max_quota_hit':
-                logging.info(f"[DEBUG] max_quota_hit check: state={state}, required={template.get('required_user_state')}, tier={creator.get('subscription_tier')}, excluded={template.get('excluded_tiers')}, flag={template.get('feature_flag')}")
-
-            # Check feature flag
-            if template.get('feature_flag') and not is_feature_enabled(template['feature_flag']):
-                skip_reasons['feature_flag'].append(slug)
-                continue
-
-            # Check required state
-            required_states = template.get('required_user_state')
-            if required_states and state not in required_states:
-                skip_reasons['state'].append(slug)
-                continue
-
-            # Check excluded tiers
-            excluded_tiers = template.get('excluded_tiers')
-            if excluded_tiers and creator.get('subscription_tier', 'free') in excluded_tiers:
-                skip_reasons['tier'].append(slug)
-                continue
-
-            # Check throttling
-            can_send, reason = check_throttling(creator_id, template['slug'])
-            if not can_send:
-                if slug == 'max_quota_hit':
-                    logging.info(f"[DEBUG] max_quota_hit throttled: {reason}")
-                skip_reasons['throttle'].append(f"{slug}({reason})")
-                continue
-
-            # Evaluate trigger conditions
-            if evaluate_trigger(creator, template, cursor):
-                logging.info(f"[ELIGIBLE] Creator {creator_id}: {slug} ELIGIBLE")
-                eligible.append(template)
-            else:
-                skip_reasons['trigger'].append(slug)
-
-        # Log skip summary
-        if not eligible:
-            logging.info(f"[ELIGIBLE] Creator {creator_id} skip summary: state={len(skip_reasons['state'])}, trigger={len(skip_reasons['trigger'])}, throttle={len(skip_reasons['throttle'])}, tier={len(skip_reasons['tier'])}, flag={len(skip_reasons['feature_flag'])}")
-            if skip_reasons['trigger']:
-                logging.info(f"[ELIGIBLE] Creator {creator_id} trigger-failed: {skip_reasons['trigger'][:5]}")
-
-        return eligible
+        if not result['eligible']:
+            reasons = result['skip_reasons']
+            logging.info(f"[ELIGIBLE] Creator {creator_id} skip summary: state={len(reasons['state'])}, trigger={len(reasons['trigger'])}, throttle={len(reasons['throttle'])}, tier={len(reasons['tier'])}, flag={len(reasons['feature_flag'])}")
+            if reasons['trigger']:
+                logging.info(f"[ELIGIBLE] Creator {creator_id} trigger-failed: {reasons['trigger'][:5]}")
+        return result['eligible']
     finally:
         conn.close()
 
 
 def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
     """Evaluate if a template's trigger conditions are met for a creator."""
-    trigger_type = template.get('trigger_type')
-    conditions = template.get('trigger_conditions', {})
+    creator_id = creator['id']
+    if 'total_unlocks' not in creator or 'has_pipeline' not in creator:
+        facts = load_creator_facts(cursor, [creator_id]).get(creator_id) or {}
+        creator = {
+            **creator,
+            'total_unlocks': facts.get('total_unlocks', 0),
+            'has_pipeline': facts.get('has_pipeline', False),
+        }
+    history = load_send_history(cursor, [creator_id]).get(creator_id, {})
+    return _trigger_met(creator, template, history)
 
+
+def _trigger_conditions(template: Dict) -> Dict:
+    conditions = template.get('trigger_conditions', {})
     if not isinstance(conditions, dict):
         try:
             conditions = json.loads(conditions) if conditions else {}
-        except:
+        except (TypeError, ValueError):
             conditions = {}
+    return conditions
 
+
+def _trigger_met(creator: Dict, template: Dict, history: Dict[str, Dict]) -> bool:
+    """
+    Trigger check against preloaded data.
+    creator needs total_unlocks/has_pipeline; history is load_send_history() for it.
+    """
+    trigger_type = template.get('trigger_type')
+    conditions = _trigger_conditions(template)
     slug = template['slug']
     creator_id = creator['id']
 
     # Check if already sent (for one-time emails)
-    if conditions.get('one_time'):
-        cursor.execute("""
-            SELECT id FROM lifecycle_email_sends
-            WHERE creator_id = %s AND template_slug = %s
-        """, (creator_id, slug))
-        if cursor.fetchone():
-            return False
+    if conditions.get('one_time') and slug in history:
+        return False
 
     # Check if previous email in sequence was sent
-    if conditions.get('requires_previous'):
-        cursor.execute("""
-            SELECT id FROM lifecycle_email_sends
-            WHERE creator_id = %s AND template_slug = %s
-        """, (creator_id, conditions['requires_previous']))
-        if not cursor.fetchone():
-            return False
+    if conditions.get('requires_previous') and conditions['requires_previous'] not in history:
+        return False
 
     if trigger_type == 'immediate':
         # Immediate triggers are handled separately
@@ -608,15 +527,10 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
             else:
                 return False
 
-        # Check additional conditions
+        # Check additional conditions (TOTAL lifetime unlocks, not daily which resets)
         condition = conditions.get('condition')
+        total_unlocks = creator.get('total_unlocks', 0) or 0
         if condition == 'no_unlocks':
-            # Check TOTAL lifetime unlocks, not just daily (daily resets each day!)
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM brand_unlocks WHERE creator_id = %s
-            """, (creator_id,))
-            unlock_row = cursor.fetchone()
-            total_unlocks = unlock_row['total'] if unlock_row else 0
             if total_unlocks > 0:
                 return False
         elif condition == 'incomplete_profile':
@@ -624,21 +538,9 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
             if creator.get('bio') and creator.get('instagram_handle'):
                 return False
         elif condition == 'has_activity':
-            # Check TOTAL lifetime unlocks (not daily which resets)
-            cursor.execute("""
-                SELECT COUNT(*) as total FROM brand_unlocks WHERE creator_id = %s
-            """, (creator_id,))
-            unlock_row = cursor.fetchone()
-            total_unlocks = unlock_row['total'] if unlock_row else 0
-            if total_unlocks == 0:
-                # Also check for any pipeline activity (saved brands)
-                cursor.execute("""
-                    SELECT 1 FROM creator_pipeline
-                    WHERE creator_id = %s
-                    LIMIT 1
-                """, (creator_id,))
-                if not cursor.fetchone():
-                    return False
+            # No unlocks: fall back to any pipeline activity (saved brands)
+            if total_unlocks == 0 and not creator.get('has_pipeline'):
+                return False
 
         return True
 
@@ -651,14 +553,9 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
         if conditions.get('days_after_previous'):
             prev_slug = conditions.get('requires_previous')
             if prev_slug:
-                cursor.execute("""
-                    SELECT sent_at FROM lifecycle_email_sends
-                    WHERE creator_id = %s AND template_slug = %s
-                    ORDER BY sent_at DESC LIMIT 1
-                """, (creator_id, prev_slug))
-                prev_send = cursor.fetchone()
-                if prev_send:
-                    days_since = (datetime.now() - prev_send['sent_at']).days
+                prev_sent_at = (history.get(prev_slug) or {}).get('last_sent_at')
+                if prev_sent_at:
+                    days_since = (datetime.now() - prev_sent_at).days
                     if days_since < conditions['days_after_previous']:
                         return False
 
@@ -676,13 +573,7 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
 
         # max_quota_hit: Send to maximizers who haven't received it this month
         if slug == 'max_quota_hit' and creator.get('lifecycle_state') == 'maximizer':
-            month_key = datetime.now().strftime('%Y-%m')
-            cursor.execute("""
-                SELECT id FROM lifecycle_email_sends
-                WHERE creator_id = %s AND template_slug = %s
-                AND sent_at >= date_trunc('month', NOW())
-            """, (creator_id, slug))
-            if not cursor.fetchone():
+            if not (history.get(slug) or {}).get('sent_this_month'):
                 logging.info(f"[TRIGGER] max_quota_hit eligible for maximizer {creator_id} (backfill)")
                 return True
 
@@ -695,12 +586,7 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
             return False
 
         # Check if already sent this week
-        cursor.execute("""
-            SELECT id FROM lifecycle_email_sends
-            WHERE creator_id = %s AND template_slug = %s
-            AND sent_at >= date_trunc('week', NOW())
-        """, (creator_id, slug))
-        if cursor.fetchone():
+        if (history.get(slug) or {}).get('sent_this_week'):
             return False
 
         return True
@@ -708,6 +594,223 @@ def evaluate_trigger(creator: Dict, template: Dict, cursor) -> bool:
     return False
 
 
+# ============================================
+# SET-BASED ELIGIBILITY
+# ============================================
+# One pass for a whole batch of creators: creator facts, send history, flags
+# and templates are each loaded with a single query, state changes and
+# throttle-counter resets are written in bulk, and every check runs in memory.
+
+def load_creator_facts(cursor, creator_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """creators.* plus email, day counts, lifetime unlocks and pipeline activity, by id."""
+    if not creator_ids:
+        return {}
+    cursor.execute("""
+        SELECT c.*,
+               u.email,
+               EXTRACT(DAY FROM NOW() - c.created_at) AS days_since_signup,
+               EXTRACT(DAY FROM NOW() - COALESCE(u.last_login, c.created_at)) AS days_since_login,
+               COALESCE(bu.total, 0) AS total_unlocks,
+               EXISTS (SELECT 1 FROM creator_pipeline cp WHERE cp.creator_id = c.id) AS has_pipeline
+        FROM creators c
+        JOIN users u ON c.user_id = u.id
+        LEFT JOIN (
+            SELECT creator_id, COUNT(*) AS total
+            FROM brand_unlocks
+            WHERE creator_id = ANY(%s)
+            GROUP BY creator_id
+        ) bu ON bu.creator_id = c.id
+        WHERE c.id = ANY(%s)
+    """, (list(creator_ids), list(creator_ids)))
+    return {row['id']: dict(row) for row in cursor.fetchall()}
+
+
+def load_send_history(cursor, creator_ids: List[int]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    """creator_id -> template_slug -> last_sent_at / sent_this_month / sent_this_week."""
+    if not creator_ids:
+        return {}
+    cursor.execute("""
+        SELECT creator_id, template_slug,
+               MAX(sent_at) AS last_sent_at,
+               COALESCE(BOOL_OR(sent_at >= date_trunc('month', NOW())), false) AS sent_this_month,
+               COALESCE(BOOL_OR(sent_at >= date_trunc('week', NOW())), false) AS sent_this_week
+        FROM lifecycle_email_sends
+        WHERE creator_id = ANY(%s)
+        GROUP BY creator_id, template_slug
+    """, (list(creator_ids),))
+    history: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for row in cursor.fetchall():
+        history.setdefault(row['creator_id'], {})[row['template_slug']] = row
+    return history
+
+
+def _effective_throttle_counts(creator: Dict, today: date) -> Tuple[int, int]:
+    """Counters after the daily / Monday-weekly resets check_throttling would apply."""
+    sent_today = creator.get('lifecycle_emails_sent_today', 0) or 0
+    last_email_date = creator.get('lifecycle_last_email_date')
+    if last_email_date and last_email_date < today:
+        sent_today = 0
+    sent_week = creator.get('lifecycle_emails_sent_this_week', 0) or 0
+    week_start = creator.get('lifecycle_week_start_date')
+    if not week_start or week_start < today - timedelta(days=today.weekday()):
+        sent_week = 0
+    return sent_today, sent_week
+
+
+def _throttle_allows(creator: Dict, template: Dict, today: date) -> Tuple[bool, str]:
+    sent_today, sent_week = _effective_throttle_counts(creator, today)
+    if not template.get('exempt_from_daily_cap', False) and sent_today >= MAX_EMAILS_PER_DAY:
+        return False, f"Daily limit reached ({MAX_EMAILS_PER_DAY}/day)"
+    if not template.get('exempt_from_weekly_cap', False) and sent_week >= MAX_EMAILS_PER_WEEK:
+        return False, f"Weekly limit reached ({MAX_EMAILS_PER_WEEK}/week)"
+    return True, "OK"
+
+
+def _apply_state_and_counter_resets(cursor, facts: Dict[int, Dict[str, Any]], today: date):
+    """Persist lifecycle_state changes and stale throttle counters for the batch."""
+    from psycopg2.extras import execute_values
+
+    changed = [
+        (cid, creator['lifecycle_state_new'])
+        for cid, creator in facts.items()
+        if creator['lifecycle_state_new'] != creator.get('lifecycle_state')
+    ]
+    if changed:
+        execute_values(cursor, """
+            UPDATE creators c
+            SET lifecycle_state = v.state, lifecycle_state_updated_at = NOW()
+            FROM (VALUES %s) AS v(id, state)
+            WHERE c.id = v.id
+        """, changed, template='(%s::int, %s::text)')
+
+    ids = list(facts)
+    week_start = today - timedelta(days=today.weekday())
+    cursor.execute("""
+        UPDATE creators SET lifecycle_emails_sent_today = 0
+        WHERE id = ANY(%s) AND lifecycle_last_email_date < %s
+    """, (ids, today))
+    cursor.execute("""
+        UPDATE creators
+        SET lifecycle_emails_sent_this_week = 0,
+            lifecycle_week_start_date = %s
+        WHERE id = ANY(%s)
+          AND (lifecycle_week_start_date IS NULL OR lifecycle_week_start_date < %s)
+    """, (week_start, ids, week_start))
+
+
+def evaluate_eligibility(conn, creator_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Eligible templates for many creators at once.
+
+    Returns creator_id -> {'creator': facts (lifecycle_state refreshed),
+    'eligible': templates in priority order, 'skip_reasons': {...}}.
+    Same checks, in the same order, as the per-creator path used to run:
+    feature flag, required state, excluded tier, throttle, trigger.
+    """
+    creator_ids = [cid for cid in dict.fromkeys(creator_ids) if cid is not None]
+    if not creator_ids:
+        return {}
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        facts = load_creator_facts(cursor, creator_ids)
+        if not facts:
+            return {}
+        history = load_send_history(cursor, list(facts))
+        cursor.execute("""
+            SELECT * FROM lifecycle_email_templates
+            WHERE active = true
+            ORDER BY priority DESC
+        """)
+        templates = cursor.fetchall()
+        cursor.execute("SELECT flag_name, enabled FROM email_feature_flags")
+        flags = {row['flag_name']: row['enabled'] for row in cursor.fetchall()}
+
+        today = date.today()
+        for creator in facts.values():
+            creator['lifecycle_state_new'] = determine_lifecycle_state(creator)
+        _apply_state_and_counter_resets(cursor, facts, today)
+        conn.commit()
+
+        results = {}
+        for creator_id, creator in facts.items():
+            creator['lifecycle_state'] = creator.pop('lifecycle_state_new')
+            state = creator['lifecycle_state']
+            creator_history = history.get(creator_id, {})
+            eligible = []
+            skip_reasons = {'feature_flag': [], 'state': [], 'tier': [], 'throttle': [], 'trigger': []}
+            for template in templates:
+                slug = template['slug']
+                if template.get('feature_flag') and not flags.get(template['feature_flag'], False):
+                    skip_reasons['feature_flag'].append(slug)
+                    continue
+                required_states = template.get('required_user_state')
+                if required_states and state not in required_states:
+                    skip_reasons['state'].append(slug)
+                    continue
+                excluded_tiers = template.get('excluded_tiers')
+                if excluded_tiers and creator.get('subscription_tier', 'free') in excluded_tiers:
+                    skip_reasons['tier'].append(slug)
+                    continue
+                can_send, reason = _throttle_allows(creator, template, today)
+                if not can_send:
+                    skip_reasons['throttle'].append(f"{slug}({reason})")
+                    continue
+                if _trigger_met(creator, template, creator_history):
+                    eligible.append(template)
+                else:
+                    skip_reasons['trigger'].append(slug)
+            results[creator_id] = {'creator': creator, 'eligible': eligible, 'skip_reasons': skip_reasons}
+        return results
+    finally:
+        cursor.close()
+
+
+def _dedup_key(template: Dict, creator_id: int) -> str:
+    if _trigger_conditions(template).get('one_time'):
+        return f"{template['slug']}_{creator_id}"
+    return f"{template['slug']}_{creator_id}_{date.today().isoformat()}"
+
+
+def plan_lifecycle_sends(conn, creator_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Ready send list: the top eligible template per creator, with dedup and
+    quiet hours resolved up front so no context is built for emails that
+    send_lifecycle_email would refuse.
+
+    Returns creator_id -> evaluate_eligibility() entry plus 'template',
+    'dedup_key' and 'skip' (None when the email should go out).
+    """
+    plan = evaluate_eligibility(conn, creator_ids)
+    quiet = is_quiet_hours()
+    keys = {}
+    for creator_id, entry in plan.items():
+        entry['template'] = entry['eligible'][0] if entry['eligible'] else None
+        entry['dedup_key'] = None
+        entry['skip'] = None
+        if not entry['template']:
+            entry['skip'] = 'no_eligible'
+        elif quiet and not entry['template'].get('exempt_from_daily_cap'):
+            entry['skip'] = 'quiet_hours'
+        else:
+            entry['dedup_key'] = _dedup_key(entry['template'], creator_id)
+            keys[entry['dedup_key']] = creator_id
+
+    if keys:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT creator_id, dedup_key FROM lifecycle_email_sends
+                WHERE creator_id = ANY(%s) AND dedup_key = ANY(%s)
+            """, (list(set(keys.values())), list(keys)))
+            for row in cursor.fetchall():
+                creator_id, key = (row['creator_id'], row['dedup_key']) if isinstance(row, dict) else row
+                if keys.get(key) == creator_id:
+                    plan[creator_id]['skip'] = 'already_sent'
+        finally:
+            cursor.close()
+    return plan
+
+
 # ============================================
 # CRON JOB HANDLERS
 # ============================================
@@ -790,27 +893,30 @@ def process_daily_lifecycle_emails(
         if 'processed_creators' not in stats:
             stats['processed_creators'] = []
 
+        # Whole batch evaluated in a handful of queries; only actual sends
+        # touch the database per creator from here on.
+        plan = plan_lifecycle_sends(conn, [creator['id'] for creator in creators])
+
         for creator in creators:
             stats['processed'] += 1
-            logging.info(f"[LIFECYCLE CRON] Processing creator {creator['id']} (state: {creator.get('lifecycle_state')})")
+            entry = plan.get(creator['id'])
+            state = entry['creator']['lifecycle_state'] if entry else creator.get('lifecycle_state')
+            eligible_count = len(entry['eligible']) if entry else 0
 
             try:
-                eligible = get_eligible_emails(creator['id'])
-                logging.info(f"[LIFECYCLE CRON] Creator {creator['id']} has {len(eligible)} eligible emails")
-
-                if not eligible:
+                if not entry or entry['skip']:
                     stats['skipped'] += 1
                     if len(stats['processed_creators']) < 10:
                         stats['processed_creators'].append({
                             'id': creator['id'],
-                            'state': creator.get('lifecycle_state'),
-                            'eligible_count': 0,
-                            'result': 'skipped_no_eligible'
+                            'state': state,
+                            'eligible_count': eligible_count,
+                            'result': f"skipped_{entry['skip'] if entry else 'no_eligible'}"
                         })
                     continue
 
                 # Send the highest priority email
-                template = eligible[0]
+                template = entry['template']
 
                 # In dry_run mode, just log what would be sent
                 if dry_run:
@@ -818,8 +924,8 @@ def process_daily_lifecycle_emails(
                     if len(stats['processed_creators']) < 10:
                         stats['processed_creators'].append({
                             'id': creator['id'],
-                            'state': creator.get('lifecycle_state'),
-                            'eligible_count': len(eligible),
+                            'state': state,
+                            'eligible_count': eligible_count,
                             'would_send': template['slug'],
                             'result': 'dry_run_sent'
                         })
@@ -834,7 +940,7 @@ def process_daily_lifecycle_emails(
                     template_slug=template['slug'],
                     context=context,
                     creator_id=creator['id'],
-                    dedup_key=f"{template['slug']}_{creator['id']}_{date.today().isoformat()}" if not template['trigger_conditions'].get('one_time') else f"{template['slug']}_{creator['id']}"
+                    dedup_key=entry['dedup_key']
                 )
 
                 if success:
@@ -857,27 +963,109 @@ def process_daily_lifecycle_emails(
         conn.close()
 
 
+def _digest_week_key(today: Optional[date] = None) -> str:
+    """ISO week the digest checkpoint belongs to, e.g. '2026-W11'."""
+    year, week, _ = (today or date.today()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _digest_checkpoints_enabled(cursor) -> bool:
+    cursor.execute("SELECT to_regclass('public.weekly_digest_checkpoints') IS NOT NULL AS ready")
+    row = cursor.fetchone()
+    return bool(row and row['ready'])
+
+
+def _load_digest_checkpoint(cursor, week_key: str) -> int:
+    cursor.execute(
+        "SELECT last_creator_id FROM weekly_digest_checkpoints WHERE week_key = %s",
+        (week_key,)
+    )
+    row = cursor.fetchone()
+    return row['last_creator_id'] if row else 0
+
+
+def _save_digest_checkpoint(cursor, week_key: str, last_creator_id: int, batch: Dict[str, Any], completed: bool):
+    cursor.execute("""
+        INSERT INTO weekly_digest_checkpoints
+            (week_key, last_creator_id, processed, sent, skipped, errors, batches, completed_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, 1, CASE WHEN %s THEN NOW() END, NOW())
+        ON CONFLICT (week_key) DO UPDATE SET
+            last_creator_id = GREATEST(weekly_digest_checkpoints.last_creator_id, EXCLUDED.last_creator_id),
+            processed = weekly_digest_checkpoints.processed + EXCLUDED.processed,
+            sent = weekly_digest_checkpoints.sent + EXCLUDED.sent,
+            skipped = weekly_digest_checkpoints.skipped + EXCLUDED.skipped,
+            errors = weekly_digest_checkpoints.errors + EXCLUDED.errors,
+            batches = weekly_digest_checkpoints.batches + 1,
+            completed_at = COALESCE(EXCLUDED.completed_at, weekly_digest_checkpoints.completed_at),
+            updated_at = NOW()
+    """, (week_key, last_creator_id, batch['creators'], batch['sent'], batch['skipped'],
+          batch['errors'], completed))
+
+
+def _send_weekly_digest(data: Dict[str, Any], new_brands: List[Dict], dedup_key: str,
+                        dry_run: bool, compute_pr_ready_score) -> Tuple[str, str]:
+    """Build one creator's context from prefetched data and send it. Runs in the digest pool."""
+    creator = data['creator']
+    context = _weekly_digest_context(data, new_brands, compute_pr_ready_score)
+    if dry_run:
+        print(f"[DRY RUN] Would send weekly_digest to creator {creator['id']} ({creator['email']})")
+        return 'sent', 'dry run'
+    success, message = send_lifecycle_email(
+        to_email=creator['email'],
+        template_slug='weekly_digest',
+        context=context,
+        creator_id=creator['id'],
+        dedup_key=dedup_key
+    )
+    return ('sent' if success else 'skipped'), message
+
+
 def process_weekly_digest(
     batch_size: int = 100,
     dry_run: bool = False,
     limit: int = None,
     test_email: str = None,
-    skip_day_check: bool = False
+    skip_day_check: bool = False,
+    time_budget: float = None,
+    workers: int = None
 ) -> Dict[str, int]:
     """
     Send weekly digest emails (Monday only).
 
+    Walks verified creators by id (keyset) from this ISO week's checkpoint in
+    weekly_digest_checkpoints, so repeated cron runs continue where the last one
+    stopped instead of re-walking the first creators. Each batch prefetches
+    creator/scrape/kit/unlock data and the brand catalog in a few ANY() queries,
+    then builds contexts and sends in a thread pool over pooled connections.
+
     Args:
         batch_size: Number of creators to process per batch
-        dry_run: If True, only count eligible users without sending emails
-        limit: If set, only process this many creators total
+        dry_run: If True, only count eligible users without sending emails (checkpoint untouched)
+        limit: If set, only process this many creators total in this run
         test_email: If set, only process creator with this email address
         skip_day_check: If True, skip the Monday-only check (for testing)
+        time_budget: Seconds this run may spend; no batch starts that would overrun it
+        workers: Context/send threads (default WEEKLY_DIGEST_WORKERS)
     """
     # Allow skipping day check for testing
     if not skip_day_check and datetime.now().weekday() != 0:  # 0 = Monday
         return {'skipped': 0, 'reason': 'Not Monday'}
 
+    if not is_feature_enabled('email_weekly_digest_v2'):
+        return {'skipped': 0, 'reason': 'Feature disabled'}
+
+    try:
+        from services.pr_ready import compute_pr_ready_score
+    except ImportError:
+        compute_pr_ready_score = None
+
+    time_budget = WEEKLY_DIGEST_TIME_BUDGET if time_budget is None else time_budget
+    workers = max(1, workers or WEEKLY_DIGEST_WORKERS)
+    started = time.monotonic()
+    # Dedup keys keep their historical %W format so a week already sent is not re-sent.
+    dedup_week = datetime.now().strftime('%Y-W%W')
+    week_key = _digest_week_key()
+
     stats = {
         'processed': 0,
         'sent': 0,
@@ -886,83 +1074,116 @@ def process_weekly_digest(
         'version': 'v2',
         'dry_run': dry_run,
         'test_email': test_email,
-        'limit': limit
+        'limit': limit,
+        'week': week_key,
+        'completed': False,
+        'batches': [],
     }
 
-    if not is_feature_enabled('email_weekly_digest_v2'):
-        return {'skipped': 0, 'reason': 'Feature disabled'}
-
     conn = get_db_connection()
     try:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Build query based on parameters
-        if test_email:
-            # Only process the specific test email (still respect unsubscribe)
-            cursor.execute("""
-                SELECT c.id, c.user_id, u.email
-                FROM creators c
-                JOIN users u ON c.user_id = u.id
-                LEFT JOIN email_preferences ep ON ep.creator_id = c.id
-                WHERE u.email = %s
-                AND u.is_verified = true
-                AND ep.unsubscribed_at IS NULL
-            """, (test_email,))
-        else:
-            # Get verified creators - exclude unsubscribed
-            effective_limit = limit if limit else batch_size
-            cursor.execute("""
-                SELECT c.id, c.user_id, u.email
-                FROM creators c
-                JOIN users u ON c.user_id = u.id
-                LEFT JOIN email_preferences ep ON ep.creator_id = c.id
-                WHERE u.is_verified = true
-                AND ep.unsubscribed_at IS NULL
-                ORDER BY c.id
-                LIMIT %s
-            """, (effective_limit,))
-
-        creators = cursor.fetchall()
-        stats['total_eligible'] = len(creators)
-
-        for creator in creators:
-            stats['processed'] += 1
-
-            try:
-                # Use dedup_key to prevent duplicate sends this week
-                week_key = datetime.now().strftime('%Y-W%W')
-                dedup_key = f"weekly_digest_{creator['id']}_{week_key}"
-
-                context = build_weekly_digest_context(creator['id'])
-
-                # In dry_run mode, just log what would be sent
-                if dry_run:
-                    stats['sent'] += 1
-                    print(f"[DRY RUN] Would send weekly_digest to creator {creator['id']} ({creator['email']})")
-                    continue
-
-                success, message = send_lifecycle_email(
-                    to_email=creator['email'],
-                    template_slug='weekly_digest',
-                    context=context,
-                    creator_id=creator['id'],
-                    dedup_key=dedup_key
-                )
-
-                if success:
-                    stats['sent'] += 1
+        checkpointed = not test_email and _digest_checkpoints_enabled(cursor)
+        last_id = _load_digest_checkpoint(cursor, week_key) if checkpointed else 0
+        stats['resumed_from'] = last_id
+        catalog = None
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='weekly-digest') as pool:
+            while True:
+                if limit and stats['processed'] >= limit:
+                    break
+                slowest = max((b['total_ms'] for b in stats['batches']), default=0) / 1000
+                if stats['batches'] and time.monotonic() - started + slowest > time_budget:
+                    stats['stopped'] = 'time_budget'
+                    break
+
+                batch_started = time.monotonic()
+                take = min(batch_size, limit - stats['processed']) if limit else batch_size
+                if test_email:
+                    # Only process the specific test email (still respect unsubscribe)
+                    cursor.execute("""
+                        SELECT c.id
+                        FROM creators c
+                        JOIN users u ON c.user_id = u.id
+                        LEFT JOIN email_preferences ep ON ep.creator_id = c.id
+                        WHERE u.email = %s
+                        AND u.is_verified = true
+                        AND ep.unsubscribed_at IS NULL
+                    """, (test_email,))
                 else:
-                    stats['skipped'] += 1
-                    if 'skip_reasons' not in stats:
-                        stats['skip_reasons'] = []
-                    stats['skip_reasons'].append(f"Creator {creator['id']}: {message}")
-
-            except Exception as e:
-                stats['errors'] += 1
-                if 'error_details' not in stats:
-                    stats['error_details'] = []
-                stats['error_details'].append(f"Creator {creator['id']}: {str(e)}")
-
+                    # Get verified creators - exclude unsubscribed
+                    cursor.execute("""
+                        SELECT c.id
+                        FROM creators c
+                        JOIN users u ON c.user_id = u.id
+                        LEFT JOIN email_preferences ep ON ep.creator_id = c.id
+                        WHERE u.is_verified = true
+                        AND ep.unsubscribed_at IS NULL
+                        AND c.id > %s
+                        ORDER BY c.id
+                        LIMIT %s
+                    """, (last_id, take))
+                creator_ids = [row['id'] for row in cursor.fetchall()]
+                if not creator_ids:
+                    stats['completed'] = not test_email
+                    break
+
+                if catalog is None:
+                    catalog = load_email_brand_catalog(cursor)
+                prefetched = load_weekly_digest_data(cursor, creator_ids)
+                prefetch_ms = (time.monotonic() - batch_started) * 1000
+
+                futures = {}
+                for creator_id in creator_ids:
+                    data = prefetched.get(creator_id)
+                    if not data:
+                        continue
+                    new_brands = pick_for_you_brands(
+                        creator_id, data['creator'].get('creator_niches'), data['unlocked_ids'], catalog
+                    )
+                    futures[creator_id] = pool.submit(
+                        _send_weekly_digest, data, new_brands, f"weekly_digest_{creator_id}_{dedup_week}",
+                        dry_run, compute_pr_ready_score
+                    )
+
+                batch = {'first_id': creator_ids[0], 'last_id': creator_ids[-1], 'creators': len(creator_ids),
+                         'sent': 0, 'skipped': 0, 'errors': 0}
+                for creator_id, future in futures.items():
+                    try:
+                        outcome, message = future.result()
+                    except Exception as e:
+                        outcome, message = 'errors', str(e)
+                        stats.setdefault('error_details', [])
+                        if len(stats['error_details']) < 20:
+                            stats['error_details'].append(f"Creator {creator_id}: {message}")
+                    batch[outcome] += 1
+                    if outcome == 'skipped':
+                        stats.setdefault('skip_reasons', [])
+                        if len(stats['skip_reasons']) < 20:
+                            stats['skip_reasons'].append(f"Creator {creator_id}: {message}")
+                for key in ('sent', 'skipped', 'errors'):
+                    stats[key] += batch[key]
+                stats['processed'] += len(creator_ids)
+
+                last_id = creator_ids[-1]
+                done = test_email or len(creator_ids) < take
+                if checkpointed and not dry_run:
+                    _save_digest_checkpoint(cursor, week_key, last_id, batch, bool(done))
+                    conn.commit()
+
+                batch['prefetch_ms'] = round(prefetch_ms, 1)
+                batch['total_ms'] = round((time.monotonic() - batch_started) * 1000, 1)
+                stats['batches'].append(batch)
+                print(f"[WEEKLY DIGEST] Batch {batch['first_id']}-{batch['last_id']}: "
+                      f"{batch['creators']} creators, sent={batch['sent']}, skipped={batch['skipped']}, "
+                      f"errors={batch['errors']}, prefetch={batch['prefetch_ms']}ms, total={batch['total_ms']}ms")
+                if done:
+                    stats['completed'] = not test_email
+                    break
+
+        stats['total_eligible'] = stats['processed']
+        stats['last_creator_id'] = last_id
+        stats['elapsed_ms'] = round((time.monotonic() - started) * 1000, 1)
         return stats
     finally:
         conn.close()
@@ -1162,52 +1383,64 @@ def get_for_you_brands_for_email(creator_id: int, cursor, limit: int = 3) -> Lis
         """, tuple(query_params) + (limit,))
         brands = cursor.fetchall()
 
-    # Simple format: name + truncated description
+    result = _format_email_brands(brands)
+    logging.info(f"[FOR YOU BRANDS] Creator {creator_id} returning: {[b['name'] for b in result]}")
+
+    return result
+
+
+def _format_email_brands(brands) -> List[Dict]:
+    """Simple format: name + description truncated to ~60 chars."""
     result = []
     for b in brands:
         desc = b.get('description') or ''
-        # Truncate description to ~60 chars
         if len(desc) > 60:
             desc = desc[:57].rsplit(' ', 1)[0] + '...'
-
         result.append({
             'name': b['name'],
             'description': desc
         })
-
-    logging.info(f"[FOR YOU BRANDS] Creator {creator_id} returning: {[b['name'] for b in result]}")
-
     return result
 
 
-def _get_matching_categories(creator: Dict) -> set:
-    """Get brand categories that match a creator's niches (lowercase for DB matching)."""
-    creator_niche = creator.get('niche') or ''
-    creator_niches = creator.get('creator_niches') or []
+def load_email_brand_catalog(cursor) -> List[Dict]:
+    """Published, PR-accepting brands for pick_for_you_brands(), loaded once per digest run."""
+    cursor.execute("""
+        SELECT b.id, b.brand_name AS name, b.description, LOWER(b.category) AS category, b.created_at
+        FROM pr_brands b
+        WHERE b.status = 'published'
+          AND b.accepting_pr = true
+    """)
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def pick_for_you_brands(creator_id: int, creator_niches, unlocked_ids, catalog: List[Dict],
+                        limit: int = 3, week_number: int = None) -> List[Dict]:
+    """In-memory get_for_you_brands_for_email() over a preloaded catalog (same match, rotation and order)."""
+    niches = set(parse_niches(creator_niches))
+    week_number = week_number or datetime.now().isocalendar()[1]
+    rotation_offset = ((creator_id * 17) + (week_number * 7)) % 1000
+    unlocked_ids = set(unlocked_ids or ())
 
-    # Parse niche if it's a JSON string
-    if isinstance(creator_niche, str) and creator_niche.startswith('['):
-        try:
-            creator_niche = json.loads(creator_niche)
-        except:
-            pass
+    def order(brand):
+        # ORDER BY (b.id + offset) % 1000, b.created_at DESC (Postgres puts NULLs first)
+        created_at = brand.get('created_at')
+        return ((brand['id'] + rotation_offset) % 1000,
+                created_at is not None,
+                -created_at.timestamp() if created_at is not None else 0)
 
-    if isinstance(creator_niches, str):
-        try:
-            creator_niches = json.loads(creator_niches)
-        except:
-            creator_niches = []
+    candidates = [b for b in catalog if b['id'] not in unlocked_ids]
+    brands = []
+    if niches:
+        brands = heapq.nsmallest(limit, (b for b in candidates if b.get('category') in niches), key=order)
+    if not brands:
+        brands = heapq.nsmallest(limit, candidates, key=order)
+    return _format_email_brands(brands)
 
-    # Normalize to list
-    if isinstance(creator_niche, list):
-        niche_list = creator_niche
-    elif creator_niche:
-        niche_list = [creator_niche]
-    else:
-        niche_list = []
 
-    all_niches = niche_list + (creator_niches if isinstance(creator_niches, list) else [])
-    all_niches = [n.strip().lower() for n in all_niches if n and isinstance(n, str)]
+def _get_matching_categories(creator: Dict) -> set:
+    """Get brand categories that match a creator's niches (lowercase for DB matching)."""
+    all_niches = canonical_niches(creator.get('niche'), creator.get('creator_niches'))
 
     niche_to_category = _get_niche_to_category_map()
     matching_categories = set()
@@ -1493,6 +1726,50 @@ def build_email_context(creator_id: int, template_slug: str) -> Dict[str, Any]:
         conn.close()
 
 
+_DIGEST_CREATOR_SQL = """
+    SELECT c.id, c.username, c.user_id, u.email, u.first_name,
+           c.daily_unlocks_used, c.unlocks_remaining,
+           c.pitches_sent_this_week, c.subscription_tier,
+           c.bio, c.image_profile, c.niche, c.creator_niches,
+           c.kit_published, c.total_pitches_sent, c.total_replies_received,
+           c.followers_count, c.creator_followers, c.engagement_rate,
+           c.avg_engagement_rate, c.weekly_digest_week_number
+    FROM creators c
+    JOIN users u ON c.user_id = u.id
+    WHERE c.id = ANY(%s)
+"""
+
+
+def load_weekly_digest_data(cursor, creator_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """creator_id -> creator row, scrape, portfolio post count and unlocked brand ids, in four queries."""
+    if not creator_ids:
+        return {}
+    cursor.execute(_DIGEST_CREATOR_SQL, (list(creator_ids),))
+    data = {
+        row['id']: {'creator': row, 'scrape': None, 'post_count': 0, 'unlocked_ids': set()}
+        for row in cursor.fetchall()
+    }
+    if not data:
+        return {}
+    ids = list(data)
+    by_user = {entry['creator']['user_id']: entry for entry in data.values() if entry['creator'].get('user_id')}
+    if by_user:
+        cursor.execute("SELECT * FROM creator_profile_data WHERE user_id = ANY(%s)", (list(by_user),))
+        for row in cursor.fetchall():
+            by_user[row['user_id']]['scrape'] = row
+    cursor.execute("""
+        SELECT creator_id, COUNT(*) AS post_count
+        FROM portfolio_posts WHERE creator_id = ANY(%s)
+        GROUP BY creator_id
+    """, (ids,))
+    for row in cursor.fetchall():
+        data[row['creator_id']]['post_count'] = row['post_count']
+    cursor.execute("SELECT creator_id, brand_id FROM brand_unlocks WHERE creator_id = ANY(%s)", (ids,))
+    for row in cursor.fetchall():
+        data[row['creator_id']]['unlocked_ids'].add(row['brand_id'])
+    return data
+
+
 def build_weekly_digest_context(creator_id: int) -> Dict[str, Any]:
     """
     Build context for the weekly digest email using AI Manager data.
@@ -1507,142 +1784,10 @@ def build_weekly_digest_context(creator_id: int) -> Dict[str, Any]:
     conn = get_db_connection()
     try:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get full creator data including user_id for scrape lookup
-        cursor.execute("""
-            SELECT c.id, c.username, c.user_id, u.email, u.first_name,
-                   c.daily_unlocks_used, c.unlocks_remaining,
-                   c.pitches_sent_this_week, c.subscription_tier,
-                   c.bio, c.image_profile, c.niche, c.creator_niches,
-                   c.kit_published, c.total_pitches_sent, c.total_replies_received,
-                   c.followers_count, c.creator_followers, c.engagement_rate,
-                   c.avg_engagement_rate, c.weekly_digest_week_number
-            FROM creators c
-            JOIN users u ON c.user_id = u.id
-            WHERE c.id = %s
-        """, (creator_id,))
-        creator = cursor.fetchone()
-
-        if not creator:
+        data = load_weekly_digest_data(cursor, [creator_id]).get(creator_id)
+        if not data:
             return {}
 
-        user_id = creator.get('user_id')
-        subscription_tier = creator.get('subscription_tier') or 'free'
-        is_pro = subscription_tier in ('pro', 'elite')
-
-        # === UNLOCKS: Calculate correctly ===
-        unlocks_remaining = creator.get('unlocks_remaining')
-        if is_pro:
-            unlocks_used = 0
-            unlocks_quota = '∞'
-        elif unlocks_remaining is not None:
-            unlocks_used = max(0, 3 - unlocks_remaining)
-            unlocks_quota = 3
-        else:
-            # Default for users without unlocks_remaining set
-            unlocks_used = creator.get('daily_unlocks_used') or 0
-            unlocks_quota = 3
-
-        # === REPLY CHANCE SCORE: Use AI Manager score ===
-        reply_chance = 0
-        pending_plans = []
-        score_delta = 0
-
-        if compute_pr_ready_score and user_id:
-            try:
-                # Get creator_profile_data (scrape) - same as dashboard
-                cursor.execute("""
-                    SELECT * FROM creator_profile_data WHERE user_id = %s
-                """, (user_id,))
-                scrape = cursor.fetchone()
-
-                # Debug: log scrape data found
-                if scrape:
-                    print(f"[WEEKLY DIGEST] Scrape found: handle={scrape.get('handle')}, "
-                          f"has_bio={bool(scrape.get('raw_bio'))}, "
-                          f"posts={len(scrape.get('recent_posts') or [])}")
-                else:
-                    print(f"[WEEKLY DIGEST] No scrape data for user_id={user_id}")
-
-                # Get kit status - same query pattern as check_media_kit_complete
-                cursor.execute("""
-                    SELECT kit_published as is_published,
-                           (SELECT COUNT(*) FROM portfolio_posts WHERE creator_id = %s) as post_count
-                    FROM creators WHERE id = %s
-                """, (creator_id, creator_id))
-                kit_row = cursor.fetchone()
-                kit_status = {
-                    'is_published': kit_row.get('is_published') if kit_row else False,
-                    'post_count': kit_row.get('post_count') or 0 if kit_row else 0
-                }
-                print(f"[WEEKLY DIGEST] Kit status: published={kit_status['is_published']}, posts={kit_status['post_count']}")
-
-                # Compute PR-Ready score
-                report = compute_pr_ready_score(
-                    scrape=dict(scrape) if scrape else {},
-                    kit_status=kit_status,
-                    is_pro=is_pro,
-                    creator_bio=creator.get('bio'),
-                    creator_profile=dict(creator)
-                )
-
-                reply_chance = report.get('score') or 0
-                score_delta = report.get('projected_gain') or 0
-                print(f"[WEEKLY DIGEST] PR-Ready score: {reply_chance}, projected_gain: {score_delta}, status: {report.get('status')}")
-
-                # Get pending plans - ONLY items where done=False
-                fixes = report.get('fixes') or []
-                not_done_fixes = [f for f in fixes if not f.get('done', False)]
-                pending_plans = [
-                    {'number': i + 1, 'title': f.get('title', '')}
-                    for i, f in enumerate(not_done_fixes[:3])  # Top 3 pending items
-                ]
-                # Debug: show which fixes are done vs not done
-                for f in fixes:
-                    print(f"[WEEKLY DIGEST] Fix: {f.get('id')} - {f.get('title')[:30]}... done={f.get('done')}")
-                print(f"[WEEKLY DIGEST] Pending plans to show: {pending_plans}")
-            except Exception as e:
-                print(f"[WEEKLY DIGEST] Error computing PR-Ready score: {e}")
-                reply_chance = _calculate_creator_progress_score(creator)
-
-        # Fallback if pr_ready not available
-        if not reply_chance:
-            reply_chance = _calculate_creator_progress_score(creator)
-
-        # === NEW BRANDS: Match to creator's niche ===
-        # Parse niche - can be a string or JSON array
-        raw_niche = creator.get('niche') or ''
-        creator_niches = creator.get('creator_niches') or []
-
-        # Parse raw_niche if it's a JSON array string
-        if isinstance(raw_niche, str) and raw_niche.startswith('['):
-            try:
-                raw_niche = json.loads(raw_niche)
-            except:
-                pass
-
-        # Normalize to list
-        if isinstance(raw_niche, list):
-            niche_list = raw_niche
-        elif raw_niche:
-            niche_list = [raw_niche]
-        else:
-            niche_list = []
-
-        # Parse creator_niches if it's a JSON string
-        if isinstance(creator_niches, str):
-            try:
-                creator_niches = json.loads(creator_niches)
-            except:
-                creator_niches = []
-
-        # Combine all niches
-        all_niches_raw = niche_list + (creator_niches if isinstance(creator_niches, list) else [])
-        all_niches = [n.strip().lower() for n in all_niches_raw if n and isinstance(n, str)]
-
-        # Get clean primary niche for display (first niche, capitalized)
-        primary_niche_display = all_niches[0].title() if all_niches else 'content'
-
         # === NEW BRANDS: Use the For You matching logic ===
         # This ensures email recommendations match what creators see in the app
         try:
@@ -1652,32 +1797,111 @@ def build_weekly_digest_context(creator_id: int) -> Dict[str, Any]:
             print(f"[WEEKLY DIGEST] Error getting For You brands: {e}")
             new_brands = []
 
-        # Build context
-        context = {
-            'first_name': creator.get('first_name') or creator.get('username') or 'there',
-            'current_score': reply_chance,
-            'score_label': 'Reply Chance',
-            'score_delta': score_delta,
-            'unlocks_used': unlocks_used,
-            'unlocks_quota': unlocks_quota,
-            'replies_count': creator.get('total_replies_received') or 0,
-            # Use pending plans from AI Manager, or fallback to static theme
-            'weekly_theme_title': pending_plans[0]['title'] if pending_plans else 'Optimize your profile',
-            'weekly_theme_body': f"Your manager found {len(pending_plans)} improvements. Start with #{pending_plans[0]['number']}." if pending_plans else 'Visit your AI Manager for personalized tips.',
-            'pending_plans': pending_plans,
-            # Use For You brands - already formatted with accurate match reasons
-            'new_brands': new_brands if new_brands else [
-                {'name': 'Explore brands', 'category': 'Various', 'reason': 'Browse the directory'}
-            ],
-            'win_story': None,
-            'cta_url': f"{FRONTEND_URL}/creator/dashboard/pr-ready",
-        }
-
-        return context
+        return _weekly_digest_context(data, new_brands, compute_pr_ready_score)
     finally:
         conn.close()
 
 
+def _weekly_digest_context(data: Dict[str, Any], new_brands: List[Dict], compute_pr_ready_score) -> Dict[str, Any]:
+    """Digest context from load_weekly_digest_data() output. No DB access, safe in worker threads."""
+    creator = data['creator']
+    user_id = creator.get('user_id')
+    subscription_tier = creator.get('subscription_tier') or 'free'
+    is_pro = subscription_tier in ('pro', 'elite')
+
+    # === UNLOCKS: Calculate correctly ===
+    unlocks_remaining = creator.get('unlocks_remaining')
+    if is_pro:
+        unlocks_used = 0
+        unlocks_quota = '∞'
+    elif unlocks_remaining is not None:
+        unlocks_used = max(0, 3 - unlocks_remaining)
+        unlocks_quota = 3
+    else:
+        # Default for users without unlocks_remaining set
+        unlocks_used = creator.get('daily_unlocks_used') or 0
+        unlocks_quota = 3
+
+    # === REPLY CHANCE SCORE: Use AI Manager score ===
+    reply_chance = 0
+    pending_plans = []
+    score_delta = 0
+
+    if compute_pr_ready_score and user_id:
+        try:
+            scrape = data.get('scrape')
+
+            # Debug: log scrape data found
+            if scrape:
+                print(f"[WEEKLY DIGEST] Scrape found: handle={scrape.get('handle')}, "
+                      f"has_bio={bool(scrape.get('raw_bio'))}, "
+                      f"posts={len(scrape.get('recent_posts') or [])}")
+            else:
+                print(f"[WEEKLY DIGEST] No scrape data for user_id={user_id}")
+
+            # Kit status - same shape as check_media_kit_complete
+            kit_status = {
+                'is_published': creator.get('kit_published') or False,
+                'post_count': data.get('post_count') or 0
+            }
+            print(f"[WEEKLY DIGEST] Kit status: published={kit_status['is_published']}, posts={kit_status['post_count']}")
+
+            # Compute PR-Ready score
+            report = compute_pr_ready_score(
+                scrape=dict(scrape) if scrape else {},
+                kit_status=kit_status,
+                is_pro=is_pro,
+                creator_bio=creator.get('bio'),
+                creator_profile=dict(creator)
+            )
+
+            reply_chance = report.get('score') or 0
+            score_delta = report.get('projected_gain') or 0
+            print(f"[WEEKLY DIGEST] PR-Ready score: {reply_chance}, projected_gain: {score_delta}, status: {report.get('status')}")
+
+            # Get pending plans - ONLY items where done=False
+            fixes = report.get('fixes') or []
+            not_done_fixes = [f for f in fixes if not f.get('done', False)]
+            pending_plans = [
+                {'number': i + 1, 'title': f.get('title', '')}
+                for i, f in enumerate(not_done_fixes[:3])  # Top 3 pending items
+            ]
+            # Debug: show which fixes are done vs not done
+            for f in fixes:
+                print(f"[WEEKLY DIGEST] Fix: {f.get('id')} - {f.get('title')[:30]}... done={f.get('done')}")
+            print(f"[WEEKLY DIGEST] Pending plans to show: {pending_plans}")
+        except Exception as e:
+            print(f"[WEEKLY DIGEST] Error computing PR-Ready score: {e}")
+            reply_chance = _calculate_creator_progress_score(creator)
+
+    # Fallback if pr_ready not available
+    if not reply_chance:
+        reply_chance = _calculate_creator_progress_score(creator)
+
+    # Build context
+    context = {
+        'first_name': creator.get('first_name') or creator.get('username') or 'there',
+        'current_score': reply_chance,
+        'score_label': 'Reply Chance',
+        'score_delta': score_delta,
+        'unlocks_used': unlocks_used,
+        'unlocks_quota': unlocks_quota,
+        'replies_count': creator.get('total_replies_received') or 0,
+        # Use pending plans from AI Manager, or fallback to static theme
+        'weekly_theme_title': pending_plans[0]['title'] if pending_plans else 'Optimize your profile',
+        'weekly_theme_body': f"Your manager found {len(pending_plans)} improvements. Start with #{pending_plans[0]['number']}." if pending_plans else 'Visit your AI Manager for personalized tips.',
+        'pending_plans': pending_plans,
+        # Use For You brands - already formatted with accurate match reasons
+        'new_brands': new_brands if new_brands else [
+            {'name': 'Explore brands', 'category': 'Various', 'reason': 'Browse the directory'}
+        ],
+        'win_story': None,
+        'cta_url': f"{FRONTEND_URL}/creator/dashboard/pr-ready",
+    }
+
+    return context
+
+
 def build_brand_email_context(creator_id: int, brand_id: int) -> Dict[str, Any]:
     """Build context for brand-specific emails (pitching, follow-up, etc.)."""
     import re
@@ -164,10 +164,12 @@ def cron_daily_emails():
 def cron_weekly_digest():
     """
     Process weekly digest emails.
-    Should be called by cron every Monday at 8am.
+    Should be called by cron on Mondays from 8am; each call resumes from the
+    week's checkpoint, so repeat it until stats.completed is true.
 
     Query params / JSON body:
-    - batch_size: Max users to process (default 10, lower to handle cold starts)
+    - batch_size: Creators per keyset batch (default 50)
+    - time_budget: Seconds to spend before returning (default WEEKLY_DIGEST_TIME_BUDGET, 25)
     - dry_run: If true, only count eligible users, don't send (default false)
     - limit: Only process this many users (for testing)
     - test_email: Only send to this specific email address
@@ -193,15 +195,15 @@ def cron_weekly_digest():
         # Support both query params (for cron services) and JSON body
         data = request.get_json(silent=True) or {}
 
-        # Query params take precedence, then JSON body, then defaults
-        # Default to 1 user to handle 30s cron timeout + cold starts
-        batch_size = int(request.args.get('batch_size', data.get('batch_size', 1)))
+        # Query params take precedence, then JSON body, then defaults.
+        # Runs resume from this week's checkpoint and stop before time_budget
+        # seconds, so each cron call advances through the creator base.
+        batch_size = int(request.args.get('batch_size', data.get('batch_size', 50)))
         dry_run = request.args.get('dry_run', str(data.get('dry_run', 'false'))).lower() == 'true'
         limit = request.args.get('limit', data.get('limit'))
-        if limit:
-            limit = int(limit)
-        else:
-            limit = 1  # Process 1 user per cron run
+        limit = int(limit) if limit else None
+        time_budget = request.args.get('time_budget', data.get('time_budget'))
+        time_budget = float(time_budget) if time_budget else None
         test_email = request.args.get('test_email', data.get('test_email'))
         skip_day_check = request.args.get('skip_day_check', str(data.get('skip_day_check', 'false'))).lower() == 'true'
 
@@ -219,7 +221,8 @@ def cron_weekly_digest():
             dry_run=dry_run,
             limit=limit,
             test_email=test_email,
-            skip_day_check=skip_day_check
+            skip_day_check=skip_day_check,
+            time_budget=time_budget
         )
         return jsonify({
             'success': True,
@@ -3,19 +3,43 @@ Logo Proxy Routes - Server-side logo fetching
 Solves CORS and DNS issues by proxying logo requests through our backend
 """
 
-from flask import Blueprint, send_file, abort
+from flask import Blueprint, abort, request
+import os
 import requests
-from io import BytesIO
 from urllib.parse import urlparse
 
+from services.media_cache import (
+    DAY,
+    MEDIA_CACHE,
+    MediaTooLarge,
+    MediaUnavailable,
+    media_response,
+    thumbnail_width,
+)
+
 logo_proxy = Blueprint('logo_proxy', __name__)
 
+# Logos change rarely; revalidate upstream weekly
+LOGO_FRESH_SEC = int(os.getenv('LOGO_PROXY_FRESH_SEC', str(7 * DAY)))
+LOGO_MAX_BYTES = 2 * 1024 * 1024
+_LOGO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def _cached_logo(url, timeout):
+    """Cached logo response for url; raises MediaUnavailable / requests errors like MEDIA_CACHE.get."""
+    result = MEDIA_CACHE.get('logo', url, headers=_LOGO_HEADERS, fresh_for=LOGO_FRESH_SEC,
+                             timeout=timeout, max_bytes=LOGO_MAX_BYTES)
+    result = MEDIA_CACHE.thumbnail('logo', url, result, thumbnail_width(request.args.get('w')))
+    return media_response(result, result.content_type or 'image/png', max_age=86400)  # Cache for 1 day
+
 @logo_proxy.route('/api/logo-proxy/<path:url>', methods=['GET'])
 def proxy_logo(url):
     """
     Proxy logo requests through our server to avoid CORS issues
 
-    Usage: /api/logo-proxy/https://logo.clearbit.com/example.com
+    Usage: /api/logo-proxy/https://logo.clearbit.com/example.com[?w=128]
     """
     try:
         # Security: Only allow specific logo services
@@ -30,25 +54,12 @@ def proxy_logo(url):
         if parsed.netloc not in allowed_domains:
             abort(403, description="Domain not allowed")
 
-        # Fetch the logo
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=5, stream=True)
-
-        if response.status_code != 200:
-            abort(404, description="Logo not found")
-
-        # Get content type
-        content_type = response.headers.get('Content-Type', 'image/png')
-
-        # Stream the image
-        img_io = BytesIO(response.content)
-        img_io.seek(0)
-
-        return send_file(img_io, mimetype=content_type, max_age=86400)  # Cache for 1 day
+        return _cached_logo(url, timeout=5)
 
+    except MediaUnavailable:
+        abort(404, description="Logo not found")
+    except MediaTooLarge:
+        abort(413, description="Logo too large")
     except requests.RequestException:
         abort(404, description="Failed to fetch logo")
     except Exception as e:
@@ -100,13 +111,8 @@ def get_brand_logo(brand_id):
 
         for logo_url in logo_urls:
             try:
-                response = requests.get(logo_url, timeout=3, stream=True)
-                if response.status_code == 200:
-                    content_type = response.headers.get('Content-Type', 'image/png')
-                    img_io = BytesIO(response.content)
-                    img_io.seek(0)
-                    return send_file(img_io, mimetype=content_type, max_age=86400)
-            except:
+                return _cached_logo(logo_url, timeout=3)
+            except (MediaUnavailable, MediaTooLarge, requests.RequestException):
                 continue
 
         # If all fail, return 404
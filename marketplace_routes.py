@@ -2,9 +2,8 @@
 Marketplace Routes - Public creator discovery for brands
 """
 from flask import Blueprint, jsonify, request
-import psycopg2
 from psycopg2.extras import RealDictCursor
-import os
+from services.db_pool import get_db_connection as pooled_db_connection
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,13 +12,7 @@ marketplace_bp = Blueprint('marketplace', __name__, url_prefix='/api/marketplace
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 @marketplace_bp.route('/creators', methods=['GET'])
 def get_marketplace_creators():
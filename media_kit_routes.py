@@ -5,9 +5,8 @@ API endpoints for creator media kit builder - create, edit, publish, and view me
 
 from flask import Blueprint, request, jsonify, session
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import psycopg2
 from psycopg2.extras import RealDictCursor
-import os
+from services.db_pool import get_db_connection as pooled_db_connection
 import json
 import random
 from datetime import datetime
@@ -16,13 +15,7 @@ media_kit_bp = Blueprint('media_kit', __name__, url_prefix='/api/media-kit')
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session or JWT"""
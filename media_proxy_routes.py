@@ -9,14 +9,23 @@ from __future__ import annotations
 
 import os
 import re
-from io import BytesIO
 from typing import Iterable, List, Optional
 from urllib.parse import quote, unquote, urlparse
 
 import requests
-from flask import Blueprint, abort, has_request_context, request, send_file
+from flask import Blueprint, abort, has_request_context, request
 from werkzeug.exceptions import HTTPException
 
+from services.media_cache import (
+    DAY,
+    MEDIA_CACHE,
+    MediaTooLarge,
+    MediaUnavailable,
+    media_response,
+    thumbnail_width,
+)
+from services.rate_limiter import MEDIA_PROXY_POLICY, rate_limit
+
 media_proxy = Blueprint("media_proxy", __name__)
 
 # Host suffix allowlist (host == suffix or host.endswith("." + suffix))
@@ -36,6 +45,9 @@ _ALLOWED_HOST_SUFFIXES = (
     "ibytedtos.com",
 )
 
+MEDIA_FRESH_SEC = int(os.getenv("MEDIA_PROXY_FRESH_SEC", str(DAY)))
+MEDIA_MAX_BYTES = 5 * 1024 * 1024
+
 _UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -217,9 +229,10 @@ def proxy_profile_snapshot_thumbnails(snapshot: Optional[dict]) -> Optional[dict
 
 
 @media_proxy.route("/api/media-proxy", methods=["GET"])
+@rate_limit(MEDIA_PROXY_POLICY)
 def proxy_media():
     """
-    GET /api/media-proxy?url=<encoded https URL>
+    GET /api/media-proxy?url=<encoded https URL>[&w=<thumbnail width>]
     """
     url = (request.args.get("url") or "").strip()
     if not url:
@@ -250,22 +263,22 @@ def proxy_media():
         ):
             referer = "https://www.tiktok.com/"
 
-        resp = requests.get(
+        # Disk/Redis cache with upstream revalidation (services/media_cache.py)
+        result = MEDIA_CACHE.get(
+            "media",
             url,
             headers={
                 "User-Agent": _UA,
                 "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
                 "Referer": referer,
             },
+            fresh_for=MEDIA_FRESH_SEC,
             timeout=12,
-            stream=True,
+            max_bytes=MEDIA_MAX_BYTES,
         )
-        if resp.status_code != 200:
-            # Expired/signed CDN URLs are common — quiet 404, not a server fault
-            print(f"[media-proxy] upstream {resp.status_code} for {url[:120]}")
-            abort(404, description="Media not found")
+        result = MEDIA_CACHE.thumbnail("media", url, result, thumbnail_width(request.args.get("w")))
 
-        content_type = resp.headers.get("Content-Type") or "image/jpeg"
+        content_type = result.content_type or "image/jpeg"
         if not content_type.startswith("image/") and "octet-stream" not in content_type:
             # Some CDNs omit type; sniff from URL
             if re.search(r"\.(png)(?:\?|$)", url, re.I):
@@ -275,18 +288,17 @@ def proxy_media():
             else:
                 content_type = "image/jpeg"
 
-        # Cap size (~5MB) to avoid abuse
-        content = resp.content
-        if len(content) > 5 * 1024 * 1024:
-            abort(413, description="Media too large")
-
-        img_io = BytesIO(content)
-        img_io.seek(0)
-        response = send_file(img_io, mimetype=content_type, max_age=86400)
+        response = media_response(result, content_type, max_age=86400)
         # Allow embedding from app.newcollab.co / localhost
         response.headers["Cross-Origin-Resource-Policy"] = "cross-origin"
-        response.headers["Cache-Control"] = "public, max-age=86400"
         return response
+    except MediaUnavailable as e:
+        # Expired/signed CDN URLs are common — quiet 404, not a server fault
+        print(f"[media-proxy] upstream {e.status_code} for {url[:120]}")
+        abort(404, description="Media not found")
+    except MediaTooLarge:
+        # Cap size (~5MB) to avoid abuse
+        abort(413, description="Media too large")
     except HTTPException:
         raise
     except requests.RequestException as e:
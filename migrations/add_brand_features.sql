@@ -0,0 +1,29 @@
+-- ============================================
+-- BRAND FEATURE STORE
+-- Precomputed fit-scoring features per brand (services/brand_feature_store.py)
+-- ============================================
+
+-- One row per brand. version = fit_score_calculator.BRAND_FEATURE_VERSION; rows
+-- from another version are ignored until recomputed. fingerprint digests the
+-- brand fields the features were parsed from.
+CREATE TABLE IF NOT EXISTS brand_features (
+    brand_id INTEGER PRIMARY KEY REFERENCES pr_brands(id) ON DELETE CASCADE,
+    version SMALLINT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    mapped_category TEXT NOT NULL DEFAULT '',
+    lane_category TEXT NOT NULL DEFAULT '',
+    dna REAL[] NOT NULL,                 -- niche_match, content_proof, engagement, consistency
+    tokens TEXT[] NOT NULL DEFAULT '{}',
+    brand_text TEXT NOT NULL DEFAULT '',
+    distinctive_pts SMALLINT NOT NULL DEFAULT 0,
+    flags INTEGER NOT NULL DEFAULT 0,    -- bits in BRAND_FEATURE_FLAGS order
+    price_tier SMALLINT NOT NULL DEFAULT 0,
+    min_followers INTEGER,
+    max_followers INTEGER,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_brand_features_version ON brand_features(version);
+
+-- Fill it: python scripts/backfill_brand_features.py
@@ -0,0 +1,180 @@
+-- ============================================
+-- BRAND POPULARITY STATS
+-- Materialized per-brand pitch/response counters so For You "Hot This Week"
+-- and the public directory stop aggregating creator_pipeline per request.
+--
+-- Kept current two ways:
+--   1. Row trigger on creator_pipeline refreshes the touched brand.
+--   2. POST /api/cron/refresh-brand-popularity re-ages the 30-day window
+--      for every brand (rows drop out of the window without any write).
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS brand_popularity_stats (
+    brand_id INT PRIMARY KEY,
+
+    -- Rolling 30-day window (on creator_pipeline.created_at)
+    pitched_creators_30d INT NOT NULL DEFAULT 0, -- DISTINCT creators with stage = 'pitched'
+    pitches_30d INT NOT NULL DEFAULT 0,          -- rows with pitched_at set
+    responses_30d INT NOT NULL DEFAULT 0,        -- rows in a response stage
+    response_rate_30d NUMERIC(5, 2),             -- responses_30d / pitches_30d, NULL when no pitches
+
+    -- All-time social proof for the public directory
+    pitch_count INT NOT NULL DEFAULT 0,
+    response_count INT NOT NULL DEFAULT 0,
+
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_brand_popularity_hot
+    ON brand_popularity_stats(pitched_creators_30d DESC, brand_id);
+
+-- Per-brand recompute needs brand_id lookups on the pipeline
+CREATE INDEX IF NOT EXISTS idx_creator_pipeline_brand_created
+    ON creator_pipeline(brand_id, created_at);
+
+-- ============================================
+-- REFRESH ONE BRAND
+-- ============================================
+CREATE OR REPLACE FUNCTION refresh_brand_popularity_stats(p_brand_id INT)
+RETURNS VOID AS $$
+BEGIN
+    IF p_brand_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pr_brands WHERE id = p_brand_id) THEN
+        DELETE FROM brand_popularity_stats WHERE brand_id = p_brand_id;
+        RETURN;
+    END IF;
+
+    INSERT INTO brand_popularity_stats (
+        brand_id, pitched_creators_30d, pitches_30d, responses_30d, response_rate_30d,
+        pitch_count, response_count, refreshed_at
+    )
+    SELECT
+        p_brand_id,
+        COUNT(DISTINCT cp.creator_id) FILTER (
+            WHERE cp.stage = 'pitched' AND cp.created_at > NOW() - INTERVAL '30 days'
+        ),
+        COUNT(*) FILTER (
+            WHERE cp.pitched_at IS NOT NULL AND cp.created_at > NOW() - INTERVAL '30 days'
+        ),
+        COUNT(*) FILTER (
+            WHERE cp.stage IN ('responded', 'accepted', 'received', 'shipped')
+              AND cp.created_at > NOW() - INTERVAL '30 days'
+        ),
+        ROUND(
+            100.0 * COUNT(*) FILTER (
+                WHERE cp.stage IN ('responded', 'accepted', 'received', 'shipped')
+                  AND cp.created_at > NOW() - INTERVAL '30 days'
+            ) / NULLIF(COUNT(*) FILTER (
+                WHERE cp.pitched_at IS NOT NULL AND cp.created_at > NOW() - INTERVAL '30 days'
+            ), 0),
+            2
+        ),
+        COUNT(*) FILTER (WHERE cp.pitched_at IS NOT NULL),
+        COUNT(*) FILTER (WHERE cp.stage IN ('responded', 'accepted', 'received', 'shipped')),
+        NOW()
+    FROM creator_pipeline cp
+    WHERE cp.brand_id = p_brand_id
+    ON CONFLICT (brand_id) DO UPDATE SET
+        pitched_creators_30d = EXCLUDED.pitched_creators_30d,
+        pitches_30d = EXCLUDED.pitches_30d,
+        responses_30d = EXCLUDED.responses_30d,
+        response_rate_30d = EXCLUDED.response_rate_30d,
+        pitch_count = EXCLUDED.pitch_count,
+        response_count = EXCLUDED.response_count,
+        refreshed_at = EXCLUDED.refreshed_at;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- REFRESH EVERY BRAND (cron + backfill)
+-- ============================================
+CREATE OR REPLACE FUNCTION refresh_all_brand_popularity_stats()
+RETURNS INT AS $$
+DECLARE
+    v_rows INT;
+BEGIN
+    INSERT INTO brand_popularity_stats (
+        brand_id, pitched_creators_30d, pitches_30d, responses_30d, response_rate_30d,
+        pitch_count, response_count, refreshed_at
+    )
+    SELECT
+        b.id,
+        COALESCE(agg.pitched_creators_30d, 0),
+        COALESCE(agg.pitches_30d, 0),
+        COALESCE(agg.responses_30d, 0),
+        ROUND(100.0 * agg.responses_30d / NULLIF(agg.pitches_30d, 0), 2),
+        COALESCE(agg.pitch_count, 0),
+        COALESCE(agg.response_count, 0),
+        NOW()
+    FROM pr_brands b
+    LEFT JOIN (
+        SELECT
+            brand_id,
+            COUNT(DISTINCT creator_id) FILTER (
+                WHERE stage = 'pitched' AND created_at > NOW() - INTERVAL '30 days'
+            ) AS pitched_creators_30d,
+            COUNT(*) FILTER (
+                WHERE pitched_at IS NOT NULL AND created_at > NOW() - INTERVAL '30 days'
+            ) AS pitches_30d,
+            COUNT(*) FILTER (
+                WHERE stage IN ('responded', 'accepted', 'received', 'shipped')
+                  AND created_at > NOW() - INTERVAL '30 days'
+            ) AS responses_30d,
+            COUNT(*) FILTER (WHERE pitched_at IS NOT NULL) AS pitch_count,
+            COUNT(*) FILTER (
+                WHERE stage IN ('responded', 'accepted', 'received', 'shipped')
+            ) AS response_count
+        FROM creator_pipeline
+        GROUP BY brand_id
+    ) agg ON agg.brand_id = b.id
+    ON CONFLICT (brand_id) DO UPDATE SET
+        pitched_creators_30d = EXCLUDED.pitched_creators_30d,
+        pitches_30d = EXCLUDED.pitches_30d,
+        responses_30d = EXCLUDED.responses_30d,
+        response_rate_30d = EXCLUDED.response_rate_30d,
+        pitch_count = EXCLUDED.pitch_count,
+        response_count = EXCLUDED.response_count,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    DELETE FROM brand_popularity_stats s
+    WHERE NOT EXISTS (SELECT 1 FROM pr_brands b WHERE b.id = s.brand_id);
+
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- INCREMENTAL UPDATES FROM creator_pipeline WRITES
+-- ============================================
+CREATE OR REPLACE FUNCTION trg_creator_pipeline_brand_popularity()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_brand_popularity_stats(OLD.brand_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.brand_id IS DISTINCT FROM OLD.brand_id) THEN
+        PERFORM refresh_brand_popularity_stats(NEW.brand_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS creator_pipeline_brand_popularity ON creator_pipeline;
+CREATE TRIGGER creator_pipeline_brand_popularity
+    AFTER INSERT OR DELETE OR UPDATE OF brand_id, creator_id, stage, pitched_at, created_at
+    ON creator_pipeline
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_creator_pipeline_brand_popularity();
+
+-- Backfill
+SELECT refresh_all_brand_popularity_stats();
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- Run: psql -d your_database -f add_brand_popularity_stats.sql
+-- ============================================
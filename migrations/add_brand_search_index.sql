@@ -0,0 +1,27 @@
+-- ============================================
+-- BRAND SEARCH INDEX
+-- Trigram indexes for brand name search (discover + autocomplete)
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Same normalization as normalize_brand_name(): lowercase, [a-z0-9] only.
+-- Generated, so admin edits, scrapers and discovery inserts keep it current.
+ALTER TABLE pr_brands
+    ADD COLUMN IF NOT EXISTS search_name TEXT
+    GENERATED ALWAYS AS (regexp_replace(lower(brand_name), '[^a-z0-9]', '', 'g')) STORED;
+
+-- '%q%' matches on either column become bitmap index scans
+CREATE INDEX IF NOT EXISTS idx_pr_brands_search_name_trgm
+    ON pr_brands USING gin (search_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_pr_brands_brand_name_trgm
+    ON pr_brands USING gin (brand_name gin_trgm_ops);
+
+-- Discovery tier 1 lookups
+CREATE INDEX IF NOT EXISTS idx_known_contacts_normalized_name_trgm
+    ON known_brand_contacts USING gin (normalized_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_known_contacts_brand_name_trgm
+    ON known_brand_contacts USING gin (brand_name gin_trgm_ops);
+
+ANALYZE pr_brands;
+ANALYZE known_brand_contacts;
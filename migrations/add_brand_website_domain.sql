@@ -0,0 +1,24 @@
+-- ============================================
+-- BRAND WEBSITE DOMAIN
+-- Normalized, indexed domain for PR Hunter dedup
+-- ============================================
+
+-- 'https://www.GlowRecipe.com/pages/press' -> 'glowrecipe.com'
+-- Same cleanup as PRHunterService._clean_domain(). Generated, so every write path keeps it current.
+ALTER TABLE pr_brands
+    ADD COLUMN IF NOT EXISTS website_domain TEXT
+    GENERATED ALWAYS AS (
+        substring(lower(website) from '^(?:[a-z][a-z0-9+.-]*://)?(?:www\.|m\.|mobile\.)?([^/:?#]+)')
+    ) STORED;
+
+ALTER TABLE brands
+    ADD COLUMN IF NOT EXISTS website_domain TEXT
+    GENERATED ALWAYS AS (
+        substring(lower(website) from '^(?:[a-z][a-z0-9+.-]*://)?(?:www\.|m\.|mobile\.)?([^/:?#]+)')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_pr_brands_website_domain ON pr_brands(website_domain);
+CREATE INDEX IF NOT EXISTS idx_brands_website_domain ON brands(website_domain);
+
+ANALYZE pr_brands;
+ANALYZE brands;
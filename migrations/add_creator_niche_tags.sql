@@ -0,0 +1,116 @@
+-- ============================================
+-- CREATOR NICHE TAGS
+-- Canonical, GIN-indexed niche arrays on creators so niche filters are array
+-- overlaps instead of ILIKE / jsonb_array_elements_text scans over the three
+-- free-form columns (niche: JSON string, CSV or plain text; creator_niches;
+-- pr_wishlist).
+--
+--   niche_tags    lowercase, trimmed, deduped niches: creator_niches first,
+--                 then the signup niche
+--   niche_tokens  sorted word set of niche_tags + pr_wishlist categories
+--                 ("tech & gadgets" -> {gadgets, tech})
+--
+-- A BEFORE trigger recomputes both on every insert / niche write, so no write
+-- path has to know about them. Parsing rules mirror services/niche_tags.py;
+-- change both together.
+-- ============================================
+
+ALTER TABLE creators ADD COLUMN IF NOT EXISTS niche_tags TEXT[] NOT NULL DEFAULT '{}';
+ALTER TABLE creators ADD COLUMN IF NOT EXISTS niche_tokens TEXT[] NOT NULL DEFAULT '{}';
+
+-- ============================================
+-- PARSING
+-- ============================================
+
+-- One stored value -> raw items: JSON array, Postgres array literal or CSV
+CREATE OR REPLACE FUNCTION niche_raw_items(raw TEXT)
+RETURNS TEXT[] AS $$
+DECLARE
+    txt TEXT := btrim(COALESCE(raw, ''), E' \t\r\n');
+BEGIN
+    IF txt = '' THEN
+        RETURN '{}';
+    END IF;
+
+    IF left(txt, 1) = '[' THEN
+        BEGIN
+            RETURN ARRAY(
+                SELECT CASE WHEN jsonb_typeof(e) = 'string' THEN e #>> '{}' ELSE e::text END
+                FROM jsonb_array_elements(txt::jsonb) WITH ORDINALITY AS t(e, pos)
+                ORDER BY pos
+            );
+        EXCEPTION WHEN others THEN
+            RETURN string_to_array(txt, ',');  -- not JSON after all
+        END;
+    END IF;
+
+    IF left(txt, 1) = '{' THEN
+        txt := btrim(txt, '{}');
+    END IF;
+    RETURN string_to_array(txt, ',');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Raw items -> lowercase niches, quotes/brackets stripped, empties dropped, first-seen order
+CREATE OR REPLACE FUNCTION niche_canonical(items TEXT[])
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(niche ORDER BY first_pos), '{}')
+    FROM (
+        SELECT niche, MIN(pos) AS first_pos
+        FROM (
+            SELECT lower(regexp_replace(btrim(item, E' "''[]{}\t\r\n'), '\s+', ' ', 'g')) AS niche, pos
+            FROM unnest(items) WITH ORDINALITY AS t(item, pos)
+        ) cleaned
+        WHERE niche <> '' AND niche NOT IN ('null', 'none', 'undefined')
+        GROUP BY niche
+    ) deduped
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Niches -> sorted word set, connectors dropped
+CREATE OR REPLACE FUNCTION niche_token_set(niches TEXT[])
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT tok ORDER BY tok), '{}')
+    FROM unnest(niches) AS n(niche),
+         regexp_split_to_table(n.niche, '[^a-z0-9]+') AS tok
+    WHERE length(tok) > 1
+      AND tok NOT IN ('and', 'the', 'for', 'with', 'of', 'in')
+$$ LANGUAGE sql IMMUTABLE;
+
+-- ============================================
+-- TRIGGER: keep niche_tags / niche_tokens current
+-- ============================================
+CREATE OR REPLACE FUNCTION trg_creators_niche_tags()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.niche_tags := niche_canonical(COALESCE(NEW.creator_niches, '{}') || niche_raw_items(NEW.niche));
+    NEW.niche_tokens := niche_token_set(
+        NEW.niche_tags || niche_canonical(niche_raw_items(NEW.pr_wishlist::text))
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS creators_niche_tags ON creators;
+CREATE TRIGGER creators_niche_tags
+    BEFORE INSERT OR UPDATE OF niche, creator_niches, pr_wishlist ON creators
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_creators_niche_tags();
+
+-- ============================================
+-- BACKFILL
+-- ============================================
+UPDATE creators c
+SET niche_tags = src.tags,
+    niche_tokens = niche_token_set(src.tags || niche_canonical(niche_raw_items(c.pr_wishlist::text)))
+FROM (
+    SELECT id, niche_canonical(COALESCE(creator_niches, '{}') || niche_raw_items(niche)) AS tags
+    FROM creators
+) src
+WHERE src.id = c.id
+  AND (c.niche IS NOT NULL OR c.creator_niches IS NOT NULL OR c.pr_wishlist IS NOT NULL);
+
+-- ============================================
+-- INDEXES (&& and @>)
+-- ============================================
+CREATE INDEX IF NOT EXISTS idx_creators_niche_tags ON creators USING GIN (niche_tags);
+CREATE INDEX IF NOT EXISTS idx_creators_niche_tokens ON creators USING GIN (niche_tokens);
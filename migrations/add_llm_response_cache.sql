@@ -0,0 +1,20 @@
+-- ============================================
+-- LLM RESPONSE CACHE
+-- Durable tier of services/llm_client.py (Redis is the fast tier)
+-- ============================================
+
+-- cache_key = 'llm:<call type>:<sha256 of the canonical prompt inputs>'
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key TEXT PRIMARY KEY,
+    call_type TEXT NOT NULL,
+    value JSONB NOT NULL,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Purge job: DELETE FROM llm_response_cache WHERE expires_at < NOW();
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_type ON llm_response_cache(call_type, created_at);
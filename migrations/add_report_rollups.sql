@@ -0,0 +1,64 @@
+-- ============================================
+-- REPORT ROLLUPS
+-- Daily counters behind the founder dashboard and KPI reports
+-- (services/report_rollups.py), so period switches stop re-aggregating
+-- creators / users / creator_pipeline / brand_unlocks / pack_purchases.
+--
+-- Written by POST /api/cron/refresh-report-rollups (daily). Readers add a
+-- live delta for today on top of the closed days stored here.
+-- ============================================
+
+-- One row per closed day. Every column except active_creators is additive
+-- across days; active_creators is that day's DISTINCT count.
+CREATE TABLE IF NOT EXISTS report_daily_rollups (
+    day DATE PRIMARY KEY,
+    signups INT NOT NULL DEFAULT 0,
+    user_signups INT NOT NULL DEFAULT 0,
+    active_creators INT NOT NULL DEFAULT 0,
+    pipeline_saves INT NOT NULL DEFAULT 0,
+    unlocks INT NOT NULL DEFAULT 0,
+    first_unlockers INT NOT NULL DEFAULT 0,     -- creators whose 1st unlock fell on this day
+    third_unlockers INT NOT NULL DEFAULT 0,     -- creators whose 3rd unlock fell on this day
+    pro_upgrades INT NOT NULL DEFAULT 0,
+    pack_purchases INT NOT NULL DEFAULT 0,
+    pack_revenue_cents INT NOT NULL DEFAULT 0,
+    pack_packs INT NOT NULL DEFAULT 0,
+    first_pack_buyers INT NOT NULL DEFAULT 0,
+    second_pack_buyers INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Distinct counts for each dashboard period (7d, 14d, 30d, 90d, 180d, all)
+-- over the closed days through as_of, and for the period before it.
+CREATE TABLE IF NOT EXISTS report_window_rollups (
+    period TEXT PRIMARY KEY,
+    as_of DATE NOT NULL,
+    active_creators INT NOT NULL DEFAULT 0,
+    prev_active_creators INT NOT NULL DEFAULT 0,
+    pack_buyers INT NOT NULL DEFAULT 0,
+    prev_pack_buyers INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Day-range scans for the rollup and the live delta
+CREATE INDEX IF NOT EXISTS idx_creators_created_at ON creators(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+CREATE INDEX IF NOT EXISTS idx_creator_pipeline_created_at ON creator_pipeline(created_at);
+CREATE INDEX IF NOT EXISTS idx_brand_unlocks_unlocked_at ON brand_unlocks(unlocked_at);
+
+-- Per-creator lookbacks (nth unlock, "new today" within a window)
+CREATE INDEX IF NOT EXISTS idx_brand_unlocks_creator_unlocked
+    ON brand_unlocks(creator_id, unlocked_at, id);
+CREATE INDEX IF NOT EXISTS idx_creator_pipeline_creator_created
+    ON creator_pipeline(creator_id, created_at);
+
+DO $$
+BEGIN
+    IF to_regclass('public.pack_purchases') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_pack_purchases_created_at ON pack_purchases(created_at);
+        CREATE INDEX IF NOT EXISTS idx_pack_purchases_creator_created
+            ON pack_purchases(creator_id, created_at, id);
+    END IF;
+END $$;
+
+-- Fill it: POST /api/cron/refresh-report-rollups?full=1
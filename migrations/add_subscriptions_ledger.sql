@@ -0,0 +1,35 @@
+-- ============================================
+-- SUBSCRIPTIONS LEDGER
+-- One row per Stripe subscription, kept current by the Stripe webhooks
+-- (subscription_routes.stripe_webhook, app /webhook/stripe) and corrected by
+-- the nightly POST /api/cron/reconcile-subscriptions. The founder dashboard
+-- computes MRR, active counts and churn here instead of paging Stripe
+-- (services/subscription_ledger.py).
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    stripe_subscription_id VARCHAR(255) PRIMARY KEY,
+    stripe_customer_id VARCHAR(255),
+    creator_id INT REFERENCES creators(id) ON DELETE SET NULL,
+    status VARCHAR(32) NOT NULL,                 -- Stripe status: active, trialing, past_due, canceled, ...
+    is_pro BOOLEAN NOT NULL DEFAULT false,       -- on a current or grandfathered Pro price
+    price_id VARCHAR(255),
+    billing_interval VARCHAR(16),                -- month / year
+    quantity INT NOT NULL DEFAULT 1,
+    mrr_cents INT NOT NULL DEFAULT 0,            -- monthly-normalised amount (yearly / 12)
+    cancel_at_period_end BOOLEAN NOT NULL DEFAULT false,
+    started_at TIMESTAMPTZ,
+    current_period_end TIMESTAMPTZ,
+    canceled_at TIMESTAMPTZ,
+    ended_at TIMESTAMPTZ,
+    last_paid_at TIMESTAMPTZ,
+    livemode BOOLEAN NOT NULL DEFAULT false,
+    stripe_event_at BIGINT,                      -- `created` of the newest applied event; older ones are ignored
+    reconciled_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_subscriptions_status ON subscriptions (status) WHERE is_pro;
+CREATE INDEX IF NOT EXISTS idx_subscriptions_ended_at ON subscriptions (ended_at) WHERE ended_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_subscriptions_creator ON subscriptions (creator_id);
@@ -0,0 +1,21 @@
+-- ============================================
+-- WEEKLY DIGEST CHECKPOINTS
+-- Keyset position of the weekly digest runner (process_weekly_digest in
+-- lifecycle_email_engine.py), one row per ISO week. Each cron run resumes
+-- after last_creator_id instead of re-walking the first creators by id.
+--
+-- Without this table the runner still pages by id within a run but starts
+-- from the beginning every time.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS weekly_digest_checkpoints (
+    week_key VARCHAR(10) PRIMARY KEY,           -- ISO week, e.g. '2026-W11'
+    last_creator_id INT NOT NULL DEFAULT 0,
+    processed INT NOT NULL DEFAULT 0,
+    sent INT NOT NULL DEFAULT 0,
+    skipped INT NOT NULL DEFAULT 0,
+    errors INT NOT NULL DEFAULT 0,
+    batches INT NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP,                     -- first run that reached the end of the creator list
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -6,8 +6,9 @@ Brand casting calls / job board layer for PR opportunities
 from flask import Blueprint, request, jsonify, session
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from functools import wraps
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.niche_tags import niche_tokens, parse_niches
 import os
 import json
 from datetime import datetime, timedelta, date
@@ -50,42 +51,10 @@ def _infer_short_niche(text: str) -> str | None:
 
 
 def _tokenize_niche_blob(value) -> set:
-    """Normalize niche strings/arrays/JSON into lowercase tokens."""
-    tokens = set()
-    if value is None:
-        return tokens
-
-    raw_items = []
-    if isinstance(value, (list, tuple)):
-        raw_items = list(value)
-    elif isinstance(value, str):
-        text = value.strip()
-        if not text:
-            return tokens
-        if text.startswith('['):
-            try:
-                parsed = json.loads(text)
-                if isinstance(parsed, list):
-                    raw_items = parsed
-                else:
-                    raw_items = [text]
-            except Exception:
-                raw_items = [text]
-        else:
-            raw_items = re.split(r'[,|/&+]|\band\b', text, flags=re.I)
-    else:
-        raw_items = [str(value)]
-
-    for item in raw_items:
-        chunk = str(item or '').strip().lower()
-        if not chunk:
-            continue
-        chunk = chunk.replace('_', ' ').replace('-', ' ')
-        tokens.add(chunk)
-        for part in re.split(r'\s+', chunk):
-            if len(part) >= 3:
-                tokens.add(part)
-    return tokens
+    """Normalize niche strings/arrays/JSON into lowercase niches + word tokens."""
+    niches = parse_niches(value)
+    # Short words ("ai", "tv") only count as whole niches: substring cluster expansion over-matches them
+    return set(niches) | {t for t in niche_tokens(niches) if len(t) >= 3}
 
 
 def _expand_niche_tokens(tokens: set) -> set:
@@ -414,13 +383,7 @@ def admin_required(f):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session or JWT"""
@@ -5,13 +5,14 @@ Handles the "give to get" follow exchange system
 
 from flask import Blueprint, request, jsonify, session
 import os
-import smtplib
 import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from psycopg2.extras import RealDictCursor
-from jinja2 import Environment, FileSystemLoader
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.mail_transport import get_template_env, send_smtp_message
+from services.niche_tags import niche_tags_column_exists, parse_niches
 
 pool_bp = Blueprint('pool', __name__, url_prefix='/api/pool')
 
@@ -33,8 +34,7 @@ def send_pool_follower_email(target_email, target_first_name, supporter_username
         return False
 
     try:
-        env = Environment(loader=FileSystemLoader('templates'))
-        template = env.get_template('pool_new_follower.html')
+        template = get_template_env().get_template('pool_new_follower.html')
 
         # Get first initial for avatar fallback
         supporter_initial = (supporter_username[0] if supporter_username else '?').upper()
@@ -59,10 +59,10 @@ def send_pool_follower_email(target_email, target_first_name, supporter_username
         html_part = MIMEText(html_content, 'html')
         msg.attach(html_part)
 
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_USER, target_email, msg.as_string())
+        send_smtp_message(
+            msg, [target_email], host='smtp.gmail.com', port=587,
+            username=GMAIL_USER, password=GMAIL_APP_PASSWORD,
+        )
 
         print(f"[Pool] Email sent successfully to {target_email}")
         return True
@@ -124,14 +124,7 @@ NICHE_ADJACENCY = {
 
 def get_db_connection():
     """Get database connection"""
-    import psycopg2
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session"""
@@ -146,20 +139,9 @@ def ensure_pool_credits(cursor, creator_id):
     """, (creator_id,))
 
 def normalize_niche(niche_value):
-    """Normalize niche value to lowercase string"""
-    if not niche_value:
-        return None
-    if isinstance(niche_value, list):
-        return niche_value[0].lower().strip() if niche_value else None
-    niche_str = str(niche_value).strip()
-    if niche_str.startswith('['):
-        try:
-            import json
-            parsed = json.loads(niche_str)
-            return parsed[0].lower().strip() if parsed else None
-        except:
-            pass
-    return niche_str.lower().strip()
+    """Primary niche (first canonical one) or None"""
+    niches = parse_niches(niche_value)
+    return niches[0] if niches else None
 
 
 def parse_social_links(social_links_value):
@@ -280,13 +262,23 @@ def get_pool_matches():
         # Merge with frontend exclusions
         already_supported.extend(frontend_exclude)
 
+        # Niche match on the GIN-indexed canonical tags once the migration has landed
+        if niche_tags_column_exists(conn):
+            niche_match_sql = """
+                        WHEN %s = ANY(c.niche_tags) THEN 100
+                        WHEN c.niche_tags && %s::text[] THEN 80"""
+        else:
+            niche_match_sql = """
+                        WHEN LOWER(c.niche) = %s THEN 100
+                        WHEN LOWER(c.niche) = ANY(%s) THEN 80"""
+
         # Build the matching query with priority scoring
         # RANKING PHILOSOPHY: Activity > Everything. Keep the Pool 100% active for snowball effect.
         # 1. Active users (boosted in last 7 days) always rank highest
         # 2. Pro + Active beats Non-Pro + Active
         # 3. Active Non-Pro beats Inactive Pro (key change!)
         # 4. Then by match score and recency
-        cursor.execute("""
+        cursor.execute(f"""
             WITH boost_counts AS (
                 SELECT supporter_id, COUNT(*) as boosts_given,
                        MAX(confirmed_at) as last_boost_at
@@ -309,9 +301,7 @@ def get_pool_matches():
                     COALESCE(bc.boosts_given, 0) as boosts_given,
                     COALESCE(ra.recent_boosts, 0) as recent_boosts,
                     bc.last_boost_at,
-                    CASE
-                        WHEN LOWER(c.niche) = %s THEN 100
-                        WHEN LOWER(c.niche) = ANY(%s) THEN 80
+                    CASE{niche_match_sql}
                         WHEN c.regions = %s AND %s IS NOT NULL THEN 60
                         ELSE 40
                     END as match_score,
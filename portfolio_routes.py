@@ -5,8 +5,8 @@ API endpoints for the new media kit portfolio builder - posts CRUD, settings, pu
 
 from flask import Blueprint, request, jsonify, session
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
 import os
 import re
 import json
@@ -40,13 +40,7 @@ portfolio_bp = Blueprint('portfolio', __name__, url_prefix='/api/portfolio')
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session or JWT"""
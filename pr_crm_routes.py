@@ -5,16 +5,17 @@ Mobile-first API endpoints for brand discovery and pipeline management
 
 from flask import Blueprint, request, jsonify, session, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.rate_limiter import DISCOVER_POLICY, rate_limit
 import os
+import hashlib
 import json
 import re
-import requests
 from html import unescape
 from datetime import datetime, date
 from decimal import Decimal
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
@@ -111,19 +112,34 @@ except ImportError as e:
         return brand.get('hero_product') or brand.get('product_sku_name') or 'your product'
 
 from services.outreach_dedupe import duplicate_outreach_block
+from services.brand_popularity import popularity_join_sql
+from services.niche_tags import parse_niches, split_compound_niche as normalize_niche
+from services.recommendation_cache import FOR_YOU_STORE, invalidate_creator_recommendations
+from services.brand_search import (
+    BRAND_AUTOCOMPLETE,
+    RANKED_ORDER_SQL,
+    brand_name_match_params,
+    brand_name_match_sql,
+    normalize_brand_name,
+)
+from services.creator_context import (
+    get_creator_context,
+    invalidate_creator_context,
+    load_creator_context,
+)
+from services.scrape_jobs import (
+    enqueue_profile_scrape,
+    get_job,
+    job_status_payload,
+    profile_age_days,
+    profile_is_stale,
+    refresh_if_stale,
+)
 
 # Feature flag for pitch engine v2 (50/50 A/B test)
 PITCH_ENGINE_V2_ENABLED = os.environ.get('PITCH_ENGINE_V2', '0') == '1'
 PITCH_ENGINE_V2_PERCENT = int(os.environ.get('PITCH_ENGINE_V2_PERCENT', '0'))  # 0-100
 
-# Try to import BeautifulSoup for Tier 2 web scraping
-try:
-    from bs4 import BeautifulSoup
-    HAS_BS4 = True
-except ImportError:
-    HAS_BS4 = False
-    print("⚠️ BeautifulSoup not installed - Tier 2 web scraping will be limited")
-
 # AI Depth Generator for brand-specific analysis
 try:
     from services.ai_depth_generator import get_ai_depth_generator
@@ -132,6 +148,7 @@ try:
     from services.fit_score_calculator import (
         calculate_fit_score,
         score_brand_for_creator,
+        score_brands_for_creator,
         scrape_agrees_with_intent,
     )
     HAS_AI_DEPTH = True
@@ -143,12 +160,14 @@ except ImportError as e:
         from services.fit_score_calculator import (
             calculate_fit_score,
             score_brand_for_creator,
+            score_brands_for_creator,
             scrape_agrees_with_intent,
         )
         from services.creator_profile_scraper import CreatorProfileScraper
     except ImportError:
         calculate_fit_score = None
         score_brand_for_creator = None
+        score_brands_for_creator = None
         scrape_agrees_with_intent = None
         CreatorProfileScraper = None
 
@@ -171,31 +190,6 @@ def get_min_follower_cap(creator_followers):
         return None  # No cap for 50K+ creators
 
 
-def normalize_niche(niche_str):
-    """
-    Normalize compound niches like "tech & gadgets" into individual components.
-    Returns a list of individual niche terms.
-    Examples:
-        "tech & gadgets" -> ["tech", "gadgets", "tech & gadgets"]
-        "food & beverage" -> ["food", "beverage", "food & beverage"]
-        "fitness" -> ["fitness"]
-    """
-    if not niche_str:
-        return []
-
-    niche_lower = niche_str.lower().strip()
-    result = [niche_lower]  # Always include the original
-
-    # Split by common separators
-    for sep in [' & ', ' and ', '/', ', ', '+']:
-        if sep in niche_lower:
-            parts = [p.strip() for p in niche_lower.split(sep) if p.strip()]
-            result.extend(parts)
-            break
-
-    return list(set(result))  # Dedupe
-
-
 # Shared related-niche map for For You + matched count.
 # Keep relationships tight — lifestyle must NOT auto-pull luxury fashion.
 FOR_YOU_RELATED_NICHES = {
@@ -605,15 +599,20 @@ def _apply_mentor_fit_to_for_you(matched_rows, creator_profile_dict, niches=None
 
     profile = _prepare_for_you_profile(creator_profile_dict, niches, followers)
 
+    candidates = [
+        brand for brand in (dict(r) for r in matched_rows)
+        if not _for_you_should_skip_brand(brand, niches, profile)
+    ]
+    if score_brands_for_creator:
+        fits = score_brands_for_creator(profile, candidates, interest_niches=list(niches or []))
+    else:
+        fits = [
+            calculate_fit_score(profile, (brand.get('category') or ''), brand=brand)
+            for brand in candidates
+        ]
+
     scored = []
-    for brand_row in matched_rows:
-        brand = dict(brand_row)
-        if _for_you_should_skip_brand(brand, niches, profile):
-            continue
-        if score_brand_for_creator:
-            fit_result = score_brand_for_creator(profile, brand, interest_niches=list(niches or []))
-        else:
-            fit_result = calculate_fit_score(profile, (brand.get('category') or ''), brand=brand)
+    for brand, fit_result in zip(candidates, fits):
         fit_score_val = fit_result.get('overall_score', 0)
         tier = fit_result.get('tier', 'growth_match')
         status = fit_result.get('status', 'not_yet')
@@ -908,13 +907,7 @@ def ensure_pitch_has_social_handle(body: str, creator: dict, *, html: bool = Fal
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session or JWT"""
@@ -927,15 +920,10 @@ def get_creator_id_from_session():
     try:
         user_id = get_jwt_identity()
         if user_id:
-            # Fetch creator_id from user_id
-            conn = get_db_connection()
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute('SELECT id FROM creators WHERE user_id = %s', (user_id,))
-            creator = cursor.fetchone()
-            cursor.close()
-            conn.close()
-            if creator:
-                return creator['id']
+            # Fetch creator_id from user_id (memoized for the rest of the request)
+            ctx = get_creator_context(user_id=user_id)
+            if ctx:
+                return ctx.creator_id
     except:
         pass
 
@@ -1516,93 +1504,45 @@ def compute_fit_with_ai_depth(creator, brand, user_id, cursor, conn, is_for_you_
             print(f"[AIDepth] Parsed from social_links: handle=@{handle}, followers={follower_count}, platform={primary_platform}")
 
             # ========================================
-            # PROFILE DATA: Check cache first, then live scrape if needed
+            # PROFILE DATA: cached profile now, background refresh when stale
             # ========================================
             scraped_profile = None
             vision_data = None
-            used_cache = False
 
             if handle and primary_platform:
-                # First, check if we have cached profile data from onboarding
+                # Stale-while-revalidate: serve whatever onboarding cached, and
+                # refresh in the background when it is missing or older than a week.
+                cached_profile = None
                 try:
                     cached_profile = scraper.get_creator_profile(user_id)
                     if cached_profile:
-                        # Check if cache is fresh (scraped within last 7 days)
-                        scraped_at = cached_profile.get('scraped_at')
-                        if scraped_at:
-                            from datetime import timezone
-                            now = datetime.now(timezone.utc)
-                            # Make scraped_at timezone-aware if needed
-                            if scraped_at.tzinfo is None:
-                                scraped_at = scraped_at.replace(tzinfo=timezone.utc)
-                            cache_age_days = (now - scraped_at).days
-
-                            if cache_age_days <= 7:
-                                # Use cached data
-                                scraped_profile = cached_profile
-                                used_cache = True
-                                print(f"[AIDepth] Using cached profile from {cache_age_days} day(s) ago: followers={cached_profile.get('follower_count')}, niche={cached_profile.get('primary_niche')}")
-
-                                # Extract vision data from cached profile
-                                vision_data = {
-                                    'primary_niche': cached_profile.get('primary_niche'),
-                                    'primary_niche_confidence': cached_profile.get('primary_niche_confidence'),
-                                    'secondary_niches': cached_profile.get('secondary_niches', []),
-                                    'content_themes': cached_profile.get('content_themes', []),
-                                    'aesthetic': cached_profile.get('aesthetic', {}),
-                                    'content_format_breakdown': cached_profile.get('content_format_breakdown', {}),
-                                    'brand_readiness_signals': cached_profile.get('brand_readiness_signals', {}),
-                                    'content_gaps': cached_profile.get('content_gaps', []),
-                                }
-                            else:
-                                print(f"[AIDepth] Cache is stale ({cache_age_days} days old), will refresh")
+                        cache_age_days = profile_age_days(cached_profile)
+                        scraped_profile = cached_profile
+                        print(f"[AIDepth] Using cached profile from {cache_age_days} day(s) ago: followers={cached_profile.get('follower_count')}, niche={cached_profile.get('primary_niche')}")
+
+                        # Extract vision data from cached profile
+                        vision_data = {
+                            'primary_niche': cached_profile.get('primary_niche'),
+                            'primary_niche_confidence': cached_profile.get('primary_niche_confidence'),
+                            'secondary_niches': cached_profile.get('secondary_niches', []),
+                            'content_themes': cached_profile.get('content_themes', []),
+                            'aesthetic': cached_profile.get('aesthetic', {}),
+                            'content_format_breakdown': cached_profile.get('content_format_breakdown', {}),
+                            'brand_readiness_signals': cached_profile.get('brand_readiness_signals', {}),
+                            'content_gaps': cached_profile.get('content_gaps', []),
+                        }
                 except Exception as cache_err:
                     print(f"[AIDepth] Cache check failed: {cache_err}")
-
-                # Only do live scrape if no cache or cache is stale
-                if not used_cache:
                     try:
-                        print(f"[AIDepth] Attempting live scrape of @{handle} on {primary_platform}")
-
-                        if primary_platform == 'tiktok':
-                            raw_scrape = scraper.scrape_tiktok_profile(handle)
-                        else:
-                            raw_scrape = scraper.scrape_instagram_profile(handle)
-
-                        if raw_scrape:
-                            # Process the scraped data
-                            scraped_profile = scraper.process_scrape(raw_scrape, primary_platform)
-                            print(f"[AIDepth] Live scrape success: followers={scraped_profile.get('follower_count')}, bio={scraped_profile.get('raw_bio', '')[:50]}...")
-
-                            # Run text analysis on scraped captions
-                            try:
-                                vision_data = scraper.run_text_analysis(
-                                    bio=scraped_profile.get('raw_bio', ''),
-                                    captions=scraped_profile.get('recent_captions', []),
-                                    handle=handle,
-                                    followers=scraped_profile.get('follower_count', 0)
-                                )
-                                print(f"[AIDepth] Text analysis: niche={vision_data.get('primary_niche')}, confidence={vision_data.get('primary_niche_confidence')}")
-                            except Exception as vision_err:
-                                print(f"[AIDepth] Text analysis failed: {vision_err}")
-
-                            # Save to database for future use
-                            try:
-                                scraper.save_creator_profile(user_id, scraped_profile, vision_data)
-                                print(f"[AIDepth] Saved profile to creator_profile_data")
-                            except Exception as save_err:
-                                print(f"[AIDepth] Failed to save profile: {save_err}")
-                                try:
-                                    conn.rollback()
-                                except:
-                                    pass
-
-                    except Exception as scrape_err:
-                        print(f"[AIDepth] Live scrape failed for @{handle}: {scrape_err}")
-                        try:
-                            conn.rollback()
-                        except:
-                            pass
+                        conn.rollback()
+                    except:
+                        pass
+
+                refresh_job = refresh_if_stale(
+                    user_id, handle, primary_platform, cached_profile, reason='ai_depth'
+                )
+                if refresh_job:
+                    print(f"[AIDepth] Profile refresh for @{handle} running in background (job {refresh_job['job_id']})")
 
             # Use scraped data if available, otherwise fall back to social_links data
             if scraped_profile:
@@ -2010,17 +1950,8 @@ def get_brands():
         is_premium = False
 
         if creator_id:
-            temp_conn = get_db_connection()
-            temp_cursor = temp_conn.cursor(cursor_factory=RealDictCursor)
-            temp_cursor.execute('''
-                SELECT subscription_tier
-                FROM creators
-                WHERE id = %s
-            ''', (creator_id,))
-            creator = temp_cursor.fetchone()
-            temp_cursor.close()
-            temp_conn.close()
-            if creator and creator['subscription_tier'] in ['pro', 'elite']:
+            ctx = get_creator_context(creator_id)
+            if ctx and ctx.is_premium:
                 is_premium = True
 
         # Build query
@@ -2297,14 +2228,6 @@ def get_categories():
 # UNIVERSAL BRAND DISCOVERY (Phase 1)
 # ============================================
 
-def normalize_brand_name(name):
-    """Normalize brand name for matching: lowercase, no spaces, no special chars"""
-    import re
-    if not name:
-        return ''
-    return re.sub(r'[^a-z0-9]', '', name.lower().strip())
-
-
 def check_discovery_rate_limit(creator_id, conn, cursor):
     """
     Check if creator has hit their daily discovery limit (5 attempts/day).
@@ -2357,266 +2280,8 @@ def log_discovery_attempt(creator_id, search_query, normalized_query, found_bran
 # TIER 2: WEB SCRAPING FOR PR CONTACTS
 # ============================================
 
-# Common PR/press page paths to check
-PR_PAGE_PATHS = [
-    '/press', '/pr', '/contact', '/partnerships', '/influencers',
-    '/affiliates', '/collaborate', '/press-room', '/media',
-    '/about/press', '/about/contact', '/contact-us', '/work-with-us',
-    '/creator-program', '/ambassador', '/brand-ambassadors',
-    '/influencer-program', '/collab', '/partner'
-]
-
-# Email patterns that indicate PR/press contacts
-PR_EMAIL_PREFIXES = ['pr', 'press', 'partnerships', 'marketing', 'collab',
-                      'collaborate', 'influencer', 'creator', 'media', 'hello',
-                      'contact', 'info', 'brand', 'ambassador', 'affiliate']
-
-
-def guess_brand_domain(brand_name):
-    """
-    Guess a brand's domain from its name.
-    Tries common patterns like brandname.com, brandname.co, etc.
-    Returns list of possible domains to try.
-    """
-    normalized = normalize_brand_name(brand_name)
-
-    # Common domain patterns
-    domains = [
-        f"{normalized}.com",
-        f"{normalized}.co",
-        f"www.{normalized}.com",
-        f"shop{normalized}.com",
-        f"{normalized}beauty.com",
-        f"get{normalized}.com",
-        f"{normalized}skin.com",
-        f"the{normalized}.com",
-        f"{normalized}official.com",
-    ]
-
-    # Handle common brand name patterns
-    # e.g., "Sol de Janeiro" -> "soldejaneiro.com"
-    words = brand_name.lower().split()
-    if len(words) > 1:
-        joined = ''.join(words)
-        domains.insert(0, f"{joined}.com")
-
-    return domains
-
-
-def validate_domain(domain, timeout=5):
-    """
-    Check if a domain is valid by making a HEAD request.
-    Returns the final URL if valid, None otherwise.
-    """
-    try:
-        # Try HTTPS first
-        url = f"https://{domain}" if not domain.startswith('http') else domain
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
-        if response.status_code < 400:
-            return response.url
-    except:
-        pass
-
-    try:
-        # Try HTTP as fallback
-        url = f"http://{domain}" if not domain.startswith('http') else domain
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
-        if response.status_code < 400:
-            return response.url
-    except:
-        pass
-
-    return None
-
-
-def extract_emails_from_text(text):
-    """
-    Extract email addresses from text using regex.
-    Returns list of unique emails found.
-    """
-    # Email regex pattern
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(email_pattern, text.lower())
-
-    # Filter out common false positives
-    exclude_patterns = ['example.com', 'email.com', 'domain.com', 'yoursite.com',
-                        'yourdomain.com', '.png', '.jpg', '.gif', 'wixpress.com',
-                        'sentry.io', 'facebook.com', 'twitter.com', 'instagram.com']
-
-    filtered = []
-    for email in emails:
-        if not any(excl in email for excl in exclude_patterns):
-            filtered.append(email)
-
-    return list(set(filtered))
-
-
-def scrape_page_for_emails(url, timeout=10):
-    """
-    Scrape a webpage for email addresses.
-    Returns list of emails found on the page.
-    """
-    if not HAS_BS4:
-        # Fallback to basic regex if BeautifulSoup not available
-        try:
-            response = requests.get(url, timeout=timeout, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            if response.status_code == 200:
-                return extract_emails_from_text(response.text)
-        except:
-            pass
-        return []
-
-    try:
-        response = requests.get(url, timeout=timeout, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        if response.status_code != 200:
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Get all text content
-        text = soup.get_text()
-        emails = extract_emails_from_text(text)
-
-        # Also check href attributes for mailto: links
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            if href.startswith('mailto:'):
-                email = href.replace('mailto:', '').split('?')[0].lower()
-                if '@' in email and email not in emails:
-                    emails.append(email)
-
-        return emails
-    except Exception as e:
-        print(f"⚠️ Error scraping {url}: {e}")
-        return []
-
-
-def find_pr_email_from_list(emails, domain=None):
-    """
-    From a list of emails, find the most likely PR/press contact.
-    Prioritizes known PR prefixes.
-    """
-    if not emails:
-        return None
-
-    # Score emails based on PR likelihood
-    scored_emails = []
-    for email in emails:
-        prefix = email.split('@')[0].lower()
-        email_domain = email.split('@')[1].lower() if '@' in email else ''
-
-        score = 0
-
-        # Boost if email matches brand domain
-        if domain and domain.replace('www.', '') in email_domain:
-            score += 10
-
-        # Score based on prefix
-        if prefix in ['pr', 'press']:
-            score += 100
-        elif prefix in ['partnerships', 'collab', 'collaborate']:
-            score += 80
-        elif prefix in ['influencer', 'influencers', 'creator', 'creators']:
-            score += 70
-        elif prefix in ['marketing', 'brand']:
-            score += 60
-        elif prefix in ['hello', 'hi', 'info', 'contact']:
-            score += 40
-        elif prefix in ['support', 'help', 'sales']:
-            score += 10
-
-        scored_emails.append((email, score))
-
-    # Sort by score descending
-    scored_emails.sort(key=lambda x: x[1], reverse=True)
-
-    # Return highest scoring email if it has any relevance
-    if scored_emails and scored_emails[0][1] > 0:
-        return scored_emails[0][0]
-
-    return None
-
-
-def tier2_web_scrape(brand_name, known_domain=None):
-    """
-    Tier 2 Discovery: Scrape brand website for PR contacts.
-
-    1. Determine brand domain (use known or guess)
-    2. Check common PR page paths
-    3. Extract emails from pages
-    4. Return best PR email found
-
-    Returns: {
-        'found': bool,
-        'email': str or None,
-        'domain': str or None,
-        'source_url': str or None,
-        'all_emails': list
-    }
-    """
-    result = {
-        'found': False,
-        'email': None,
-        'domain': None,
-        'source_url': None,
-        'all_emails': []
-    }
-
-    # Determine domain to use
-    domains_to_try = []
-    if known_domain:
-        domains_to_try.append(known_domain)
-    domains_to_try.extend(guess_brand_domain(brand_name))
-
-    # Find a valid domain
-    valid_base_url = None
-    valid_domain = None
-    for domain in domains_to_try:
-        url = validate_domain(domain)
-        if url:
-            valid_base_url = url
-            parsed = urlparse(url)
-            valid_domain = parsed.netloc.replace('www.', '')
-            result['domain'] = valid_domain
-            break
-
-    if not valid_base_url:
-        print(f"⚠️ Tier 2: Could not find valid domain for {brand_name}")
-        return result
-
-    print(f"✓ Tier 2: Found valid domain {valid_domain} for {brand_name}")
-
-    # Scrape homepage first
-    all_emails = scrape_page_for_emails(valid_base_url)
-
-    # Try PR page paths
-    for path in PR_PAGE_PATHS:
-        try:
-            page_url = urljoin(valid_base_url, path)
-            emails = scrape_page_for_emails(page_url, timeout=5)
-            if emails:
-                all_emails.extend(emails)
-                result['source_url'] = page_url
-                print(f"✓ Tier 2: Found emails on {page_url}: {emails}")
-        except:
-            pass
-
-    # Dedupe
-    all_emails = list(set(all_emails))
-    result['all_emails'] = all_emails
-
-    # Find best PR email
-    pr_email = find_pr_email_from_list(all_emails, valid_domain)
-    if pr_email:
-        result['found'] = True
-        result['email'] = pr_email
-        print(f"✓ Tier 2: Best PR email for {brand_name}: {pr_email}")
-
-    return result
+# Concurrent crawler with per-brand/per-domain result caching
+from services.email_discovery import guess_brand_domain, resolve_brand_domain, tier2_web_scrape
 
 
 # ============================================
@@ -2648,12 +2313,9 @@ def tier3_pattern_inference(brand_name, domain=None):
     if not domain:
         # Try to find a valid domain
         domains_to_try = guess_brand_domain(brand_name)
-        for d in domains_to_try[:3]:  # Only try first 3
-            url = validate_domain(d, timeout=3)
-            if url:
-                parsed = urlparse(url)
-                domain = parsed.netloc.replace('www.', '')
-                break
+        url = resolve_brand_domain(domains_to_try[:3], timeout=3)  # Only try first 3
+        if url:
+            domain = urlparse(url).netloc.replace('www.', '')
 
     if not domain:
         print(f"⚠️ Tier 3: Could not determine domain for {brand_name}")
@@ -2685,6 +2347,7 @@ def tier3_pattern_inference(brand_name, domain=None):
 
 
 @pr_crm.route('/brands/discover', methods=['POST'])
+@rate_limit(DISCOVER_POLICY)
 def discover_brand():
     """
     Universal Brand Discovery endpoint.
@@ -2723,7 +2386,7 @@ def discover_brand():
         # ============================================
         # STEP 1: Check curated directory first
         # ============================================
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT
                 id, brand_name, website, logo_url, cover_image_url, category, niches,
                 product_types, regions, platforms, min_followers, max_followers,
@@ -2733,13 +2396,12 @@ def discover_brand():
                 avg_product_value, collaboration_type, payment_offered, micro_friendly,
                 source, discovery_tier, verified_contact
             FROM pr_brands
-            WHERE LOWER(REPLACE(brand_name, ' ', '')) ILIKE %s
-               OR brand_name ILIKE %s
+            WHERE {brand_name_match_sql(conn)}
             ORDER BY
                 CASE WHEN source = 'curated' THEN 0 ELSE 1 END,
                 search_count DESC NULLS LAST
             LIMIT 1
-        ''', (f'%{normalized_query}%', f'%{search_query}%'))
+        ''', brand_name_match_params(search_query))
 
         existing_brand = cursor.fetchone()
 
@@ -3123,44 +2785,37 @@ def get_search_suggestions():
     """
     Get brand name suggestions for search autocomplete.
     Returns top matches from both curated and discovered brands.
+    Served from the in-process autocomplete index; SQL only if it can't be built.
     """
     try:
         query = request.args.get('q', '').strip()
         if len(query) < 2:
             return jsonify({'success': True, 'suggestions': []})
 
-        normalized = normalize_brand_name(query)
-
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Search curated brands first, then discovered
-        cursor.execute('''
-            SELECT id, brand_name, logo_url, category, source
-            FROM pr_brands
-            WHERE brand_name ILIKE %s
-               OR LOWER(REPLACE(brand_name, ' ', '')) ILIKE %s
-            ORDER BY
-                CASE WHEN source = 'curated' THEN 0 ELSE 1 END,
-                search_count DESC NULLS LAST,
-                brand_name ASC
-            LIMIT 8
-        ''', (f'%{query}%', f'%{normalized}%'))
-
-        suggestions = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
+        suggestions = BRAND_AUTOCOMPLETE.suggest(query, limit=8)
+        if suggestions is None:
+            conn = get_db_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(f'''
+                SELECT id, brand_name AS name, logo_url AS logo, category, source
+                FROM pr_brands
+                WHERE {brand_name_match_sql(conn)}
+                ORDER BY {RANKED_ORDER_SQL}
+                LIMIT 8
+            ''', brand_name_match_params(query))
+            suggestions = cursor.fetchall()
+            cursor.close()
+            conn.close()
 
         return jsonify({
             'success': True,
             'suggestions': [
                 {
                     'id': s['id'],
-                    'name': s['brand_name'],
-                    'logo': s['logo_url'],
+                    'name': s['name'],
+                    'logo': s['logo'],
                     'category': s['category'],
-                    'source': s.get('source', 'curated')
+                    'source': s.get('source') or 'curated'
                 }
                 for s in suggestions
             ]
@@ -3278,6 +2933,7 @@ def dashboard_init():
                     WHERE id = %s
                 ''', (FREE_UNLOCK_LIMIT, creator_id))
                 conn.commit()
+                invalidate_creator_context(creator_id)
                 unlocks_reset_at = None  # Will be refreshed
 
             if unlocks_remaining is None:
@@ -3311,14 +2967,8 @@ def dashboard_init():
         pitched_brand_ids = [r['brand_id'] for r in pipeline_rows if r['stage'] == 'pitched']
 
         # 5. Parse user niches
-        raw_niches = creator.get('creator_niches') or creator.get('niche') or []
-        if isinstance(raw_niches, str):
-            try:
-                raw_niches = json.loads(raw_niches)
-            except:
-                raw_niches = [n.strip() for n in raw_niches.split(',') if n.strip()]
-
-        user_niches = raw_niches if isinstance(raw_niches, list) else []
+        user_niches = (parse_niches(creator.get('creator_niches'))
+                       or parse_niches(creator.get('niche')))
 
         return jsonify({
             'success': True,
@@ -3468,6 +3118,7 @@ def save_brand_to_pipeline():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify({
             'success': True,
@@ -3570,6 +3221,7 @@ def remove_from_pipeline(pipeline_id):
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify({
             'success': True,
@@ -3605,6 +3257,7 @@ def remove_brand_from_pipeline(brand_id):
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify({
             'success': True,
@@ -3976,6 +3629,7 @@ def track_pitch():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         # Build tracking pixel URL
         api_base = os.getenv('API_BASE_URL', 'https://api.newcollab.co')
@@ -4678,6 +4332,7 @@ def generate_pr_package():
                 brand_dict,
                 creator_dict,
                 template_fallback_fn=generate_golden_template_pitch,
+                regenerate=bool(regenerate),
             )
 
             if not v2_result.success:
@@ -4736,7 +4391,8 @@ def generate_pr_package():
                 creator=creator_dict,
                 brand=brand_dict,
                 cursor=cursor,
-                max_attempts=2
+                max_attempts=2,
+                regenerate=bool(regenerate)
             )
 
             if not result.success:
@@ -5320,6 +4976,7 @@ def generate_pr_package_v2():
                     dict(brand),
                     dict(creator),
                     template_fallback_fn=generate_golden_template_pitch,
+                    regenerate=bool(regenerate),
                 )
 
                 if not v2_result.success:
@@ -5369,7 +5026,8 @@ def generate_pr_package_v2():
                     creator=dict(creator),
                     brand=dict(brand),
                     cursor=cursor,
-                    max_attempts=2
+                    max_attempts=2,
+                    regenerate=bool(regenerate)
                 )
 
                 if not result.success:
@@ -6445,26 +6103,8 @@ def generate_golden_template_pitch(brand, creator):
     engagement_rate = round(float(engagement_rate_raw), 1)
 
     # Niche - handle various formats (string, JSON string, array)
-    creator_niches_raw = creator.get('creator_niches') or creator.get('niche')
-    if isinstance(creator_niches_raw, str):
-        try:
-            parsed = json.loads(creator_niches_raw)
-            if isinstance(parsed, list):
-                # Clean each niche of any remaining quotes/brackets
-                creator_niches = [str(n).strip('"\'[] ') for n in parsed if n]
-            else:
-                creator_niches = [str(parsed).strip('"\'[] ')]
-        except:
-            # Plain string - clean and use as single niche
-            creator_niches = [creator_niches_raw.strip('"\'[] ')]
-    elif isinstance(creator_niches_raw, list):
-        # Clean each niche of any remaining quotes/brackets
-        creator_niches = [str(n).strip('"\'[] ') for n in creator_niches_raw if n]
-    else:
-        creator_niches = []
-
-    # Filter out empty values
-    creator_niches = [n for n in creator_niches if n and n.lower() not in ['null', 'none', '']]
+    creator_niches = (parse_niches(creator.get('creator_niches'))
+                      or parse_niches(creator.get('niche')))
 
     brand_category = (brand.get('category') or '').lower()
     niche = None
@@ -6503,20 +6143,6 @@ def generate_golden_template_pitch(brand, creator):
     if not niche:
         niche = brand_category or 'content'
 
-    # Clean niche value - remove JSON artifacts like brackets and quotes
-    if niche:
-        niche = str(niche).strip()
-        # Remove JSON array formatting if present
-        if niche.startswith('[') and niche.endswith(']'):
-            try:
-                parsed = json.loads(niche)
-                if isinstance(parsed, list) and len(parsed) > 0:
-                    niche = parsed[0]
-            except:
-                niche = niche.strip('[]"\'').split(',')[0].strip().strip('"\'')
-        # Clean any remaining quotes
-        niche = niche.strip('"\'[]')
-
     # Platform
     social_links_raw = creator.get('social_links') or []
     if isinstance(social_links_raw, str):
@@ -7126,13 +6752,8 @@ def generate_followup_pitch(brand, creator, original_pitch=None, days_since_pitc
 
 def get_subscription_status(creator_id):
     """Helper to get creator subscription status"""
-    conn = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    cursor.execute('SELECT subscription_tier FROM creators WHERE id = %s', (creator_id,))
-    result = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return result.get('subscription_tier', 'free') if result else 'free'
+    ctx = get_creator_context(creator_id)
+    return ctx.tier if ctx else 'free'
 
 
 # ============================================
@@ -7205,6 +6826,8 @@ def attempt_unlock(creator_id, brand_id, conn=None):
                 ON CONFLICT (creator_id, brand_id) DO NOTHING
             ''', (creator_id, brand_id))
             conn.commit()
+            invalidate_creator_recommendations(creator_id)
+            invalidate_creator_context(creator_id)
             return {"status": "unlocked", "credits_used": 0, "remaining": None, "tier": "pro"}
 
         # Free tier: check if reset needed
@@ -7277,6 +6900,8 @@ def attempt_unlock(creator_id, brand_id, conn=None):
         ''', (creator_id, brand_id))
 
         conn.commit()
+        invalidate_creator_recommendations(creator_id)
+        invalidate_creator_context(creator_id)
 
         # Trigger quota hit email when user uses their last unlock
         if new_remaining == 0:
@@ -7433,63 +7058,14 @@ def check_brand_unlock_status(creator_id, brand_id, conn=None):
 
 def get_creator_unlock_balance(creator_id, conn=None):
     """Get creator's current unlock balance and status"""
-    close_conn = False
-    if not conn:
-        conn = get_db_connection()
-        close_conn = True
-
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    pack_sql = pack_credits_select_sql(conn)
-    cursor.execute(f'''
-        SELECT unlocks_tier, unlocks_remaining, unlocks_reset_at, subscription_tier,
-               {pack_sql}
-        FROM creators WHERE id = %s
-    ''', (creator_id,))
-    creator = cursor.fetchone()
-
-    if not creator:
-        cursor.close()
-        if close_conn:
-            conn.close()
+    if conn:
+        # Caller's transaction: read through it instead of the shared cache
+        ctx = load_creator_context(conn, creator_id)
+    else:
+        ctx = get_creator_context(creator_id)
+    if not ctx:
         return None
-
-    # Pro/Elite = unlimited
-    if creator.get('unlocks_tier') == 'pro' or creator.get('subscription_tier') in ('pro', 'elite'):
-        cursor.close()
-        if close_conn:
-            conn.close()
-        return {
-            "tier": "pro",
-            "remaining": None,  # unlimited
-            "reset_at": None,
-            "is_unlimited": True,
-            "pack_credits": 0,
-        }
-
-    # Check if reset needed
-    unlocks_remaining = creator.get('unlocks_remaining') or 0
-    unlocks_reset_at = creator.get('unlocks_reset_at')
-    pack_credits = pack_credits_of(creator)
-
-    if unlocks_reset_at and datetime.now() > unlocks_reset_at:
-        unlocks_remaining = FREE_UNLOCK_LIMIT  # Would reset on next attempt_unlock
-
-    cursor.close()
-    if close_conn:
-        conn.close()
-
-    total_left = total_unlocks_left(unlocks_remaining, pack_credits)
-    used = max(0, FREE_UNLOCK_LIMIT - unlocks_remaining)
-
-    return {
-        "tier": "free",
-        "remaining": total_left,
-        "used": used,
-        "limit": FREE_UNLOCK_LIMIT,
-        "pack_credits": pack_credits,
-        "reset_at": unlocks_reset_at.isoformat() if unlocks_reset_at else None,
-        "is_unlimited": False
-    }
+    return ctx.unlock_balance(FREE_UNLOCK_LIMIT)
 
 
 @pr_crm.route('/unlocks/balance', methods=['GET'])
@@ -7967,6 +7543,7 @@ def begin_pipeline_send():
         pipeline_id = cursor.fetchone()['id']
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
         return jsonify({'success': True, 'pipeline_id': pipeline_id})
 
     except Exception as e:
@@ -8635,22 +8212,8 @@ def get_for_you():
         signup_niche = creator.get('niche') if creator else None
         foryou_niches = creator.get('creator_niches') or [] if creator else []
 
-        # Parse signup niche (could be string or array)
-        parsed_signup_niches = []
-        if signup_niche:
-            if isinstance(signup_niche, list):
-                parsed_signup_niches = [n.lower().strip() for n in signup_niche if n]
-            elif isinstance(signup_niche, str):
-                # Handle JSON array string or comma-separated
-                import json
-                try:
-                    parsed = json.loads(signup_niche)
-                    if isinstance(parsed, list):
-                        parsed_signup_niches = [str(n).lower().strip() for n in parsed if n]
-                    else:
-                        parsed_signup_niches = [str(parsed).lower().strip()]
-                except:
-                    parsed_signup_niches = [n.strip().lower() for n in signup_niche.split(',') if n.strip()]
+        # Parse signup niche (JSON array string, comma-separated or plain)
+        parsed_signup_niches = parse_niches(signup_niche)
 
         # Combine niches, preferring For You selection, falling back to signup
         # These are USER INTERESTS — soft preference only, not scoring truth
@@ -8667,6 +8230,25 @@ def get_for_you():
                 0
             )
 
+        # Repeat loads: serve the cached page. Pipeline saves, niche edits and
+        # new scrapes invalidate it; the fingerprint covers profile inputs and
+        # the weekly rotation / seasonal month.
+        now_utc = datetime.utcnow()
+        for_you_fp = hashlib.sha256(json.dumps({
+            'niches': interest_niches,
+            'followers': followers,
+            'week': now_utc.strftime('%G-%V'),
+            'month': now_utc.month,
+            'v': 1,
+        }, sort_keys=True, default=str).encode()).hexdigest()[:24]
+        if request.args.get('refresh') != '1':
+            cached_page = FOR_YOU_STORE.get(creator_id, for_you_fp)
+            if cached_page is not None:
+                cursor.close()
+                conn.close()
+                print(f"[ForYou] cache hit creator={creator_id}")
+                return jsonify({**cached_page, 'is_pro': is_pro})
+
         # Load scrape early — candidate pool + scoring source of truth
         scrape_profile = None
         try:
@@ -8750,90 +8332,33 @@ def get_for_you():
         sensitive_clause = "AND LOWER(b.category) != ALL(%s)" if excluded_categories else ""
         sensitive_params = [excluded_categories] if excluded_categories else []
 
-        if hot_niches_list and min_follower_cap:
-            query = f"""
-                SELECT
-                    b.id, b.slug, b.brand_name AS name, b.logo_url AS logo,
-                    b.description, b.category, b.response_rate, b.price_point, b.price_point,
-                    b.min_followers, b.micro_friendly, b.website, b.application_form_url
-                FROM pr_brands b
-                WHERE b.slug IS NOT NULL
-                  AND COALESCE(b.status, 'published') = 'published'
-                  AND b.id != ALL(%s)
-                  AND (b.min_followers IS NULL OR b.min_followers <= %s)
-                  AND LOWER(b.category) = ANY(%s)
-                  {sensitive_clause}
-                ORDER BY (
-                    SELECT COUNT(DISTINCT cp.creator_id) FROM creator_pipeline cp
-                    WHERE cp.brand_id = b.id
-                    AND cp.stage = 'pitched'
-                    AND cp.created_at > NOW() - INTERVAL '30 days'
-                ) DESC, b.response_rate DESC NULLS LAST
-                LIMIT 6
-            """
-            cursor.execute(query, (exclude_ids, min_follower_cap, hot_niches_list, *sensitive_params))
-        elif hot_niches_list:
-            query = f"""
-                SELECT
-                    b.id, b.slug, b.brand_name AS name, b.logo_url AS logo,
-                    b.description, b.category, b.response_rate, b.price_point, b.price_point,
-                    b.min_followers, b.micro_friendly, b.website, b.application_form_url
-                FROM pr_brands b
-                WHERE b.slug IS NOT NULL
-                  AND COALESCE(b.status, 'published') = 'published'
-                  AND b.id != ALL(%s)
-                  AND LOWER(b.category) = ANY(%s)
-                  {sensitive_clause}
-                ORDER BY (
-                    SELECT COUNT(DISTINCT cp.creator_id) FROM creator_pipeline cp
-                    WHERE cp.brand_id = b.id
-                    AND cp.stage = 'pitched'
-                    AND cp.created_at > NOW() - INTERVAL '30 days'
-                ) DESC, b.response_rate DESC NULLS LAST
-                LIMIT 6
-            """
-            cursor.execute(query, (exclude_ids, hot_niches_list, *sensitive_params))
-        elif min_follower_cap:
-            query = f"""
-                SELECT
-                    b.id, b.slug, b.brand_name AS name, b.logo_url AS logo,
-                    b.description, b.category, b.response_rate, b.price_point,
-                    b.min_followers, b.micro_friendly, b.website, b.application_form_url
-                FROM pr_brands b
-                WHERE b.slug IS NOT NULL
-                  AND COALESCE(b.status, 'published') = 'published'
-                  AND b.id != ALL(%s)
-                  AND (b.min_followers IS NULL OR b.min_followers <= %s)
-                  {sensitive_clause}
-                ORDER BY (
-                    SELECT COUNT(DISTINCT cp.creator_id) FROM creator_pipeline cp
-                    WHERE cp.brand_id = b.id
-                    AND cp.stage = 'pitched'
-                    AND cp.created_at > NOW() - INTERVAL '30 days'
-                ) DESC, b.response_rate DESC NULLS LAST
-                LIMIT 6
-            """
-            cursor.execute(query, (exclude_ids, min_follower_cap, *sensitive_params))
-        else:
-            query = f"""
-                SELECT
-                    b.id, b.slug, b.brand_name AS name, b.logo_url AS logo,
-                    b.description, b.category, b.response_rate, b.price_point,
-                    b.min_followers, b.micro_friendly, b.website, b.application_form_url
-                FROM pr_brands b
-                WHERE b.slug IS NOT NULL
-                  AND COALESCE(b.status, 'published') = 'published'
-                  AND b.id != ALL(%s)
-                  {sensitive_clause}
-                ORDER BY (
-                    SELECT COUNT(DISTINCT cp.creator_id) FROM creator_pipeline cp
-                    WHERE cp.brand_id = b.id
-                    AND cp.stage = 'pitched'
-                    AND cp.created_at > NOW() - INTERVAL '30 days'
-                ) DESC, b.response_rate DESC NULLS LAST
-                LIMIT 6
-            """
-            cursor.execute(query, (exclude_ids, *sensitive_params))
+        # Hot ordering reads the maintained brand_popularity_stats counters
+        # (one index lookup per brand) instead of a COUNT subquery per brand.
+        hot_filter_sql = ""
+        hot_params = [exclude_ids]
+        if min_follower_cap:
+            hot_filter_sql += " AND (b.min_followers IS NULL OR b.min_followers <= %s)"
+            hot_params.append(min_follower_cap)
+        if hot_niches_list:
+            hot_filter_sql += " AND LOWER(b.category) = ANY(%s)"
+            hot_params.append(hot_niches_list)
+        hot_params.extend(sensitive_params)
+
+        cursor.execute(f"""
+            SELECT
+                b.id, b.slug, b.brand_name AS name, b.logo_url AS logo,
+                b.description, b.category, b.response_rate, b.price_point,
+                b.min_followers, b.micro_friendly, b.website, b.application_form_url
+            FROM pr_brands b
+            {popularity_join_sql(conn)}
+            WHERE b.slug IS NOT NULL
+              AND COALESCE(b.status, 'published') = 'published'
+              AND b.id != ALL(%s)
+              {hot_filter_sql}
+              {sensitive_clause}
+            ORDER BY COALESCE(ps.pitched_creators_30d, 0) DESC, b.response_rate DESC NULLS LAST
+            LIMIT 6
+        """, tuple(hot_params))
         hot = cursor.fetchall()
 
         # Fallback: if not enough brands with pitches, fill from popular brands (also filtered by niche)
@@ -9207,7 +8732,7 @@ def get_for_you():
         cursor.close()
         conn.close()
 
-        return jsonify({
+        page = {
             'success': True,
             'hot': [dict(r) for r in hot],
             'matched': filtered_matched,
@@ -9215,13 +8740,19 @@ def get_for_you():
             'seasonal_reason': seasonal_reasons.get(month, ''),
             'seasonal_month': datetime.now().strftime('%B'),
             'newest': [dict(r) for r in newest],
-            'is_pro': is_pro,
             'has_profile': bool(niches or followers),
             'profile': {
                 'niches': niches,
                 'followers': followers,
             }
-        })
+        }
+        if filtered_matched:
+            try:
+                FOR_YOU_STORE.set(creator_id, for_you_fp, page)
+            except Exception as cache_err:
+                print(f"[ForYou] cache store skipped: {cache_err}")
+
+        return jsonify({**page, 'is_pro': is_pro})
 
     except Exception as e:
         print(f"Error in get_for_you: {str(e)}")
@@ -9416,6 +8947,7 @@ def update_creator_profile():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify({
             'success': True,
@@ -9682,26 +9214,51 @@ def get_social_proof_brands():
 # AI DEPTH UPGRADE - Creator Profile Scraping & Enrichment
 # ============================================================================
 
+def _scrape_summary(profile_data, vision_data, handle):
+    """Onboarding card summary for a scraped (or cached) profile."""
+    aesthetic = (vision_data or {}).get('aesthetic') or {}
+    if isinstance(aesthetic, str):
+        try:
+            aesthetic = json.loads(aesthetic)
+        except Exception:
+            aesthetic = {}
+    return {
+        'follower_count': profile_data.get('follower_count', 0),
+        'follower_display': format_follower_count(profile_data.get('follower_count', 0)),
+        'niche': vision_data.get('primary_niche') if vision_data else None,
+        'engagement_rate': profile_data.get('engagement_rate', 0),
+        'latest_post_days_ago': profile_data.get('latest_post_days_ago', 0),
+        'aesthetic_descriptors': aesthetic.get('aesthetic_descriptors', []) if isinstance(aesthetic, dict) else [],
+        'handle': handle,
+    }
+
+
 @pr_crm.route('/creator/scrape', methods=['POST'])
 def scrape_creator_profile():
     """
     Scrape and enrich creator profile from social media.
 
     Called during onboarding when user enters their social handle.
-    Triggers in-house scrape + Gemini Vision analysis.
+    Scrapes inside the request by default. With "async": true it serves the
+    cached profile for the same handle at once (refreshing it in the
+    background when stale); otherwise it queues the scrape and returns 202
+    with a job_id to poll at /creator/scrape/status/<job_id>.
 
     Request body:
     {
         "handle": "@username",
-        "platform": "instagram" | "tiktok"
+        "platform": "instagram" | "tiktok",
+        "async": false  (true = cached profile or background job)
     }
 
     Returns:
     {
         "success": true,
         "profile": { ... scraped data ... },
-        "summary": { follower_count, niche, engagement_rate }
+        "summary": { follower_count, niche, engagement_rate },
+        "refreshing": false
     }
+    or, async only, 202 {"success": true, "background": true, "job_id": "..."}
     """
     from services.creator_profile_scraper import scrape_and_enrich_creator
 
@@ -9712,6 +9269,7 @@ def scrape_creator_profile():
     data = request.get_json() or {}
     handle = data.get('handle', '').strip()
     platform = data.get('platform', 'instagram').lower()
+    run_async = bool(data.get('async', False))
 
     if not handle:
         return jsonify({'success': False, 'error': 'handle is required'}), 400
@@ -9735,6 +9293,41 @@ def scrape_creator_profile():
 
         user_id = creator['user_id']
 
+        # async=true: cached profile or a queued scrape to poll
+        if run_async:
+            cached = None
+            try:
+                cached = CreatorProfileScraper(conn).get_creator_profile(user_id) if CreatorProfileScraper else None
+            except Exception as cache_err:
+                print(f"[CreatorScrape] cache lookup failed: {cache_err}")
+                conn.rollback()
+
+            same_handle = (
+                cached
+                and (cached.get('handle') or '').lower().lstrip('@') == handle.lower()
+                and (cached.get('primary_platform') or platform).lower() == platform
+            )
+            if same_handle:
+                job = None
+                if profile_is_stale(cached):
+                    job, _ = enqueue_profile_scrape(user_id, handle, platform, reason='creator_scrape')
+                return jsonify({
+                    'success': True,
+                    'profile': cached,
+                    'summary': _scrape_summary(cached, cached, handle),
+                    'refreshing': job is not None,
+                    'job_id': job['job_id'] if job else None,
+                })
+
+            job, _ = enqueue_profile_scrape(user_id, handle, platform, reason='creator_scrape')
+            return jsonify({
+                'success': True,
+                'background': True,
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'status_url': f"/api/pr-crm/creator/scrape/status/{job['job_id']}",
+            }), 202
+
         # Run scrape and enrichment
         profile_data, vision_data = scrape_and_enrich_creator(
             user_id=str(user_id),
@@ -9743,21 +9336,11 @@ def scrape_creator_profile():
             db_conn=conn
         )
 
-        # Build summary for UI
-        summary = {
-            'follower_count': profile_data.get('follower_count', 0),
-            'follower_display': format_follower_count(profile_data.get('follower_count', 0)),
-            'niche': vision_data.get('primary_niche') if vision_data else None,
-            'engagement_rate': profile_data.get('engagement_rate', 0),
-            'latest_post_days_ago': profile_data.get('latest_post_days_ago', 0),
-            'aesthetic_descriptors': vision_data.get('aesthetic', {}).get('aesthetic_descriptors', []) if vision_data else [],
-            'handle': handle,
-        }
-
         return jsonify({
             'success': True,
             'profile': profile_data,
-            'summary': summary
+            'summary': _scrape_summary(profile_data, vision_data, handle),
+            'refreshing': False,
         })
 
     except ValueError as e:
@@ -9779,6 +9362,51 @@ def scrape_creator_profile():
             conn.close()
 
 
+@pr_crm.route('/creator/scrape/status/<job_id>', methods=['GET'])
+def scrape_creator_profile_status(job_id):
+    """
+    Poll a background profile scrape.
+
+    Returns 202 while queued/running, 200 with profile + summary when done,
+    400 with the user-facing error when the scrape failed validation.
+    """
+    creator_id = get_creator_id_from_session()
+    if not creator_id:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute('SELECT user_id FROM creators WHERE id = %s', (creator_id,))
+        creator = cursor.fetchone()
+    finally:
+        if conn:
+            conn.close()
+
+    job = get_job(job_id)
+    if not creator or not job or job.get('user_id') != str(creator['user_id']):
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    status = job_status_payload(job)
+    if job['status'] == 'done':
+        result = job.get('result') or {}
+        profile_data = result.get('profile') or {}
+        return jsonify({
+            'success': True,
+            'job': status,
+            'profile': profile_data,
+            'summary': _scrape_summary(profile_data, result.get('vision'), job.get('handle')),
+        })
+    if job['status'] == 'failed':
+        return jsonify({
+            'success': False,
+            'job': status,
+            'error': job.get('error') if job.get('invalid') else 'Failed to scrape profile',
+        }), 400 if job.get('invalid') else 500
+    return jsonify({'success': True, 'job': status}), 202
+
+
 @pr_crm.route('/brand/enrich', methods=['POST'])
 def enrich_brand_context():
     """
@@ -5,16 +5,19 @@ No authentication required - open to Google crawlers
 
 from flask import Blueprint, request, jsonify, Response
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
 from datetime import date, timedelta
 import hashlib
 import hmac
 import os
-import psycopg2
 import requests
 
 from brand_stats_synthesis import resolve_brand_stats, resolve_pitch_social_proof
 from brand_categories import normalize_category, aggregate_category_counts, category_label
 from services.public_brand_guard import scraper_rate_limit
+from services.public_response_cache import cached_public_response
+from services.brand_popularity import popularity_join_sql
+from services.recommendation_cache import invalidate_creator_recommendations
 
 public_bp = Blueprint('public', __name__, url_prefix='/api/public')
 
@@ -286,13 +289,7 @@ def add_cors_headers(response):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 
 def submit_to_indexnow(urls):
@@ -336,6 +333,7 @@ def submit_to_indexnow(urls):
 
 @public_bp.route('/brands', methods=['GET'])
 @scraper_rate_limit
+@cached_public_response('brands')
 def get_public_brands():
     """
     Public endpoint: Get paginated brand directory
@@ -399,8 +397,8 @@ def get_public_brands():
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        # Build query with filters (includes pitch stats from creator_pipeline)
-        query = """
+        # Build query with filters (pitch stats come from brand_popularity_stats)
+        query = f"""
             SELECT
                 b.id,
                 b.slug,
@@ -426,14 +424,7 @@ def get_public_brands():
                 COALESCE(ps.pitch_count, 0) as pitch_count,
                 COALESCE(ps.response_count, 0) as response_count
             FROM pr_brands b
-            LEFT JOIN (
-                SELECT
-                    brand_id,
-                    COUNT(*) FILTER (WHERE pitched_at IS NOT NULL) as pitch_count,
-                    COUNT(*) FILTER (WHERE stage IN ('responded', 'accepted', 'received', 'shipped')) as response_count
-                FROM creator_pipeline
-                GROUP BY brand_id
-            ) ps ON b.id = ps.brand_id
+            {popularity_join_sql(conn)}
             WHERE (COALESCE(b.status, 'published') = 'published')
         """
         params = []
@@ -589,6 +580,7 @@ def get_public_brands():
 
 @public_bp.route('/brands/<slug>', methods=['GET'])
 @scraper_rate_limit
+@cached_public_response('brand')
 def get_public_brand(slug):
     """
     Public endpoint: Get single brand details by slug
@@ -605,7 +597,7 @@ def get_public_brand(slug):
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT
                 b.id,
                 b.slug,
@@ -642,14 +634,7 @@ def get_public_brand(slug):
                 COALESCE(ps.pitch_count, 0) as pitch_count,
                 COALESCE(ps.response_count, 0) as response_count
             FROM pr_brands b
-            LEFT JOIN (
-                SELECT
-                    brand_id,
-                    COUNT(*) FILTER (WHERE pitched_at IS NOT NULL) as pitch_count,
-                    COUNT(*) FILTER (WHERE stage IN ('responded', 'accepted', 'received', 'shipped')) as response_count
-                FROM creator_pipeline
-                GROUP BY brand_id
-            ) ps ON b.id = ps.brand_id
+            {popularity_join_sql(conn)}
             WHERE b.slug = %s AND (COALESCE(b.status, 'published') = 'published')
         """, (slug,))
 
@@ -904,6 +889,7 @@ def unlock_brand_access(slug):
 
         cursor.close()
         conn.close()
+        invalidate_creator_recommendations(creator_id)
 
         return jsonify(response), 200
 
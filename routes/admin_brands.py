@@ -15,11 +15,22 @@ import json
 # Add parent directory for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.brand_feature_store import refresh_brand_features
+from services.public_response_cache import invalidate_public_brand_cache
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
+
+
+def _refresh_brand_features(conn, brand_ids):
+    """Recompute stored fit features after a brand write. Scoring re-parses the brand if this fails."""
+    try:
+        refresh_brand_features(conn, brand_ids)
+    except Exception as e:
+        conn.rollback()
+        print(f"[BrandFeatures] refresh failed for {len(brand_ids)} brands: {e}")
 
 
 # Create Blueprint
@@ -356,7 +367,9 @@ def create_brand():
         brand = cursor.fetchone()
 
         conn.commit()
+        _refresh_brand_features(conn, [brand_id])
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify({
             'brand': brand,
@@ -500,7 +513,9 @@ def update_brand(brand_id):
         brand = cursor.fetchone()
 
         conn.commit()
+        _refresh_brand_features(conn, [brand_id])
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify(brand), 200
 
@@ -523,6 +538,7 @@ def delete_brand(brand_id):
 
         conn.commit()
         conn.close()
+        invalidate_public_brand_cache()
 
         if not result:
             return jsonify({'error': 'Brand not found'}), 404
@@ -607,7 +623,9 @@ def bulk_import_brands():
                 continue
 
         conn.commit()
+        _refresh_brand_features(conn, [b['id'] for b in imported_brands])
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify({
             'imported': imported_count,
@@ -687,7 +705,9 @@ def bulk_update_brands():
         updated_count = cursor.rowcount
 
         conn.commit()
+        _refresh_brand_features(conn, brand_ids)
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify({'updated': updated_count}), 200
 
@@ -975,8 +995,7 @@ def bulk_enrich_brands_endpoint():
         # Run bulk enrichment
         enriched_count = bulk_enrich_brands(
             brand_ids=brand_ids,
-            only_missing_fields=only_missing,
-            rate_limit_delay=0.5  # Faster for admin UI
+            only_missing_fields=only_missing
         )
 
         return jsonify({
@@ -1361,7 +1380,9 @@ JSON:"""
         ))
 
         conn.commit()
+        _refresh_brand_features(conn, [brand_id])
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify({
             'success': True,
@@ -1467,7 +1488,6 @@ def run_follower_enrichment():
         stats = bulk_enrich_follower_requirements(
             limit=limit,
             only_null_values=only_null_values,
-            rate_limit_delay=0.5,
             dry_run=dry_run
         )
 
@@ -1531,7 +1551,9 @@ def enrich_single_brand_followers(brand_id):
         """, (result['min_followers'], result['micro_friendly'], brand_id))
 
         conn.commit()
+        _refresh_brand_features(conn, [brand_id])
         conn.close()
+        invalidate_public_brand_cache()
 
         return jsonify({
             'success': True,
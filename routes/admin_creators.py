@@ -5,7 +5,6 @@ Admin API Routes for Creator Management (scan/search)
 from flask import Blueprint, request, jsonify, session
 from functools import wraps
 from psycopg2.extras import RealDictCursor
-import psycopg2
 import os
 import sys
 import json
@@ -16,6 +15,7 @@ from decimal import Decimal
 
 # Add parent directory for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.db_pool import get_db_connection as pooled_db_connection
 
 
 # Create Blueprint
@@ -62,7 +62,7 @@ def admin_required(f):
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 def _parse_json_maybe(value, default):
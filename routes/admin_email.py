@@ -11,7 +11,6 @@ from datetime import datetime, timedelta
 import sys
 import os
 import json
-import smtplib
 import time
 import threading
 import re
@@ -22,13 +21,14 @@ from email.mime.multipart import MIMEMultipart
 from email.utils import make_msgid
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
 from services.outreach_image_gen import (
     generate_ugc_image,
     get_showcase_creators,
     init as init_outreach_image_gen,
 )
-from services.resend_mail import send_resend_email
+from services.mail_transport import send_smtp_message
+from services.resend_mail import send_resend_bulk, send_resend_email
 # Initialise schema + seed on first import (idempotent)
 try:
     init_outreach_image_gen()
@@ -43,12 +43,20 @@ GMAIL_APP_PASSWORD = os.getenv('SMTP_PASSWORD')
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 MAX_SEND_ATTEMPTS = 3
 STUCK_SENDING_TIMEOUT_SECONDS = 45  # Dead Vercel workers leave rows in 'sending'
-CRON_BATCH_SIZE = 12  # Stay well under the Vercel 60s cap (Resend + retry)
+# Recipients claimed per cron tick / send call. At 100 per batch request and the
+# default 2 req/s Resend limit this still finishes well under the Vercel 60s cap.
+CRON_BATCH_SIZE = int(os.getenv('CAMPAIGN_CRON_BATCH_SIZE', '400'))
+CAMPAIGN_SEND_CHUNK = int(os.getenv('CAMPAIGN_SEND_CHUNK', '100'))
+CAMPAIGN_SEND_CONCURRENCY = int(os.getenv('CAMPAIGN_SEND_CONCURRENCY', '2'))
+# No new Resend call starts after this many seconds of a send call. Plus the 30s
+# batch request timeout this stays under STUCK_SENDING_TIMEOUT_SECONDS, so the
+# orphan recovery never requeues a row whose send may still be in flight.
+CAMPAIGN_SEND_BUDGET_SECONDS = int(os.getenv('CAMPAIGN_SEND_BUDGET_SECONDS', '12'))
 ALLOWED_BRAND_TEMPLATE_IDS = {8}
 DISALLOWED_BRAND_TEMPLATE_IDS = {6, 7}
 BLOCKED_OUTREACH_STATUSES = {
@@ -1053,14 +1061,63 @@ def _recover_stuck_sending_v2(cursor):
     return _recover_orphaned_sending(cursor)
 
 
-def _process_campaign_batch(cursor, campaign_id, subject, html_content, batch_size, conn=None):
+def _campaign_messages(recipients, subject, html_content):
+    """Personalize every claimed recipient. Returns (messages, errors by recipient id)."""
+    messages = []
+    errors = {}
+    for recipient in recipients:
+        try:
+            user_id = recipient.get('user_id') or recipient.get('id') or ''
+            unsubscribe_url = _build_unsubscribe_url(user_id) if user_id else ''
+            messages.append({
+                'recipient': recipient,
+                'to_email': (recipient.get('email') or '').strip().lower(),
+                'subject': personalize_text(subject, recipient, unsubscribe_url=unsubscribe_url),
+                'html_content': personalize_text(html_content, recipient, unsubscribe_url=unsubscribe_url),
+                # Same header rule as _send_campaign_email: only real user ids get one-click unsubscribe
+                'unsubscribe_url': unsubscribe_url if recipient.get('user_id') else None,
+                'tags': [{'name': 'type', 'value': 'campaign'}],
+            })
+        except Exception as e:
+            errors[recipient['id']] = str(e)[:500]
+    return messages, errors
+
+
+def _write_recipient_statuses(cursor, rows):
+    """rows: (recipient_id, status, last_error) in one UPDATE ... FROM VALUES."""
+    if not rows:
+        return
+    execute_values(
+        cursor,
+        """
+        UPDATE email_campaign_recipients e
+        SET status = v.status, last_error = v.last_error, updated_at = NOW()
+        FROM (VALUES %s) AS v(id, status, last_error)
+        WHERE e.id = v.id
+        """,
+        rows,
+        template='(%s::bigint, %s::text, %s::text)',
+        page_size=500,
+    )
+
+
+def _send_campaign_batch(cursor, campaign_id, subject, html_content, batch_size, conn=None):
     """
-    Process a batch of recipients synchronously.
-    Commits after each email when conn is provided so a killed Vercel
-    worker does not leave already-delivered mail stuck in 'sending'.
-    Returns (sent_count, failed_count).
+    Claim up to batch_size recipients and send them through Resend's batch API.
+
+    Already-logged emails are skipped with one lookup, messages go out in
+    CAMPAIGN_SEND_CHUNK-sized batches on CAMPAIGN_SEND_CONCURRENCY workers
+    behind the shared Resend token bucket, and each finished chunk is written
+    back (statuses + email_logs) and committed before the next one. No new
+    call starts after CAMPAIGN_SEND_BUDGET_SECONDS; unsent recipients go back
+    as failed_temp. Returns a stats dict with sent/failed counts and throughput.
     """
-    # Pick recipients to send
+    started = time.monotonic()
+    stats = {
+        'claimed': 0, 'sent': 0, 'failed': 0, 'already_sent': 0,
+        'batches': 0, 'elapsed_sec': 0.0, 'emails_per_sec': 0.0,
+    }
+
     cursor.execute(
         """
         WITH picked AS (
@@ -1088,100 +1145,91 @@ def _process_campaign_batch(cursor, campaign_id, subject, html_content, batch_si
         (campaign_id, MAX_SEND_ATTEMPTS, batch_size)
     )
     recipients = cursor.fetchall()
-
     if not recipients:
-        return 0, 0
-
+        return stats
+    stats['claimed'] = len(recipients)
     if conn:
         conn.commit()
 
-    sent_count = 0
-    failed_count = 0
-
+    # One lookup for every address this campaign already delivered to
+    emails = sorted({(r.get('email') or '').strip().lower() for r in recipients})
+    cursor.execute(
+        """
+        SELECT DISTINCT LOWER(email) AS email FROM email_logs
+        WHERE campaign_id = %s AND status = 'sent' AND LOWER(email) = ANY(%s)
+        """,
+        (campaign_id, emails)
+    )
+    logged = {row['email'] for row in cursor.fetchall()}
+    to_send = []
+    done_rows = []
     for recipient in recipients:
-        recipient_id = recipient['id']
-        recipient_email = (recipient.get('email') or '').strip().lower()
-
-        try:
-            cursor.execute(
-                """
-                SELECT 1 FROM email_logs
-                WHERE campaign_id = %s AND LOWER(email) = %s AND status = 'sent'
-                LIMIT 1
-                """,
-                (campaign_id, recipient_email)
-            )
-            if cursor.fetchone():
-                cursor.execute(
-                    """
-                    UPDATE email_campaign_recipients
-                    SET status = 'sent', last_error = NULL, updated_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (recipient_id,)
-                )
-                sent_count += 1
-                if conn:
-                    conn.commit()
-                continue
-
-            personalized_subject = personalize_text(subject, recipient)
-            personalized_content = personalize_text(html_content, recipient)
+        if (recipient.get('email') or '').strip().lower() in logged:
+            done_rows.append((recipient['id'], 'sent', None))
+        else:
+            to_send.append(recipient)
+    if done_rows:
+        _write_recipient_statuses(cursor, done_rows)
+        stats['already_sent'] = len(done_rows)
+        stats['sent'] += len(done_rows)
+        if conn:
+            conn.commit()
 
-            success, send_error, send_retryable = _send_with_retry(
-                to_email=recipient_email,
-                subject=personalized_subject,
-                html_content=personalized_content,
-                recipient=recipient,
-            )
+    messages, build_errors = _campaign_messages(to_send, subject, html_content)
+    if build_errors:
+        _write_recipient_statuses(
+            cursor, [(rid, 'failed_temp', err) for rid, err in build_errors.items()]
+        )
+        stats['failed'] += len(build_errors)
+        if conn:
+            conn.commit()
 
-            if success:
-                cursor.execute(
-                    """
-                    UPDATE email_campaign_recipients
-                    SET status = 'sent', last_error = NULL, updated_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (recipient_id,)
-                )
-                cursor.execute(
-                    """
-                    INSERT INTO email_logs (campaign_id, user_id, creator_id, email, status, sent_at)
-                    VALUES (%s, %s, %s, %s, 'sent', NOW())
-                    """,
-                    (campaign_id, recipient['user_id'], recipient['creator_id'], recipient_email)
-                )
-                sent_count += 1
+    for chunk, results in send_resend_bulk(
+        messages,
+        batch_size=CAMPAIGN_SEND_CHUNK,
+        concurrency=CAMPAIGN_SEND_CONCURRENCY,
+        deadline=started + CAMPAIGN_SEND_BUDGET_SECONDS,
+    ):
+        stats['batches'] += 1
+        status_rows = []
+        log_rows = []
+        for msg, result in zip(chunk, results):
+            recipient = msg['recipient']
+            if result.get('success'):
+                status_rows.append((recipient['id'], 'sent', None))
+                log_rows.append((campaign_id, recipient['user_id'], recipient['creator_id'], msg['to_email']))
+                stats['sent'] += 1
             else:
-                fail_status = 'failed_temp' if send_retryable else 'failed_perm'
-                cursor.execute(
-                    """
-                    UPDATE email_campaign_recipients
-                    SET status = %s, last_error = %s, updated_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (fail_status, (send_error or 'Resend send failed')[:500], recipient_id)
-                )
-                failed_count += 1
-
-            if conn:
-                conn.commit()
-            time.sleep(0.08)
-
-        except Exception as e:
-            cursor.execute(
+                error = (result.get('error') or 'Resend send failed')[:500]
+                print(f"[Resend] Failed {msg['to_email']}: {error}")
+                fail_status = 'failed_temp' if result.get('retryable') else 'failed_perm'
+                status_rows.append((recipient['id'], fail_status, error))
+                stats['failed'] += 1
+        _write_recipient_statuses(cursor, status_rows)
+        if log_rows:
+            execute_values(
+                cursor,
                 """
-                UPDATE email_campaign_recipients
-                SET status = 'failed_temp', last_error = %s, updated_at = NOW()
-                WHERE id = %s
+                INSERT INTO email_logs (campaign_id, user_id, creator_id, email, status, sent_at)
+                VALUES %s
                 """,
-                (str(e)[:500], recipient_id)
+                log_rows,
+                template="(%s, %s, %s, %s, 'sent', NOW())",
+                page_size=500,
             )
-            failed_count += 1
-            if conn:
-                conn.commit()
+        if conn:
+            conn.commit()
 
-    return sent_count, failed_count
+    elapsed = time.monotonic() - started
+    stats['elapsed_sec'] = round(elapsed, 2)
+    stats['emails_per_sec'] = round((stats['sent'] - stats['already_sent']) / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
+
+
+def _process_campaign_batch(cursor, campaign_id, subject, html_content, batch_size, conn=None):
+    """Send one batch of recipients. Returns (sent_count, failed_count)."""
+    stats = _send_campaign_batch(cursor, campaign_id, subject, html_content, batch_size, conn=conn)
+    return stats['sent'], stats['failed']
 
 
 def _recover_orphaned_sending(cursor, campaign_id=None):
@@ -1284,11 +1332,17 @@ def cron_process_campaigns():
             _recover_orphaned_sending(cursor, campaign['id'])
             conn.commit()
 
-            sent, failed = _process_campaign_batch(
+            batch = _send_campaign_batch(
                 cursor, campaign['id'], subject, html_content, CRON_BATCH_SIZE, conn=conn
             )
+            sent, failed = batch['sent'], batch['failed']
             total_sent += sent
             total_failed += failed
+            print(
+                f"[Cron] campaign {campaign['id']}: {sent} sent, {failed} failed, "
+                f"{batch['already_sent']} already logged, {batch['batches']} Resend batches, "
+                f"{batch['emails_per_sec']}/s over {batch['elapsed_sec']}s"
+            )
 
             _refresh_campaign_totals_from_recipients(cursor, campaign['id'], final=False)
             conn.commit()
@@ -1296,7 +1350,11 @@ def cron_process_campaigns():
             results.append({
                 'campaign_id': campaign['id'],
                 'sent': sent,
-                'failed': failed
+                'failed': failed,
+                'already_sent': batch['already_sent'],
+                'batches': batch['batches'],
+                'elapsed_sec': batch['elapsed_sec'],
+                'emails_per_sec': batch['emails_per_sec'],
             })
 
         # Step 3: Check for completed campaigns and update status
@@ -1877,8 +1935,16 @@ def _build_unsubscribe_url(user_id):
         return ''
 
 
-def personalize_text(text, recipient):
-    """Replace template variables with recipient data."""
+_HARDCODED_UNSUB_RE = re.compile(
+    r'href="https?://[^"]*(?:app\.newcollab\.co/(?:login|creator/dashboard/settings)|newcollab\.co/unsubscribe)[^"]*"([^>]*>(?:[^<]*</a>)?)'
+)
+
+
+def personalize_text(text, recipient, unsubscribe_url=None):
+    """Replace template variables with recipient data.
+
+    Pass unsubscribe_url when it is already built (bulk sends) to skip re-signing.
+    """
     if not text:
         return text
 
@@ -1886,8 +1952,9 @@ def personalize_text(text, recipient):
     if recipient.get('tier', 'free') != 'free':
         pitches_remaining = 'unlimited'
 
-    user_id = recipient.get('user_id') or recipient.get('id') or ''
-    unsubscribe_url = _build_unsubscribe_url(user_id) if user_id else ''
+    if unsubscribe_url is None:
+        user_id = recipient.get('user_id') or recipient.get('id') or ''
+        unsubscribe_url = _build_unsubscribe_url(user_id) if user_id else ''
 
     replacements = {
         '{{first_name}}': recipient.get('first_name') or recipient.get('username') or 'there',
@@ -1903,14 +1970,13 @@ def personalize_text(text, recipient):
         '{{unsubscribe_url}}': unsubscribe_url,
     }
 
-    for var, value in replacements.items():
-        text = text.replace(var, str(value))
+    if '{{' in text:
+        for var, value in replacements.items():
+            text = text.replace(var, str(value))
 
     # Rewrite any hardcoded unsubscribe links that point to /login or /settings
     if unsubscribe_url:
-        import re
-        text = re.sub(
-            r'href="https?://[^"]*(?:app\.newcollab\.co/(?:login|creator/dashboard/settings)|newcollab\.co/unsubscribe)[^"]*"([^>]*>(?:[^<]*</a>)?)',
+        text = _HARDCODED_UNSUB_RE.sub(
             lambda m: f'href="{unsubscribe_url}"{m.group(1)}',
             text
         )
@@ -1934,11 +2000,11 @@ def send_email_gmail_with_meta(to_email, subject, html_content):
         html_part = MIMEText(html_content, 'html')
         msg.attach(html_part)
 
-        # Connect to Gmail SMTP with TLS (port 587)
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_USER, to_email, msg.as_string())
+        # Gmail SMTP with TLS (port 587), pooled keep-alive session
+        send_smtp_message(
+            msg, [to_email], host='smtp.gmail.com', port=587,
+            username=GMAIL_USER, password=GMAIL_APP_PASSWORD,
+        )
 
         print(f"Email sent successfully to {to_email}")
         return {"success": True, "message_id": msg.get("Message-ID")}
@@ -13,11 +13,12 @@ import os
 # Add parent directory for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import from app instead of non-existent database module
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
+
+
 def get_db_connection():
-    """Get database connection - imported from app.py pattern"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    """Get database connection"""
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 from tasks.pr_hunter_tasks import run_pr_hunt, reverify_email
 
@@ -131,79 +132,16 @@ def start_pr_hunt():
             # Redis not available - run synchronously
             print(f"Celery unavailable ({str(celery_error)}), running synchronously...")
 
-            from services.pr_hunter import PRHunterService
-            from tasks.pr_hunter_tasks import save_candidate_to_db
+            from services.pr_hunter import PRHunterService, run_hunt_inline
 
             service = PRHunterService()
             conn = None
 
             try:
-                # Step 1: Discovery
-                print(f"Starting PR hunt for keyword: {keyword}")
-                discovered_brands = service.search_google_for_brands(keyword, max_results)
-                print(f"Discovered {len(discovered_brands)} brands")
-
-                # Step 2: Filter duplicates
                 conn = get_db_connection()
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-                unique_brands = []
-                for brand in discovered_brands:
-                    domain = brand.get('domain')
-                    if not domain:
-                        continue
-
-                    # Check if already exists in pr_brands
-                    cursor.execute('SELECT id FROM pr_brands WHERE website LIKE %s', (f'%{domain}%',))
-                    if cursor.fetchone():
-                        print(f"Skipping {domain} - already in pr_brands")
-                        continue
-
-                    # Check if already in candidates
-                    cursor.execute('SELECT id FROM brand_candidates WHERE domain = %s', (domain,))
-                    if cursor.fetchone():
-                        print(f"Skipping {domain} - already in candidates")
-                        continue
-
-                    unique_brands.append(brand)
-
-                print(f"After deduplication: {len(unique_brands)} unique brands")
-
-                # Step 3: Enrich each brand
-                enriched_count = 0
-                saved_count = 0
-                rejected_count = 0
-
-                for brand in unique_brands:
-                    try:
-                        enriched_brand = service.enrich_brand_data(brand)
-                        enriched_count += 1
-
-                        passes_quality, rejection_reason = service.quality_gate(enriched_brand)
-
-                        if passes_quality:
-                            save_candidate_to_db(cursor, enriched_brand, keyword)
-                            saved_count += 1
-                            print(f"Saved: {enriched_brand['brand_name']}")
-                        else:
-                            rejected_count += 1
-                            print(f"Rejected: {enriched_brand['brand_name']} - {rejection_reason}")
-
-                        conn.commit()
-
-                    except Exception as e:
-                        print(f"Error enriching {brand.get('brand_name', 'Unknown')}: {str(e)}")
-                        conn.rollback()
-                        continue
-
-                result = {
-                    'keyword': keyword,
-                    'discovered': len(discovered_brands),
-                    'unique': len(unique_brands),
-                    'enriched': enriched_count,
-                    'saved': saved_count,
-                    'rejected': rejected_count
-                }
+                result = run_hunt_inline(service, conn, keyword, max_results)
+                result.pop('completed_at', None)
+                saved_count = result['saved']
 
                 return jsonify({
                     'task_id': 'sync-' + keyword.lower().replace(' ', '-'),
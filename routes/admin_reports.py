@@ -3,7 +3,7 @@ Admin Reports API Routes
 KPI Dashboard for tracking creator usage and monetization metrics
 """
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session, stream_with_context
 from functools import wraps
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
@@ -11,12 +11,15 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.report_export import EXPORTS, FORMATS, RETENTION_SQL, TOP_USERS_SQL, export_chunks
+from services.report_rollups import PERIOD_DAYS, load_report_rollups, rollup_status
+from services.subscription_ledger import subscription_metrics
 
 
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 admin_reports_bp = Blueprint('admin_reports', __name__, url_prefix='/api/admin/reports')
@@ -52,8 +55,12 @@ def _pack_stats_from_row(row):
     }
 
 
-def fetch_pack_report_stats(cursor, start_date, end_date, prev_start_date, prev_end_date):
-    """One-time $9 extra-pack sales. Never folded into MRR."""
+def fetch_pack_report_stats(cursor, start_date, end_date, prev_start_date, prev_end_date, rollups=None):
+    """One-time $9 extra-pack sales. Never folded into MRR.
+
+    With rollups (services.report_rollups.ReportRollups) the counters come from
+    report_daily_rollups and the period dates from the rollup period.
+    """
     from services.pack_credits import PACK_BUNDLE_CENTS, PACK_BUNDLE_SIZE
 
     empty = _empty_pack_bucket()
@@ -73,6 +80,11 @@ def fetch_pack_report_stats(cursor, start_date, end_date, prev_start_date, prev_
     if not _pack_purchases_table_exists(cursor):
         return stats
 
+    if rollups is not None:
+        _fill_pack_stats_from_rollups(cursor, stats, rollups)
+        stats['recent'] = _recent_pack_purchases(cursor)
+        return stats
+
     agg_sql = """
         SELECT
             COUNT(*)::int AS purchases,
@@ -138,6 +150,11 @@ def fetch_pack_report_stats(cursor, start_date, end_date, prev_start_date, prev_
         for row in cursor.fetchall()
     ]
 
+    stats['recent'] = _recent_pack_purchases(cursor)
+    return stats
+
+
+def _recent_pack_purchases(cursor):
     cursor.execute("""
         SELECT
             pp.creator_id,
@@ -164,8 +181,56 @@ def fetch_pack_report_stats(cursor, start_date, end_date, prev_start_date, prev_
             'created_at': created.strftime('%b %d, %H:%M') if created else None,
             'created_at_iso': created.isoformat() if created else None,
         })
-    stats['recent'] = recent
-    return stats
+    return recent
+
+
+def _rollup_pack_bucket(rollups, start=None, end=None, buyers=0):
+    return {
+        'purchases': rollups.total('pack_purchases', start, end),
+        'buyers': buyers,
+        'revenue_cents': rollups.total('pack_revenue_cents', start, end),
+        'packs': rollups.total('pack_packs', start, end),
+    }
+
+
+def _fill_pack_stats_from_rollups(cursor, stats, rollups):
+    window = rollups.window()
+    prev_end = rollups.start - timedelta(days=1)
+    month_start = rollups.today.replace(day=1)
+
+    stats['all_time'] = {
+        **_rollup_pack_bucket(rollups, buyers=rollups.total('first_pack_buyers')),
+        'repeat_buyers': rollups.total('second_pack_buyers'),
+    }
+    stats['period'] = _rollup_pack_bucket(rollups, rollups.start, buyers=window['pack_buyers'])
+    stats['prev_period'] = _rollup_pack_bucket(
+        rollups, rollups.prev_start, prev_end, buyers=window['prev_pack_buyers']
+    )
+    today = _rollup_pack_bucket(rollups, rollups.today)
+    stats['today'] = {
+        'purchases': today['purchases'],
+        'revenue_cents': today['revenue_cents'],
+        'packs': today['packs'],
+    }
+
+    # Distinct buyers within one month stays a bounded live count
+    cursor.execute("""
+        SELECT COUNT(DISTINCT creator_id)::int AS buyers
+        FROM pack_purchases
+        WHERE created_at >= DATE_TRUNC('month', NOW())
+    """)
+    month_buyers = int((cursor.fetchone() or {}).get('buyers') or 0)
+    stats['this_month'] = _rollup_pack_bucket(rollups, month_start, buyers=month_buyers)
+
+    daily = []
+    for day, counters in sorted(rollups.days.items()):
+        if day >= rollups.start and counters['pack_purchases']:
+            daily.append({
+                'date': str(day),
+                'count': counters['pack_purchases'],
+                'revenue_cents': counters['pack_revenue_cents'],
+            })
+    stats['daily'] = daily
 
 
 # ============================================================================
@@ -226,13 +291,18 @@ def get_overview():
     try:
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
+        rollups = load_report_rollups(cursor)
 
         # Total users and creators
-        cursor.execute("SELECT COUNT(*) as count FROM users")
-        total_users = cursor.fetchone()['count']
+        if rollups:
+            total_users = rollups.total('user_signups')
+            total_creators = rollups.total('signups')
+        else:
+            cursor.execute("SELECT COUNT(*) as count FROM users")
+            total_users = cursor.fetchone()['count']
 
-        cursor.execute("SELECT COUNT(*) as count FROM creators")
-        total_creators = cursor.fetchone()['count']
+            cursor.execute("SELECT COUNT(*) as count FROM creators")
+            total_creators = cursor.fetchone()['count']
 
         # Active users based on creator_pipeline table (since brand_unlocks may be empty)
         # Active today (last 24 hours)
@@ -259,13 +329,16 @@ def get_overview():
         """)
         active_30d = cursor.fetchone()['count']
 
-        # Total unlocks (from brand_unlocks if exists, otherwise 0)
-        cursor.execute("SELECT COUNT(*) as count FROM brand_unlocks")
-        total_unlocks = cursor.fetchone()['count']
+        # Total unlocks and pipeline saves
+        if rollups:
+            total_unlocks = rollups.total('unlocks')
+            total_pipeline = rollups.total('pipeline_saves')
+        else:
+            cursor.execute("SELECT COUNT(*) as count FROM brand_unlocks")
+            total_unlocks = cursor.fetchone()['count']
 
-        # Total pipeline saves
-        cursor.execute("SELECT COUNT(*) as count FROM creator_pipeline")
-        total_pipeline = cursor.fetchone()['count']
+            cursor.execute("SELECT COUNT(*) as count FROM creator_pipeline")
+            total_pipeline = cursor.fetchone()['count']
 
         # Subscription breakdown
         cursor.execute("""
@@ -577,21 +650,22 @@ def get_signups():
 
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
+        rollups = load_report_rollups(cursor)
 
         # Daily signups
-        cursor.execute("""
-            SELECT
-                DATE(created_at) as date,
-                COUNT(*) as count
-            FROM creators
-            WHERE DATE(created_at) >= %s
-            GROUP BY DATE(created_at)
-            ORDER BY date ASC
-        """, (start_date,))
-        daily = cursor.fetchall()
-
-        # Convert dates to strings
-        daily_data = [{'date': str(row['date']), 'count': row['count']} for row in daily]
+        if rollups:
+            daily_data = rollups.daily('signups', start_date)
+        else:
+            cursor.execute("""
+                SELECT
+                    DATE(created_at) as date,
+                    COUNT(*) as count
+                FROM creators
+                WHERE DATE(created_at) >= %s
+                GROUP BY DATE(created_at)
+                ORDER BY date ASC
+            """, (start_date,))
+            daily_data = [{'date': str(row['date']), 'count': row['count']} for row in cursor.fetchall()]
 
         # Total in period
         total_period = sum(row['count'] for row in daily_data)
@@ -635,20 +709,25 @@ def get_dau():
 
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
+        rollups = load_report_rollups(cursor)
 
         # DAU based on creator_pipeline activity (brand_unlocks may be empty)
-        cursor.execute("""
-            SELECT
-                DATE(created_at) as date,
-                COUNT(DISTINCT creator_id) as active_users
-            FROM creator_pipeline
-            WHERE DATE(created_at) >= %s
-            GROUP BY DATE(created_at)
-            ORDER BY date ASC
-        """, (start_date,))
-        daily = cursor.fetchall()
-
-        daily_data = [{'date': str(row['date']), 'active_users': row['active_users']} for row in daily]
+        if rollups:
+            daily_data = rollups.daily('active_creators', start_date, key='active_users')
+        else:
+            cursor.execute("""
+                SELECT
+                    DATE(created_at) as date,
+                    COUNT(DISTINCT creator_id) as active_users
+                FROM creator_pipeline
+                WHERE DATE(created_at) >= %s
+                GROUP BY DATE(created_at)
+                ORDER BY date ASC
+            """, (start_date,))
+            daily_data = [
+                {'date': str(row['date']), 'active_users': row['active_users']}
+                for row in cursor.fetchall()
+            ]
 
         # Calculate average DAU
         avg_dau = sum(row['active_users'] for row in daily_data) / len(daily_data) if daily_data else 0
@@ -780,37 +859,13 @@ def get_top_users():
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         # Get top users with saves and pitches from creator_pipeline
-        cursor.execute("""
-            SELECT
-                cp.creator_id,
-                u.email,
-                c.username,
-                COALESCE(c.subscription_tier, 'free') as tier,
-                COUNT(*) as saves,
-                COUNT(cp.pitched_at) as pitches,
-                (
-                    SELECT COUNT(*) FROM creator_pipeline cp2
-                    WHERE cp2.creator_id = c.id
-                    AND cp2.pitched_at >= DATE_TRUNC('week', NOW())
-                ) as pitches_this_week,
-                MAX(COALESCE(cp.pitched_at, cp.created_at)) as last_activity
-            FROM creator_pipeline cp
-            JOIN creators c ON cp.creator_id = c.id
-            JOIN users u ON c.user_id = u.id
-            WHERE DATE(cp.created_at) >= %s
-            GROUP BY cp.creator_id, u.email, c.username, c.subscription_tier, c.id
-            ORDER BY
-                CASE WHEN %s = 'saves' THEN COUNT(*) END DESC,
-                CASE WHEN %s = 'pitches' THEN COUNT(cp.pitched_at) END DESC,
-                CASE WHEN %s = 'all' THEN COUNT(*) + COUNT(cp.pitched_at) * 2 END DESC
-            LIMIT %s
-        """, (start_date, metric, metric, metric, limit))
-
-        users = cursor.fetchall()
+        cursor.execute(TOP_USERS_SQL + ' LIMIT %(limit)s', {
+            'start_date': start_date, 'metric': metric, 'limit': limit,
+        })
 
         # Convert datetime to string
         users_data = []
-        for user in users:
+        for user in cursor:
             users_data.append({
                 'creator_id': user['creator_id'],
                 'email': user['email'],
@@ -1003,40 +1058,10 @@ def get_retention():
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         # Get signup cohorts from last 10 weeks using creator_pipeline activity
-        cursor.execute("""
-            WITH signup_cohorts AS (
-                SELECT
-                    id as creator_id,
-                    DATE_TRUNC('week', created_at) as signup_week
-                FROM creators
-                WHERE created_at >= NOW() - INTERVAL '10 weeks'
-            ),
-            activity AS (
-                -- Combine saves (created_at) and pitches (pitched_at) as activity signals
-                SELECT creator_id, DATE_TRUNC('week', created_at) as activity_week
-                FROM creator_pipeline
-                WHERE created_at >= NOW() - INTERVAL '14 weeks'
-                UNION
-                SELECT creator_id, DATE_TRUNC('week', pitched_at) as activity_week
-                FROM creator_pipeline
-                WHERE pitched_at IS NOT NULL AND pitched_at >= NOW() - INTERVAL '14 weeks'
-            )
-            SELECT
-                sc.signup_week,
-                COUNT(DISTINCT sc.creator_id) as total_users,
-                COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week THEN sc.creator_id END) as week_0,
-                COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '1 week' THEN sc.creator_id END) as week_1,
-                COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '2 weeks' THEN sc.creator_id END) as week_2,
-                COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '3 weeks' THEN sc.creator_id END) as week_3,
-                COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '4 weeks' THEN sc.creator_id END) as week_4
-            FROM signup_cohorts sc
-            LEFT JOIN activity a ON sc.creator_id = a.creator_id
-            GROUP BY sc.signup_week
-            ORDER BY sc.signup_week DESC
-        """)
+        cursor.execute(RETENTION_SQL, {'weeks': 10})
 
         cohorts = []
-        for row in cursor.fetchall():
+        for row in cursor:
             total = row['total_users'] or 1  # Avoid division by zero
             cohorts.append({
                 'signup_week': str(row['signup_week'].date()) if row['signup_week'] else None,
@@ -1872,6 +1897,136 @@ def get_engagement():
         return jsonify({'error': str(e)}), 500
 
 
+def _health_entry(this_period, last_period, daily):
+    return {
+        'this_week': this_period,  # Keep key name for frontend compat
+        'last_week': last_period,
+        'change': this_period - last_period,
+        'daily': daily,
+    }
+
+
+def _rollup_health_metrics(rollups):
+    """Founder dashboard health block from report_daily_rollups (+ today live)."""
+    window = rollups.window()
+    return {
+        'signups': _health_entry(
+            rollups.period_total('signups'), rollups.prev_total('signups'), rollups.daily('signups')
+        ),
+        'pitches': _health_entry(
+            rollups.period_total('unlocks'), rollups.prev_total('unlocks'), rollups.daily('unlocks')
+        ),
+        'active_creators': _health_entry(
+            window['active_creators'], window['prev_active_creators'], rollups.daily('active_creators')
+        ),
+        'upgrades': _health_entry(
+            rollups.period_total('pro_upgrades'), rollups.prev_total('pro_upgrades'),
+            rollups.daily('pro_upgrades'),
+        ),
+    }
+
+
+def _live_health_metrics(cursor, start_date, end_date, prev_start_date, prev_end_date):
+    """Founder dashboard health block aggregated from the raw tables (custom ranges)."""
+
+    def daily(sql):
+        cursor.execute(sql, (start_date, end_date))
+        return [{'date': str(row['date']), 'count': row['count']} for row in cursor.fetchall()]
+
+    def count(sql, start, end):
+        cursor.execute(sql, (start, end))
+        return cursor.fetchone()['count']
+
+    # Signups by day (selected period)
+    signup_daily = daily("""
+        SELECT
+            DATE(created_at) as date,
+            COUNT(*) as count
+        FROM creators
+        WHERE created_at >= %s AND created_at <= %s
+        GROUP BY DATE(created_at)
+        ORDER BY date ASC
+    """)
+
+    # Current period vs previous period signups
+    signups_this_period = count("""
+        SELECT COUNT(*) as count FROM creators
+        WHERE created_at >= %s AND created_at <= %s
+    """, start_date, end_date)
+    signups_last_period = count("""
+        SELECT COUNT(*) as count FROM creators
+        WHERE created_at >= %s AND created_at < %s
+    """, prev_start_date, prev_end_date)
+
+    # Brand unlocks by day (selected period)
+    pitches_daily = daily("""
+        SELECT
+            DATE(unlocked_at) as date,
+            COUNT(*) as count
+        FROM brand_unlocks
+        WHERE unlocked_at >= %s AND unlocked_at <= %s
+        GROUP BY DATE(unlocked_at)
+        ORDER BY date ASC
+    """)
+
+    # Current period vs previous period unlocks
+    pitches_this_period = count("""
+        SELECT COUNT(*) as count FROM brand_unlocks
+        WHERE unlocked_at >= %s AND unlocked_at <= %s
+    """, start_date, end_date)
+    pitches_last_period = count("""
+        SELECT COUNT(*) as count FROM brand_unlocks
+        WHERE unlocked_at >= %s AND unlocked_at < %s
+    """, prev_start_date, prev_end_date)
+
+    # Active creators by day (selected period)
+    active_daily = daily("""
+        SELECT
+            DATE(created_at) as date,
+            COUNT(DISTINCT creator_id) as count
+        FROM creator_pipeline
+        WHERE created_at >= %s AND created_at <= %s
+        GROUP BY DATE(created_at)
+        ORDER BY date ASC
+    """)
+
+    # Current period vs previous period active creators
+    active_this_period = count("""
+        SELECT COUNT(DISTINCT creator_id) as count FROM creator_pipeline
+        WHERE created_at >= %s AND created_at <= %s
+    """, start_date, end_date)
+    active_last_period = count("""
+        SELECT COUNT(DISTINCT creator_id) as count FROM creator_pipeline
+        WHERE created_at >= %s AND created_at < %s
+    """, prev_start_date, prev_end_date)
+
+    # Pro upgrades (subscription_started_at of current pro/elite creators)
+    upgrades_daily = daily("""
+        SELECT
+            DATE(subscription_started_at) as date,
+            COUNT(*) as count
+        FROM creators
+        WHERE subscription_tier IN ('pro', 'elite')
+        AND subscription_started_at >= %s AND subscription_started_at <= %s
+        GROUP BY DATE(subscription_started_at)
+        ORDER BY date ASC
+    """)
+    upgrades_last_period = count("""
+        SELECT COUNT(*) as count FROM creators
+        WHERE subscription_tier IN ('pro', 'elite')
+        AND subscription_started_at >= %s AND subscription_started_at < %s
+    """, prev_start_date, prev_end_date)
+
+    return {
+        'signups': _health_entry(signups_this_period, signups_last_period, signup_daily),
+        'pitches': _health_entry(pitches_this_period, pitches_last_period, pitches_daily),
+        'active_creators': _health_entry(active_this_period, active_last_period, active_daily),
+        'upgrades': _health_entry(
+            sum(row['count'] for row in upgrades_daily), upgrades_last_period, upgrades_daily
+        ),
+    }
+
+
 # ============================================================================
 # FOUNDER DASHBOARD - Consolidated KPIs for adminsimple.html
 # ============================================================================
@@ -1946,40 +2101,61 @@ def get_founder_dashboard():
         conn = get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
+        # Preset periods read report_daily_rollups (+ today live), so 'all'
+        # costs the same as '7d'. Custom ranges aggregate the raw tables.
+        rollups = None
+        if not (start_date_str and end_date_str):
+            rollups = load_report_rollups(cursor, period if period in PERIOD_DAYS else '7d')
+
         # ================== MRR CALCULATION ==================
         # Pro = $19/month (only tier currently available)
-        cursor.execute("""
-            SELECT
-                COALESCE(subscription_tier, 'free') as tier,
-                COUNT(*) as count
-            FROM creators
-            GROUP BY COALESCE(subscription_tier, 'free')
-        """)
-        tier_counts = {row['tier']: row['count'] for row in cursor.fetchall()}
-
-        pro_count_db = tier_counts.get('pro', 0)
-        free_count = tier_counts.get('free', 0)
-
-        # MRR — prefer live Stripe active subs; fall back to DB tier count × $19
         pro_price = 19
-        mrr_source = 'database'
-        from utils.stripe_mrr import fetch_stripe_mrr
-
-        stripe_mrr = fetch_stripe_mrr()
-        if stripe_mrr:
-            current_mrr = int(stripe_mrr['mrr_dollars'])
-            pro_count = stripe_mrr['active_subscriptions']
-            mrr_source = 'stripe'
+        subscription_stats = subscription_metrics(cursor, start_date, end_date)
+        stripe_mrr = None
+        if subscription_stats:
+            # Webhook-maintained ledger: one aggregate, no Stripe paging
+            current_mrr = int(subscription_stats['mrr_dollars'])
+            pro_count = subscription_stats['active_subscriptions']
+            mrr_source = 'ledger'
+            if rollups:
+                total_creators = rollups.total('signups')
+            else:
+                cursor.execute("SELECT COUNT(*) AS count FROM creators")
+                total_creators = cursor.fetchone()['count']
+            # Funnel/tier view: every live Pro subscription, like creators.subscription_tier
+            pro_count_db = pro_count + subscription_stats['trialing'] + subscription_stats['past_due']
         else:
-            pro_count = pro_count_db
-            current_mrr = pro_count * pro_price
+            cursor.execute("""
+                SELECT
+                    COALESCE(subscription_tier, 'free') as tier,
+                    COUNT(*) as count
+                FROM creators
+                GROUP BY COALESCE(subscription_tier, 'free')
+            """)
+            tier_counts = {row['tier']: row['count'] for row in cursor.fetchall()}
+
+            pro_count_db = tier_counts.get('pro', 0)
+            free_count = tier_counts.get('free', 0)
+
+            # Before the ledger is populated: live Stripe active subs, else DB tier count × $19
+            mrr_source = 'database'
+            from utils.stripe_mrr import fetch_stripe_mrr
+
+            stripe_mrr = fetch_stripe_mrr()
+            if stripe_mrr:
+                current_mrr = int(stripe_mrr['mrr_dollars'])
+                pro_count = stripe_mrr['active_subscriptions']
+                mrr_source = 'stripe'
+            else:
+                pro_count = pro_count_db
+                current_mrr = pro_count * pro_price
+            total_creators = free_count + pro_count
 
         total_paid_subs = pro_count
         goal_mrr = 1000
         progress_pct = min(round((current_mrr / goal_mrr) * 100, 1), 100)
 
         # Conversion rate (paid / total)
-        total_creators = free_count + pro_count
         conversion_rate = round((total_paid_subs / max(total_creators, 1)) * 100, 2)
 
         # Need X more subs to hit goal
@@ -1988,7 +2164,7 @@ def get_founder_dashboard():
         # ================== EXTRA PACKS ($9 one-time) ==================
         # Pack revenue is not MRR. Track purchases separately from Pro.
         pack_stats = fetch_pack_report_stats(
-            cursor, start_date, end_date, prev_start_date, prev_end_date
+            cursor, start_date, end_date, prev_start_date, prev_end_date, rollups=rollups
         )
         from services.pack_credits import pack_credits_column_exists
         has_pack_col = pack_credits_column_exists(conn)
@@ -2067,108 +2243,45 @@ def get_founder_dashboard():
         near_limit_count = cursor.fetchone()['count']
 
         # ================== HEALTH METRICS (Dynamic Period) ==================
-        # Sparkline data for signups, pitches, and active creators based on selected period
-
-        # Signups by day (selected period)
-        cursor.execute("""
-            SELECT
-                DATE(created_at) as date,
-                COUNT(*) as count
-            FROM creators
-            WHERE created_at >= %s AND created_at <= %s
-            GROUP BY DATE(created_at)
-            ORDER BY date ASC
-        """, (start_date, end_date))
-        signup_daily = [{'date': str(row['date']), 'count': row['count']} for row in cursor.fetchall()]
-
-        # Current period vs previous period signups
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM creators
-            WHERE created_at >= %s AND created_at <= %s
-        """, (start_date, end_date))
-        signups_this_period = cursor.fetchone()['count']
-
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM creators
-            WHERE created_at >= %s AND created_at < %s
-        """, (prev_start_date, prev_end_date))
-        signups_last_period = cursor.fetchone()['count']
-
-        # Brand unlocks by day (selected period)
-        cursor.execute("""
-            SELECT
-                DATE(unlocked_at) as date,
-                COUNT(*) as count
-            FROM brand_unlocks
-            WHERE unlocked_at >= %s AND unlocked_at <= %s
-            GROUP BY DATE(unlocked_at)
-            ORDER BY date ASC
-        """, (start_date, end_date))
-        pitches_daily = [{'date': str(row['date']), 'count': row['count']} for row in cursor.fetchall()]
-
-        # Current period vs previous period unlocks
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM brand_unlocks
-            WHERE unlocked_at >= %s AND unlocked_at <= %s
-        """, (start_date, end_date))
-        pitches_this_period = cursor.fetchone()['count']
-
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM brand_unlocks
-            WHERE unlocked_at >= %s AND unlocked_at < %s
-        """, (prev_start_date, prev_end_date))
-        pitches_last_period = cursor.fetchone()['count']
-
-        # Active creators by day (selected period)
-        cursor.execute("""
-            SELECT
-                DATE(created_at) as date,
-                COUNT(DISTINCT creator_id) as count
-            FROM creator_pipeline
-            WHERE created_at >= %s AND created_at <= %s
-            GROUP BY DATE(created_at)
-            ORDER BY date ASC
-        """, (start_date, end_date))
-        active_daily = [{'date': str(row['date']), 'count': row['count']} for row in cursor.fetchall()]
-
-        # Current period vs previous period active creators
-        cursor.execute("""
-            SELECT COUNT(DISTINCT creator_id) as count FROM creator_pipeline
-            WHERE created_at >= %s AND created_at <= %s
-        """, (start_date, end_date))
-        active_this_period = cursor.fetchone()['count']
-
-        cursor.execute("""
-            SELECT COUNT(DISTINCT creator_id) as count FROM creator_pipeline
-            WHERE created_at >= %s AND created_at < %s
-        """, (prev_start_date, prev_end_date))
-        active_last_period = cursor.fetchone()['count']
+        # Sparkline data for signups, pitches, active creators and upgrades
+        if rollups:
+            health = _rollup_health_metrics(rollups)
+        else:
+            health = _live_health_metrics(cursor, start_date, end_date, prev_start_date, prev_end_date)
+        signups_this_period = health['signups']['this_week']
 
         # ================== CREATOR ACTIVATION FUNNEL (All Time) ==================
         # Credits fire on unlock (Get Brand PR), not on send.
         # creator_pipeline.pitched_at is a leftover send/confirm flag and must
         # not be used as a funnel step — it undercounts post-migration users.
-        cursor.execute("SELECT COUNT(*) as count FROM creators")
-        total_signups = cursor.fetchone()['count']
+        if rollups:
+            total_signups = rollups.total('signups')
+            unlocked_brand = rollups.total('first_unlockers')
+        else:
+            cursor.execute("SELECT COUNT(*) as count FROM creators")
+            total_signups = cursor.fetchone()['count']
 
-        cursor.execute("""
-            SELECT COUNT(DISTINCT creator_id) as count FROM brand_unlocks
-        """)
-        unlocked_brand = cursor.fetchone()['count']
+            cursor.execute("""
+                SELECT COUNT(DISTINCT creator_id) as count FROM brand_unlocks
+            """)
+            unlocked_brand = cursor.fetchone()['count']
 
         # Unlock is the activation event. Keep sent_pitch as an alias so older
         # clients do not invent an "unlocked but never pitched" gap.
         sent_pitch = unlocked_brand
 
         # Over 2 brands unlocked = 3+ (paywall-adjacent on the free 3-unlock plan)
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM (
-                SELECT creator_id FROM brand_unlocks
-                GROUP BY creator_id
-                HAVING COUNT(*) > 2
-            ) as multi_unlock
-        """)
-        pitched_multiple = cursor.fetchone()['count']
+        if rollups:
+            pitched_multiple = rollups.total('third_unlockers')
+        else:
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM (
+                    SELECT creator_id FROM brand_unlocks
+                    GROUP BY creator_id
+                    HAVING COUNT(*) > 2
+                ) as multi_unlock
+            """)
+            pitched_multiple = cursor.fetchone()['count']
 
         subscribed_pro = pro_count_db
         bought_pack = pack_stats['all_time']['buyers']
@@ -2181,22 +2294,24 @@ def get_founder_dashboard():
         got_package = cursor.fetchone()['count']
 
         # ================== THIS MONTH STATS ==================
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM creators
-            WHERE created_at >= DATE_TRUNC('month', NOW())
-        """)
-        signups_this_month = cursor.fetchone()['count']
+        if rollups:
+            signups_this_month = rollups.month_total('signups')
+            pitches_this_month = rollups.month_total('unlocks')
+        else:
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM creators
+                WHERE created_at >= DATE_TRUNC('month', NOW())
+            """)
+            signups_this_month = cursor.fetchone()['count']
 
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM brand_unlocks
-            WHERE unlocked_at >= DATE_TRUNC('month', NOW())
-        """)
-        pitches_this_month = cursor.fetchone()['count']
+            cursor.execute("""
+                SELECT COUNT(*) as count FROM brand_unlocks
+                WHERE unlocked_at >= DATE_TRUNC('month', NOW())
+            """)
+            pitches_this_month = cursor.fetchone()['count']
 
-        cursor.execute("""
-            SELECT COUNT(DISTINCT creator_id) as count FROM brand_unlocks
-        """)
-        unique_pitch_users = cursor.fetchone()['count']
+        # Same all-time count as the funnel's unlocked_brand
+        unique_pitch_users = unlocked_brand
 
         # ================== TOP BRANDS BY UNLOCKS & PITCHES ==================
         # Most unlocked + pitched brands - tracks actual engagement
@@ -2370,33 +2485,19 @@ def get_founder_dashboard():
                 'subs_needed': subs_needed,
                 'conversion_rate': conversion_rate,
                 'source': mrr_source,
-                'stripe_live': bool(stripe_mrr and stripe_mrr.get('live_mode')),
+                'stripe_live': bool((subscription_stats or stripe_mrr or {}).get('live_mode')),
+                'churn': {
+                    key: subscription_stats[key]
+                    for key in ('churned', 'churned_mrr_dollars', 'churn_rate', 'new_subscriptions',
+                                'trialing', 'past_due', 'cancelling', 'reconciled_at')
+                } if subscription_stats else None,
             },
             'at_limit_users': at_limit_users,
             'at_limit_count': at_limit_count,
             'near_limit_count': near_limit_count,
             'top_brands': top_brands,
             'brands_by_category': brands_by_category,
-            'health': {
-                'signups': {
-                    'this_week': signups_this_period,  # Keep key name for frontend compat
-                    'last_week': signups_last_period,
-                    'change': signups_this_period - signups_last_period,
-                    'daily': signup_daily
-                },
-                'pitches': {
-                    'this_week': pitches_this_period,
-                    'last_week': pitches_last_period,
-                    'change': pitches_this_period - pitches_last_period,
-                    'daily': pitches_daily
-                },
-                'active_creators': {
-                    'this_week': active_this_period,
-                    'last_week': active_last_period,
-                    'change': active_this_period - active_last_period,
-                    'daily': active_daily
-                }
-            },
+            'health': health,
             'period': {
                 'key': period,
                 'label': period_label,
@@ -2710,3 +2811,139 @@ def send_nudge_email():
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
+
+
+# ============================================================================
+# DB POOL HEALTH - checkouts, pool waits, timeouts per pool
+# ============================================================================
+
+@admin_reports_bp.route('/db-pool', methods=['GET'])
+@admin_required
+def get_db_pool_stats():
+    """Live stats for the shared Postgres pools in this worker."""
+    from services.db_pool import pool_stats
+    return jsonify({'pools': pool_stats()}), 200
+
+
+# ============================================================================
+# LLM CACHE - hit rate, coalesced calls, API latency and tokens per call type
+# ============================================================================
+
+@admin_reports_bp.route('/llm-cache', methods=['GET'])
+@admin_required
+def get_llm_cache_stats():
+    """Shared LLM client metrics for this worker."""
+    from services.llm_client import LLM
+    return jsonify(LLM.stats()), 200
+
+
+@admin_reports_bp.route('/media-cache', methods=['GET'])
+@admin_required
+def get_media_cache_stats():
+    """Media/logo proxy cache hit rate and size for this worker."""
+    from services.media_cache import MEDIA_CACHE
+    return jsonify(MEDIA_CACHE.stats()), 200
+
+
+@admin_reports_bp.route('/geoip', methods=['GET'])
+@admin_required
+def get_geoip_stats():
+    """Region-gate GeoIP index, LRU hits and any remaining ip-api fallbacks for this worker."""
+    from services.geoip import GEOIP
+    return jsonify(GEOIP.stats()), 200
+
+
+# ============================================================================
+# BRAND FEATURES - snapshot size, hit/stale rate of precomputed fit features
+# ============================================================================
+
+@admin_reports_bp.route('/brand-features', methods=['GET'])
+@admin_required
+def get_brand_feature_stats():
+    """Brand feature store snapshot metrics for this worker."""
+    from services.brand_feature_store import BRAND_FEATURES
+    return jsonify(BRAND_FEATURES.stats()), 200
+
+
+@admin_reports_bp.route('/rollups', methods=['GET'])
+@admin_required
+def get_report_rollup_status():
+    """How far report_daily_rollups has been rolled (see /api/cron/refresh-report-rollups)."""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        status = rollup_status(cursor)
+        conn.close()
+        return jsonify(status), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ============================================================================
+# STREAMING EXPORTS - CSV / NDJSON in constant memory (services/report_export.py)
+# ============================================================================
+
+@admin_reports_bp.route('/export', methods=['GET'])
+@admin_required
+def list_report_exports():
+    """Datasets available at /export/<name>."""
+    return jsonify({
+        'exports': [
+            {'name': e.name, 'description': e.description, 'columns': list(e.columns)}
+            for e in EXPORTS.values()
+        ],
+        'formats': list(FORMATS),
+    }), 200
+
+
+@admin_reports_bp.route('/export/<name>', methods=['GET'])
+@admin_required
+def stream_report_export(name):
+    """
+    Stream one dataset as CSV or NDJSON without building it in memory.
+
+    Query params:
+        format: 'csv' (default) or 'ndjson'
+        days: Time period for dated exports (default 30)
+        weeks: Cohort weeks for retention (default 10)
+        metric: top_users ordering, 'saves', 'pitches' or 'all'
+    """
+    export = EXPORTS.get(name)
+    if export is None:
+        return jsonify({'error': f'Unknown export: {name}', 'exports': list(EXPORTS)}), 404
+    fmt = request.args.get('format', 'csv')
+
+    conn = get_db_connection()
+    try:
+        chunks = export_chunks(conn, export, fmt, request.args)
+        # Run the query and fetch the first rows now so SQL errors still get a JSON 500
+        first = next(chunks, '')
+    except ValueError as e:
+        conn.close()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        conn.close()
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        try:
+            yield first
+            yield from chunks
+        except Exception as e:
+            # Headers are gone; the client sees a truncated file
+            print(f"[AdminReports] export {name} failed mid-stream: {e}")
+        finally:
+            chunks.close()
+            conn.close()
+
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    return Response(
+        stream_with_context(generate()),
+        content_type=FORMATS[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no',
+        },
+    )
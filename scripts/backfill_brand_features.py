@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Compute brand_features rows for every brand (migrations/add_brand_features.sql).
+
+    python scripts/backfill_brand_features.py            # missing or old-version rows only
+    python scripts/backfill_brand_features.py --all      # recompute everything
+
+Run after bumping BRAND_FEATURE_VERSION in services/fit_score_calculator.py.
+"""
+import os
+import sys
+import argparse
+
+# Add parent directory for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.brand_feature_store import backfill_brand_features
+from services.db_pool import get_db_connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute fit-scoring features for pr_brands')
+    parser.add_argument('--batch-size', type=int, default=500, help='Brands per upsert/commit (default: 500)')
+    parser.add_argument('--all', action='store_true', help='Recompute rows that are already current')
+    args = parser.parse_args()
+
+    conn = get_db_connection(source='env')
+    try:
+        total = backfill_brand_features(
+            conn,
+            batch_size=args.batch_size,
+            only_stale=not args.all,
+            on_progress=lambda done, last_id: print(f'  {done} brands (through id {last_id})'),
+        )
+    finally:
+        conn.close()
+    print(f'Brand features written: {total}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Build the offline IP -> country index used by the region gate (services/geoip.py).
+
+    # MaxMind GeoLite2 Country CSV
+    python scripts/build_geoip_index.py \
+        --blocks GeoLite2-Country-Blocks-IPv4.csv --blocks GeoLite2-Country-Blocks-IPv6.csv \
+        --locations GeoLite2-Country-Locations-en.csv
+
+    # DB-IP / IP2Location lite style start,end,country CSV
+    python scripts/build_geoip_index.py --ranges dbip-country-lite.csv
+
+Writes GEOIP_INDEX_PATH (default data/geoip/country-ip.idx) unless --out is given.
+Run it in the build step and again when the database is refreshed; workers pick
+up the new file on restart.
+"""
+import os
+import sys
+import argparse
+
+# Add parent directory for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.geoip import GEOIP_INDEX_PATH, build_index, read_geolite_csv, read_range_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the GeoIP country index')
+    parser.add_argument('--blocks', action='append', default=[], help='GeoLite2 Country Blocks CSV (repeatable)')
+    parser.add_argument('--locations', help='GeoLite2 Country Locations CSV (with --blocks)')
+    parser.add_argument('--ranges', action='append', default=[], help='start,end,country CSV (repeatable)')
+    parser.add_argument('--out', default=GEOIP_INDEX_PATH, help=f'Index file (default: {GEOIP_INDEX_PATH})')
+    args = parser.parse_args()
+
+    if args.blocks and not args.locations:
+        parser.error('--blocks needs --locations')
+    if not args.blocks and not args.ranges:
+        parser.error('give --blocks/--locations or --ranges')
+
+    def records():
+        if args.blocks:
+            yield from read_geolite_csv(args.blocks, args.locations)
+        for path in args.ranges:
+            yield from read_range_csv(path)
+
+    counts = build_index(records(), args.out)
+    print(f"GeoIP index written: {args.out} "
+          f"({counts['v4']} IPv4 / {counts['v6']} IPv6 ranges, {counts['countries']} countries)")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,11 @@ Export full Creator usage analytics & monetization insights from Admin Reports A
 Usage:
   python scripts/export_admin_reports.py
   API_BASE=https://api.newcollab.co python scripts/export_admin_reports.py
+
+Row-level datasets (every unlock, pitch, active creator...) are streamed chunk
+by chunk from /api/admin/reports/export/<name> straight to disk, so long
+periods export in constant memory. REPORT_EXPORT_SOURCE=db reads them from
+Postgres directly with the same engine (services/report_export.py).
 """
 
 from __future__ import annotations
@@ -16,7 +21,7 @@ import sys
 import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import requests
 
@@ -25,6 +30,9 @@ ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "pr-hunter-admin-2026")
 DAYS = int(os.getenv("REPORT_DAYS", "90"))
 TOP_LIMIT = int(os.getenv("REPORT_LIMIT", "500"))
 BRAND_LIMIT = int(os.getenv("REPORT_BRAND_LIMIT", "100"))
+EXPORT_FORMAT = os.getenv("REPORT_EXPORT_FORMAT", "csv")
+EXPORT_SOURCE = os.getenv("REPORT_EXPORT_SOURCE", "api")
+RETENTION_WEEKS = int(os.getenv("REPORT_RETENTION_WEEKS", "52"))
 OUTPUT_DIR = Path(
     os.getenv(
         "REPORT_OUTPUT_DIR",
@@ -42,6 +50,66 @@ def fetch(path: str, params: dict | None = None) -> Any:
     return resp.json()
 
 
+def write_chunks(path: Path, chunks: Iterable) -> int:
+    """Write text or byte chunks as they arrive. Returns bytes written."""
+    written = 0
+    with path.open("wb") as f:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def export_params() -> dict:
+    return {"days": DAYS, "weeks": RETENTION_WEEKS, "format": EXPORT_FORMAT}
+
+
+def api_export_names() -> list[str]:
+    return [e["name"] for e in fetch("/api/admin/reports/export").get("exports", [])]
+
+
+def stream_api_export(name: str, path: Path) -> int:
+    url = f"{API_BASE}/api/admin/reports/export/{name}"
+    with requests.get(url, headers=HEADERS, params=export_params(), stream=True, timeout=180) as resp:
+        resp.raise_for_status()
+        return write_chunks(path, resp.iter_content(chunk_size=64 * 1024))
+
+
+def stream_db_exports(out_dir: Path) -> list[Path]:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from dotenv import load_dotenv
+    load_dotenv()
+    from services.db_pool import get_db_connection
+    from services.report_export import EXPORTS, export_chunks
+
+    files: list[Path] = []
+    conn = get_db_connection()
+    try:
+        for name, export in EXPORTS.items():
+            path = out_dir / f"14_export_{name}.{EXPORT_FORMAT}"
+            size = write_chunks(path, export_chunks(conn, export, EXPORT_FORMAT, export_params()))
+            conn.rollback()  # end the read transaction between exports
+            print(f"  {path.name}: {size:,} bytes")
+            files.append(path)
+    finally:
+        conn.close()
+    return files
+
+
+def stream_exports(out_dir: Path) -> list[Path]:
+    if EXPORT_SOURCE == "db":
+        return stream_db_exports(out_dir)
+    files: list[Path] = []
+    for name in api_export_names():
+        path = out_dir / f"14_export_{name}.{EXPORT_FORMAT}"
+        size = stream_api_export(name, path)
+        print(f"  {path.name}: {size:,} bytes")
+        files.append(path)
+    return files
+
+
 def write_json(path: Path, data: Any) -> None:
     path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
 
@@ -191,6 +259,13 @@ def main() -> int:
     csv_files = build_csv_files(out_dir, bundle)
     print(f"Wrote {len(csv_files)} CSV files")
 
+    print(f"Streaming row-level exports ({EXPORT_FORMAT}, source={EXPORT_SOURCE}) ...")
+    try:
+        csv_files += stream_exports(out_dir)
+    except requests.RequestException as exc:
+        print(f"ERROR: export stream failed: {exc}", file=sys.stderr)
+        return 1
+
     zip_path = out_dir.parent / f"{out_dir.name}.zip"
     with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
         zf.write(json_path, arcname=f"{out_dir.name}/full_report_bundle.json")
@@ -206,6 +281,7 @@ def main() -> int:
         f"Files:\n"
         f"- full_report_bundle.json (complete API payload)\n"
         f"- *.csv (tabular slices for spreadsheets)\n"
+        f"- 14_export_* (full row-level exports, streamed)\n"
         f"- ../{zip_path.name} (zip of all files)\n",
         encoding="utf-8",
     )
@@ -7,6 +7,8 @@ Run this directly on the server:
 
 Or with arguments:
     python scripts/run_follower_enrichment.py --limit 500 --batch-size 100
+
+Interrupted runs pick up after the last committed brand with --resume.
 """
 import os
 import sys
@@ -26,7 +28,8 @@ def main():
     parser = argparse.ArgumentParser(description='Run AI follower enrichment on published brands')
     parser.add_argument('--limit', type=int, default=2500, help='Total brands to process (default: 2500)')
     parser.add_argument('--batch-size', type=int, default=100, help='Brands per batch (default: 100)')
-    parser.add_argument('--delay', type=float, default=0.5, help='Delay between API calls in seconds (default: 0.5)')
+    parser.add_argument('--workers', type=int, default=6, help='Concurrent AI requests (default: 6)')
+    parser.add_argument('--resume', action='store_true', help='Continue after the last committed brand of an interrupted run')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without updating DB')
     parser.add_argument('--only-null', action='store_true', help='Only enrich brands with NULL values')
     args = parser.parse_args()
@@ -54,7 +57,7 @@ def main():
     print(f"  Total to process: {total_to_process}")
     print(f"  Batch size: {args.batch_size}")
     print(f"  Number of batches: {num_batches}")
-    print(f"  Rate limit delay: {args.delay}s")
+    print(f"  Workers: {args.workers}")
     print(f"  Dry run: {args.dry_run}")
     print(f"  Only NULL values: {args.only_null}")
 
@@ -64,6 +67,7 @@ def main():
 
     total_stats = {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
     processed_so_far = 0
+    after_id = 0
 
     for batch_num in range(num_batches):
         remaining = total_to_process - processed_so_far
@@ -78,10 +82,11 @@ def main():
 
         batch_stats = bulk_enrich_follower_requirements(
             limit=batch_limit,
-            offset=processed_so_far,
+            after_id=after_id,
             only_null_values=args.only_null,
-            rate_limit_delay=args.delay,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            workers=args.workers,
+            resume=args.resume
         )
 
         # Accumulate stats
@@ -91,16 +96,16 @@ def main():
         total_stats['skipped'] += batch_stats.get('skipped', 0)
 
         processed_so_far += batch_stats.get('processed', 0)
+        if not batch_stats.get('last_id'):
+            break
+        # Keyset: rows updated in this batch drop out of the NULL-only set, so offsets would skip brands
+        after_id = batch_stats['last_id']
 
         print(f"\nBatch {batch_num + 1} complete:")
         print(f"  Processed: {batch_stats.get('processed', 0)}")
         print(f"  Updated: {batch_stats.get('updated', 0)}")
         print(f"  Errors: {batch_stats.get('errors', 0)}")
-
-        # Brief pause between batches
-        if batch_num < num_batches - 1:
-            print("\nPausing 2s before next batch...")
-            time.sleep(2)
+        print(f"  Throughput: {batch_stats.get('per_minute', 0)}/min")
 
     print("\n" + "=" * 60)
     print("ENRICHMENT COMPLETE")
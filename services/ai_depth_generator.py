@@ -26,6 +26,9 @@ from services.unlock_validator import (
     get_curated_fallback
 )
 
+# Shared Gemini transport + content-hash response cache
+from services.llm_client import LLM, LLMReply, gemini_generate
+
 # Import deterministic scoring - scores are calculated BEFORE LLM sees anything
 from services.fit_score_calculator import (
     calculate_fit_score,
@@ -426,6 +429,27 @@ brand aesthetics, historical creator patterns, or content format
 preferences that would not apply to a random brand.'''
 
 
+def _gemini_payload(prompt: str, system_prompt: str) -> Dict:
+    return {
+        'contents': [{
+            'parts': [
+                {'text': f"{system_prompt}\n\n{prompt}"}
+            ]
+        }],
+        'generationConfig': {
+            'temperature': 0.4,
+            'topK': 1,
+            'topP': 0.8,
+            'maxOutputTokens': 4096,
+        }
+    }
+
+
+def forget_gemini_reply(prompt: str, system_prompt: str = AI_DEPTH_SYSTEM_PROMPT) -> None:
+    """Drop the cached reply for this prompt after it failed validation, so it is not replayed."""
+    LLM.forget('ai_depth', {'model': GEMINI_MODEL, 'payload': _gemini_payload(prompt, system_prompt)})
+
+
 def call_gemini(prompt: str, system_prompt: str = AI_DEPTH_SYSTEM_PROMPT) -> Dict:
     """
     Call Gemini API with the prompt.
@@ -443,28 +467,11 @@ def call_gemini(prompt: str, system_prompt: str = AI_DEPTH_SYSTEM_PROMPT) -> Dic
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY not configured")
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
+    payload = _gemini_payload(prompt, system_prompt)
 
-    payload = {
-        'contents': [{
-            'parts': [
-                {'text': f"{system_prompt}\n\n{prompt}"}
-            ]
-        }],
-        'generationConfig': {
-            'temperature': 0.4,
-            'topK': 1,
-            'topP': 0.8,
-            'maxOutputTokens': 4096,
-        }
-    }
-
-    try:
-        response = requests.post(url, json=payload, timeout=30)
-        response.raise_for_status()
-
-        result = response.json()
-        text = result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+    def produce():
+        reply = gemini_generate('ai_depth', GEMINI_MODEL, payload, api_key=GEMINI_API_KEY)
+        text = reply['text']
 
         # Parse JSON from response
         if '```json' in text:
@@ -472,7 +479,11 @@ def call_gemini(prompt: str, system_prompt: str = AI_DEPTH_SYSTEM_PROMPT) -> Dic
         elif '```' in text:
             text = text.split('```')[1].split('```')[0].strip()
 
-        return json.loads(text)
+        return LLMReply(json.loads(text), reply['input_tokens'], reply['output_tokens'])
+
+    try:
+        # Same creator fingerprint + brand -> same prompt -> served from cache
+        return LLM.call('ai_depth', {'model': GEMINI_MODEL, 'payload': payload}, produce)
 
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse Gemini response as JSON: {e}")
@@ -690,6 +701,8 @@ def generate_unlock_analysis(creator_id: str, creator_profile: Dict,
                 output = _add_verdict_details(output, brand_name, status=deterministic_status)
                 return output, False
 
+            forget_gemini_reply(user_prompt)
+
             # Store for retry
             previous_output = output
             previous_issues = issues
@@ -0,0 +1,373 @@
+"""Precomputed brand features for fit scoring.
+
+fit_score_calculator turns a brand's name, description, category and hero
+product into tokens, lanes and signal flags. brand_features
+(migrations/add_brand_features.sql) keeps that record per brand, together with
+the category DNA weights, price tier and follower bounds. It is written when
+admin routes or the bulk enricher change a brand, and
+scripts/backfill_brand_features.py fills in the rest.
+
+BRAND_FEATURES holds every row of the current version in a column-oriented
+snapshot. Scoring reads it by brand id. It only parses brand text again when the
+stored fingerprint no longer matches the brand dict it was handed. The snapshot
+is loaded at startup and reloads in the background when brand writes bump the
+public brand cache generation, or after BRAND_FEATURES_TTL.
+"""
+
+import os
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from services.db_pool import get_db_connection
+from services.fit_score_calculator import (
+    BRAND_FEATURE_FLAGS,
+    BRAND_FEATURE_VERSION,
+    brand_fingerprint,
+    compute_brand_text_features,
+    get_brand_dna,
+)
+from services.public_response_cache import PUBLIC_CACHE
+
+BRAND_FEATURES_TTL = int(os.getenv('BRAND_FEATURES_TTL', '1800'))
+_GENERATION_CHECK_SEC = 5
+
+DNA_WEIGHT_KEYS = ('niche_match', 'content_proof', 'engagement', 'consistency')
+
+# price_point is the average product price in USD; 0 = unknown
+PRICE_TIER_BOUNDS = (25, 75, 200)
+
+FEATURE_COLUMNS = (
+    'brand_id', 'version', 'fingerprint', 'category', 'mapped_category', 'lane_category',
+    'dna', 'tokens', 'brand_text', 'distinctive_pts', 'flags', 'price_tier',
+    'min_followers', 'max_followers',
+)
+
+_SOURCE_COLUMNS = '''
+    id, brand_name, description, category, hero_product, price_point,
+    min_followers, max_followers
+'''
+
+_TABLE_READY = None
+
+
+def price_tier(price_point) -> int:
+    """1 budget .. 4 luxury from the average product price; 0 when unknown."""
+    try:
+        price = int(price_point or 0)
+    except (TypeError, ValueError):
+        return 0
+    if price <= 0:
+        return 0
+    return 1 + sum(price >= bound for bound in PRICE_TIER_BOUNDS)
+
+
+def _int_or_none(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_brand_features(brand: Dict) -> Dict:
+    """The stored record for one pr_brands row (FEATURE_COLUMNS order as dict keys)."""
+    feats = compute_brand_text_features(brand)
+    weights = get_brand_dna(feats['category'])['weights']
+    flags = 0
+    for bit, name in enumerate(BRAND_FEATURE_FLAGS):
+        if feats[name]:
+            flags |= 1 << bit
+    return {
+        'brand_id': int(brand['id']),
+        'version': BRAND_FEATURE_VERSION,
+        'fingerprint': brand_fingerprint(brand),
+        'category': feats['category'],
+        'mapped_category': feats['mapped_cat'],
+        'lane_category': feats['lane_cat'],
+        'dna': [float(weights[key]) for key in DNA_WEIGHT_KEYS],
+        'tokens': sorted(feats['tokens']),
+        'brand_text': feats['brand_text'],
+        'distinctive_pts': feats['distinctive_pts'],
+        'flags': flags,
+        'price_tier': price_tier(brand.get('price_point')),
+        'min_followers': _int_or_none(brand.get('min_followers')),
+        'max_followers': _int_or_none(brand.get('max_followers')),
+    }
+
+
+def features_table_ready(cursor) -> bool:
+    """Cheap catalog check for brand_features, remembered once it exists."""
+    global _TABLE_READY
+    if _TABLE_READY is True:
+        return True
+    cursor.execute("SELECT to_regclass('brand_features') IS NOT NULL AS ready")
+    row = cursor.fetchone()
+    _TABLE_READY = bool(row and (row['ready'] if isinstance(row, dict) else row[0]))
+    if not _TABLE_READY:
+        print("[BrandFeatures] brand_features missing; run migrations/add_brand_features.sql")
+    return _TABLE_READY
+
+
+def upsert_brand_features(cursor, brands: Iterable[Dict]) -> int:
+    """Compute and store features for brand rows in one statement. Caller commits."""
+    from psycopg2.extras import execute_values
+
+    records = {}
+    for brand in brands:
+        if brand and brand.get('id') is not None:
+            record = compute_brand_features(brand)
+            records[record['brand_id']] = record
+    if not records or not features_table_ready(cursor):
+        return 0
+    rows = [tuple(record[column] for column in FEATURE_COLUMNS) for record in records.values()]
+    execute_values(
+        cursor,
+        f"""
+        INSERT INTO brand_features ({', '.join(FEATURE_COLUMNS)})
+        VALUES %s
+        ON CONFLICT (brand_id) DO UPDATE SET
+            {', '.join(f'{c} = EXCLUDED.{c}' for c in FEATURE_COLUMNS[1:])},
+            computed_at = NOW()
+        """,
+        rows,
+        template='(%s, %s, %s, %s, %s, %s, %s::real[], %s::text[], %s, %s, %s, %s, %s, %s)',
+        page_size=len(rows),
+    )
+    return len(rows)
+
+
+def refresh_brand_features(conn, brand_ids: List[int]) -> int:
+    """Recompute features for brands that were just written, and commit."""
+    ids = [int(i) for i in brand_ids if i is not None]
+    if not ids:
+        return 0
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute(f'SELECT {_SOURCE_COLUMNS} FROM pr_brands WHERE id = ANY(%s)', (ids,))
+        count = upsert_brand_features(cursor, cursor.fetchall())
+        conn.commit()
+        return count
+    finally:
+        cursor.close()
+
+
+def backfill_brand_features(conn, batch_size: int = 500, only_stale: bool = True,
+                            on_progress: Optional[Callable] = None) -> int:
+    """Keyset pass over pr_brands, one upsert and commit per batch. only_stale skips current rows."""
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    stale_filter = '''
+        AND NOT EXISTS (
+            SELECT 1 FROM brand_features f
+            WHERE f.brand_id = b.id AND f.version = %(version)s
+        )''' if only_stale else ''
+    total, after_id = 0, 0
+    try:
+        if not features_table_ready(cursor):
+            return 0
+        while True:
+            cursor.execute(f'''
+                SELECT {_SOURCE_COLUMNS}
+                FROM pr_brands b
+                WHERE b.id > %(after_id)s {stale_filter}
+                ORDER BY b.id
+                LIMIT %(limit)s
+            ''', {'after_id': after_id, 'version': BRAND_FEATURE_VERSION, 'limit': batch_size})
+            rows = cursor.fetchall()
+            if not rows:
+                return total
+            total += upsert_brand_features(cursor, rows)
+            conn.commit()
+            after_id = rows[-1]['id']
+            if on_progress:
+                on_progress(total, after_id)
+    finally:
+        cursor.close()
+
+
+def load_feature_rows(conn):
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        if not features_table_ready(cursor):
+            return []
+        cursor.execute(
+            f'SELECT {", ".join(FEATURE_COLUMNS)} FROM brand_features WHERE version = %s ORDER BY brand_id',
+            (BRAND_FEATURE_VERSION,),
+        )
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class BrandFeatureSnapshot:
+    """Column-oriented feature rows: one array per feature, brand id -> row position."""
+
+    def __init__(self, rows):
+        self.index = {}
+        self.fingerprints = []
+        self.brand_texts = []
+        self.tokens = []
+        # Categories are a small vocabulary: rows store codes into self.labels
+        self.labels = []
+        self._label_codes = {}
+        self.dna = {}
+        self.category = array('H')
+        self.mapped_category = array('H')
+        self.lane_category = array('H')
+        self.flags = array('L')
+        self.distinctive_pts = array('B')
+        self.price_tier = array('B')
+        self.min_followers = array('q')
+        self.max_followers = array('q')
+        for row in rows:
+            self._append(row)
+
+    def _code(self, label):
+        label = label or ''
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def _append(self, row):
+        self.index[int(row['brand_id'])] = len(self.fingerprints)
+        self.fingerprints.append(row['fingerprint'])
+        self.brand_texts.append(row['brand_text'] or '')
+        self.tokens.append(frozenset(sys.intern(t) for t in row['tokens'] or ()))
+        category = self._code(row['category'])
+        self.category.append(category)
+        if row.get('dna'):
+            self.dna.setdefault(category, tuple(row['dna']))
+        self.mapped_category.append(self._code(row['mapped_category']))
+        self.lane_category.append(self._code(row['lane_category']))
+        self.flags.append(int(row['flags'] or 0))
+        self.distinctive_pts.append(int(row['distinctive_pts'] or 0))
+        self.price_tier.append(int(row['price_tier'] or 0))
+        # -1 = no bound
+        self.min_followers.append(_int_or_none(row.get('min_followers')) or 0)
+        max_followers = _int_or_none(row.get('max_followers'))
+        self.max_followers.append(-1 if max_followers is None else max_followers)
+
+    def features(self, brand_id, fingerprint: Optional[str] = None) -> Optional[Dict]:
+        """_brand_features-shaped dict, or None when absent or the fingerprint moved on."""
+        pos = self.index.get(brand_id)
+        if pos is None:
+            return None
+        if fingerprint is not None and self.fingerprints[pos] != fingerprint:
+            return None
+        flags = self.flags[pos]
+        category = self.category[pos]
+        max_followers = self.max_followers[pos]
+        feats = {
+            'category': self.labels[category],
+            'mapped_cat': self.labels[self.mapped_category[pos]],
+            'lane_cat': self.labels[self.lane_category[pos]],
+            'brand_text': self.brand_texts[pos],
+            'tokens': self.tokens[pos],
+            'distinctive_pts': self.distinctive_pts[pos],
+            'dna': self.dna.get(category),
+            'price_tier': self.price_tier[pos],
+            'min_followers': self.min_followers[pos],
+            'max_followers': None if max_followers < 0 else max_followers,
+        }
+        for bit, name in enumerate(BRAND_FEATURE_FLAGS):
+            feats[name] = bool(flags >> bit & 1)
+        return feats
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+
+class BrandFeatureStore:
+    """Process-wide snapshot holder: warm at startup, background reload, never blocks scoring."""
+
+    def __init__(self, ttl=BRAND_FEATURES_TTL, loader=None):
+        self.ttl = ttl
+        self.loader = loader
+        self._snapshot = None
+        self._generation = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._build_lock = threading.Lock()
+        self._metrics = {'builds': 0, 'build_errors': 0, 'hits': 0, 'misses': 0, 'stale': 0}
+
+    def _load_rows(self):
+        if self.loader is not None:
+            return self.loader()
+        conn = get_db_connection(source='env')
+        try:
+            return load_feature_rows(conn)
+        finally:
+            conn.close()
+
+    def _build(self):
+        try:
+            generation = PUBLIC_CACHE.generation()
+            snapshot = BrandFeatureSnapshot(self._load_rows())
+            self._snapshot = snapshot
+            self._generation = generation
+            self._built_at = self._checked_at = time.time()
+            self._metrics['builds'] += 1
+        except Exception as e:
+            self._metrics['build_errors'] += 1
+            print(f"[BrandFeatures] snapshot build failed: {e}")
+        finally:
+            self._build_lock.release()
+
+    def warm(self):
+        """Load the snapshot now (startup). Returns the number of brands loaded."""
+        self._build_lock.acquire()
+        self._build()
+        return len(self._snapshot) if self._snapshot is not None else 0
+
+    def warm_async(self):
+        threading.Thread(target=self.warm, name='brand-features-warm', daemon=True).start()
+
+    def _needs_rebuild(self, now):
+        if now - self._built_at > self.ttl:
+            return True
+        if now - self._checked_at < _GENERATION_CHECK_SEC:
+            return False
+        self._checked_at = now
+        return PUBLIC_CACHE.generation() != self._generation
+
+    def _refresh_if_stale(self):
+        if not self._needs_rebuild(time.time()):
+            return
+        # One loader at a time, off the request thread; the old snapshot keeps serving
+        if self._build_lock.acquire(blocking=False):
+            threading.Thread(target=self._build, name='brand-features-reload', daemon=True).start()
+
+    def lookup(self, brand: Dict) -> Optional[Dict]:
+        """Stored features for a brand dict, or None (caller parses the brand itself)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        self._refresh_if_stale()
+        try:
+            brand_id = int(brand.get('id'))
+        except (TypeError, ValueError):
+            return None
+        if brand_id not in snapshot.index:
+            self._metrics['misses'] += 1
+            return None
+        feats = snapshot.features(brand_id, brand_fingerprint(brand))
+        self._metrics['hits' if feats is not None else 'stale'] += 1
+        return feats
+
+    def invalidate(self):
+        self._built_at = 0.0
+
+    def stats(self):
+        data = dict(self._metrics)
+        data['brands'] = len(self._snapshot) if self._snapshot is not None else 0
+        data['version'] = BRAND_FEATURE_VERSION
+        data['generation'] = self._generation
+        return data
+
+
+BRAND_FEATURES = BrandFeatureStore()
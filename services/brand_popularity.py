@@ -0,0 +1,69 @@
+"""Per-brand pitch/response counters from brand_popularity_stats.
+
+A row trigger on creator_pipeline keeps each brand current; the cron refresher
+re-ages the 30-day window. Until the migration lands, the SQL helpers fall back
+to aggregating creator_pipeline inline so nothing breaks.
+"""
+
+_TABLE_READY = None
+
+_LEGACY_STATS_SUBQUERY = """(
+    SELECT
+        brand_id,
+        COUNT(DISTINCT creator_id) FILTER (
+            WHERE stage = 'pitched' AND created_at > NOW() - INTERVAL '30 days'
+        ) AS pitched_creators_30d,
+        COUNT(*) FILTER (WHERE pitched_at IS NOT NULL) AS pitch_count,
+        COUNT(*) FILTER (
+            WHERE stage IN ('responded', 'accepted', 'received', 'shipped')
+        ) AS response_count
+    FROM creator_pipeline
+    GROUP BY brand_id
+)"""
+
+
+def popularity_table_exists(conn) -> bool:
+    """Cheap catalog check, cached once the table shows up."""
+    global _TABLE_READY
+    if _TABLE_READY is True:
+        return True
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+              AND table_name = 'brand_popularity_stats'
+            LIMIT 1
+            """
+        )
+        _TABLE_READY = cursor.fetchone() is not None
+        return _TABLE_READY
+    finally:
+        cursor.close()
+
+
+def popularity_join_sql(conn, alias='ps', brand_alias='b') -> str:
+    """LEFT JOIN exposing pitched_creators_30d, pitch_count and response_count."""
+    source = 'brand_popularity_stats' if popularity_table_exists(conn) else _LEGACY_STATS_SUBQUERY
+    return f"LEFT JOIN {source} {alias} ON {alias}.brand_id = {brand_alias}.id"
+
+
+def refresh_brand_popularity(conn, brand_id=None) -> int:
+    """Recompute one brand (or every brand when brand_id is None). Commits."""
+    if not popularity_table_exists(conn):
+        return 0
+    cursor = conn.cursor()
+    try:
+        if brand_id is None:
+            cursor.execute("SELECT refresh_all_brand_popularity_stats() AS refreshed")
+            row = cursor.fetchone()
+            refreshed = (row['refreshed'] if isinstance(row, dict) else row[0]) or 0
+        else:
+            cursor.execute("SELECT refresh_brand_popularity_stats(%s)", (brand_id,))
+            refreshed = 1
+        conn.commit()
+        return int(refreshed)
+    finally:
+        cursor.close()
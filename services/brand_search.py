@@ -0,0 +1,229 @@
+"""Brand name search for discovery and autocomplete.
+
+pr_brands.search_name (migrations/add_brand_search_index.sql) holds
+normalize_brand_name(brand_name); trigram GIN indexes on it and on brand_name
+turn the '%q%' matches into index scans. Autocomplete is served from an
+in-process prefix trie over every brand's full name and words, ranked
+curated-first, then search_count, then name. The trie rebuilds when admin brand
+writes bump the public brand cache generation, or after BRAND_AUTOCOMPLETE_TTL.
+"""
+
+import os
+import re
+import threading
+import time
+
+from psycopg2.extras import RealDictCursor
+
+from services.db_pool import get_db_connection
+from services.public_response_cache import PUBLIC_CACHE
+
+BRAND_AUTOCOMPLETE_TTL = int(os.getenv('BRAND_AUTOCOMPLETE_TTL', '600'))
+_GENERATION_CHECK_SEC = 5
+_NODE_TOP_K = 20
+
+_COLUMN_READY = None
+
+RANKED_ORDER_SQL = '''
+    CASE WHEN source = 'curated' THEN 0 ELSE 1 END,
+    search_count DESC NULLS LAST,
+    brand_name ASC
+'''
+
+
+def normalize_brand_name(name):
+    """Normalize brand name for matching: lowercase, no spaces, no special chars"""
+    if not name:
+        return ''
+    return re.sub(r'[^a-z0-9]', '', name.lower().strip())
+
+
+def search_column_exists(conn) -> bool:
+    """Cheap catalog check for pr_brands.search_name."""
+    global _COLUMN_READY
+    if _COLUMN_READY is True:
+        return True
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+              AND table_name = 'pr_brands'
+              AND column_name = 'search_name'
+            LIMIT 1
+            """
+        )
+        _COLUMN_READY = cursor.fetchone() is not None
+        return _COLUMN_READY
+    finally:
+        cursor.close()
+
+
+def brand_name_match_sql(conn):
+    """WHERE fragment matching (normalized, raw) query params. Indexed once the migration has landed."""
+    if search_column_exists(conn):
+        return "(search_name LIKE %s OR brand_name ILIKE %s)"
+    return "(LOWER(REPLACE(brand_name, ' ', '')) ILIKE %s OR brand_name ILIKE %s)"
+
+
+def brand_name_match_params(query):
+    return (f'%{normalize_brand_name(query)}%', f'%{query}%')
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class BrandAutocompleteIndex:
+    """Prefix trie of brand names. Each node keeps its best-ranked entries."""
+
+    def __init__(self, rows):
+        # rows arrive in rank order; the list position is the rank
+        self.entries = [
+            {
+                'id': row['id'],
+                'name': row['brand_name'],
+                'logo': row.get('logo_url'),
+                'category': row.get('category'),
+                'source': row.get('source') or 'curated',
+            }
+            for row in rows if row.get('brand_name')
+        ]
+        self._search = [
+            (normalize_brand_name(e['name']), e['name'].lower()) for e in self.entries
+        ]
+        self.root = _Node()
+        for rank, entry in enumerate(self.entries):
+            keys = {self._search[rank][0]}
+            keys.update(normalize_brand_name(word) for word in entry['name'].split())
+            for key in keys:
+                self._insert(key, rank)
+
+    def _insert(self, key, rank):
+        node = self.root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+            if len(node.top) < _NODE_TOP_K and (not node.top or node.top[-1] != rank):
+                node.top.append(rank)
+
+    def _prefix_ranks(self, key):
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.top
+
+    def suggest(self, query, limit=8):
+        """Prefix matches first; substring matches fill any remaining slots. Rank order."""
+        key = normalize_brand_name(query)
+        raw = query.strip().lower()
+        if not key and not raw:
+            return []
+        ranks = set(self._prefix_ranks(key)[:limit]) if key else set()
+        if len(ranks) < limit:
+            for rank, (search_name, lowered) in enumerate(self._search):
+                if rank in ranks:
+                    continue
+                if (key and key in search_name) or (raw and raw in lowered):
+                    ranks.add(rank)
+                    if len(ranks) >= limit:
+                        break
+        return [dict(self.entries[rank]) for rank in sorted(ranks)[:limit]]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def load_autocomplete_rows(conn):
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute(f'''
+            SELECT id, brand_name, logo_url, category, source
+            FROM pr_brands
+            ORDER BY {RANKED_ORDER_SQL}
+        ''')
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class BrandAutocomplete:
+    """Process-wide index holder: lazy build, generation + TTL refresh, stale-while-rebuilding."""
+
+    def __init__(self, ttl=BRAND_AUTOCOMPLETE_TTL, loader=None):
+        self.ttl = ttl
+        self.loader = loader
+        self._index = None
+        self._generation = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._build_lock = threading.Lock()
+        self._metrics = {'builds': 0, 'build_errors': 0, 'lookups': 0}
+
+    def _load_rows(self):
+        if self.loader is not None:
+            return self.loader()
+        conn = get_db_connection(source='env')
+        try:
+            return load_autocomplete_rows(conn)
+        finally:
+            conn.close()
+
+    def _needs_rebuild(self, now):
+        if self._index is None or now - self._built_at > self.ttl:
+            return True
+        if now - self._checked_at < _GENERATION_CHECK_SEC:
+            return False
+        self._checked_at = now
+        return PUBLIC_CACHE.generation() != self._generation
+
+    def index(self):
+        """Current index, rebuilt if stale. None only when no index could ever be built."""
+        now = time.time()
+        if not self._needs_rebuild(now):
+            return self._index
+        # One builder at a time; everyone else keeps serving the old index
+        if not self._build_lock.acquire(blocking=self._index is None):
+            return self._index
+        try:
+            if self._index is not None and self._built_at >= now:
+                return self._index  # another thread rebuilt while we waited
+            generation = PUBLIC_CACHE.generation()
+            rows = self._load_rows()
+            self._index = BrandAutocompleteIndex(rows)
+            self._generation = generation
+            self._built_at = self._checked_at = time.time()
+            self._metrics['builds'] += 1
+        except Exception as e:
+            self._metrics['build_errors'] += 1
+            print(f"[BrandSearch] autocomplete build failed: {e}")
+        finally:
+            self._build_lock.release()
+        return self._index
+
+    def suggest(self, query, limit=8):
+        """Ranked suggestions, or None when the index is unavailable (caller falls back to SQL)."""
+        index = self.index()
+        if index is None:
+            return None
+        self._metrics['lookups'] += 1
+        return index.suggest(query, limit)
+
+    def invalidate(self):
+        self._built_at = 0.0
+
+    def stats(self):
+        data = dict(self._metrics)
+        data['brands'] = len(self._index) if self._index is not None else 0
+        data['generation'] = self._generation
+        return data
+
+
+BRAND_AUTOCOMPLETE = BrandAutocomplete()
@@ -12,18 +12,93 @@ Fills in:
 - description (if missing)
 - hero_product (if missing)
 - tone/voice (if missing)
+
+Bulk jobs run the AI calls on a thread pool (BULK_ENRICH_WORKERS). All calls share
+ANTHROPIC_LIMIT, which halves its rate on 429/529 and creeps back up on success.
+Results are written in id order with one UPDATE ... FROM (VALUES ...) per batch,
+committed per batch; with resume=True the last committed id is checkpointed so a
+killed job picks up where it stopped. Follower requirements are asked for several
+brands per prompt.
 """
 import os
 import json
+import hashlib
 import requests
 import time
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from services.rate_limiter import AdaptiveTokenBucket
+from services.redis_client import get_redis, mark_redis_failed
 
 
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+ANTHROPIC_API_URL = os.getenv('ANTHROPIC_API_URL', 'https://api.anthropic.com/v1/messages')
 CLAUDE_MODEL = 'claude-haiku-4-5-20251001'  # Same model as admin AI enricher
 UNSPLASH_ACCESS_KEY = os.getenv('UNSPLASH_ACCESS_KEY', '')  # Optional: for cover images
 
+BULK_ENRICH_WORKERS = int(os.getenv('BULK_ENRICH_WORKERS', '6'))
+BULK_ENRICH_BATCH_SIZE = int(os.getenv('BULK_ENRICH_BATCH_SIZE', '25'))
+FOLLOWER_PROMPT_BATCH = int(os.getenv('FOLLOWER_PROMPT_BATCH', '10'))
+ANTHROPIC_MAX_RETRIES = 4
+CHECKPOINT_TTL = 7 * 24 * 3600
+
+# Requests/second to Anthropic, shared by every bulk job in this process
+ANTHROPIC_LIMIT = AdaptiveTokenBucket(
+    rate=float(os.getenv('ANTHROPIC_START_RPS', '2')),
+    min_rate=0.2,
+    max_rate=float(os.getenv('ANTHROPIC_MAX_RPS', '8')),
+)
+
+
+def _retry_after(response, attempt: int) -> float:
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return min(30.0, 2.0 ** attempt)
+
+
+def call_claude(prompt: str, *, max_tokens: int, timeout: int) -> str:
+    """
+    POST one prompt to Claude, paced by ANTHROPIC_LIMIT.
+
+    429/529 responses slow the shared limiter down and are retried after Retry-After.
+    Raises requests.RequestException once retries run out.
+    """
+    for attempt in range(ANTHROPIC_MAX_RETRIES + 1):
+        ANTHROPIC_LIMIT.acquire()
+        response = requests.post(
+            ANTHROPIC_API_URL,
+            headers={
+                "x-api-key": ANTHROPIC_API_KEY,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            },
+            json={
+                "model": CLAUDE_MODEL,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}]
+            },
+            timeout=timeout
+        )
+        if response.status_code in (429, 529):
+            ANTHROPIC_LIMIT.throttled(_retry_after(response, attempt))
+            continue
+        response.raise_for_status()
+        ANTHROPIC_LIMIT.succeeded()
+        return response.json().get('content', [{}])[0].get('text', '')
+    raise requests.HTTPError(f"Anthropic still rate limiting after {ANTHROPIC_MAX_RETRIES} retries")
+
+
+def parse_json_reply(text: str):
+    """Parse the JSON body of a model reply, stripping ``` fences."""
+    if '```json' in text:
+        text = text.split('```json')[1].split('```')[0].strip()
+    elif '```' in text:
+        text = text.split('```')[1].split('```')[0].strip()
+    return json.loads(text)
+
 
 def generate_slug(brand_name: str) -> str:
     """
@@ -255,34 +330,10 @@ Return ONLY valid JSON, no explanation.
 
 JSON:"""
 
+    text = ''
     try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": CLAUDE_MODEL,
-                "max_tokens": 1500,  # Increased for comprehensive enrichment
-                "messages": [{"role": "user", "content": prompt}]
-            },
-            timeout=45  # Increased timeout for larger response
-        )
-        response.raise_for_status()
-
-        result = response.json()
-        text = result.get('content', [{}])[0].get('text', '')
-
-        # Parse JSON from response
-        if '```json' in text:
-            text = text.split('```json')[1].split('```')[0].strip()
-        elif '```' in text:
-            text = text.split('```')[1].split('```')[0].strip()
-
-        enriched = json.loads(text)
-        return enriched
+        text = call_claude(prompt, max_tokens=1500, timeout=45)  # Sized for comprehensive enrichment
+        return parse_json_reply(text)
 
     except json.JSONDecodeError as e:
         print(f"[AI Enrich] JSON parse error for {brand_name}: {e}")
@@ -296,11 +347,325 @@ JSON:"""
         return None
 
 
+# ============================================================================
+# BULK JOB ENGINE
+# ============================================================================
+
+class EnrichmentCheckpoint:
+    """Last committed pr_brands.id of a resumable bulk job (Redis, else this process)."""
+
+    _local: Dict[str, int] = {}
+
+    def __init__(self, name: str):
+        self.key = f'bulkenrich:ckpt:{name}'
+
+    def load(self) -> int:
+        client = get_redis()
+        if client is not None:
+            try:
+                value = client.get(self.key)
+                return int(value) if value else 0
+            except Exception:
+                mark_redis_failed()
+        return self._local.get(self.key, 0)
+
+    def save(self, last_id: int) -> None:
+        self._local[self.key] = last_id
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(self.key, last_id, ex=CHECKPOINT_TTL)
+            except Exception:
+                mark_redis_failed()
+
+    def clear(self) -> None:
+        self._local.pop(self.key, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(self.key)
+            except Exception:
+                mark_redis_failed()
+
+
+def _ordered_results(pool, fn, units, window: int):
+    """Like pool.map, but with at most ``window`` calls in flight."""
+    pending = deque()
+    for unit in units:
+        pending.append((unit, pool.submit(fn, unit)))
+        if len(pending) >= window:
+            head, future = pending.popleft()
+            yield head, future.result()
+    while pending:
+        head, future = pending.popleft()
+        yield head, future.result()
+
+
+def run_bulk_job(
+    label: str,
+    units: List,
+    work: Callable,
+    flush: Callable,
+    *,
+    total: int,
+    last_id: Callable,
+    workers: int = BULK_ENRICH_WORKERS,
+    batch_size: int = BULK_ENRICH_BATCH_SIZE,
+    checkpoint: Optional[EnrichmentCheckpoint] = None,
+    on_progress: Optional[Callable] = None
+) -> Dict:
+    """
+    Run ``work(unit)`` on a thread pool and hand results to ``flush`` in input order.
+
+    flush([(unit, result), ...]) runs on the calling thread, owns the DB writes and
+    commit, and returns counts {processed, updated, errors, skipped}. After each flush
+    the checkpoint moves to last_id(unit) of the batch and progress is reported.
+    work() must not raise; a unit whose work raised is passed to flush with None.
+    """
+    stats = {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0, 'last_id': None}
+    started = time.monotonic()
+    throttled_before = ANTHROPIC_LIMIT.throttle_count
+
+    def safe_work(unit):
+        try:
+            return work(unit)
+        except Exception as e:
+            print(f"[{label}] Worker error: {e}")
+            return None
+
+    def flush_batch(batch):
+        for key, count in flush(batch).items():
+            stats[key] += count
+        stats['last_id'] = last_id(batch[-1][0])
+        if checkpoint is not None:
+            checkpoint.save(stats['last_id'])
+        elapsed = time.monotonic() - started
+        stats['elapsed_sec'] = round(elapsed, 1)
+        stats['per_minute'] = round(stats['processed'] * 60 / elapsed, 1) if elapsed else 0.0
+        stats['throttled'] = ANTHROPIC_LIMIT.throttle_count - throttled_before
+        stats['rate_limit_rps'] = round(ANTHROPIC_LIMIT.rate, 2)
+        remaining = max(total - stats['processed'], 0)
+        eta = remaining * 60 / stats['per_minute'] if stats['per_minute'] else 0
+        print(f"[{label}] {stats['processed']}/{total} done, {stats['updated']} updated, "
+              f"{stats['errors']} errors | {stats['per_minute']}/min, ETA {eta / 60:.1f}m, "
+              f"{stats['throttled']} throttled @ {stats['rate_limit_rps']} req/s")
+        if on_progress:
+            on_progress(dict(stats))
+
+    batch = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for unit, result in _ordered_results(pool, safe_work, units, max(1, workers) * 4):
+            batch.append((unit, result))
+            if len(batch) >= batch_size:
+                flush_batch(batch)
+                batch = []
+    if batch:
+        flush_batch(batch)
+    return stats
+
+
+# ============================================================================
+# BULK BRAND ENRICHMENT
+# ============================================================================
+
+VALID_TONES = ['premium', 'casual', 'wellness', 'functional', 'luxury', 'playful', 'minimalist', 'bold']
+ALLOWED_CATEGORIES = [
+    'skincare', 'beauty', 'fashion', 'wellness', 'fitness', 'food',
+    'travel', 'tech', 'gaming', 'lifestyle', 'home', 'pet', 'baby',
+    'jewelry', 'haircare', 'sustainable', 'luxury', 'activewear',
+    'supplements', 'other'
+]
+
+# Columns bulk enrichment may fill, with the cast used in the VALUES list
+BRAND_UPDATE_COLUMNS = [
+    ('slug', 'text'), ('cover_image_url', 'text'), ('description', 'text'),
+    ('hero_product', 'text'), ('target_audience', 'text'), ('tone', 'text'),
+    ('price_point', 'int'), ('instagram_handle', 'text'), ('tiktok_handle', 'text'),
+    ('youtube_handle', 'text'), ('min_followers', 'int'), ('collaboration_type', 'text'),
+    ('seo_title', 'text'), ('seo_description', 'text'), ('success_stories', 'text'),
+    ('response_rate', 'int'), ('avg_response_time_days', 'int'), ('category', 'text'),
+]
+
+
+def _clean_handle(value) -> Optional[str]:
+    handle = str(value).strip().lstrip('@')
+    if handle and handle.lower() not in ['null', 'none'] and len(handle) <= 100:
+        return handle
+    return None
+
+
+def _int_in_range(value, low: int, high: int) -> Optional[int]:
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        return None
+    return number if low <= number <= high else None
+
+
+def build_brand_update(
+    brand: Dict,
+    enriched: Optional[Dict],
+    *,
+    cover_image_url: Optional[str] = None,
+    slug: Optional[str] = None
+) -> Dict:
+    """
+    Fields to write for one brand: only ones that are empty on the brand, plus category.
+
+    NEVER touches the manually-entered PR contact fields (application_form_url,
+    contact_email, has_application_form, logo_url).
+    """
+    fields = {}
+    if slug and not brand.get('slug'):
+        fields['slug'] = slug
+    if cover_image_url and not brand.get('cover_image_url'):
+        fields['cover_image_url'] = cover_image_url
+    if not enriched:
+        return fields
+
+    def missing(column):
+        return not brand.get(column) and enriched.get(column)
+
+    # Core fields
+    if missing('description'):
+        fields['description'] = enriched['description']
+    if missing('hero_product'):
+        fields['hero_product'] = enriched['hero_product']
+    if missing('target_audience'):
+        fields['target_audience'] = enriched['target_audience'][:255]
+
+    # Tone - validate against allowed values
+    if missing('tone'):
+        tone = enriched['tone'].lower().strip()
+        if tone in VALID_TONES:
+            fields['tone'] = tone
+
+    if missing('price_point'):
+        price = _int_in_range(enriched['price_point'], 1, 2 ** 31 - 1)
+        if price:
+            fields['price_point'] = price
+
+    # Social handles - only if missing
+    for column in ('instagram_handle', 'tiktok_handle', 'youtube_handle'):
+        if missing(column):
+            handle = _clean_handle(enriched[column])
+            if handle:
+                fields[column] = handle
+
+    # Min followers, clamped to a sane gifting range
+    if missing('min_followers'):
+        try:
+            min_followers = int(enriched['min_followers'])
+            if min_followers < 500:
+                min_followers = 1000
+            elif min_followers > 100000:
+                min_followers = 50000
+            fields['min_followers'] = min_followers
+        except (ValueError, TypeError):
+            pass
+
+    if missing('collaboration_type'):
+        collab = str(enriched['collaboration_type']).lower().strip()
+        if collab in ['gifted', 'paid', 'both']:
+            fields['collaboration_type'] = collab
+
+    # SEO fields
+    if missing('seo_title'):
+        fields['seo_title'] = enriched['seo_title'][:255]
+    if missing('seo_description'):
+        fields['seo_description'] = enriched['seo_description'][:500]
+    if missing('success_stories'):
+        fields['success_stories'] = enriched['success_stories'][:2000]
+
+    # Response metrics
+    if missing('response_rate'):
+        rate = _int_in_range(enriched['response_rate'], 5, 95)
+        if rate is not None:
+            fields['response_rate'] = rate
+    if missing('avg_response_time_days'):
+        days = _int_in_range(enriched['avg_response_time_days'], 1, 60)
+        if days is not None:
+            fields['avg_response_time_days'] = days
+
+    # Always update category if AI provides one (to fix incorrectly categorized brands)
+    if enriched.get('category') in ALLOWED_CATEGORIES:
+        fields['category'] = enriched['category']
+
+    return fields
+
+
+def assign_unique_slugs(cursor, brands: List[Dict]) -> Dict[int, str]:
+    """
+    Unique slugs for a batch of brands in one query.
+
+    Same scheme as generate_unique_slug ("bala", "bala-1", ...), but also unique
+    within the batch, since none of these rows are written yet.
+    """
+    bases = {brand['id']: generate_slug(brand['brand_name']) for brand in brands}
+    if not bases:
+        return {}
+    unique_bases = sorted(set(bases.values()))
+    cursor.execute(
+        "SELECT slug FROM pr_brands WHERE slug = ANY(%s) OR slug LIKE ANY(%s)",
+        (unique_bases, [f"{base}-%" for base in unique_bases]),
+    )
+    taken = {row['slug'] for row in cursor.fetchall()}
+
+    slugs = {}
+    for brand_id, base in bases.items():
+        slug, counter = base, 1
+        while slug in taken:
+            slug = f"{base}-{counter}"
+            counter += 1
+        taken.add(slug)
+        slugs[brand_id] = slug
+    return slugs
+
+
+def write_brand_updates(cursor, updates: Dict[int, Dict]) -> int:
+    """One UPDATE ... FROM (VALUES ...) for {brand_id: fields}; NULL keeps the current value."""
+    from psycopg2.extras import execute_values
+
+    rows = [
+        (brand_id, *[fields.get(column) for column, _ in BRAND_UPDATE_COLUMNS])
+        for brand_id, fields in updates.items() if fields
+    ]
+    if not rows:
+        return 0
+    names = [column for column, _ in BRAND_UPDATE_COLUMNS]
+    execute_values(
+        cursor,
+        f"""
+        UPDATE pr_brands AS b
+        SET {', '.join(f'{name} = COALESCE(v.{name}, b.{name})' for name in names)},
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(id, {', '.join(names)})
+        WHERE b.id = v.id
+        """,
+        rows,
+        template='(%s::int, ' + ', '.join(f'%s::{cast}' for _, cast in BRAND_UPDATE_COLUMNS) + ')',
+        page_size=len(rows),
+    )
+    return len(rows)
+
+
+def _enrich_brand_remote(brand: Dict):
+    """Network half of one brand's enrichment; runs on the bulk worker pool."""
+    cover_image_url = None
+    if not brand.get('cover_image_url') and brand.get('website'):
+        cover_image_url = get_cover_image_url_url(brand['website'], brand['brand_name'])
+    return cover_image_url, enrich_brand_with_ai(dict(brand))
+
+
 def bulk_enrich_brands(
     brand_ids: List[int],
     *,
     only_missing_fields: bool = True,
-    rate_limit_delay: float = 1.0
+    rate_limit_delay: Optional[float] = None,
+    workers: int = BULK_ENRICH_WORKERS,
+    batch_size: int = BULK_ENRICH_BATCH_SIZE,
+    resume: bool = False,
+    on_progress: Optional[Callable] = None
 ) -> int:
     """
     Bulk enrich brands with AI-generated metadata.
@@ -308,14 +673,19 @@ def bulk_enrich_brands(
     Args:
         brand_ids: List of pr_brands.id to enrich
         only_missing_fields: If True, only enrich brands with missing description/hero_product
-        rate_limit_delay: Seconds to wait between API calls
+        rate_limit_delay: Ignored; calls are paced by ANTHROPIC_LIMIT
+        workers: Concurrent brands in flight
+        batch_size: Brands per UPDATE/commit
+        resume: Skip brands up to the last committed id of a previous run over the same ids
+        on_progress: Called with a stats dict after every batch
 
     Returns:
         Number of brands successfully enriched
     """
     try:
-        import psycopg2
         from psycopg2.extras import RealDictCursor
+        from services.db_pool import get_db_connection as pooled_db_connection
+        from services.brand_feature_store import upsert_brand_features
     except ImportError:
         print("[AI Enrich] ERROR: psycopg2 not installed")
         return 0
@@ -326,23 +696,15 @@ def bulk_enrich_brands(
         return 0
 
     enriched_count = 0
+    conn = None
 
     try:
-        conn = psycopg2.connect(db_url)
+        conn = pooled_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         # Fetch brands with all fields we might enrich
         # IMPORTANT: Also fetch PR contact fields (application_form_url, contact_email) to preserve them
-        if only_missing_fields:
-            # Only enrich brands missing key fields
-            cursor.execute("""
-                SELECT id, brand_name, website, description, hero_product, target_audience, tone, price_point,
-                       category, slug, cover_image_url, instagram_handle, tiktok_handle, youtube_handle,
-                       min_followers, collaboration_type, seo_title, seo_description, success_stories,
-                       response_rate, avg_response_time_days,
-                       application_form_url, contact_email, has_application_form, logo_url
-                FROM pr_brands
-                WHERE id = ANY(%s)
+        missing_filter = """
                 AND (
                     description IS NULL OR description = '' OR
                     hero_product IS NULL OR hero_product = '' OR
@@ -353,205 +715,54 @@ def bulk_enrich_brands(
                     instagram_handle IS NULL OR instagram_handle = '' OR
                     tiktok_handle IS NULL OR tiktok_handle = '' OR
                     seo_title IS NULL OR seo_title = ''
-                )
-                AND website IS NOT NULL
-            """, (brand_ids,))
-        else:
-            # Enrich all brands
-            cursor.execute("""
-                SELECT id, brand_name, website, description, hero_product, target_audience, tone, price_point,
-                       category, slug, cover_image_url, instagram_handle, tiktok_handle, youtube_handle,
-                       min_followers, collaboration_type, seo_title, seo_description, success_stories,
-                       response_rate, avg_response_time_days,
-                       application_form_url, contact_email, has_application_form, logo_url
-                FROM pr_brands
-                WHERE id = ANY(%s)
-                AND website IS NOT NULL
-            """, (brand_ids,))
-
+                )""" if only_missing_fields else ""
+        cursor.execute(f"""
+            SELECT id, brand_name, website, description, hero_product, target_audience, tone, price_point,
+                   category, slug, cover_image_url, instagram_handle, tiktok_handle, youtube_handle,
+                   min_followers, max_followers, collaboration_type, seo_title, seo_description, success_stories,
+                   response_rate, avg_response_time_days,
+                   application_form_url, contact_email, has_application_form, logo_url
+            FROM pr_brands
+            WHERE id = ANY(%s)
+            {missing_filter}
+            AND website IS NOT NULL
+            ORDER BY id
+        """, (brand_ids,))
         brands = cursor.fetchall()
-        print(f"[AI Enrich] Processing {len(brands)} brands...")
-
-        for i, brand in enumerate(brands):
-            print(f"\n[AI Enrich] {i+1}/{len(brands)}: {brand['brand_name']}...")
-
-            # CRITICAL: NEVER modify these manually-entered PR contact fields during AI enrichment
-            # These are precious data entry fields that must be preserved:
-            # - application_form_url (PR Form URL)
-            # - contact_email (PR Email)
-            # - has_application_form (boolean flag)
-            # - logo_url (manually entered or Clearbit logo)
-
-            # Update brand with enriched fields (only update fields that are null/empty)
-            updates = []
-            values = []
-
-            # 1. Generate unique slug if missing (no AI needed)
-            if not brand.get('slug'):
-                slug = generate_unique_slug(brand['brand_name'], cursor)
-                updates.append("slug = %s")
-                values.append(slug)
-                print(f"[AI Enrich] Generated slug: {slug}")
-
-            # 2. Scrape cover image from brand website if missing
-            if not brand.get('cover_image_url') and brand.get('website'):
-                cover_image_url = get_cover_image_url_url(brand['website'], brand['brand_name'])
-                if cover_image_url:
-                    updates.append("cover_image_url = %s")
-                    values.append(cover_image_url)
-                    print(f"[AI Enrich] Found cover image: {cover_image_url[:60]}...")
-
-            # 3. AI enrichment for all fields (matching individual enrich endpoint)
-            enriched = enrich_brand_with_ai(dict(brand))
-
-            if enriched:
-                # Core fields
-                if not brand.get('description') and enriched.get('description'):
-                    updates.append("description = %s")
-                    values.append(enriched['description'])
-
-                if not brand.get('hero_product') and enriched.get('hero_product'):
-                    updates.append("hero_product = %s")
-                    values.append(enriched['hero_product'])
-
-                if not brand.get('target_audience') and enriched.get('target_audience'):
-                    updates.append("target_audience = %s")
-                    values.append(enriched['target_audience'][:255] if len(enriched['target_audience']) > 255 else enriched['target_audience'])
-
-                # Tone - validate against allowed values
-                if not brand.get('tone') and enriched.get('tone'):
-                    valid_tones = ['premium', 'casual', 'wellness', 'functional', 'luxury', 'playful', 'minimalist', 'bold']
-                    tone = enriched['tone'].lower().strip()
-                    if tone in valid_tones:
-                        updates.append("tone = %s")
-                        values.append(tone)
-
-                # Price point
-                if not brand.get('price_point') and enriched.get('price_point'):
-                    try:
-                        price = int(enriched['price_point'])
-                        if price > 0:
-                            updates.append("price_point = %s")
-                            values.append(price)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Social handles - only if missing
-                if not brand.get('instagram_handle') and enriched.get('instagram_handle'):
-                    handle = str(enriched['instagram_handle']).strip().lstrip('@')
-                    if handle and handle.lower() not in ['null', 'none'] and len(handle) <= 100:
-                        updates.append("instagram_handle = %s")
-                        values.append(handle)
-
-                if not brand.get('tiktok_handle') and enriched.get('tiktok_handle'):
-                    handle = str(enriched['tiktok_handle']).strip().lstrip('@')
-                    if handle and handle.lower() not in ['null', 'none'] and len(handle) <= 100:
-                        updates.append("tiktok_handle = %s")
-                        values.append(handle)
-
-                if not brand.get('youtube_handle') and enriched.get('youtube_handle'):
-                    handle = str(enriched['youtube_handle']).strip().lstrip('@')
-                    if handle and handle.lower() not in ['null', 'none'] and len(handle) <= 100:
-                        updates.append("youtube_handle = %s")
-                        values.append(handle)
-
-                # Min followers
-                if not brand.get('min_followers') and enriched.get('min_followers'):
-                    try:
-                        min_followers = int(enriched['min_followers'])
-                        if 500 <= min_followers <= 100000:
-                            updates.append("min_followers = %s")
-                            values.append(min_followers)
-                        elif min_followers < 500:
-                            updates.append("min_followers = %s")
-                            values.append(1000)
-                        elif min_followers > 100000:
-                            updates.append("min_followers = %s")
-                            values.append(50000)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Collaboration type
-                if not brand.get('collaboration_type') and enriched.get('collaboration_type'):
-                    collab = str(enriched['collaboration_type']).lower().strip()
-                    if collab in ['gifted', 'paid', 'both']:
-                        updates.append("collaboration_type = %s")
-                        values.append(collab)
-
-                # SEO fields
-                if not brand.get('seo_title') and enriched.get('seo_title'):
-                    updates.append("seo_title = %s")
-                    values.append(enriched['seo_title'][:255])
-
-                if not brand.get('seo_description') and enriched.get('seo_description'):
-                    updates.append("seo_description = %s")
-                    values.append(enriched['seo_description'][:500])
-
-                # Success stories
-                if not brand.get('success_stories') and enriched.get('success_stories'):
-                    updates.append("success_stories = %s")
-                    values.append(enriched['success_stories'][:2000])
-
-                # Response metrics
-                if not brand.get('response_rate') and enriched.get('response_rate'):
-                    try:
-                        rate = int(enriched['response_rate'])
-                        if 5 <= rate <= 95:
-                            updates.append("response_rate = %s")
-                            values.append(rate)
-                    except (ValueError, TypeError):
-                        pass
-
-                if not brand.get('avg_response_time_days') and enriched.get('avg_response_time_days'):
-                    try:
-                        days = int(enriched['avg_response_time_days'])
-                        if 1 <= days <= 60:
-                            updates.append("avg_response_time_days = %s")
-                            values.append(days)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Always update category if AI provides one (to fix incorrectly categorized brands)
-                if enriched.get('category'):
-                    # Validate category is in allowed list
-                    allowed_categories = [
-                        'skincare', 'beauty', 'fashion', 'wellness', 'fitness', 'food',
-                        'travel', 'tech', 'gaming', 'lifestyle', 'home', 'pet', 'baby',
-                        'jewelry', 'haircare', 'sustainable', 'luxury', 'activewear',
-                        'supplements', 'other'
-                    ]
-                    if enriched['category'] in allowed_categories:
-                        updates.append("category = %s")
-                        values.append(enriched['category'])
-            else:
-                print(f"[AI Enrich] ⚠ AI enrichment failed for {brand['brand_name']}")
-
-            # Apply all updates (slug, cover_image_url, and/or AI-enriched fields)
-            if updates:
-                updates.append("updated_at = NOW()")
-                values.append(brand['id'])
-
-                update_sql = f"""
-                    UPDATE pr_brands
-                    SET {', '.join(updates)}
-                    WHERE id = %s
-                """
-
-                cursor.execute(update_sql, values)
-                enriched_count += 1
-                print(f"[AI Enrich] OK Enriched {brand['brand_name']}")
-            else:
-                print(f"[AI Enrich] - No new fields to update for {brand['brand_name']}")
 
-            # Commit every 10 brands
-            if (i + 1) % 10 == 0:
-                conn.commit()
-
-            # Rate limiting
-            if i < len(brands) - 1:
-                time.sleep(rate_limit_delay)
-
-        conn.commit()
+        checkpoint = None
+        if resume:
+            digest = hashlib.sha1(','.join(map(str, sorted(brand_ids))).encode()).hexdigest()[:16]
+            checkpoint = EnrichmentCheckpoint(f'brands:{digest}')
+            after_id = checkpoint.load()
+            brands = [brand for brand in brands if brand['id'] > after_id]
+        print(f"[AI Enrich] Processing {len(brands)} brands with {workers} workers...")
+
+        def flush(batch):
+            slugs = assign_unique_slugs(cursor, [brand for brand, _ in batch if not brand.get('slug')])
+            updates, errors = {}, 0
+            for brand, result in batch:
+                cover_image_url, enriched = result or (None, None)
+                if not enriched:
+                    print(f"[AI Enrich] ⚠ AI enrichment failed for {brand['brand_name']}")
+                    errors += 1
+                updates[brand['id']] = build_brand_update(
+                    brand, enriched, cover_image_url=cover_image_url, slug=slugs.get(brand['id'])
+                )
+            updated = write_brand_updates(cursor, updates)
+            upsert_brand_features(cursor, [dict(brand, **updates[brand['id']]) for brand, _ in batch])
+            conn.commit()
+            return {'processed': len(batch), 'updated': updated, 'errors': errors,
+                    'skipped': len(batch) - updated}
+
+        stats = run_bulk_job(
+            'AI Enrich', brands, _enrich_brand_remote, flush,
+            total=len(brands), last_id=lambda brand: brand['id'],
+            workers=workers, batch_size=batch_size, checkpoint=checkpoint, on_progress=on_progress,
+        )
+        if checkpoint is not None:
+            checkpoint.clear()
+        enriched_count = stats['updated']
         print(f"\n[AI Enrich] Successfully enriched {enriched_count}/{len(brands)} brands")
 
     except Exception as e:
@@ -576,8 +787,8 @@ def enrich_new_awin_brands(limit: int = 100) -> int:
         Number of brands enriched
     """
     try:
-        import psycopg2
         from psycopg2.extras import RealDictCursor
+        from services.db_pool import get_db_connection as pooled_db_connection
     except ImportError:
         print("[AI Enrich] ERROR: psycopg2 not installed")
         return 0
@@ -588,7 +799,7 @@ def enrich_new_awin_brands(limit: int = 100) -> int:
         return 0
 
     try:
-        conn = psycopg2.connect(db_url)
+        conn = pooled_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         # Get Awin brands with missing fields
@@ -621,6 +832,69 @@ def enrich_new_awin_brands(limit: int = 100) -> int:
 # FOLLOWER REQUIREMENTS ENRICHMENT
 # ============================================================================
 
+FOLLOWER_GUIDELINES = """1. **min_followers**: The minimum follower count this brand likely requires for PR gifting.
+   GUIDELINES:
+   - Small indie/startup DTC brands (newer, niche): 500-2000 followers
+   - Mid-size DTC brands (established online presence): 2000-5000 followers
+   - Growing brands with some retail presence: 5000-10000 followers
+   - Established mainstream brands: 10000-25000 followers
+   - Major/luxury brands (Sephora-level, luxury goods): 25000-100000 followers
+   - If the brand has a public application form, they're likely more open to smaller creators
+   - Beauty/skincare brands tend to accept smaller creators than fashion brands
+   - Brands in the "sustainable", "wellness", or "indie" space tend to be more micro-friendly
+
+2. **micro_friendly**: Is this brand actively open to working with micro-influencers (<10K followers)?
+   - TRUE if: indie brand, has public PR form, explicitly targets small creators, newer DTC brand, community-focused
+   - FALSE if: luxury brand, requires professional content, high follower minimums, exclusive/premium positioning
+   - When in doubt for DTC brands with application forms, lean towards TRUE"""
+
+
+def _follower_context(brand: Dict) -> str:
+    context_parts = [f"Brand: {brand.get('brand_name', '')}"]
+    if brand.get('website'):
+        context_parts.append(f"Website: {brand['website']}")
+    if brand.get('category'):
+        context_parts.append(f"Category: {brand['category']}")
+    if brand.get('description'):
+        context_parts.append(f"Description: {brand['description']}")
+    if brand.get('has_application_form'):
+        context_parts.append("Has public PR application form: Yes")
+    if brand.get('application_form_url'):
+        context_parts.append(f"Application URL: {brand['application_form_url']}")
+    return "\n".join(context_parts)
+
+
+def _normalize_follower_result(raw) -> Optional[Dict]:
+    """Validate one {min_followers, micro_friendly} answer from the model."""
+    if not isinstance(raw, dict):
+        return None
+    min_followers = raw.get('min_followers')
+    micro_friendly = raw.get('micro_friendly')
+    if min_followers is None or micro_friendly is None:
+        return None
+
+    # Validate min_followers range
+    try:
+        min_followers = int(min_followers)
+        if min_followers < 100:
+            min_followers = 500
+        elif min_followers > 500000:
+            min_followers = 100000
+    except (ValueError, TypeError):
+        min_followers = 5000  # Default
+
+    # Ensure micro_friendly is boolean
+    if isinstance(micro_friendly, str):
+        micro_friendly = micro_friendly.lower() in ['true', 'yes', '1']
+    else:
+        micro_friendly = bool(micro_friendly)
+
+    return {
+        'min_followers': min_followers,
+        'micro_friendly': micro_friendly
+    }
+
+
 def enrich_follower_requirements_ai(brand: Dict) -> Optional[Dict]:
     """
     Use Claude AI to determine accurate min_followers and micro_friendly values.
@@ -640,51 +914,16 @@ def enrich_follower_requirements_ai(brand: Dict) -> Optional[Dict]:
         return None
 
     brand_name = brand.get('brand_name', '')
-    website = brand.get('website', '')
-    category = brand.get('category', '')
-    description = brand.get('description', '')
-    has_application_form = brand.get('has_application_form', False)
-    application_form_url = brand.get('application_form_url', '')
-
     if not brand_name:
         return None
 
-    # Build context from available data
-    context_parts = [f"Brand: {brand_name}"]
-    if website:
-        context_parts.append(f"Website: {website}")
-    if category:
-        context_parts.append(f"Category: {category}")
-    if description:
-        context_parts.append(f"Description: {description}")
-    if has_application_form:
-        context_parts.append("Has public PR application form: Yes")
-    if application_form_url:
-        context_parts.append(f"Application URL: {application_form_url}")
-
-    context = "\n".join(context_parts)
-
     prompt = f"""You are an expert at determining influencer requirements for brand PR programs.
 
-{context}
+{_follower_context(brand)}
 
 Based on the brand information above, determine:
 
-1. **min_followers**: The minimum follower count this brand likely requires for PR gifting.
-   GUIDELINES:
-   - Small indie/startup DTC brands (newer, niche): 500-2000 followers
-   - Mid-size DTC brands (established online presence): 2000-5000 followers
-   - Growing brands with some retail presence: 5000-10000 followers
-   - Established mainstream brands: 10000-25000 followers
-   - Major/luxury brands (Sephora-level, luxury goods): 25000-100000 followers
-   - If the brand has a public application form, they're likely more open to smaller creators
-   - Beauty/skincare brands tend to accept smaller creators than fashion brands
-   - Brands in the "sustainable", "wellness", or "indie" space tend to be more micro-friendly
-
-2. **micro_friendly**: Is this brand actively open to working with micro-influencers (<10K followers)?
-   - TRUE if: indie brand, has public PR form, explicitly targets small creators, newer DTC brand, community-focused
-   - FALSE if: luxury brand, requires professional content, high follower minimums, exclusive/premium positioning
-   - When in doubt for DTC brands with application forms, lean towards TRUE
+{FOLLOWER_GUIDELINES}
 
 Return ONLY valid JSON:
 {{"min_followers": <integer>, "micro_friendly": <true or false>}}
@@ -692,61 +931,11 @@ Return ONLY valid JSON:
 JSON:"""
 
     try:
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": CLAUDE_MODEL,
-                "max_tokens": 200,
-                "messages": [{"role": "user", "content": prompt}]
-            },
-            timeout=30
-        )
-        response.raise_for_status()
-
-        result = response.json()
-        text = result.get('content', [{}])[0].get('text', '')
-
-        # Parse JSON from response
-        if '```json' in text:
-            text = text.split('```json')[1].split('```')[0].strip()
-        elif '```' in text:
-            text = text.split('```')[1].split('```')[0].strip()
-
-        enriched = json.loads(text)
-
-        # Validate response
-        min_followers = enriched.get('min_followers')
-        micro_friendly = enriched.get('micro_friendly')
-
-        if min_followers is None or micro_friendly is None:
+        text = call_claude(prompt, max_tokens=200, timeout=30)
+        result = _normalize_follower_result(parse_json_reply(text))
+        if result is None:
             print(f"[Follower Enrich] Missing fields in response for {brand_name}")
-            return None
-
-        # Validate min_followers range
-        try:
-            min_followers = int(min_followers)
-            if min_followers < 100:
-                min_followers = 500
-            elif min_followers > 500000:
-                min_followers = 100000
-        except (ValueError, TypeError):
-            min_followers = 5000  # Default
-
-        # Ensure micro_friendly is boolean
-        if isinstance(micro_friendly, str):
-            micro_friendly = micro_friendly.lower() in ['true', 'yes', '1']
-        else:
-            micro_friendly = bool(micro_friendly)
-
-        return {
-            'min_followers': min_followers,
-            'micro_friendly': micro_friendly
-        }
+        return result
 
     except json.JSONDecodeError as e:
         print(f"[Follower Enrich] JSON parse error for {brand_name}: {e}")
@@ -759,13 +948,94 @@ JSON:"""
         return None
 
 
+def enrich_follower_requirements_batch_ai(brands: List[Dict]) -> Dict[int, Dict]:
+    """
+    Follower requirements for several brands in one prompt.
+
+    Returns {brand id: {min_followers, micro_friendly}}. Brands the model skipped or
+    answered badly are absent; callers fall back to enrich_follower_requirements_ai.
+    """
+    if not ANTHROPIC_API_KEY or not brands:
+        return {}
+
+    blocks = "\n\n".join(f"### id={brand['id']}\n{_follower_context(brand)}" for brand in brands)
+    prompt = f"""You are an expert at determining influencer requirements for brand PR programs.
+
+{blocks}
+
+For EACH brand above, determine:
+
+{FOLLOWER_GUIDELINES}
+
+Return ONLY valid JSON keyed by the brand id:
+{{"<id>": {{"min_followers": <integer>, "micro_friendly": <true or false>}}, ...}}
+
+JSON:"""
+
+    try:
+        text = call_claude(prompt, max_tokens=60 * len(brands) + 100, timeout=60)
+        answers = parse_json_reply(text)
+    except (json.JSONDecodeError, requests.RequestException) as e:
+        print(f"[Follower Enrich] Batch of {len(brands)} failed: {e}")
+        return {}
+    if not isinstance(answers, dict):
+        return {}
+
+    results = {}
+    for brand in brands:
+        result = _normalize_follower_result(answers.get(str(brand['id'])))
+        if result:
+            results[brand['id']] = result
+    return results
+
+
+def _enrich_follower_chunk(brands: List[Dict]) -> Dict[int, Dict]:
+    """Network half of follower enrichment for one prompt batch; runs on the bulk worker pool."""
+    results = enrich_follower_requirements_batch_ai(brands) if len(brands) > 1 else {}
+    for brand in brands:
+        if brand['id'] not in results:
+            result = enrich_follower_requirements_ai(dict(brand))
+            if result:
+                results[brand['id']] = result
+    return results
+
+
+def write_follower_updates(cursor, results: Dict[int, Dict]) -> int:
+    """One UPDATE ... FROM (VALUES ...) for {brand_id: {min_followers, micro_friendly}}."""
+    from psycopg2.extras import execute_values
+
+    rows = [(brand_id, r['min_followers'], r['micro_friendly']) for brand_id, r in results.items()]
+    if not rows:
+        return 0
+    execute_values(
+        cursor,
+        """
+        UPDATE pr_brands AS b
+        SET min_followers = v.min_followers,
+            micro_friendly = v.micro_friendly,
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(id, min_followers, micro_friendly)
+        WHERE b.id = v.id
+        """,
+        rows,
+        template='(%s::int, %s::int, %s::boolean)',
+        page_size=len(rows),
+    )
+    return len(rows)
+
+
 def bulk_enrich_follower_requirements(
     *,
     limit: int = 500,
     offset: int = 0,
+    after_id: int = 0,
     only_null_values: bool = True,
-    rate_limit_delay: float = 0.5,
-    dry_run: bool = False
+    rate_limit_delay: Optional[float] = None,
+    dry_run: bool = False,
+    workers: int = BULK_ENRICH_WORKERS,
+    prompt_batch: int = FOLLOWER_PROMPT_BATCH,
+    resume: bool = False,
+    on_progress: Optional[Callable] = None
 ) -> Dict:
     """
     Bulk enrich min_followers and micro_friendly for all published brands.
@@ -775,17 +1045,23 @@ def bulk_enrich_follower_requirements(
 
     Args:
         limit: Maximum number of brands to process in one run
-        offset: Number of brands to skip (for pagination)
+        offset: Number of brands to skip (prefer after_id: updated rows drop out of
+            the only_null_values set, which shifts offsets)
+        after_id: Only brands with id > after_id; pass the previous run's last_id
         only_null_values: If True, only enrich brands with NULL values
-        rate_limit_delay: Seconds to wait between API calls
+        rate_limit_delay: Ignored; calls are paced by ANTHROPIC_LIMIT
         dry_run: If True, don't update database, just log what would happen
+        workers: Concurrent prompts in flight
+        prompt_batch: Brands per prompt
+        resume: Start after the checkpoint of the last interrupted run
+        on_progress: Called with a stats dict after every committed batch
 
     Returns:
-        Dict with {processed: int, updated: int, errors: int, skipped: int}
+        Dict with {processed, updated, errors, skipped, last_id, per_minute, ...}
     """
     try:
-        import psycopg2
         from psycopg2.extras import RealDictCursor
+        from services.db_pool import get_db_connection as pooled_db_connection
     except ImportError:
         print("[Follower Enrich] ERROR: psycopg2 not installed")
         return {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
@@ -796,100 +1072,69 @@ def bulk_enrich_follower_requirements(
         return {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
 
     stats = {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
+    checkpoint = None
+    if resume and not dry_run:
+        checkpoint = EnrichmentCheckpoint('followers:null' if only_null_values else 'followers:all')
+        after_id = max(after_id, checkpoint.load())
+    conn = None
 
     try:
-        conn = psycopg2.connect(db_url)
+        conn = pooled_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        # Build query based on mode
-        if only_null_values:
-            # Only brands with NULL min_followers OR NULL micro_friendly
-            cursor.execute("""
-                SELECT id, brand_name, website, category, description,
-                       has_application_form, application_form_url,
-                       min_followers, micro_friendly, logo_url
-                FROM pr_brands
-                WHERE COALESCE(status, 'published') = 'published'
-                  AND (min_followers IS NULL OR micro_friendly IS NULL)
-                ORDER BY id ASC
-                LIMIT %s OFFSET %s
-            """, (limit, offset))
-        else:
-            # ALL published brands (re-evaluate existing values)
-            cursor.execute("""
-                SELECT id, brand_name, website, category, description,
-                       has_application_form, application_form_url,
-                       min_followers, micro_friendly, logo_url
-                FROM pr_brands
-                WHERE COALESCE(status, 'published') = 'published'
-                ORDER BY id ASC
-                LIMIT %s OFFSET %s
-            """, (limit, offset))
+        # Only brands with NULL min_followers OR NULL micro_friendly, unless re-evaluating all
+        null_filter = "AND (min_followers IS NULL OR micro_friendly IS NULL)" if only_null_values else ""
+        cursor.execute(f"""
+            SELECT id, brand_name, website, category, description,
+                   has_application_form, application_form_url,
+                   min_followers, micro_friendly, logo_url
+            FROM pr_brands
+            WHERE COALESCE(status, 'published') = 'published'
+              AND id > %s
+              {null_filter}
+            ORDER BY id ASC
+            LIMIT %s OFFSET %s
+        """, (after_id, limit, offset))
 
         brands = cursor.fetchall()
         total = len(brands)
         print(f"[Follower Enrich] Found {total} brands to process...")
 
         if total == 0:
-            conn.close()
+            if checkpoint is not None:
+                checkpoint.clear()
             return stats
 
-        for i, brand in enumerate(brands):
-            stats['processed'] += 1
-            brand_name = brand['brand_name']
-
-            print(f"\n[Follower Enrich] {i+1}/{total}: {brand_name}...")
-
-            # Skip if both fields already have values (when only_null_values=True)
-            if only_null_values and brand.get('min_followers') is not None and brand.get('micro_friendly') is not None:
-                print(f"[Follower Enrich] - Skipped (already has values)")
-                stats['skipped'] += 1
-                continue
-
-            # Get AI enrichment
-            result = enrich_follower_requirements_ai(dict(brand))
-
-            if not result:
-                print(f"[Follower Enrich] WARN Failed to enrich {brand_name}")
-                stats['errors'] += 1
-                time.sleep(rate_limit_delay)
-                continue
-
-            min_followers = result['min_followers']
-            micro_friendly = result['micro_friendly']
-
-            print(f"[Follower Enrich] AI result: min_followers={min_followers}, micro_friendly={micro_friendly}")
-
+        size = max(1, prompt_batch)
+        chunks = [brands[i:i + size] for i in range(0, total, size)]
+
+        def flush(batch):
+            results, errors = {}, 0
+            for chunk, chunk_results in batch:
+                chunk_results = chunk_results or {}
+                for brand in chunk:
+                    if brand['id'] in chunk_results:
+                        results[brand['id']] = chunk_results[brand['id']]
+                    else:
+                        print(f"[Follower Enrich] WARN Failed to enrich {brand['brand_name']}")
+                        errors += 1
             if dry_run:
-                print(f"[Follower Enrich] DRY RUN - would update {brand_name}")
-                stats['updated'] += 1
+                for brand_id, result in results.items():
+                    print(f"[Follower Enrich] DRY RUN - would set brand {brand_id}: {result}")
+                updated = len(results)
             else:
-                # Update database
-                try:
-                    cursor.execute("""
-                        UPDATE pr_brands
-                        SET min_followers = %s,
-                            micro_friendly = %s,
-                            updated_at = NOW()
-                        WHERE id = %s
-                    """, (min_followers, micro_friendly, brand['id']))
-                    stats['updated'] += 1
-                    print(f"[Follower Enrich] OK Updated {brand_name}")
-                except Exception as db_err:
-                    print(f"[Follower Enrich] DB error for {brand_name}: {db_err}")
-                    stats['errors'] += 1
-
-            # Commit every 25 brands
-            if (i + 1) % 25 == 0:
+                updated = write_follower_updates(cursor, results)
                 conn.commit()
-                print(f"[Follower Enrich] Committed batch ({i+1}/{total})")
+            return {'processed': sum(len(chunk) for chunk, _ in batch), 'updated': updated, 'errors': errors}
 
-            # Rate limiting
-            if i < total - 1:
-                time.sleep(rate_limit_delay)
-
-        conn.commit()
-        conn.close()
+        stats = run_bulk_job(
+            'Follower Enrich', chunks, _enrich_follower_chunk, flush,
+            total=total, last_id=lambda chunk: chunk[-1]['id'],
+            workers=workers, batch_size=max(1, BULK_ENRICH_BATCH_SIZE // size),
+            checkpoint=checkpoint, on_progress=on_progress,
+        )
+        if checkpoint is not None and total < limit:
+            checkpoint.clear()
 
         print(f"\n[Follower Enrich] COMPLETE:")
         print(f"  Processed: {stats['processed']}")
@@ -901,6 +1146,8 @@ def bulk_enrich_follower_requirements(
         print(f"[Follower Enrich] Database error: {e}")
         if conn:
             conn.rollback()
+    finally:
+        if conn:
             conn.close()
 
     return stats
@@ -914,8 +1161,8 @@ def get_follower_enrichment_stats() -> Dict:
         Dict with counts of null/filled values
     """
     try:
-        import psycopg2
         from psycopg2.extras import RealDictCursor
+        from services.db_pool import get_db_connection as pooled_db_connection
     except ImportError:
         return {'error': 'psycopg2 not installed'}
 
@@ -924,7 +1171,7 @@ def get_follower_enrichment_stats() -> Dict:
         return {'error': 'DATABASE_URL not found'}
 
     try:
-        conn = psycopg2.connect(db_url)
+        conn = pooled_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         cursor.execute("""
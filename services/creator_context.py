@@ -0,0 +1,281 @@
+"""Request-scoped creator identity and entitlements.
+
+One query loads the creator id, user id, subscription tier, unlock counters,
+pack credits and niches. The result is memoized on flask.g for the rest of the
+request and cached in Redis for a short TTL so the next request skips the query
+as well. Subscription webhooks, pack purchases and unlocks call
+invalidate_creator_context() after their writes commit.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from psycopg2.extras import RealDictCursor
+
+from services.db_pool import get_db_connection
+from services.pack_credits import pack_credits_of, pack_credits_select_sql, total_unlocks_left
+from services.redis_client import get_redis, mark_redis_failed
+
+CREATOR_CONTEXT_TTL = int(os.getenv('CREATOR_CONTEXT_TTL', '60'))
+_LOCAL_MAX_ENTRIES = int(os.getenv('CREATOR_CONTEXT_MAX_ENTRIES', '5000'))
+_G_ATTR = '_creator_contexts'
+
+
+class CreatorContext:
+    """Identity + entitlement snapshot for one creator."""
+
+    __slots__ = (
+        'creator_id', 'user_id', 'subscription_tier', 'unlocks_tier',
+        'unlocks_remaining', 'unlocks_reset_at', 'pack_credits', 'niches',
+    )
+
+    def __init__(self, creator_id, user_id=None, subscription_tier=None, unlocks_tier=None,
+                 unlocks_remaining=None, unlocks_reset_at=None, pack_credits=0, niches=()):
+        self.creator_id = creator_id
+        self.user_id = user_id
+        self.subscription_tier = subscription_tier
+        self.unlocks_tier = unlocks_tier
+        self.unlocks_remaining = unlocks_remaining
+        self.unlocks_reset_at = unlocks_reset_at
+        self.pack_credits = pack_credits
+        self.niches = list(niches or [])
+
+    @classmethod
+    def from_row(cls, row):
+        niches = [n for n in (row.get('creator_niches') or []) if n]
+        if not niches and row.get('niche'):
+            niches = [row['niche']]
+        return cls(
+            creator_id=row['creator_id'],
+            user_id=row.get('user_id'),
+            subscription_tier=row.get('subscription_tier'),
+            unlocks_tier=row.get('unlocks_tier'),
+            unlocks_remaining=row.get('unlocks_remaining'),
+            unlocks_reset_at=row.get('unlocks_reset_at'),
+            pack_credits=pack_credits_of(row),
+            niches=niches,
+        )
+
+    @property
+    def tier(self):
+        return self.subscription_tier or 'free'
+
+    @property
+    def is_premium(self):
+        """Paid subscription (gates premium brands)."""
+        return self.tier in ('pro', 'elite')
+
+    @property
+    def has_unlimited_unlocks(self):
+        return self.unlocks_tier == 'pro' or self.is_premium
+
+    def unlock_balance(self, limit, now=None):
+        """Same shape as pr_crm_routes.get_creator_unlock_balance()."""
+        if self.has_unlimited_unlocks:
+            return {
+                "tier": "pro",
+                "remaining": None,  # unlimited
+                "reset_at": None,
+                "is_unlimited": True,
+                "pack_credits": 0,
+            }
+        unlocks_remaining = self.unlocks_remaining or 0
+        reset_at = self.unlocks_reset_at
+        if reset_at and (now or datetime.now()) > reset_at:
+            unlocks_remaining = limit  # Would reset on next attempt_unlock
+        return {
+            "tier": "free",
+            "remaining": total_unlocks_left(unlocks_remaining, self.pack_credits),
+            "used": max(0, limit - unlocks_remaining),
+            "limit": limit,
+            "pack_credits": self.pack_credits,
+            "reset_at": reset_at.isoformat() if reset_at else None,
+            "is_unlimited": False,
+        }
+
+    def to_json(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        if self.unlocks_reset_at:
+            data['unlocks_reset_at'] = self.unlocks_reset_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw):
+        data = json.loads(raw)
+        if data.get('unlocks_reset_at'):
+            data['unlocks_reset_at'] = datetime.fromisoformat(data['unlocks_reset_at'])
+        return cls(**data)
+
+
+def load_creator_context(conn, creator_id=None, user_id=None):
+    """One query on conn, by creator id or user id. None when no creator row."""
+    column, value = ('id', creator_id) if creator_id else ('user_id', user_id)
+    if not value:
+        return None
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute(f'''
+            SELECT id AS creator_id, user_id, subscription_tier, unlocks_tier,
+                   unlocks_remaining, unlocks_reset_at, creator_niches, niche,
+                   {pack_credits_select_sql(conn)}
+            FROM creators WHERE {column} = %s
+            LIMIT 1
+        ''', (value,))
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return CreatorContext.from_row(row) if row else None
+
+
+class CreatorContextCache:
+    """Short-TTL contexts keyed by creator id and user id; in-process LRU without Redis."""
+
+    def __init__(self, ttl=CREATOR_CONTEXT_TTL, max_local_entries=_LOCAL_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_local_entries = max_local_entries
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _keys(ctx):
+        keys = [f'creatorctx:id:{int(ctx.creator_id)}']
+        if ctx.user_id:
+            keys.append(f'creatorctx:user:{ctx.user_id}')
+        return keys
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def get(self, creator_id=None, user_id=None):
+        key = f'creatorctx:id:{int(creator_id)}' if creator_id else f'creatorctx:user:{user_id}'
+        raw = None
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception:
+                mark_redis_failed()
+                client = None
+        if client is None:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry and entry[0] > time.time():
+                    self._local.move_to_end(key)
+                    raw = entry[1]
+                elif entry:
+                    self._local.pop(key, None)
+        if raw is None:
+            self._count('misses')
+            return None
+        try:
+            ctx = CreatorContext.from_json(raw)
+        except (TypeError, ValueError, KeyError):
+            self._count('misses')
+            return None
+        self._count('hits')
+        return ctx
+
+    def set(self, ctx):
+        raw = ctx.to_json()
+        keys = self._keys(ctx)
+        client = get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline()
+                for key in keys:
+                    pipe.set(key, raw, ex=self.ttl)
+                pipe.execute()
+                return
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            for key in keys:
+                self._local[key] = (time.time() + self.ttl, raw)
+                self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self, creator_id):
+        key = f'creatorctx:id:{int(creator_id)}'
+        self._count('invalidations')
+        cached = self.get(creator_id=creator_id)
+        keys = self._keys(cached) if cached else [key]
+        with self._lock:
+            for k in keys:
+                self._local.pop(k, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(*keys)
+            except Exception:
+                mark_redis_failed()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data['local_entries'] = len(self._local)
+        return data
+
+
+CONTEXT_CACHE = CreatorContextCache()
+
+
+def _request_memo():
+    from flask import g, has_app_context
+    if not has_app_context():
+        return None
+    memo = getattr(g, _G_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(g, _G_ATTR, memo)
+    return memo
+
+
+def get_creator_context(creator_id=None, user_id=None):
+    """Context for a creator (by id, or by user id). Memoized per request, cached briefly across requests."""
+    if not creator_id and not user_id:
+        return None
+    memo_key = ('id', int(creator_id)) if creator_id else ('user', str(user_id))
+    memo = _request_memo()
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    ctx = CONTEXT_CACHE.get(creator_id=creator_id, user_id=user_id)
+    if ctx is None:
+        conn = get_db_connection(source='env')
+        try:
+            ctx = load_creator_context(conn, creator_id=creator_id, user_id=user_id)
+        finally:
+            conn.close()
+        if ctx is not None:
+            try:
+                CONTEXT_CACHE.set(ctx)
+            except Exception as e:
+                print(f"[CreatorContext] store failed creator={ctx.creator_id}: {e}")
+
+    if memo is not None and ctx is not None:
+        memo[('id', int(ctx.creator_id))] = ctx
+        if ctx.user_id:
+            memo[('user', str(ctx.user_id))] = ctx
+    return ctx
+
+
+def invalidate_creator_context(creator_id):
+    """Drop the cached context for a creator, here and in Redis. Call after the write commits. Never raises."""
+    if not creator_id:
+        return
+    try:
+        memo = _request_memo()
+        if memo:
+            for key, ctx in list(memo.items()):
+                if ctx.creator_id == int(creator_id):
+                    memo.pop(key, None)
+        CONTEXT_CACHE.invalidate(creator_id)
+    except Exception as e:
+        print(f"[CreatorContext] invalidate failed creator={creator_id}: {e}")
@@ -22,6 +22,8 @@ from services.inhouse_social_scraper import (
 )
 from services.youtube_scraper import scrape_youtube as diy_scrape_youtube
 from services.profile_quality import assert_onboarding_quality
+from services.llm_client import LLM, LLMReply, gemini_generate
+from services.recommendation_cache import invalidate_user_recommendations
 
 # Gemini configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
@@ -424,42 +426,37 @@ Recent captions:
 
 Analyze and return JSON only.'''
 
-        try:
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_VISION_MODEL}:generateContent?key={GEMINI_API_KEY}"
-
-            payload = {
-                'contents': [{
-                    'parts': [
-                        {'text': system_prompt},
-                        {'text': user_prompt}
-                    ]
-                }],
-                'generationConfig': {
-                    'temperature': 0.1,  # Lower temp for more consistent JSON
-                    'maxOutputTokens': 2048,
-                    'responseMimeType': 'application/json',  # Force JSON output
-                }
+        payload = {
+            'contents': [{
+                'parts': [
+                    {'text': system_prompt},
+                    {'text': user_prompt}
+                ]
+            }],
+            'generationConfig': {
+                'temperature': 0.1,  # Lower temp for more consistent JSON
+                'maxOutputTokens': 2048,
+                'responseMimeType': 'application/json',  # Force JSON output
             }
+        }
 
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-
-            result = response.json()
-
-            # Extract text from response
-            candidates = result.get('candidates', [])
-            if not candidates:
-                print(f"[TextAnalysis] No candidates in response")
-                return self._get_fallback_vision_result()
-
-            text = candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-
-            if not text:
+        def produce():
+            reply = gemini_generate('text_analysis', GEMINI_VISION_MODEL, payload, api_key=GEMINI_API_KEY)
+            if not reply['text']:
+                # Not cached: the next scrape of this profile asks again
                 print(f"[TextAnalysis] Empty text in response")
-                return self._get_fallback_vision_result()
-
+                return LLMReply(None)
             # Parse JSON from response with robust extraction
-            analysis_result = self._extract_json_safely(text)
+            return LLMReply(self._extract_json_safely(reply['text']),
+                            reply['input_tokens'], reply['output_tokens'])
+
+        try:
+            # Re-scraping an unchanged profile yields the same prompt and a cache hit
+            analysis_result = LLM.call(
+                'text_analysis', {'model': GEMINI_VISION_MODEL, 'payload': payload}, produce
+            )
+            if not analysis_result:
+                return self._get_fallback_vision_result()
 
             # Add fields expected by downstream code
             if 'content_format_breakdown' not in analysis_result:
@@ -937,6 +934,7 @@ Analyze and return JSON only.'''
             ))
 
             self.db_conn.commit()
+            invalidate_user_recommendations(self.db_conn, user_id)
             return True
 
         except Exception as e:
@@ -0,0 +1,362 @@
+"""Shared Postgres connection pool. Every blueprint checks out warm connections here.
+
+Callers keep the old pattern: ``conn = get_db_connection()`` ... ``conn.close()``.
+``close()`` hands the connection back to the pool instead of tearing down the
+socket, so a request pays the TCP+TLS+auth handshake only when the pool is cold.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DEFAULT_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '10'))
+DEFAULT_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+# Supabase/pgbouncer drop idle sockets; ping before reuse, recycle old ones.
+DEFAULT_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', '30'))
+DEFAULT_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+_G_CHECKOUTS = '_db_pool_checkouts'
+_G_REQUEST_CONN = '_db_pool_request_conn'
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection freed up within the pool timeout."""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection whose close() returns it to its pool."""
+
+    _pool = None
+    _lease = 0
+    _owner = None
+    _created_at = 0.0
+    _last_used = 0.0
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            return super().close()
+        pool.putconn(self)
+
+    def discard(self):
+        """Really close the socket."""
+        self._pool = None
+        if not self.closed:
+            psycopg2.extensions.connection.close(self)
+
+
+class ConnectionPool:
+    """Thread-safe pool with a soft size, a hard overflow cap and wait metrics.
+
+    ``size`` connections stay warm. Up to ``max_overflow`` extra ones are opened
+    under bursts and closed again on return. Past that, callers wait up to
+    ``timeout`` seconds and then get ``PoolTimeout``.
+    """
+
+    def __init__(self, connect, name='default', size=DEFAULT_POOL_SIZE,
+                 max_overflow=DEFAULT_MAX_OVERFLOW, timeout=DEFAULT_POOL_TIMEOUT,
+                 ping_after=DEFAULT_PING_AFTER, recycle=DEFAULT_RECYCLE):
+        self._connect = connect
+        self.name = name
+        self.size = max(0, int(size))
+        self.max_overflow = max(0, int(max_overflow))
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self.recycle = recycle
+        self._idle = []
+        self._in_use = set()
+        self._cond = threading.Condition(threading.Lock())
+        self._leases = 0
+        self._metrics = {
+            'checkouts': 0,
+            'created': 0,
+            'discarded': 0,
+            'waits': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'timeouts': 0,
+            'failed_pings': 0,
+        }
+
+    @property
+    def max_connections(self):
+        return self.size + self.max_overflow
+
+    def _total(self):
+        return len(self._idle) + len(self._in_use)
+
+    def getconn(self, cursor_factory=None, autocommit=False):
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                conn = self._idle.pop() if self._idle else None
+                if conn is not None or self._total() < self.max_connections:
+                    break
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'db pool {self.name!r} exhausted '
+                        f'({self.max_connections} connections busy for {self.timeout}s)'
+                    )
+                self._cond.wait(remaining)
+            # Reserve the slot before leaving the lock so concurrent callers
+            # can't overshoot max_connections while we connect.
+            placeholder = object()
+            self._in_use.add(placeholder)
+
+        try:
+            if conn is not None and not self._healthy(conn):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+                conn._created_at = time.monotonic()
+                with self._cond:
+                    self._metrics['created'] += 1
+        except Exception:
+            with self._cond:
+                self._in_use.discard(placeholder)
+                self._cond.notify()
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000 if waited else 0.0
+        with self._cond:
+            self._in_use.discard(placeholder)
+            self._in_use.add(conn)
+            self._leases += 1
+            conn._lease = self._leases
+            self._metrics['checkouts'] += 1
+            if waited:
+                self._metrics['waits'] += 1
+                self._metrics['wait_ms_total'] += wait_ms
+                self._metrics['wait_ms_max'] = max(self._metrics['wait_ms_max'], wait_ms)
+
+        conn._pool = self
+        conn._owner = threading.get_ident()
+        conn.cursor_factory = cursor_factory
+        if conn.autocommit != autocommit:
+            conn.autocommit = autocommit
+        _track_checkout(conn)
+        return conn
+
+    def putconn(self, conn):
+        with self._cond:
+            if conn not in self._in_use:
+                return  # double close() — already back in the pool
+            if conn._owner not in (None, threading.get_ident()):
+                # The owner may still be mid-transaction: don't reuse it, but free the slot.
+                logger.warning('db pool %r: discarding connection closed from a thread that does not own it', self.name)
+                self._in_use.discard(conn)
+                conn._owner = None
+                self._cond.notify()
+                foreign = True
+            else:
+                foreign = False
+        if foreign:
+            self._discard(conn)
+            return
+
+        keep = self._reset(conn)
+        with self._cond:
+            self._in_use.discard(conn)
+            conn._owner = None
+            if keep and len(self._idle) < self.size:
+                conn._last_used = time.monotonic()
+                self._idle.append(conn)
+                keep = True
+            else:
+                keep = False
+            self._cond.notify()
+        if not keep:
+            self._discard(conn)
+
+    def _reset(self, conn):
+        """Roll back leftovers so the next caller starts clean. False = unusable."""
+        if conn.closed:
+            return False
+        try:
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            conn.cursor_factory = None
+            return True
+        except Exception:
+            return False
+
+    def _healthy(self, conn):
+        if conn.closed:
+            return False
+        now = time.monotonic()
+        if self.recycle and now - (conn._created_at or now) > self.recycle:
+            return False
+        if self.ping_after is not None and now - (conn._last_used or now) > self.ping_after:
+            try:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                cursor.close()
+                conn.rollback()
+            except Exception:
+                with self._cond:
+                    self._metrics['failed_pings'] += 1
+                return False
+        return True
+
+    def _discard(self, conn):
+        with self._cond:
+            self._metrics['discarded'] += 1
+        try:
+            conn.discard()
+        except Exception:
+            pass
+
+    def closeall(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._cond:
+            data = dict(self._metrics)
+            data.update({
+                'name': self.name,
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+            })
+        data['wait_ms_total'] = round(data['wait_ms_total'], 2)
+        data['wait_ms_max'] = round(data['wait_ms_max'], 2)
+        return data
+
+
+# ============================================
+# MODULE-LEVEL POOLS
+# ============================================
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _connect_params(source):
+    """'url' reads DATABASE_URL, 'env' reads DB_HOST/DB_NAME/...; each falls back to the other."""
+    url = os.getenv('DATABASE_URL')
+    has_env = bool(os.getenv('DB_HOST') or os.getenv('DB_NAME'))
+    if url and (source == 'url' or not has_env):
+        return {'dsn': url}
+    return {
+        'host': os.getenv('DB_HOST'),
+        'port': os.getenv('DB_PORT', 5432),
+        'database': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+    }
+
+
+def get_pool(source='url'):
+    params = _connect_params(source)
+    key = tuple(sorted((k, str(v)) for k, v in params.items()))
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                lambda: psycopg2.connect(connection_factory=PooledConnection, **params),
+                name=source,
+            )
+            _pools[key] = pool
+    return pool
+
+
+def get_db_connection(cursor_factory=None, autocommit=False, source='url'):
+    """Check out a pooled connection. ``conn.close()`` returns it."""
+    return get_pool(source).getconn(cursor_factory=cursor_factory, autocommit=autocommit)
+
+
+def pool_stats():
+    return [pool.stats() for pool in list(_pools.values())]
+
+
+def close_all_pools():
+    for pool in list(_pools.values()):
+        pool.closeall()
+
+
+# ============================================
+# FLASK REQUEST SCOPE
+# ============================================
+
+def _flask_g():
+    try:
+        from flask import g, has_app_context
+    except ImportError:
+        return None
+    return g if has_app_context() else None
+
+
+def _track_checkout(conn):
+    g = _flask_g()
+    if g is None:
+        return
+    checkouts = g.get(_G_CHECKOUTS)
+    if checkouts is None:
+        checkouts = []
+        setattr(g, _G_CHECKOUTS, checkouts)
+    checkouts.append((conn, conn._lease))
+
+
+def get_request_connection(cursor_factory=None, source='url'):
+    """One connection per request, memoized on ``g`` and returned at teardown.
+
+    Don't close() it yourself; commit/rollback as usual.
+    """
+    g = _flask_g()
+    if g is None:
+        return get_db_connection(cursor_factory=cursor_factory, source=source)
+    conns = g.get(_G_REQUEST_CONN)
+    if conns is None:
+        conns = {}
+        setattr(g, _G_REQUEST_CONN, conns)
+    conn = conns.get(source)
+    if conn is None or conn.closed or conn._pool is None:
+        conn = get_db_connection(source=source)
+        conns[source] = conn
+    conn.cursor_factory = cursor_factory
+    return conn
+
+
+def release_request_connections(exc=None):
+    """Teardown hook: give back the request connection and anything a handler leaked."""
+    g = _flask_g()
+    if g is None:
+        return
+    checkouts = g.pop(_G_CHECKOUTS, None) or []
+    g.pop(_G_REQUEST_CONN, None)
+    for conn, lease in checkouts:
+        pool = conn._pool
+        if pool is None or conn._lease != lease:
+            continue
+        try:
+            pool.putconn(conn)
+        except Exception as e:
+            logger.warning('db pool: failed to release connection at teardown: %s', e)
+
+
+def init_app(app):
+    app.teardown_appcontext(release_request_connections)
@@ -0,0 +1,459 @@
+"""Tier 2 brand discovery: crawl a brand's website for PR contact emails.
+
+Guessed domains are probed concurrently, then the homepage and every
+PR_PAGE_PATHS page are fetched concurrently over one keep-alive session. The
+crawl stops as soon as a pr@/press@ address on the brand's own domain turns up.
+Results are cached per brand, per domain (dead domains too) and per site in
+Redis, with an in-process fallback, so repeat searches skip the network.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.brand_search import normalize_brand_name
+from services.redis_client import get_redis, mark_redis_failed
+
+# Try to import BeautifulSoup for Tier 2 web scraping
+try:
+    from bs4 import BeautifulSoup
+    HAS_BS4 = True
+except ImportError:
+    HAS_BS4 = False
+    print("⚠️ BeautifulSoup not installed - Tier 2 web scraping will be limited")
+
+EMAIL_DISCOVERY_WORKERS = int(os.getenv('EMAIL_DISCOVERY_WORKERS', '8'))
+DISCOVERY_CACHE_TTL = int(os.getenv('EMAIL_DISCOVERY_CACHE_TTL', str(7 * 86400)))
+DISCOVERY_NEGATIVE_TTL = int(os.getenv('EMAIL_DISCOVERY_NEGATIVE_TTL', str(6 * 3600)))
+_LOCAL_MAX_ENTRIES = int(os.getenv('EMAIL_DISCOVERY_MAX_ENTRIES', '5000'))
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Common PR/press page paths to check
+PR_PAGE_PATHS = [
+    '/press', '/pr', '/contact', '/partnerships', '/influencers',
+    '/affiliates', '/collaborate', '/press-room', '/media',
+    '/about/press', '/about/contact', '/contact-us', '/work-with-us',
+    '/creator-program', '/ambassador', '/brand-ambassadors',
+    '/influencer-program', '/collab', '/partner'
+]
+
+# Email patterns that indicate PR/press contacts
+PR_EMAIL_PREFIXES = ['pr', 'press', 'partnerships', 'marketing', 'collab',
+                      'collaborate', 'influencer', 'creator', 'media', 'hello',
+                      'contact', 'info', 'brand', 'ambassador', 'affiliate']
+
+# pr@/press@ on the brand's own domain: nothing scores higher, stop crawling
+HIGH_CONFIDENCE_SCORE = 110
+
+# Shared across requests so concurrent discoveries can't fan out unbounded
+_EXECUTOR = ThreadPoolExecutor(max_workers=EMAIL_DISCOVERY_WORKERS, thread_name_prefix='email-discovery')
+
+
+class DiscoveryCache:
+    """JSON values with per-entry TTL in Redis; in-process LRU when Redis is down."""
+
+    def __init__(self, max_local_entries=_LOCAL_MAX_ENTRIES):
+        self.max_local_entries = max_local_entries
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def get(self, key):
+        raw = None
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception:
+                mark_redis_failed()
+                client = None
+        if client is None:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry and entry[0] > time.time():
+                    self._local.move_to_end(key)
+                    raw = entry[1]
+                elif entry:
+                    self._local.pop(key, None)
+        if raw is None:
+            self._count('misses')
+            return None
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            self._count('misses')
+            return None
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl):
+        raw = json.dumps(value)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, raw, ex=int(ttl))
+                return
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            self._local[key] = (time.time() + ttl, raw)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data['local_entries'] = len(self._local)
+        return data
+
+
+DISCOVERY_CACHE = DiscoveryCache()
+
+
+def _host_session(pool_size=EMAIL_DISCOVERY_WORKERS):
+    """Keep-alive session for one site crawl: every page reuses the host's connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = _USER_AGENT
+    return session
+
+
+def _close_after(session, futures):
+    """Close session once every future is done; fetches still running keep it until they finish."""
+    pending = [f for f in futures if not f.done()]
+    if not pending:
+        session.close()
+        return
+    lock = threading.Lock()
+    remaining = [len(pending)]
+
+    def finished(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            session.close()
+
+    for future in pending:
+        future.add_done_callback(finished)
+
+
+def guess_brand_domain(brand_name):
+    """
+    Guess a brand's domain from its name.
+    Tries common patterns like brandname.com, brandname.co, etc.
+    Returns list of possible domains to try.
+    """
+    normalized = normalize_brand_name(brand_name)
+
+    # Common domain patterns
+    domains = [
+        f"{normalized}.com",
+        f"{normalized}.co",
+        f"www.{normalized}.com",
+        f"shop{normalized}.com",
+        f"{normalized}beauty.com",
+        f"get{normalized}.com",
+        f"{normalized}skin.com",
+        f"the{normalized}.com",
+        f"{normalized}official.com",
+    ]
+
+    # Handle common brand name patterns
+    # e.g., "Sol de Janeiro" -> "soldejaneiro.com"
+    words = brand_name.lower().split()
+    if len(words) > 1:
+        joined = ''.join(words)
+        domains.insert(0, f"{joined}.com")
+
+    return domains
+
+
+def _probe_domain(domain, timeout):
+    try:
+        # Try HTTPS first
+        url = f"https://{domain}" if not domain.startswith('http') else domain
+        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code < 400:
+            return response.url
+    except Exception:
+        pass
+
+    try:
+        # Try HTTP as fallback
+        url = f"http://{domain}" if not domain.startswith('http') else domain
+        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code < 400:
+            return response.url
+    except Exception:
+        pass
+
+    return None
+
+
+def validate_domain(domain, timeout=5):
+    """
+    Check if a domain is valid by making a HEAD request.
+    Returns the final URL if valid, None otherwise. Dead domains are cached too.
+    """
+    key = f'emaildisc:domain:{domain.lower()}'
+    cached = DISCOVERY_CACHE.get(key)
+    if cached is not None:
+        return cached.get('url')
+    url = _probe_domain(domain, timeout)
+    DISCOVERY_CACHE.set(key, {'url': url}, DISCOVERY_CACHE_TTL if url else DISCOVERY_NEGATIVE_TTL)
+    return url
+
+
+def resolve_brand_domain(domains, timeout=5):
+    """First domain, in list order, that answers. Candidates are probed concurrently."""
+    domains = list(dict.fromkeys(domains))
+    pending = object()
+    results = [pending] * len(domains)
+    futures = {_EXECUTOR.submit(validate_domain, d, timeout): i for i, d in enumerate(domains)}
+    try:
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                results[futures[future]] = None
+            # Decided once every higher-priority candidate has answered
+            for url in results:
+                if url is pending:
+                    break
+                if url:
+                    return url
+            else:
+                return None
+    finally:
+        for future in futures:
+            future.cancel()
+    return None
+
+
+def extract_emails_from_text(text):
+    """
+    Extract email addresses from text using regex.
+    Returns list of unique emails found.
+    """
+    # Email regex pattern
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    emails = re.findall(email_pattern, text.lower())
+
+    # Filter out common false positives
+    exclude_patterns = ['example.com', 'email.com', 'domain.com', 'yoursite.com',
+                        'yourdomain.com', '.png', '.jpg', '.gif', 'wixpress.com',
+                        'sentry.io', 'facebook.com', 'twitter.com', 'instagram.com']
+
+    filtered = []
+    for email in emails:
+        if not any(excl in email for excl in exclude_patterns):
+            filtered.append(email)
+
+    return list(set(filtered))
+
+
+def scrape_page_for_emails(url, timeout=10, session=None):
+    """
+    Scrape a webpage for email addresses.
+    Returns list of emails found on the page.
+    """
+    http = session or requests
+    if not HAS_BS4:
+        # Fallback to basic regex if BeautifulSoup not available
+        try:
+            response = http.get(url, timeout=timeout, headers={'User-Agent': _USER_AGENT})
+            if response.status_code == 200:
+                return extract_emails_from_text(response.text)
+        except Exception:
+            pass
+        return []
+
+    try:
+        response = http.get(url, timeout=timeout, headers={'User-Agent': _USER_AGENT})
+        if response.status_code != 200:
+            return []
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # Get all text content
+        text = soup.get_text()
+        emails = extract_emails_from_text(text)
+
+        # Also check href attributes for mailto: links
+        for a_tag in soup.find_all('a', href=True):
+            href = a_tag['href']
+            if href.startswith('mailto:'):
+                email = href.replace('mailto:', '').split('?')[0].lower()
+                if '@' in email and email not in emails:
+                    emails.append(email)
+
+        return emails
+    except Exception as e:
+        print(f"⚠️ Error scraping {url}: {e}")
+        return []
+
+
+def score_pr_email(email, domain=None):
+    """PR likelihood of one address; higher is better, 0 means irrelevant."""
+    prefix = email.split('@')[0].lower()
+    email_domain = email.split('@')[1].lower() if '@' in email else ''
+
+    score = 0
+
+    # Boost if email matches brand domain
+    if domain and domain.replace('www.', '') in email_domain:
+        score += 10
+
+    # Score based on prefix
+    if prefix in ['pr', 'press']:
+        score += 100
+    elif prefix in ['partnerships', 'collab', 'collaborate']:
+        score += 80
+    elif prefix in ['influencer', 'influencers', 'creator', 'creators']:
+        score += 70
+    elif prefix in ['marketing', 'brand']:
+        score += 60
+    elif prefix in ['hello', 'hi', 'info', 'contact']:
+        score += 40
+    elif prefix in ['support', 'help', 'sales']:
+        score += 10
+
+    return score
+
+
+def find_pr_email_from_list(emails, domain=None):
+    """
+    From a list of emails, find the most likely PR/press contact.
+    Prioritizes known PR prefixes.
+    """
+    if not emails:
+        return None
+
+    scored_emails = [(email, score_pr_email(email, domain)) for email in emails]
+
+    # Sort by score descending
+    scored_emails.sort(key=lambda x: x[1], reverse=True)
+
+    # Return highest scoring email if it has any relevance
+    if scored_emails and scored_emails[0][1] > 0:
+        return scored_emails[0][0]
+
+    return None
+
+
+def crawl_site_for_emails(base_url, domain, paths=PR_PAGE_PATHS):
+    """
+    Homepage + PR pages, fetched concurrently. Returns [(url, emails)] in page order.
+    Pages still in flight are dropped once a high-confidence address is found.
+    """
+    session = _host_session()
+    urls = [base_url] + [urljoin(base_url, path) for path in paths]
+    futures = {
+        _EXECUTOR.submit(scrape_page_for_emails, url, 10 if i == 0 else 5, session): i
+        for i, url in enumerate(urls)
+    }
+    pages = {}
+    try:
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                pages[i] = future.result() or []
+            except Exception:
+                pages[i] = []
+            if pages[i]:
+                print(f"✓ Tier 2: Found emails on {urls[i]}: {pages[i]}")
+            if any(score_pr_email(e, domain) >= HIGH_CONFIDENCE_SCORE for e in pages[i]):
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+        _close_after(session, futures)
+    return [(urls[i], pages[i]) for i in sorted(pages)]
+
+
+def tier2_web_scrape(brand_name, known_domain=None):
+    """
+    Tier 2 Discovery: Scrape brand website for PR contacts.
+
+    1. Determine brand domain (use known or guess)
+    2. Check common PR page paths
+    3. Extract emails from pages
+    4. Return best PR email found
+
+    Returns: {
+        'found': bool,
+        'email': str or None,
+        'domain': str or None,
+        'source_url': str or None,
+        'all_emails': list
+    }
+    """
+    brand_key = f'emaildisc:brand:{normalize_brand_name(brand_name)}:{(known_domain or "").lower()}'
+    cached = DISCOVERY_CACHE.get(brand_key)
+    if cached is not None:
+        print(f"✓ Tier 2: Cached result for {brand_name} (found={cached.get('found')})")
+        return cached
+
+    result = {
+        'found': False,
+        'email': None,
+        'domain': None,
+        'source_url': None,
+        'all_emails': []
+    }
+
+    # Determine domain to use
+    domains_to_try = []
+    if known_domain:
+        domains_to_try.append(known_domain)
+    domains_to_try.extend(guess_brand_domain(brand_name))
+
+    # Find a valid domain
+    valid_base_url = resolve_brand_domain(domains_to_try)
+    if not valid_base_url:
+        print(f"⚠️ Tier 2: Could not find valid domain for {brand_name}")
+        DISCOVERY_CACHE.set(brand_key, result, DISCOVERY_NEGATIVE_TTL)
+        return result
+
+    valid_domain = urlparse(valid_base_url).netloc.replace('www.', '')
+    result['domain'] = valid_domain
+    print(f"✓ Tier 2: Found valid domain {valid_domain} for {brand_name}")
+
+    site_key = f'emaildisc:site:{valid_domain.lower()}'
+    pages = DISCOVERY_CACHE.get(site_key)
+    if pages is None:
+        pages = crawl_site_for_emails(valid_base_url, valid_domain)
+        has_emails = any(emails for _, emails in pages)
+        DISCOVERY_CACHE.set(site_key, pages, DISCOVERY_CACHE_TTL if has_emails else DISCOVERY_NEGATIVE_TTL)
+
+    # Dedupe
+    all_emails = list(dict.fromkeys(email for _, emails in pages for email in emails))
+    result['all_emails'] = all_emails
+
+    # Find best PR email
+    pr_email = find_pr_email_from_list(all_emails, valid_domain)
+    if pr_email:
+        result['found'] = True
+        result['email'] = pr_email
+        result['source_url'] = next(url for url, emails in pages if pr_email in emails)
+        print(f"✓ Tier 2: Best PR email for {brand_name}: {pr_email}")
+
+    DISCOVERY_CACHE.set(brand_key, result, DISCOVERY_CACHE_TTL if pr_email else DISCOVERY_NEGATIVE_TTL)
+    return result
@@ -0,0 +1,135 @@
+"""In-process feature-flag registry shared by every blueprint.
+
+All flags load in one query and checks are dict lookups. After FEATURE_FLAG_TTL
+seconds the next check compares a Redis version stamp, which set() bumps, and
+reloads only if it moved. Without Redis it just reloads on the TTL. A failed
+reload keeps the last snapshot; with no snapshot at all, flags read as off.
+"""
+
+import os
+import threading
+import time
+
+from services.db_pool import get_db_connection
+from services.redis_client import get_redis, mark_redis_failed
+
+FEATURE_FLAG_TTL = float(os.getenv('FEATURE_FLAG_TTL', '30'))
+
+
+class FeatureFlagRegistry:
+    """Snapshot of a flag_name/enabled table with TTL + version-stamp refresh."""
+
+    def __init__(self, table, ttl=FEATURE_FLAG_TTL):
+        self.table = table
+        self.ttl = ttl
+        self._flags = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._metrics = {'checks': 0, 'loads': 0, 'version_checks': 0, 'load_errors': 0}
+
+    @property
+    def _version_key(self):
+        return f'flags:{self.table}:version'
+
+    def _remote_version(self):
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            value = client.get(self._version_key)
+        except Exception as e:
+            print(f"[FeatureFlags] Redis version check failed: {e}")
+            mark_redis_failed()
+            return None
+        return value.decode() if isinstance(value, bytes) else (value or '0')
+
+    def _load(self):
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT flag_name, enabled FROM {self.table}")
+            return {row[0]: bool(row[1]) for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def _refresh(self, force=False):
+        with self._lock:
+            if not force and self._flags is not None and time.monotonic() - self._checked_at < self.ttl:
+                return  # another thread refreshed while we waited
+            version = self._remote_version()
+            if not force and self._flags is not None and version is not None:
+                self._metrics['version_checks'] += 1
+                if version == self._version:
+                    self._checked_at = time.monotonic()
+                    return
+            try:
+                flags = self._load()
+            except Exception as e:
+                self._metrics['load_errors'] += 1
+                print(f"[FeatureFlags] Failed to load {self.table}: {e}")
+                if self._flags is None:
+                    self._flags = {}
+                self._checked_at = time.monotonic()  # retry after the TTL, not on every check
+                return
+            self._flags = flags
+            self._version = version
+            self._checked_at = time.monotonic()
+            self._metrics['loads'] += 1
+
+    def _snapshot(self):
+        if self._flags is None or time.monotonic() - self._checked_at >= self.ttl:
+            self._refresh()
+        return self._flags
+
+    def is_enabled(self, flag_name, default=False):
+        self._metrics['checks'] += 1
+        return self._snapshot().get(flag_name, default)
+
+    def all(self, fresh=False):
+        """All flags as a dict; fresh=True re-reads the table (admin views)."""
+        if fresh:
+            self._refresh(force=True)
+        return dict(self._snapshot())
+
+    def set(self, flag_name, enabled):
+        """Write a flag, then bump the version stamp so every worker reloads."""
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""UPDATE {self.table}
+                    SET enabled = %s, updated_at = NOW()
+                    WHERE flag_name = %s""",
+                (enabled, flag_name)
+            )
+            conn.commit()
+            updated = cursor.rowcount > 0
+        finally:
+            conn.close()
+        if updated:
+            self.invalidate()
+        return updated
+
+    def invalidate(self):
+        client = get_redis()
+        if client is not None:
+            try:
+                client.incr(self._version_key)
+            except Exception as e:
+                print(f"[FeatureFlags] Redis version bump failed: {e}")
+                mark_redis_failed()
+        with self._lock:
+            self._checked_at = 0.0
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data['flags'] = len(self._flags or {})
+            data['age_sec'] = round(time.monotonic() - self._checked_at, 1) if self._flags is not None else None
+        data['ttl_sec'] = self.ttl
+        return data
+
+
+EMAIL_FEATURE_FLAGS = FeatureFlagRegistry('email_feature_flags')
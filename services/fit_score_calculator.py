@@ -7,7 +7,9 @@ calculator prefilters candidates and serves as fallback + brand-context gates
 (e.g. lifestyle-labeled luxury handbags vs affordable mom finds).
 """
 
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
+import hashlib
 import json
 import re
 
@@ -496,28 +498,29 @@ def _flatten_text(*parts) -> str:
     return ' '.join(bits).lower()
 
 
-def check_brand_context_mismatch(creator_profile: Dict, brand: Optional[Dict]) -> Tuple[bool, str]:
-    """
-    Catch brand-specific mismatches category DNA misses
-    (e.g. BY FAR labeled lifestyle but sells luxury handbags).
-    Note: brand.price_point is PR package value, not product luxury — do not use it here.
-    """
-    if not brand:
-        return False, ''
-
-    brand_blob = _flatten_text(
-        brand.get('name'),
-        brand.get('brand_name'),
-        brand.get('description'),
-        brand.get('category'),
-    )
-
+def _parsed_aesthetic(creator_profile: Dict):
     aesthetic = creator_profile.get('aesthetic') or {}
     if isinstance(aesthetic, str):
         try:
             aesthetic = json.loads(aesthetic)
         except Exception:
             aesthetic = {}
+    return aesthetic
+
+
+def _any_word(pattern, text: str) -> bool:
+    return pattern.search(text) is not None
+
+
+# One alternation per signal list instead of a regex per keyword
+_HAIR_CREATOR_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(s) for s in HAIR_CREATOR_SIGNALS) + r')\b'
+)
+
+
+def _creator_context(creator_profile: Dict) -> Dict:
+    """Creator-side flags for check_brand_context_mismatch, computed once per creator."""
+    aesthetic = _parsed_aesthetic(creator_profile)
     creator_blob = _flatten_text(
         creator_profile.get('raw_bio'),
         creator_profile.get('primary_niche'),
@@ -526,48 +529,60 @@ def check_brand_context_mismatch(creator_profile: Dict, brand: Optional[Dict]) -
         (aesthetic or {}).get('aesthetic_descriptors') if isinstance(aesthetic, dict) else None,
         creator_profile.get('aesthetic_descriptors'),
     )
+    is_parenting = any(s in creator_blob for s in PARENTING_CREATOR_SIGNALS)
+    return {
+        'affordable': any(s in creator_blob for s in AFFORDABLE_CREATOR_SIGNALS),
+        'parenting': is_parenting,
+        'eyewear': any(s in creator_blob for s in OPTICAL_CREATOR_SIGNALS),
+        'hair': _any_word(_HAIR_CREATOR_RE, creator_blob),
+        'cbd_sensitive': is_parenting or any(
+            s in creator_blob for s in ('beauty', 'skincare', 'makeup', 'baby')
+        ),
+    }
+
 
-    is_luxury_brand = any(s in brand_blob for s in LUXURY_BRAND_SIGNALS)
-    is_affordable_creator = any(s in creator_blob for s in AFFORDABLE_CREATOR_SIGNALS)
-    is_parenting_creator = any(s in creator_blob for s in PARENTING_CREATOR_SIGNALS)
+def _context_mismatch(creator_ctx: Dict, brand_feats: Dict) -> Tuple[bool, str]:
+    is_affordable_creator = creator_ctx['affordable']
+    is_parenting_creator = creator_ctx['parenting']
 
-    if is_luxury_brand and (is_affordable_creator or is_parenting_creator):
+    if brand_feats['ctx_luxury'] and (is_affordable_creator or is_parenting_creator):
         return True, (
             "Brand signals luxury/designer positioning that conflicts with this "
             "creator's affordable / parenting content"
         )
 
-    category = (brand.get('category') or '').lower().strip()
+    category = brand_feats['category']
     if category in ('fashion', 'luxury', 'apparel', 'clothing', 'streetwear') and (
         is_affordable_creator or is_parenting_creator
     ):
         return True, "Fashion/luxury category does not fit affordable parenting content"
 
-    is_optical_brand = any(s in brand_blob for s in OPTICAL_BRAND_SIGNALS)
-    creator_has_eyewear = any(s in creator_blob for s in OPTICAL_CREATOR_SIGNALS)
-    if is_optical_brand and not creator_has_eyewear:
+    if brand_feats['ctx_optical'] and not creator_ctx['eyewear']:
         return True, "Optical/eyewear brand does not fit this creator's content"
 
-    is_wig_brand = any(s in brand_blob for s in WIG_BRAND_SIGNALS)
-    creator_has_hair = any(
-        re.search(r'\b' + re.escape(s) + r'\b', creator_blob)
-        for s in HAIR_CREATOR_SIGNALS
-    )
-    if is_wig_brand and not creator_has_hair:
+    if brand_feats['ctx_wig'] and not creator_ctx['hair']:
         return True, "Wig/hair-system brand does not fit this creator's content"
 
-    if category == 'haircare' and not creator_has_hair:
+    if category == 'haircare' and not creator_ctx['hair']:
         return True, "Haircare brand does not fit this creator's content"
 
-    is_cbd_brand = any(s in brand_blob for s in CBD_BRAND_SIGNALS)
-    if is_cbd_brand and (is_parenting_creator or any(
-        s in creator_blob for s in ('beauty', 'skincare', 'makeup', 'baby')
-    )):
+    if brand_feats['ctx_cbd'] and creator_ctx['cbd_sensitive']:
         return True, "CBD/cannabis brand does not fit this creator's content"
 
     return False, ''
 
 
+def check_brand_context_mismatch(creator_profile: Dict, brand: Optional[Dict]) -> Tuple[bool, str]:
+    """
+    Catch brand-specific mismatches category DNA misses
+    (e.g. BY FAR labeled lifestyle but sells luxury handbags).
+    Note: brand.price_point is PR package value, not product luxury — do not use it here.
+    """
+    if not brand:
+        return False, ''
+    return _context_mismatch(_creator_context(creator_profile), _brand_features(brand))
+
+
 # Scraped primary niche adjacency — off-lane brands need content proof or they Stretch
 PRIMARY_NICHE_ADJACENCY = {
     'beauty': {'beauty', 'skincare', 'makeup', 'wellness', 'cosmetics'},
@@ -663,25 +678,11 @@ def check_primary_niche_mismatch(
     return False, ''
 
 
-def calculate_fit_score(
-    creator_profile: Dict,
-    brand_category: str,
-    brand: Optional[Dict] = None,
-) -> Dict:
-    """
-    Calculate deterministic fit score for creator vs brand category.
-
-    Optional `brand` dict (name/description/price_point) applies brand-level
-    deal-breakers so lifestyle-labeled luxury brands score as Stretch.
-
-    Scoring uses scraped social profile only — do not pass user checkbox niches
-    into secondary_niches or they will inflate off-lane matches.
-    """
-    category = (brand_category or '').lower().strip()
-    if brand and not category:
-        category = (brand.get('category') or '').lower().strip()
+def _category_fit(creator_profile: Dict, category: str, memo: Optional[Dict] = None) -> Tuple:
+    """Brand-independent half of calculate_fit_score; memoized per category in batches."""
+    if memo is not None and category in memo:
+        return memo[category]
     brand_dna = get_brand_dna(category)
-    weights = brand_dna['weights']
 
     # Calculate sub-scores
     niche_score = calculate_niche_score(creator_profile, brand_dna)
@@ -689,15 +690,29 @@ def calculate_fit_score(
     engagement_score = calculate_engagement_score(creator_profile)
     consistency_score = calculate_consistency_score(creator_profile)
 
-    # Check for deal breakers (category DNA + brand-specific context + primary lane)
     has_deal_breaker, deal_breaker_reason = check_deal_breaker(creator_profile, brand_dna, category)
-    brand_mismatch, brand_mismatch_reason = check_brand_context_mismatch(creator_profile, brand)
-    if brand_mismatch:
-        has_deal_breaker = True
-        deal_breaker_reason = brand_mismatch_reason
-    primary_mismatch, primary_mismatch_reason = check_primary_niche_mismatch(
-        creator_profile, category, content_score
+    primary_mismatch = check_primary_niche_mismatch(creator_profile, category, content_score)
+
+    parts = (
+        brand_dna['weights'],
+        niche_score, content_score, engagement_score, consistency_score,
+        (has_deal_breaker, deal_breaker_reason),
+        primary_mismatch,
     )
+    if memo is not None:
+        memo[category] = parts
+    return parts
+
+
+def _assemble_fit(parts: Tuple, category: str, brand_mismatch: Tuple[bool, str]) -> Dict:
+    (weights, niche_score, content_score, engagement_score, consistency_score,
+     (has_deal_breaker, deal_breaker_reason),
+     (primary_mismatch, primary_mismatch_reason)) = parts
+
+    # Deal breakers: category DNA, then brand-specific context, then primary lane
+    if brand_mismatch[0]:
+        has_deal_breaker = True
+        deal_breaker_reason = brand_mismatch[1]
     if primary_mismatch:
         has_deal_breaker = True
         deal_breaker_reason = primary_mismatch_reason
@@ -714,25 +729,7 @@ def calculate_fit_score(
     if has_deal_breaker:
         overall_score = min(overall_score, 25)  # Cap at 25% for deal breakers
 
-    # Determine tier
-    tier_info = None
-    for tier_name, tier_data in SCORE_TIERS.items():
-        if overall_score >= tier_data['min']:
-            tier_info = {
-                'tier': tier_name,
-                'status': tier_data['status'],
-                'stars': tier_data['stars'],
-                'label': tier_data['label'],
-            }
-            break
-
-    if not tier_info:
-        tier_info = {
-            'tier': 'not_recommended',
-            'status': 'build_first',
-            'stars': 1,
-            'label': 'Not Recommended',
-        }
+    tier_info = _tier_info_for_score(overall_score)
 
     # Identify what's missing
     missing = []
@@ -763,6 +760,30 @@ def calculate_fit_score(
     }
 
 
+def calculate_fit_score(
+    creator_profile: Dict,
+    brand_category: str,
+    brand: Optional[Dict] = None,
+) -> Dict:
+    """
+    Calculate deterministic fit score for creator vs brand category.
+
+    Optional `brand` dict (name/description/price_point) applies brand-level
+    deal-breakers so lifestyle-labeled luxury brands score as Stretch.
+
+    Scoring uses scraped social profile only — do not pass user checkbox niches
+    into secondary_niches or they will inflate off-lane matches.
+    """
+    category = (brand_category or '').lower().strip()
+    if brand and not category:
+        category = (brand.get('category') or '').lower().strip()
+    return _assemble_fit(
+        _category_fit(creator_profile, category),
+        category,
+        check_brand_context_mismatch(creator_profile, brand),
+    )
+
+
 def _tier_info_for_score(overall_score: float) -> Dict:
     for tier_name, tier_data in SCORE_TIERS.items():
         if overall_score >= tier_data['min']:
@@ -809,27 +830,97 @@ def scrape_agrees_with_intent(scrape_primary: str, intent_niches: Optional[List[
     return False
 
 
-def score_brand_for_creator(
-    creator_profile: Dict,
-    brand: Optional[Dict] = None,
-    interest_niches: Optional[List[str]] = None,
-) -> Dict:
-    """
-    Brand-aware fit score. Category DNA is the baseline; name, description,
-    hero product, creator themes, and onboarding intent differentiate brands
-    in the same category so For You does not flatten to one percentage.
-    """
-    brand = brand or {}
-    profile = creator_profile or {}
+_BRAND_FEATURE_CACHE_SIZE = 4096
+
+# Bump when _brand_text_features or the signal lists it reads change: stored
+# brand_features rows (services/brand_feature_store.py) from another version
+# are ignored until recomputed.
+BRAND_FEATURE_VERSION = 2
+
+# Boolean features, in bit order for the stored flags column
+BRAND_FEATURE_FLAGS = (
+    'ctx_luxury', 'ctx_optical', 'ctx_wig', 'ctx_cbd',
+    'optical', 'wig', 'cbd', 'fragrance',
+    'beauty_sku', 'wellness_sku', 'parenting_sku', 'off_intent_wellness', 'hair_terms',
+)
+
+
+@lru_cache(maxsize=_BRAND_FEATURE_CACHE_SIZE)
+def _brand_text_features(ctx_blob: str, brand_text: str, category: str) -> Dict:
+    """Tokens and signal flags for one brand. Cached: the catalog barely changes."""
+    mapped_cat = _mapped_category(category)
+    beauty_sku = any(s in brand_text for s in _BEAUTY_SKU_TERMS)
+    tokens = frozenset(_meaningful_tokens(brand_text))
+    return {
+        'category': category,
+        'mapped_cat': mapped_cat,
+        'lane_cat': 'beauty' if mapped_cat == 'lifestyle' and beauty_sku else mapped_cat,
+        'brand_text': brand_text,
+        'tokens': tokens,
+        'distinctive_pts': min(14, len(tokens - _GENERIC_BRAND_TOKENS)),
+        # check_brand_context_mismatch reads name/description/category
+        'ctx_luxury': any(s in ctx_blob for s in LUXURY_BRAND_SIGNALS),
+        'ctx_optical': any(s in ctx_blob for s in OPTICAL_BRAND_SIGNALS),
+        'ctx_wig': any(s in ctx_blob for s in WIG_BRAND_SIGNALS),
+        'ctx_cbd': any(s in ctx_blob for s in CBD_BRAND_SIGNALS),
+        # score_brand_for_creator reads name/description/hero product
+        'optical': any(s in brand_text for s in OPTICAL_BRAND_SIGNALS),
+        'wig': any(s in brand_text for s in WIG_BRAND_SIGNALS),
+        'cbd': any(s in brand_text for s in CBD_BRAND_SIGNALS),
+        'fragrance': any(s in brand_text for s in ('fragrance', 'perfume', 'scent', 'eau')),
+        'beauty_sku': beauty_sku,
+        'wellness_sku': any(s in brand_text for s in _WELLNESS_SKU_TERMS),
+        'parenting_sku': any(s in brand_text for s in _PARENTING_SKU_TERMS),
+        'off_intent_wellness': any(s in brand_text for s in _OFF_INTENT_WELLNESS_TERMS),
+        'hair_terms': any(s in brand_text for s in _HAIR_BRAND_TERMS),
+    }
+
+
+def _brand_text_inputs(brand: Dict) -> Tuple[str, str, str]:
+    """(ctx_blob, brand_text, category): everything _brand_text_features sees of a brand."""
+    # Both name spellings, as scoring always read them: queries alias
+    # brand_name AS name, but some rows carry a different name as well.
+    ctx_blob = _flatten_text(
+        brand.get('name'),
+        brand.get('brand_name'),
+        brand.get('description'),
+        brand.get('category'),
+    )
+    brand_text = _flatten_text(
+        brand.get('name'),
+        brand.get('brand_name'),
+        brand.get('description'),
+        brand.get('hero_product'),
+        brand.get('product_sku_name'),
+    )
     category = (brand.get('category') or '').lower().strip()
-    base = calculate_fit_score(profile, category, brand=brand)
+    return ctx_blob, brand_text, category
 
-    aesthetic = profile.get('aesthetic') or {}
-    if isinstance(aesthetic, str):
-        try:
-            aesthetic = json.loads(aesthetic)
-        except Exception:
-            aesthetic = {}
+
+def brand_fingerprint(brand: Dict) -> str:
+    """Digest of the text compute_brand_text_features parses; stale stored rows stop matching."""
+    raw = '\x1f'.join(_brand_text_inputs(brand))
+    return hashlib.blake2b(raw.encode('utf-8', 'replace'), digest_size=12).hexdigest()
+
+
+def compute_brand_text_features(brand: Dict) -> Dict:
+    """Parse brand text into scoring features. Request paths go through _brand_features."""
+    return _brand_text_features(*_brand_text_inputs(brand))
+
+
+def _brand_features(brand: Dict) -> Dict:
+    """Precomputed features from the brand feature store, else parsed from the brand dict."""
+    if brand.get('id') is not None:
+        from services.brand_feature_store import BRAND_FEATURES
+        stored = BRAND_FEATURES.lookup(brand)
+        if stored is not None:
+            return stored
+    return compute_brand_text_features(brand)
+
+
+def _creator_features(profile: Dict, interest_niches: Optional[List[str]] = None) -> Dict:
+    """Everything score_brand_for_creator needs from the creator, computed once."""
+    aesthetic = _parsed_aesthetic(profile)
     descriptors = profile.get('aesthetic_descriptors')
     if not descriptors and isinstance(aesthetic, dict):
         descriptors = aesthetic.get('aesthetic_descriptors')
@@ -847,53 +938,21 @@ def score_brand_for_creator(
         interest_niches,
         profile.get('match_intent_lanes'),
     )
-    brand_text = _flatten_text(
-        brand.get('name'),
-        brand.get('brand_name'),
-        brand.get('description'),
-        brand.get('hero_product'),
-        brand.get('product_sku_name'),
-    )
 
-    overlap = _meaningful_tokens(creator_blob) & _meaningful_tokens(brand_text)
-    overlap_pts = min(8, len(overlap) * 2)
-
-    theme_pts = 0
     themes = profile.get('content_themes') or []
     if isinstance(themes, str):
         try:
             themes = json.loads(themes)
         except Exception:
             themes = [themes]
+    theme_words = []
     for theme in list(themes)[:12]:
         words = [
             w for w in re.findall(r'[a-z]{4,}', str(theme).lower())
             if w not in _SCORE_STOPWORDS
         ]
-        if not words:
-            continue
-        if all(w in brand_text for w in words[:2]):
-            theme_pts += 3
-        elif any(w in brand_text for w in words):
-            theme_pts += 1
-    if any(s in intent_blob for s in ('fragrance', 'perfume', 'scent')) and any(
-        s in brand_text for s in ('fragrance', 'perfume', 'scent', 'eau')
-    ):
-        theme_pts += 4
-    sku_pts = 0
-    if any(s in brand_text for s in _BEAUTY_SKU_TERMS) and any(
-        s in intent_blob for s in ('beauty', 'makeup', 'skincare', 'glow', 'self-care', 'self care')
-    ):
-        sku_pts += 4
-    if any(s in brand_text for s in _WELLNESS_SKU_TERMS) and any(
-        s in intent_blob for s in ('wellness', 'self-care', 'self care', 'health', 'ritual')
-    ):
-        sku_pts += 3
-    if any(s in brand_text for s in _PARENTING_SKU_TERMS) and any(
-        s in intent_blob for s in ('baby', 'mom', 'mum', 'parent', 'family', 'toddler', 'kids')
-    ):
-        sku_pts += 5
-    theme_pts = min(8, theme_pts)
+        if words:
+            theme_words.append(words)
 
     intent_lanes = set()
     for src in (
@@ -920,55 +979,99 @@ def score_brand_for_creator(
             if mapped:
                 proof_lanes.add(mapped)
 
-    mapped_cat = _mapped_category(category)
-    if mapped_cat == 'lifestyle' and any(s in brand_text for s in _BEAUTY_SKU_TERMS):
-        lane_cat = 'beauty'
-    else:
-        lane_cat = mapped_cat
+    try:
+        followers = int(profile.get('follower_count') or 0)
+    except (TypeError, ValueError):
+        followers = 0
+
+    return {
+        'context': _creator_context(profile),
+        'tokens': _meaningful_tokens(creator_blob),
+        'theme_words': theme_words,
+        'fragrance': any(s in intent_blob for s in ('fragrance', 'perfume', 'scent')),
+        'beauty_intent': any(
+            s in intent_blob for s in ('beauty', 'makeup', 'skincare', 'glow', 'self-care', 'self care')
+        ),
+        'wellness_text': any(
+            s in intent_blob for s in ('wellness', 'self-care', 'self care', 'health', 'ritual')
+        ),
+        'parenting_intent': any(
+            s in intent_blob for s in ('baby', 'mom', 'mum', 'parent', 'family', 'toddler', 'kids')
+        ),
+        'eyewear': any(s in creator_blob for s in OPTICAL_CREATOR_SIGNALS),
+        'hair_word': _any_word(_HAIR_CREATOR_RE, intent_blob),
+        'hair_text': any(s in intent_blob for s in ('hair', 'haircare', 'curl')),
+        'intent_lanes': intent_lanes,
+        'proof_lanes': proof_lanes,
+        'wellness_intent': bool(intent_lanes & {'wellness', 'fitness'}),
+        'followers': followers,
+        'category_fit': {},
+    }
+
+
+def _score_pair(profile: Dict, creator: Dict, brand: Dict) -> Dict:
+    feats = _brand_features(brand)
+    category = feats['category']
+    base = _assemble_fit(
+        _category_fit(profile, category, creator['category_fit']),
+        category,
+        _context_mismatch(creator['context'], feats) if brand else (False, ''),
+    )
+    brand_text = feats['brand_text']
+
+    overlap = creator['tokens'] & feats['tokens']
+    overlap_pts = min(8, len(overlap) * 2)
+
+    theme_pts = 0
+    for words in creator['theme_words']:
+        if all(w in brand_text for w in words[:2]):
+            theme_pts += 3
+        elif any(w in brand_text for w in words):
+            theme_pts += 1
+    if creator['fragrance'] and feats['fragrance']:
+        theme_pts += 4
+    sku_pts = 0
+    if feats['beauty_sku'] and creator['beauty_intent']:
+        sku_pts += 4
+    if feats['wellness_sku'] and creator['wellness_text']:
+        sku_pts += 3
+    if feats['parenting_sku'] and creator['parenting_intent']:
+        sku_pts += 5
+    theme_pts = min(8, theme_pts)
+
+    intent_lanes = creator['intent_lanes']
+    mapped_cat = feats['mapped_cat']
+    lane_cat = feats['lane_cat']
     if lane_cat in intent_lanes:
         lane_pts = 8
     elif any(lane_cat in PRIMARY_NICHE_ADJACENCY.get(lane, {lane}) for lane in intent_lanes):
         lane_pts = 0
-    elif lane_cat in proof_lanes:
+    elif lane_cat in creator['proof_lanes']:
         lane_pts = 0
     else:
         lane_pts = -14
 
     penalty = 0
     hard_caps = []
-    if any(s in brand_text for s in OPTICAL_BRAND_SIGNALS) and not any(
-        s in creator_blob for s in OPTICAL_CREATOR_SIGNALS
-    ):
+    if feats['optical'] and not creator['eyewear']:
         penalty -= 30
         hard_caps.append(32)
-    if any(s in brand_text for s in WIG_BRAND_SIGNALS) and not any(
-        re.search(r'\b' + re.escape(s) + r'\b', intent_blob)
-        for s in HAIR_CREATOR_SIGNALS
-    ):
+    if feats['wig'] and not creator['hair_word']:
         penalty -= 30
         hard_caps.append(32)
-    if mapped_cat == 'haircare' and not any(
-        re.search(r'\b' + re.escape(s) + r'\b', intent_blob)
-        for s in HAIR_CREATOR_SIGNALS
-    ):
+    if mapped_cat == 'haircare' and not creator['hair_word']:
         penalty -= 22
         hard_caps.append(32)
-    if any(s in brand_text for s in CBD_BRAND_SIGNALS):
+    if feats['cbd']:
         penalty -= 35
         hard_caps.append(28)
-    wellness_intent = bool(intent_lanes & {'wellness', 'fitness'})
-    if not wellness_intent and any(s in brand_text for s in _OFF_INTENT_WELLNESS_TERMS):
+    if not creator['wellness_intent'] and feats['off_intent_wellness']:
         penalty -= 18
-    if any(s in brand_text for s in _HAIR_BRAND_TERMS) and not any(
-        s in intent_blob for s in ('hair', 'haircare', 'curl')
-    ):
+    if feats['hair_terms'] and not creator['hair_text']:
         penalty -= 5
 
     follower_pts = 0
-    try:
-        followers = int(profile.get('follower_count') or 0)
-    except (TypeError, ValueError):
-        followers = 0
+    followers = creator['followers']
     try:
         min_f = int(brand.get('min_followers') or 0)
     except (TypeError, ValueError):
@@ -981,12 +1084,6 @@ def score_brand_for_creator(
         elif followers >= min_f:
             follower_pts = 1
 
-    distinctive = {
-        t for t in _meaningful_tokens(brand_text)
-        if t not in _GENERIC_BRAND_TOKENS
-    }
-    distinctive_pts = min(14, len(distinctive))
-
     # Category DNA is a gate, not the displayed percentage. Identical beauty
     # DNA was flattening every card to 55%.
     in_intent = lane_cat in intent_lanes
@@ -996,7 +1093,7 @@ def score_brand_for_creator(
 
     score = (
         lane_base
-        + distinctive_pts
+        + feats['distinctive_pts']
         + overlap_pts
         + theme_pts
         + sku_pts
@@ -1009,7 +1106,7 @@ def score_brand_for_creator(
     score = int(round(max(8, min(86, score))))
 
     tier_info = _tier_info_for_score(score)
-    result = dict(base)
+    result = base
     result.update({
         'overall_score': score,
         'tier': tier_info['tier'],
@@ -1025,6 +1122,49 @@ def score_brand_for_creator(
     return result
 
 
+def score_brand_for_creator(
+    creator_profile: Dict,
+    brand: Optional[Dict] = None,
+    interest_niches: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Brand-aware fit score. Category DNA is the baseline; name, description,
+    hero product, creator themes, and onboarding intent differentiate brands
+    in the same category so For You does not flatten to one percentage.
+    """
+    return score_brands_for_creator(creator_profile, [brand], interest_niches)[0]
+
+
+def score_brands_for_creator(
+    creator_profile: Dict,
+    brands: List[Optional[Dict]],
+    interest_niches: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    score_brand_for_creator for a whole list, in order. Creator text is parsed
+    once, brand features come from a shared cache and category sub-scores are
+    computed once per category, so scoring the full catalog stays cheap.
+    """
+    profile = creator_profile or {}
+    creator = _creator_features(profile, interest_niches)
+    return [_score_pair(profile, creator, brand or {}) for brand in brands]
+
+
+def score_creators_for_brand(
+    creator_profiles: List[Optional[Dict]],
+    brand: Optional[Dict],
+    interest_niches: Optional[List[Optional[List[str]]]] = None,
+) -> List[Dict]:
+    """One brand against many creators. interest_niches is parallel to creator_profiles."""
+    brand = brand or {}
+    out = []
+    for i, creator_profile in enumerate(creator_profiles):
+        profile = creator_profile or {}
+        niches = interest_niches[i] if interest_niches else None
+        out.append(_score_pair(profile, _creator_features(profile, niches), brand))
+    return out
+
+
 def get_score_context_for_llm(fit_score: Dict, brand_name: str) -> str:
     """
     Generate context string to pass to Gemini.
@@ -24,6 +24,7 @@ from typing import Dict, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from services.llm_client import LLM, LLMReply, sdk_usage
 from services.pitch_identity import resolve_pitch_identity
 
 # Gemini API
@@ -681,7 +682,8 @@ class GeminiPitchGeneratorV2:
         brand: Dict,
         creator: Dict,
         template_fallback_fn=None,
-        use_pro_model: bool = False
+        use_pro_model: bool = False,
+        regenerate: bool = False
     ) -> PitchResult:
         """
         Generate a pitch using Gemini v2 with validation and retry.
@@ -691,6 +693,7 @@ class GeminiPitchGeneratorV2:
             creator: Creator data dict
             template_fallback_fn: Optional fallback function
             use_pro_model: Use gemini-2.5-pro instead of flash
+            regenerate: User asked for a new pitch - bypass cached replies
 
         Returns:
             PitchResult with generated pitch
@@ -727,7 +730,8 @@ class GeminiPitchGeneratorV2:
                 result, was_safety_blocked = self._call_gemini(
                     user_prompt,
                     model,
-                    last_error
+                    last_error,
+                    refresh=regenerate
                 )
 
                 if was_safety_blocked:
@@ -757,6 +761,7 @@ class GeminiPitchGeneratorV2:
                         )
                     else:
                         print(f"[GeminiPitchV2] Validation failed: {validation.reason}")
+                        self._forget_reply(user_prompt, model, last_error)
                         last_error = validation.reason
                         retry_count += 1
                 else:
@@ -793,82 +798,109 @@ class GeminiPitchGeneratorV2:
         self,
         user_prompt: str,
         model: str,
-        previous_error: Optional[str] = None
+        previous_error: Optional[str] = None,
+        refresh: bool = False
     ) -> tuple[Optional[Dict], bool]:
         """
-        Make the Gemini API call.
+        Make the Gemini API call. refresh=True skips the cached reply.
 
         Returns:
             (result_dict, was_safety_blocked)
         """
-        # Append retry context if previous attempt failed
-        prompt = user_prompt
-        if previous_error:
-            prompt = f"{user_prompt}\n\nPREVIOUS ATTEMPT FAILED: {previous_error}. Fix and regenerate. Do not repeat the error."
-
-        # Build config
-        config = types.GenerateContentConfig(
-            system_instruction=SYSTEM_INSTRUCTION,
-            temperature=TEMPERATURE,
-            top_p=TOP_P,
-            top_k=TOP_K,
-            max_output_tokens=MAX_OUTPUT_TOKENS,
-            response_mime_type="application/json",
-            response_schema=PITCH_SCHEMA,
-            safety_settings=get_safety_settings()
-        )
+        prompt = self._retry_prompt(user_prompt, previous_error)
 
-        # Make API call
-        response = self.client.models.generate_content(
-            model=model,
-            contents=[
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=prompt)]
-                )
-            ],
-            config=config
-        )
+        safety_blocked = False
 
-        # Check for safety block
-        if response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'finish_reason') and str(candidate.finish_reason) == "SAFETY":
-                print("[GeminiPitchV2] Safety filter blocked response")
-                return None, True
+        def produce():
+            nonlocal safety_blocked
+            # Build config
+            config = types.GenerateContentConfig(
+                system_instruction=SYSTEM_INSTRUCTION,
+                temperature=TEMPERATURE,
+                top_p=TOP_P,
+                top_k=TOP_K,
+                max_output_tokens=MAX_OUTPUT_TOKENS,
+                response_mime_type="application/json",
+                response_schema=PITCH_SCHEMA,
+                safety_settings=get_safety_settings()
+            )
 
-        # Parse response
-        if response and response.text:
-            raw_text = response.text
-            print(f"[GeminiPitchV2] Raw response length: {len(raw_text)}")
-            print(f"[GeminiPitchV2] Raw response preview: {raw_text[:500]}...")
+            # Make API call
+            response = self.client.models.generate_content(
+                model=model,
+                contents=[
+                    types.Content(
+                        role="user",
+                        parts=[types.Part.from_text(text=prompt)]
+                    )
+                ],
+                config=config
+            )
 
-            try:
-                result = json.loads(raw_text)
-                return result, False
-            except json.JSONDecodeError as e:
-                print(f"[GeminiPitchV2] JSON parse error: {e}")
-                # Try to extract JSON from response
-                text = raw_text.strip()
-
-                # Remove markdown code fences if present
-                if text.startswith("```"):
-                    lines = text.split("\n")
-                    # Remove first line (```json) and last line (```)
-                    text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
-
-                start = text.find('{')
-                end = text.rfind('}')
-                if start != -1 and end > start:
-                    json_text = text[start:end+1]
-                    print(f"[GeminiPitchV2] Extracted JSON: {json_text[:200]}...")
-                    try:
-                        result = json.loads(json_text)
-                        return result, False
-                    except json.JSONDecodeError as e2:
-                        print(f"[GeminiPitchV2] Extracted JSON parse error: {e2}")
-
-        return None, False
+            # Check for safety block
+            if response.candidates:
+                candidate = response.candidates[0]
+                if hasattr(candidate, 'finish_reason') and str(candidate.finish_reason) == "SAFETY":
+                    print("[GeminiPitchV2] Safety filter blocked response")
+                    safety_blocked = True
+                    return LLMReply(None)
+
+            return LLMReply(self._parse_pitch_json(response.text if response else None), *sdk_usage(response))
+
+        # Variant ids are baked into the prompt, so only an identical draw for the
+        # same creator + brand is served from cache.
+        result = LLM.call('pitch', self._cache_key_material(prompt, model), produce, refresh=refresh)
+        return result, safety_blocked
+
+    @staticmethod
+    def _retry_prompt(user_prompt: str, previous_error: Optional[str]) -> str:
+        """Append retry context if previous attempt failed."""
+        if not previous_error:
+            return user_prompt
+        return f"{user_prompt}\n\nPREVIOUS ATTEMPT FAILED: {previous_error}. Fix and regenerate. Do not repeat the error."
+
+    @staticmethod
+    def _cache_key_material(prompt: str, model: str) -> Dict:
+        return {
+            'model': model, 'system': SYSTEM_INSTRUCTION, 'prompt': prompt,
+            'config': [TEMPERATURE, TOP_P, TOP_K, MAX_OUTPUT_TOKENS, PROMPT_VERSION],
+        }
+
+    def _forget_reply(self, user_prompt: str, model: str, previous_error: Optional[str]) -> None:
+        """Drop a reply that failed validate_pitch so it is not replayed for the cache TTL."""
+        LLM.forget('pitch', self._cache_key_material(self._retry_prompt(user_prompt, previous_error), model))
+
+    def _parse_pitch_json(self, raw_text: Optional[str]) -> Optional[Dict]:
+        """Pitch JSON from the raw model text, tolerating code fences and stray prose."""
+        if not raw_text:
+            return None
+        print(f"[GeminiPitchV2] Raw response length: {len(raw_text)}")
+        print(f"[GeminiPitchV2] Raw response preview: {raw_text[:500]}...")
+
+        try:
+            return json.loads(raw_text)
+        except json.JSONDecodeError as e:
+            print(f"[GeminiPitchV2] JSON parse error: {e}")
+            # Try to extract JSON from response
+            text = raw_text.strip()
+
+            # Remove markdown code fences if present
+            if text.startswith("```"):
+                lines = text.split("\n")
+                # Remove first line (```json) and last line (```)
+                text = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
+
+            start = text.find('{')
+            end = text.rfind('}')
+            if start != -1 and end > start:
+                json_text = text[start:end+1]
+                print(f"[GeminiPitchV2] Extracted JSON: {json_text[:200]}...")
+                try:
+                    return json.loads(json_text)
+                except json.JSONDecodeError as e2:
+                    print(f"[GeminiPitchV2] Extracted JSON parse error: {e2}")
+
+        return None
 
     def _run_fallback(
         self,
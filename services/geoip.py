@@ -0,0 +1,286 @@
+"""Offline IP -> country lookups for the region gate.
+
+scripts/build_geoip_index.py turns a GeoLite2 Country CSV, or a start,end,country
+range CSV (DB-IP / IP2Location lite), into one binary index file. In the index,
+each address family is a sorted array of fixed-width big-endian range starts,
+with a parallel array of country slots; gaps between ranges map to slot 0
+(unknown). A lookup is a bisect over the memory-mapped file, so workers share
+the pages, startup parses nothing, and no request leaves the box. Hot IPs sit
+in a small LRU in front of it.
+
+Until an index is deployed (GEOIP_INDEX_PATH), GEOIP.country_for_ip falls back
+to ip-api.com as before; set GEOIP_REMOTE_FALLBACK=0 to turn that off.
+"""
+
+import bisect
+import csv
+import ipaddress
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import requests
+
+GEOIP_INDEX_PATH = os.getenv('GEOIP_INDEX_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'geoip', 'country-ip.idx'
+)
+GEOIP_LRU_SIZE = int(os.getenv('GEOIP_LRU_SIZE', '4096'))
+GEOIP_REMOTE_FALLBACK = os.getenv('GEOIP_REMOTE_FALLBACK', '1') != '0'
+
+_MAGIC = b'NCGEOIP1'
+_HEADER = struct.Struct('<8sIII')  # magic, countries, v4 ranges, v6 ranges
+_SLOT = struct.Struct('<H')
+_UNKNOWN = '--'
+_KEY_WIDTH = {4: 4, 6: 16}
+
+
+def parse_ip(value):
+    """ipaddress object for a public address (IPv4-mapped IPv6 unwrapped), else None."""
+    try:
+        ip = ipaddress.ip_address((value or '').strip())
+    except ValueError:
+        return None
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    if not ip.is_global:
+        return None
+    return ip
+
+
+# ---- building ---------------------------------------------------------------
+
+def _country(code):
+    code = (code or '').strip().upper()
+    if len(code) != 2 or not code.isalpha() or code == 'ZZ':
+        return None
+    return code
+
+
+def _range_bound(value):
+    value = (value or '').strip()
+    if value.isdigit():
+        return ipaddress.IPv4Address(int(value)) if int(value) <= 0xFFFFFFFF else ipaddress.IPv6Address(int(value))
+    return ipaddress.ip_address(value)
+
+
+def read_range_csv(path):
+    """(first_ip, last_ip, country) from start,end,country[,...] rows (dotted, colon or integer IPs)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            try:
+                first, last = _range_bound(row[0]), _range_bound(row[1])
+            except ValueError:
+                continue  # header
+            country = _country(row[2])
+            if country and first.version == last.version:
+                yield first, last, country
+
+
+def read_geolite_csv(blocks_paths, locations_path):
+    """(first_ip, last_ip, country) from GeoLite2-Country-Blocks-IPv{4,6}.csv + Locations."""
+    with open(locations_path, newline='', encoding='utf-8') as f:
+        countries = {row['geoname_id']: _country(row.get('country_iso_code')) for row in csv.DictReader(f)}
+    for blocks_path in blocks_paths:
+        with open(blocks_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                country = countries.get(row.get('geoname_id')) or countries.get(row.get('registered_country_geoname_id'))
+                if not country:
+                    continue
+                network = ipaddress.ip_network(row['network'], strict=False)
+                yield network.network_address, network.broadcast_address, country
+
+
+def build_index(ranges, path):
+    """Write the binary index for (first_ip, last_ip, country) ranges. Returns per-family range counts."""
+    countries = [_UNKNOWN]
+    slots = {_UNKNOWN: 0}
+    families = {4: [], 6: []}
+    for first, last, country in ranges:
+        if country not in slots:
+            slots[country] = len(countries)
+            countries.append(country)
+        families[first.version].append((int(first), int(last), slots[country]))
+
+    sections = {}
+    for version, items in families.items():
+        items.sort()
+        starts, values = [], []
+        covered_to = -1
+        for first, last, slot in items:
+            if last <= covered_to:
+                continue  # overlapped by an earlier range
+            first = max(first, covered_to + 1)
+            if first > covered_to + 1 and starts:
+                starts.append(covered_to + 1)  # gap -> unknown
+                values.append(0)
+            elif values and values[-1] == slot:
+                covered_to = last  # adjacent range, same country: extend
+                continue
+            starts.append(first)
+            values.append(slot)
+            covered_to = last
+        max_value = (1 << (8 * _KEY_WIDTH[version])) - 1
+        if starts and covered_to < max_value:
+            starts.append(covered_to + 1)
+            values.append(0)
+        sections[version] = (starts, values)
+
+    tmp = f'{path}.tmp'
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(countries), len(sections[4][0]), len(sections[6][0])))
+        f.write(''.join(countries).encode('ascii'))
+        for version in (4, 6):
+            starts, values = sections[version]
+            width = _KEY_WIDTH[version]
+            f.write(b''.join(start.to_bytes(width, 'big') for start in starts))
+            f.write(b''.join(_SLOT.pack(value) for value in values))
+    os.replace(tmp, path)
+    return {'v4': len(sections[4][0]), 'v6': len(sections[6][0]), 'countries': len(countries) - 1}
+
+
+# ---- lookups ----------------------------------------------------------------
+
+class _Keys:
+    """Read-only sequence of fixed-width big-endian keys inside the mapped file (for bisect)."""
+
+    __slots__ = ('buf', 'offset', 'width', 'count')
+
+    def __init__(self, buf, offset, width, count):
+        self.buf = buf
+        self.offset = offset
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * self.width
+        return self.buf[start:start + self.width]
+
+
+class GeoIPIndex:
+    """A memory-mapped index written by build_index."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_countries, n4, n6 = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError(f'{path} is not a GeoIP index')
+        offset = _HEADER.size
+        self.countries = self._mm[offset:offset + 2 * n_countries].decode('ascii')
+        offset += 2 * n_countries
+        self._sections = {}
+        for version, count in ((4, n4), (6, n6)):
+            width = _KEY_WIDTH[version]
+            keys = _Keys(self._mm, offset, width, count)
+            offset += width * count
+            self._sections[version] = (keys, offset)
+            offset += _SLOT.size * count
+        self.ranges = {'v4': n4, 'v6': n6}
+
+    def lookup(self, ip):
+        """Country code for an ipaddress object, or None for gaps/unknown."""
+        keys, slots_offset = self._sections[ip.version]
+        i = bisect.bisect_right(keys, ip.packed) - 1
+        if i < 0:
+            return None
+        slot = _SLOT.unpack_from(self._mm, slots_offset + i * _SLOT.size)[0]
+        return self.countries[2 * slot:2 * slot + 2] if slot else None
+
+    def close(self):
+        self._mm.close()
+
+
+class GeoIPResolver:
+    """LRU -> local index -> (only without an index) ip-api.com."""
+
+    def __init__(self, path=GEOIP_INDEX_PATH, lru_size=GEOIP_LRU_SIZE, remote_fallback=GEOIP_REMOTE_FALLBACK):
+        self.path = path
+        self.lru_size = lru_size
+        self.remote_fallback = remote_fallback
+        self._index = None
+        self._opened = False
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = dict.fromkeys(
+            ('lookups', 'lru_hits', 'index_hits', 'unknown', 'remote_calls', 'remote_errors'), 0
+        )
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self._metrics[key] += value
+
+    def index(self):
+        if not self._opened:
+            with self._lock:
+                if not self._opened:
+                    self._opened = True
+                    try:
+                        self._index = GeoIPIndex(self.path)
+                        print(f"[GeoIP] Loaded {self.path} ({self._index.ranges})")
+                    except (OSError, ValueError) as e:
+                        print(f"[GeoIP] No local index ({e}); remote fallback {'on' if self.remote_fallback else 'off'}")
+        return self._index
+
+    def _remote(self, ip, timeout):
+        self._count(remote_calls=1)
+        try:
+            response = requests.get(f'http://ip-api.com/json/{ip}?fields=countryCode', timeout=timeout)
+            if response.status_code == 200:
+                return response.json().get('countryCode') or None
+        except Exception as e:
+            print(f"[GeoIP] ip-api lookup failed: {e}")
+        self._count(remote_errors=1)
+        return None
+
+    def country_for_ip(self, value, timeout=3):
+        """ISO country code for a public IP string; None for private/invalid/unknown (callers fail open)."""
+        ip = parse_ip(value)
+        if ip is None:
+            return None
+        key = ip.packed
+        self._count(lookups=1)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self._metrics['lru_hits'] += 1
+                return self._lru[key]
+
+        index = self.index()
+        if index is not None:
+            country = index.lookup(ip)
+            self._count(**({'index_hits': 1} if country else {'unknown': 1}))
+        elif self.remote_fallback:
+            country = self._remote(ip, timeout)
+            if country is None:
+                return None  # don't pin a failed remote call
+        else:
+            self._count(unknown=1)
+            return None
+
+        with self._lock:
+            self._lru[key] = country
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+        return country
+
+    def stats(self):
+        index = self.index()
+        with self._lock:
+            data = dict(self._metrics)
+            data['lru_entries'] = len(self._lru)
+        data['index'] = {'path': self.path, 'ranges': index.ranges} if index else None
+        data['remote_fallback'] = self.remote_fallback
+        return data
+
+
+GEOIP = GeoIPResolver()
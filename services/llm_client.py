@@ -0,0 +1,390 @@
+"""Shared LLM call path: content-addressed response cache, coalescing, retries, metrics.
+
+Every call site hands over the exact inputs that shape the reply (model,
+system prompt, user prompt, generation config). Their canonical JSON is
+hashed into the cache key, so an identical prompt for the same creator and
+brand is answered from cache instead of being re-billed.
+
+    value = LLM.call('ai_depth', key_material, produce)
+    if not valid(value):
+        LLM.forget('ai_depth', key_material)  # never replay a rejected reply
+
+refresh=True (a user's explicit "regenerate") skips the cache read and
+overwrites the entry with the new reply.
+
+Lookups go Redis -> Postgres (llm_response_cache, for call types with
+persist=True) -> produce(). An in-process LRU stands in for Redis when it is
+down. Concurrent identical calls in one worker wait for the first one; across
+workers a short Redis lock makes followers poll for the leader's result.
+gemini_generate() is the REST transport with timeouts and retries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from services.redis_client import get_redis, mark_redis_failed
+
+GEMINI_API_BASE = os.getenv('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+_LOCAL_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1000'))
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_LOCK_POLL = 0.25
+
+
+class LLMCallType:
+    """Cache TTL, Postgres persistence, timeout and retry budget for one kind of call."""
+
+    def __init__(self, name, ttl, timeout=30, retries=2, persist=False, version=1):
+        self.name = name
+        self.ttl = int(os.getenv(f'LLM_CACHE_TTL_{name.upper()}', ttl))
+        self.timeout = timeout
+        self.retries = retries
+        self.persist = persist
+        # Bump when a prompt template changes meaning without changing its text inputs
+        self.version = version
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+CALL_TYPES = {
+    call_type.name: call_type for call_type in (
+        LLMCallType('ai_depth', 7 * DAY, timeout=30, persist=True),
+        LLMCallType('mentor_rank', HOUR, timeout=45, retries=1),
+        LLMCallType('pitch', DAY, timeout=60, retries=0),
+        LLMCallType('pr_package', 7 * DAY, timeout=90, retries=0, persist=True),
+        LLMCallType('text_analysis', 30 * DAY, timeout=30, persist=True),
+    )
+}
+
+
+class LLMReply:
+    """What produce() returns: the value to hand back (None = don't cache) and token usage."""
+
+    __slots__ = ('value', 'input_tokens', 'output_tokens')
+
+    def __init__(self, value, input_tokens=0, output_tokens=0):
+        self.value = value
+        self.input_tokens = int(input_tokens or 0)
+        self.output_tokens = int(output_tokens or 0)
+
+
+def content_key(call_type, key_material):
+    """llm:<type>:<sha256 of canonical JSON of the inputs>."""
+    canonical = json.dumps(
+        {'v': call_type.version, 'in': key_material},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return f'llm:{call_type.name}:{hashlib.sha256(canonical.encode()).hexdigest()}'
+
+
+class LLMClient:
+    def __init__(self, call_types=None, max_local_entries=_LOCAL_MAX_ENTRIES):
+        self.call_types = dict(call_types or CALL_TYPES)
+        self.max_local_entries = max_local_entries
+        self._local = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._pg_ready = None
+
+    # ---- metrics ----------------------------------------------------------
+
+    def _count(self, name, **counts):
+        with self._lock:
+            metrics = self._metrics.setdefault(name, {
+                'calls': 0, 'hits': 0, 'pg_hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0,
+                'api_ms': 0, 'api_max_ms': 0, 'input_tokens': 0, 'output_tokens': 0,
+            })
+            for key, value in counts.items():
+                if key == 'api_max_ms':
+                    metrics[key] = max(metrics[key], value)
+                else:
+                    metrics[key] += value
+
+    def stats(self):
+        """Per call type: cache hits/misses, coalesced waits, API latency and tokens (this worker)."""
+        with self._lock:
+            data = {name: dict(metrics) for name, metrics in self._metrics.items()}
+            local_entries = len(self._local)
+        for metrics in data.values():
+            api_calls = metrics['misses'] - metrics['errors']
+            metrics['api_avg_ms'] = round(metrics['api_ms'] / api_calls) if api_calls > 0 else 0
+            lookups = metrics['calls']
+            metrics['hit_rate'] = round((metrics['hits'] + metrics['pg_hits']) / lookups, 3) if lookups else 0.0
+        return {'call_types': data, 'local_entries': local_entries}
+
+    # ---- cache tiers ------------------------------------------------------
+
+    def _get_fast(self, key):
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+                return raw.decode() if isinstance(raw, bytes) else raw
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] > time.time():
+                self._local.move_to_end(key)
+                return entry[1]
+            if entry:
+                self._local.pop(key, None)
+        return None
+
+    def _set_fast(self, key, raw, ttl):
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, raw, ex=ttl)
+                return
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            self._local[key] = (time.time() + ttl, raw)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def _pg(self, fn):
+        """Run fn(cursor) on a pooled autocommit connection; the tier switches off if the table is missing."""
+        if self._pg_ready is False:
+            return None
+        try:
+            from services.db_pool import get_db_connection
+            conn = get_db_connection(autocommit=True)
+        except Exception:
+            return None
+        try:
+            cursor = conn.cursor()
+            if self._pg_ready is None:
+                cursor.execute("SELECT to_regclass('llm_response_cache') IS NOT NULL")
+                self._pg_ready = bool(cursor.fetchone()[0])
+                if not self._pg_ready:
+                    print("[LLM] llm_response_cache missing; run migrations/add_llm_response_cache.sql")
+                    return None
+            return fn(cursor)
+        except Exception as e:
+            print(f"[LLM] Postgres cache error: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def _get_pg(self, key):
+        def lookup(cursor):
+            cursor.execute("""
+                UPDATE llm_response_cache SET hits = hits + 1
+                WHERE cache_key = %s AND expires_at > NOW()
+                RETURNING value, GREATEST(EXTRACT(EPOCH FROM expires_at - NOW()), 1)::int
+            """, (key,))
+            return cursor.fetchone()
+        return self._pg(lookup)
+
+    def _set_pg(self, key, call_type, raw, reply):
+        def store(cursor):
+            cursor.execute("""
+                INSERT INTO llm_response_cache
+                    (cache_key, call_type, value, input_tokens, output_tokens, expires_at)
+                VALUES (%s, %s, %s, %s, %s, NOW() + make_interval(secs => %s))
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    input_tokens = EXCLUDED.input_tokens,
+                    output_tokens = EXCLUDED.output_tokens,
+                    created_at = NOW(),
+                    expires_at = EXCLUDED.expires_at
+            """, (key, call_type.name, raw, reply.input_tokens,
+                  reply.output_tokens, call_type.ttl))
+        self._pg(store)
+
+    def lookup(self, call_type, key):
+        """Cached reply as a JSON string, or None. Callers decode their own copy."""
+        raw = self._get_fast(key)
+        if raw is not None:
+            self._count(call_type.name, hits=1)
+            return raw
+        if call_type.persist:
+            row = self._get_pg(key)
+            if row is not None:
+                value, remaining = row
+                raw = json.dumps(value)
+                self._set_fast(key, raw, min(call_type.ttl, remaining))
+                self._count(call_type.name, pg_hits=1)
+                return raw
+        return None
+
+    def forget(self, call_type_name, key_material):
+        """Drop one cached reply, e.g. after the caller found it unusable."""
+        call_type = self.call_types[call_type_name]
+        key = content_key(call_type, key_material)
+        with self._lock:
+            self._local.pop(key, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(key)
+            except Exception:
+                mark_redis_failed()
+        if call_type.persist:
+            self._pg(lambda cursor: cursor.execute(
+                "DELETE FROM llm_response_cache WHERE cache_key = %s", (key,)))
+
+    # ---- the call path ----------------------------------------------------
+
+    def _wait_for_peer(self, call_type, key):
+        """Another worker holds the lock for this key: poll for its result until the lock lapses."""
+        client = get_redis()
+        if client is None:
+            return None
+        deadline = time.monotonic() + call_type.timeout * (call_type.retries + 1)
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(_LOCK_POLL)
+                raw = client.get(key)
+                if raw:
+                    return raw.decode() if isinstance(raw, bytes) else raw
+                if not client.exists(f'{key}:lock'):
+                    return None
+        except Exception:
+            mark_redis_failed()
+        return None
+
+    def _produce(self, call_type, key, produce, ttl):
+        client = get_redis()
+        lock_key = f'{key}:lock'
+        lock_ttl = call_type.timeout * (call_type.retries + 1) + 5
+        locked = False
+        if client is not None:
+            try:
+                locked = bool(client.set(lock_key, '1', nx=True, ex=lock_ttl))
+                if not locked:
+                    raw = self._wait_for_peer(call_type, key)
+                    if raw is not None:
+                        self._count(call_type.name, coalesced=1)
+                        return json.loads(raw), raw
+            except Exception:
+                mark_redis_failed()
+
+        self._count(call_type.name, misses=1)
+        started = time.monotonic()
+        try:
+            reply = produce()
+        except Exception:
+            self._count(call_type.name, errors=1)
+            raise
+        finally:
+            if locked:
+                try:
+                    client.delete(lock_key)
+                except Exception:
+                    mark_redis_failed()
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        self._count(call_type.name, api_ms=elapsed_ms, api_max_ms=elapsed_ms,
+                    input_tokens=reply.input_tokens, output_tokens=reply.output_tokens)
+        if reply.value is None:
+            return None, None
+        raw = json.dumps(reply.value)
+        self._set_fast(key, raw, ttl)
+        if call_type.persist:
+            self._set_pg(key, call_type, raw, reply)
+        return reply.value, raw
+
+    def call(self, call_type_name, key_material, produce: Callable[[], LLMReply],
+             ttl: Optional[int] = None, refresh: bool = False) -> Any:
+        """
+        Cached value for these inputs, else produce().value (cached unless None).
+        refresh=True always produces and replaces the cached value.
+
+        Exceptions from produce() propagate to the caller and to every caller
+        coalesced onto it; nothing is cached for them.
+        """
+        call_type = self.call_types[call_type_name]
+        key = content_key(call_type, key_material)
+        self._count(call_type.name, calls=1)
+
+        raw = None if refresh else self.lookup(call_type, key)
+        if raw is not None:
+            return json.loads(raw)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            self._count(call_type.name, coalesced=1)
+            raw = future.result()
+            return json.loads(raw) if raw is not None else None
+
+        try:
+            value, raw = self._produce(call_type, key, produce, int(ttl or call_type.ttl))
+            future.set_result(raw)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+LLM = LLMClient()
+
+
+def gemini_generate(call_type_name, model, payload, api_key=None) -> Dict:
+    """
+    POST a generateContent request with the call type's timeout and retry budget.
+
+    Retries timeouts, connection errors, 429 and 5xx with exponential backoff
+    (Retry-After when given). Returns {'text', 'input_tokens', 'output_tokens',
+    'finish_reason', 'raw'}; raises requests.RequestException when out of retries.
+    """
+    call_type = CALL_TYPES[call_type_name]
+    api_key = api_key or os.getenv('GEMINI_API_KEY')
+    url = f'{GEMINI_API_BASE}/models/{model}:generateContent?key={api_key}'
+    for attempt in range(call_type.retries + 1):
+        last_attempt = attempt == call_type.retries
+        try:
+            response = requests.post(url, json=payload, timeout=call_type.timeout)
+        except (requests.Timeout, requests.ConnectionError):
+            if last_attempt:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+            continue
+        if response.status_code in _RETRY_STATUSES and not last_attempt:
+            try:
+                delay = float(response.headers.get('retry-after'))
+            except (TypeError, ValueError):
+                delay = 0.5 * 2 ** attempt
+            time.sleep(min(delay, 10.0))
+            continue
+        response.raise_for_status()
+        result = response.json()
+        candidates = result.get('candidates') or [{}]
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        usage = result.get('usageMetadata') or {}
+        return {
+            'text': ''.join(p.get('text', '') for p in parts if isinstance(p, dict)),
+            'input_tokens': usage.get('promptTokenCount', 0),
+            'output_tokens': usage.get('candidatesTokenCount', 0),
+            'finish_reason': candidates[0].get('finishReason'),
+            'raw': result,
+        }
+    raise requests.HTTPError(f'Gemini {call_type_name} failed after {call_type.retries} retries')
+
+
+def sdk_usage(response):
+    """(input, output) token counts from a google-genai SDK response, or zeros."""
+    usage = getattr(response, 'usage_metadata', None)
+    return (
+        getattr(usage, 'prompt_token_count', 0) or 0,
+        getattr(usage, 'candidates_token_count', 0) or 0,
+    )
@@ -0,0 +1,235 @@
+"""Shared mail plumbing for every sender: templates, SMTP, Resend HTTP, user lookups.
+
+- get_template_env(): one Jinja environment per template dir, compiled
+  templates kept in memory (no per-email loader or mtime checks).
+- send_smtp_message(): keep-alive SMTP connections per (host, port, user),
+  so a cron sending hundreds of reminders pays STARTTLS + login once.
+- http_session(): pooled requests.Session for the Resend API.
+- lookup_user_id(): recipient email -> users.id, cached briefly.
+"""
+
+import os
+import smtplib
+import threading
+import time
+from functools import lru_cache
+
+import requests
+from jinja2 import Environment, FileSystemLoader
+from requests.adapters import HTTPAdapter
+
+from services.db_pool import get_db_connection
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+SMTP_TIMEOUT = int(os.getenv('SMTP_TIMEOUT', '20'))
+# Providers drop idle sessions after a minute or two; don't hand out older ones.
+SMTP_IDLE_TIMEOUT = int(os.getenv('SMTP_IDLE_TIMEOUT', '60'))
+# Gmail caps messages per session at ~100; reconnect a bit before that.
+SMTP_MAX_MESSAGES_PER_CONN = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONN', '90'))
+SMTP_MAX_IDLE_CONNS = int(os.getenv('SMTP_MAX_IDLE_CONNS', '2'))
+USER_ID_CACHE_TTL = int(os.getenv('MAIL_USER_ID_CACHE_TTL', '600'))
+
+
+# ============================================
+# TEMPLATES
+# ============================================
+
+@lru_cache(maxsize=8)
+def get_template_env(template_dir=TEMPLATE_DIR):
+    """Cached Jinja environment. Templates compile once per process."""
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+def render_template(template_name, context, template_dir=TEMPLATE_DIR):
+    return get_template_env(template_dir).get_template(template_name).render(**context)
+
+
+# ============================================
+# SMTP CONNECTION POOL
+# ============================================
+
+class SMTPPool:
+    """Idle authenticated SMTP sessions keyed by (host, port, username)."""
+
+    def __init__(self, max_idle=SMTP_MAX_IDLE_CONNS, idle_timeout=SMTP_IDLE_TIMEOUT,
+                 max_messages=SMTP_MAX_MESSAGES_PER_CONN, timeout=SMTP_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._idle = {}  # key -> [(server, last_used, sent_count)]
+        self._lock = threading.Lock()
+        self.stats = {'connects': 0, 'reuses': 0, 'messages': 0}
+
+    def _connect(self, host, port, username, password):
+        server = smtplib.SMTP(host, port, timeout=self.timeout)
+        try:
+            server.starttls()
+            if username and password:
+                server.login(username, password)
+        except Exception:
+            _close_quietly(server)
+            raise
+        with self._lock:
+            self.stats['connects'] += 1
+        return server
+
+    def _checkout(self, key):
+        now = time.time()
+        stale = []
+        found = None
+        with self._lock:
+            entries = self._idle.get(key) or []
+            while entries:
+                server, last_used, sent = entries.pop()
+                if now - last_used > self.idle_timeout:
+                    stale.append(server)
+                    continue
+                found = (server, sent)
+                self.stats['reuses'] += 1
+                break
+        for server in stale:
+            _close_quietly(server)
+        return found
+
+    def _checkin(self, key, server, sent):
+        if sent >= self.max_messages:
+            _close_quietly(server)
+            return
+        with self._lock:
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < self.max_idle:
+                entries.append((server, time.time(), sent))
+                return
+        _close_quietly(server)
+
+    def sendmail(self, host, port, username, password, from_addr, to_addrs, message):
+        """sendmail() on a pooled session. A dropped idle session is replaced once."""
+        key = (host, int(port), username)
+        for attempt in range(2):
+            reused = self._checkout(key)
+            if reused:
+                server, sent = reused
+            else:
+                server, sent = self._connect(host, port, username, password), 0
+            lost = None
+            try:
+                server.sendmail(from_addr, to_addrs, message)
+            except smtplib.SMTPServerDisconnected as e:
+                lost = e
+            except smtplib.SMTPException:
+                # Refused recipient etc.: the session is still good
+                self._checkin(key, server, sent + 1)
+                raise
+            except OSError as e:
+                lost = e
+            if lost is not None:
+                _close_quietly(server)
+                if reused and attempt == 0:
+                    continue
+                raise lost
+            with self._lock:
+                self.stats['messages'] += 1
+            self._checkin(key, server, sent + 1)
+            return
+
+    def close_all(self):
+        with self._lock:
+            servers = [s for entries in self._idle.values() for s, _, _ in entries]
+            self._idle.clear()
+        for server in servers:
+            _close_quietly(server)
+
+
+def _close_quietly(server):
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+SMTP_POOL = SMTPPool()
+
+
+def send_smtp_message(msg, to_addrs=None, host=None, port=None, username=None,
+                      password=None, from_addr=None):
+    """Send an email.message through the shared pool. Config defaults to SMTP_* env vars."""
+    host = host or os.getenv('SMTP_SERVER', 'smtp.gmail.com')
+    port = int(port or os.getenv('SMTP_PORT', 587))
+    username = username if username is not None else os.getenv('SMTP_USERNAME')
+    password = password if password is not None else os.getenv('SMTP_PASSWORD')
+    from_addr = from_addr or username
+    if to_addrs is None:
+        to_addrs = [msg['To']]
+    SMTP_POOL.sendmail(host, port, username, password, from_addr, to_addrs, msg.as_string())
+
+
+# ============================================
+# HTTP (RESEND)
+# ============================================
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """Process-wide keep-alive session for mail APIs."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+# ============================================
+# USER ID LOOKUP
+# ============================================
+
+_user_ids = {}  # lower(email) -> (expires_at, user_id or None)
+_user_ids_lock = threading.Lock()
+
+
+def lookup_user_id(email, conn=None):
+    """users.id for a recipient email (lowercased), or None. Hits and misses are cached."""
+    email = (email or '').strip().lower()
+    if not email:
+        return None
+    now = time.time()
+    with _user_ids_lock:
+        entry = _user_ids.get(email)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT id FROM users WHERE email = %s LIMIT 1", (email,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    except Exception as e:
+        print(f"[MailTransport] user id lookup failed: {e}")
+        return None
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
+
+    user_id = (row['id'] if isinstance(row, dict) else row[0]) if row else None
+    with _user_ids_lock:
+        _user_ids[email] = (now + USER_ID_CACHE_TTL, user_id)
+    return user_id
@@ -0,0 +1,519 @@
+"""Shared content cache for the media and logo proxies.
+
+Upstream images are kept on local disk (MEDIA_CACHE_DIR). The disk tier is an
+LRU bounded by total bytes (MEDIA_CACHE_MAX_BYTES). Images small enough are
+also kept in Redis, so other workers can serve them.
+
+An entry stays fresh for the caller's fresh_for. After that, the next request
+revalidates upstream with If-None-Match / If-Modified-Since, and a 304 just
+renews the entry. When the upstream is unreachable, the stale copy is served.
+
+Concurrent misses for one URL in a worker share a single upstream fetch.
+Bodies over MEDIA_CACHE_MAX_ENTRY_BYTES are not cached: they stream straight
+through when their Content-Length is within the caller's max_bytes, and are
+otherwise buffered up to max_bytes (MediaTooLarge past it), so a 200 never
+carries a truncated image. Thumbnails (width=) are downscaled with Pillow when it is installed;
+without it the original is served.
+
+    result = MEDIA_CACHE.get('media', url, headers, fresh_for=DAY)
+    return media_response(result, max_age=86400)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from io import BytesIO
+
+import requests
+from flask import Response, request
+
+from services.redis_client import get_redis, mark_redis_failed
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; thumbnails fall back to the original
+    Image = None
+
+DAY = 24 * 3600
+
+MEDIA_CACHE_DIR = os.getenv('MEDIA_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'newcollab-media-cache')
+MEDIA_CACHE_MAX_BYTES = int(os.getenv('MEDIA_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+MEDIA_CACHE_MAX_ENTRY_BYTES = int(os.getenv('MEDIA_CACHE_MAX_ENTRY_BYTES', str(2 * 1024 * 1024)))
+MEDIA_CACHE_REDIS_MAX_BYTES = int(os.getenv('MEDIA_CACHE_REDIS_MAX_BYTES', str(256 * 1024)))
+MEDIA_CACHE_REDIS_TTL = int(os.getenv('MEDIA_CACHE_REDIS_TTL', str(7 * DAY)))
+
+THUMBNAIL_WIDTHS = (64, 128, 256, 512)
+_CHUNK = 64 * 1024
+
+
+class MediaUnavailable(Exception):
+    """Upstream answered with a non-image status (expired signed URL, 404...)."""
+
+    def __init__(self, status_code):
+        super().__init__(f'upstream {status_code}')
+        self.status_code = status_code
+
+
+class MediaTooLarge(Exception):
+    """Upstream body (declared or read) is over the caller's max_bytes."""
+
+
+def cache_key(namespace, url):
+    return f"{namespace}:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+
+def thumbnail_width(raw):
+    """Requested width snapped up to THUMBNAIL_WIDTHS, None for no/invalid width."""
+    try:
+        width = int(raw)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0:
+        return None
+    for allowed in THUMBNAIL_WIDTHS:
+        if width <= allowed:
+            return allowed
+    return None
+
+
+class CachedMedia:
+    """One stored body plus what is needed to serve and revalidate it."""
+
+    META_FIELDS = ('content_type', 'etag', 'upstream_etag', 'last_modified', 'fresh_until', 'source_etag')
+
+    def __init__(self, body, content_type, fresh_until, upstream_etag=None, last_modified=None,
+                 etag=None, source_etag=None):
+        self.body = body
+        self.content_type = content_type
+        self.fresh_until = fresh_until
+        self.upstream_etag = upstream_etag
+        self.last_modified = last_modified
+        # What browsers see: a digest of the bytes, stable across upstream URL changes
+        self.etag = etag or hashlib.sha1(body).hexdigest()
+        self.source_etag = source_etag
+
+    @property
+    def fresh(self):
+        return self.fresh_until > time.time()
+
+    def meta(self):
+        return {field: getattr(self, field) for field in self.META_FIELDS}
+
+    @classmethod
+    def from_meta(cls, body, meta):
+        return cls(body, **meta)
+
+
+class MediaResult:
+    """What a route serves: a cached entry, or a pass-through stream for large bodies."""
+
+    __slots__ = ('status', 'content_type', 'entry', 'stream')
+
+    def __init__(self, status, content_type, entry=None, stream=None):
+        self.status = status
+        self.content_type = content_type
+        self.entry = entry
+        self.stream = stream
+
+
+def _read_up_to(response, limit):
+    """(body, None) when the body fits in limit, else (prefix, iterator over the rest)."""
+    chunks = response.iter_content(_CHUNK)
+    buf = bytearray()
+    for chunk in chunks:
+        buf.extend(chunk)
+        if len(buf) > limit:
+            return bytes(buf), chunks
+    return bytes(buf), None
+
+
+def _drain_up_to(prefix, rest, limit):
+    """Whole body from a prefix + iterator, raising MediaTooLarge past limit."""
+    buf = bytearray(prefix)
+    for chunk in rest:
+        buf.extend(chunk)
+        if len(buf) > limit:
+            raise MediaTooLarge(f'over {limit} bytes')
+    return bytes(buf)
+
+
+def _pass_through(prefix, rest, response):
+    try:
+        yield prefix
+        yield from rest
+    finally:
+        response.close()
+
+
+def _downscale(body, width):
+    """(bytes, content_type) of the image resized to width, or None when not smaller/decodable."""
+    try:
+        with Image.open(BytesIO(body)) as img:
+            if img.width <= width:
+                return None
+            height = max(1, round(img.height * width / img.width))
+            fmt = 'PNG' if img.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+            resized = img.convert('RGBA' if fmt == 'PNG' else 'RGB').resize((width, height), Image.LANCZOS)
+            out = BytesIO()
+            resized.save(out, fmt, optimize=True, **({'quality': 82} if fmt == 'JPEG' else {}))
+            return out.getvalue(), f'image/{fmt.lower()}'
+    except Exception as e:
+        print(f"[MediaCache] thumbnail failed: {e}")
+        return None
+
+
+class MediaCache:
+    def __init__(self, directory=MEDIA_CACHE_DIR, max_bytes=MEDIA_CACHE_MAX_BYTES,
+                 max_entry_bytes=MEDIA_CACHE_MAX_ENTRY_BYTES, redis_max_bytes=MEDIA_CACHE_REDIS_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.redis_max_bytes = redis_max_bytes
+        # key -> (size, entry); entry is None when the body lives on disk
+        self._index = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._metrics = dict.fromkeys((
+            'hits', 'redis_hits', 'misses', 'revalidated', 'stale_served', 'coalesced',
+            'passthrough', 'upstream_errors', 'evictions', 'thumbnails', 'thumbnail_hits',
+            'bytes_fetched',
+        ), 0)
+
+    # ---- metrics ----------------------------------------------------------
+
+    def _count(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self._metrics[key] += value
+
+    def stats(self):
+        """Hit/miss/revalidation counters and local tier size (this worker)."""
+        with self._lock:
+            data = dict(self._metrics)
+            data.update(entries=len(self._index), bytes=self._bytes, max_bytes=self.max_bytes,
+                        disk=self.directory is not None)
+        served = data['hits'] + data['redis_hits'] + data['revalidated'] + data['stale_served'] + data['coalesced']
+        lookups = served + data['misses'] + data['passthrough']
+        data['hit_rate'] = round(served / lookups, 3) if lookups else 0.0
+        data['thumbnails_enabled'] = Image is not None
+        return data
+
+    # ---- local tier: disk (or memory when the directory is unusable) -------
+
+    def _paths(self, key):
+        name = key.replace(':', '_')
+        return os.path.join(self.directory, f'{name}.bin'), os.path.join(self.directory, f'{name}.json')
+
+    def _load_index(self):
+        """Adopt files left by earlier processes, oldest first, once per process."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.directory is None:
+                return
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                found = []
+                for name in os.listdir(self.directory):
+                    if name.endswith('.json'):
+                        body_path = os.path.join(self.directory, name[:-5] + '.bin')
+                        if os.path.exists(body_path):
+                            stat = os.stat(body_path)
+                            found.append((stat.st_mtime, name[:-5].replace('_', ':', 1), stat.st_size))
+            except OSError as e:
+                print(f"[MediaCache] disk tier unavailable, keeping bodies in memory: {e}")
+                self.directory = None
+                return
+            for _, key, size in sorted(found):
+                self._index[key] = (size, None)
+                self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        removed = []
+        with self._lock:
+            while self._bytes > self.max_bytes and self._index:
+                key, (size, _) = self._index.popitem(last=False)
+                self._bytes -= size
+                removed.append(key)
+            self._metrics['evictions'] += len(removed)
+        if self.directory is not None:
+            for key in removed:
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def _drop_local(self, key):
+        with self._lock:
+            size, _ = self._index.pop(key, (0, None))
+            self._bytes -= size
+        if self.directory is not None:
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _get_local(self, key):
+        self._load_index()
+        with self._lock:
+            item = self._index.get(key)
+            if item is None:
+                return None
+            self._index.move_to_end(key)
+            if item[1] is not None:
+                return item[1]
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            os.utime(body_path)
+        except (OSError, ValueError, TypeError):
+            # Evicted by another worker sharing the directory
+            self._drop_local(key)
+            return None
+        return CachedMedia.from_meta(body, meta)
+
+    def _write_file(self, path, data, mode):
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _set_local(self, key, entry, body_changed=True):
+        self._load_index()
+        stored = entry
+        if self.directory is not None:
+            body_path, meta_path = self._paths(key)
+            try:
+                if body_changed or not os.path.exists(body_path):
+                    self._write_file(body_path, entry.body, 'wb')
+                self._write_file(meta_path, json.dumps(entry.meta()), 'w')
+                stored = None
+            except OSError as e:
+                print(f"[MediaCache] disk write failed: {e}")
+        size = len(entry.body)
+        with self._lock:
+            old_size, _ = self._index.pop(key, (0, None))
+            self._index[key] = (size, stored)
+            self._bytes += size - old_size
+        self._evict()
+
+    # ---- shared tier: Redis -----------------------------------------------
+
+    def _get_redis(self, key):
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            data = client.hgetall(f'media:{key}')
+        except Exception:
+            mark_redis_failed()
+            return None
+        if not data or b'body' not in data or b'meta' not in data:
+            return None
+        try:
+            return CachedMedia.from_meta(data[b'body'], json.loads(data[b'meta']))
+        except (ValueError, TypeError):
+            return None
+
+    def _set_redis(self, key, entry):
+        if len(entry.body) > self.redis_max_bytes:
+            return
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.hset(f'media:{key}', mapping={'body': entry.body, 'meta': json.dumps(entry.meta())})
+            pipe.expire(f'media:{key}', MEDIA_CACHE_REDIS_TTL)
+            pipe.execute()
+        except Exception:
+            mark_redis_failed()
+
+    def _lookup(self, key):
+        """(entry, tier) from disk/memory, then Redis (promoted to local)."""
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry, 'local'
+        entry = self._get_redis(key)
+        if entry is not None:
+            self._set_local(key, entry)
+            return entry, 'redis'
+        return None, None
+
+    def _store(self, key, entry, body_changed=True):
+        self._set_local(key, entry, body_changed)
+        self._set_redis(key, entry)
+
+    def forget(self, key):
+        self._drop_local(key)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(f'media:{key}')
+            except Exception:
+                mark_redis_failed()
+
+    # ---- upstream ---------------------------------------------------------
+
+    def _fetch(self, key, url, headers, stale, fresh_for, timeout, max_bytes):
+        request_headers = dict(headers or {})
+        if stale is not None:
+            if stale.upstream_etag:
+                request_headers['If-None-Match'] = stale.upstream_etag
+            if stale.last_modified:
+                request_headers['If-Modified-Since'] = stale.last_modified
+        try:
+            response = requests.get(url, headers=request_headers, timeout=timeout, stream=True)
+        except requests.RequestException:
+            self._count(upstream_errors=1)
+            if stale is not None:
+                self._count(stale_served=1)
+                return MediaResult('STALE', stale.content_type, entry=stale)
+            raise
+
+        if response.status_code == 304 and stale is not None:
+            response.close()
+            stale.fresh_until = time.time() + fresh_for
+            self._store(key, stale, body_changed=False)
+            self._count(revalidated=1)
+            return MediaResult('REVALIDATED', stale.content_type, entry=stale)
+
+        if response.status_code != 200:
+            response.close()
+            self._count(upstream_errors=1)
+            if stale is not None and response.status_code >= 500:
+                self._count(stale_served=1)
+                return MediaResult('STALE', stale.content_type, entry=stale)
+            if stale is not None:
+                self.forget(key)
+            raise MediaUnavailable(response.status_code)
+
+        try:
+            declared = int(response.headers.get('Content-Length') or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_bytes:
+            response.close()
+            raise MediaTooLarge(f'{declared} bytes')
+
+        content_type = response.headers.get('Content-Type') or ''
+        body, rest = _read_up_to(response, min(self.max_entry_bytes, max_bytes))
+        if rest is not None:
+            # Too big to cache. The cap has to hold before the 200 goes out, so
+            # only a body with a Content-Length within max_bytes streams; an
+            # undeclared one is buffered up to max_bytes first.
+            try:
+                if len(body) > max_bytes:
+                    raise MediaTooLarge(f'over {max_bytes} bytes')
+                if declared:
+                    self._count(passthrough=1, bytes_fetched=declared)
+                    return MediaResult('PASS', content_type, stream=_pass_through(body, rest, response))
+                body = _drain_up_to(body, rest, max_bytes)
+            except BaseException:
+                response.close()
+                raise
+            response.close()
+            self._count(passthrough=1, bytes_fetched=len(body))
+            return MediaResult('PASS', content_type, stream=iter((body,)))
+        response.close()
+
+        entry = CachedMedia(
+            body, content_type, time.time() + fresh_for,
+            upstream_etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        self._count(misses=1, bytes_fetched=len(body))
+        if body:
+            self._store(key, entry)
+        return MediaResult('MISS', content_type, entry=entry)
+
+    def get(self, namespace, url, headers=None, fresh_for=DAY, timeout=12, max_bytes=5 * 1024 * 1024):
+        """
+        MediaResult for url: cached, revalidated, fetched, or streamed through.
+
+        Raises MediaUnavailable for upstream non-200s, MediaTooLarge when the
+        body is over max_bytes (checked before anything is served), and
+        requests.RequestException when the fetch fails with nothing cached. A result's content_type is the
+        upstream's; callers apply their own defaults.
+        """
+        key = cache_key(namespace, url)
+        entry, tier = self._lookup(key)
+        if entry is not None and entry.fresh:
+            self._count(**({'hits': 1} if tier == 'local' else {'redis_hits': 1}))
+            return MediaResult('HIT', entry.content_type, entry=entry)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            result = future.result()
+            if result.stream is None:
+                self._count(coalesced=1)
+                return MediaResult('COALESCED', result.content_type, entry=result.entry)
+            # A stream can only be read once: fetch our own copy
+            return self._fetch(key, url, headers, entry, fresh_for, timeout, max_bytes)
+
+        try:
+            result = self._fetch(key, url, headers, entry, fresh_for, timeout, max_bytes)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def thumbnail(self, namespace, url, result, width):
+        """result downscaled to width (cached per source version); result itself when not possible."""
+        if Image is None or not width or result.entry is None or not result.entry.body:
+            return result
+        source = result.entry
+        key = f'{cache_key(namespace, url)}.w{width}'
+        thumb, _ = self._lookup(key)
+        if thumb is not None and thumb.source_etag == source.etag:
+            self._count(thumbnail_hits=1)
+            return MediaResult(result.status, thumb.content_type, entry=thumb)
+        scaled = _downscale(source.body, width)
+        if scaled is None:
+            return result
+        body, content_type = scaled
+        thumb = CachedMedia(body, content_type, source.fresh_until, source_etag=source.etag)
+        self._store(key, thumb)
+        self._count(thumbnails=1)
+        return MediaResult(result.status, content_type, entry=thumb)
+
+
+def media_response(result, content_type, max_age):
+    """Flask response for a MediaResult: ETag + conditional 304 for cached bodies, streamed otherwise."""
+    if result.stream is not None:
+        response = Response(result.stream, mimetype=content_type, direct_passthrough=True)
+    else:
+        response = Response(result.entry.body, mimetype=content_type)
+        response.set_etag(result.entry.etag)
+        response = response.make_conditional(request)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    response.headers['X-Media-Cache'] = result.status
+    return response
+
+
+MEDIA_CACHE = MediaCache()
@@ -9,7 +9,7 @@ Flow:
 2. Brand-aware calculator scores every candidate
 3. Diversity cap + weekly rotation already applied upstream
 4. Gemini optionally reorders IDs; displayed score stays calculator
-5. Cache successful ranks (~1 hour)
+5. Cache successful ranks (~1 hour, shared via services.recommendation_cache)
 """
 
 from __future__ import annotations
@@ -18,7 +18,6 @@ import hashlib
 import json
 import os
 import re
-import time
 from collections import Counter
 from typing import Dict, List, Optional, Tuple
 
@@ -26,9 +25,12 @@ import requests
 
 from services.fit_score_calculator import (
     score_brand_for_creator,
+    score_brands_for_creator,
     PRIMARY_NICHE_ADJACENCY,
     _mapped_category,
 )
+from services.llm_client import LLM, LLMReply, gemini_generate
+from services.recommendation_cache import MENTOR_MATCH_STORE
 
 
 def _gemini_api_key() -> Optional[str]:
@@ -39,8 +41,6 @@ def _gemini_model() -> str:
     return os.getenv('MENTOR_MATCH_MODEL') or os.getenv('GEMINI_MODEL') or 'gemini-2.5-flash'
 
 
-_MATCH_CACHE: Dict[int, Tuple[float, str, List[Dict]]] = {}
-_CACHE_TTL_SEC = int(os.getenv('MENTOR_MATCH_CACHE_TTL', '3600'))
 
 MATCHMAKER_SYSTEM = '''You are NewCollab's AI talent manager.
 Rank pre-approved brand IDs for ONE creator using their scraped social profile AND onboarding interests.
@@ -186,10 +186,6 @@ def _call_gemini_rank(prompt: str) -> List[int]:
         raise ValueError('GEMINI_API_KEY not configured')
 
     model = _gemini_model()
-    url = (
-        f'https://generativelanguage.googleapis.com/v1beta/models/'
-        f'{model}:generateContent?key={api_key}'
-    )
     payload = {
         'contents': [{'parts': [{'text': f'{MATCHMAKER_SYSTEM}\n\n{prompt}'}]}],
         'generationConfig': {
@@ -201,21 +197,24 @@ def _call_gemini_rank(prompt: str) -> List[int]:
             'responseSchema': MATCH_SCHEMA,
         },
     }
-    response = requests.post(url, json=payload, timeout=45)
-    if response.status_code >= 400:
-        print(f'[MentorMatch] schema call HTTP {response.status_code}; retrying plain JSON')
-        payload['generationConfig'].pop('responseSchema', None)
-        response = requests.post(url, json=payload, timeout=45)
-    response.raise_for_status()
-    result = response.json()
-    candidates = result.get('candidates') or []
-    if not candidates:
-        raise ValueError(f'Gemini returned no candidates: {result.get("promptFeedback")}')
-    parts = candidates[0].get('content', {}).get('parts') or []
-    text = ''.join(p.get('text', '') for p in parts if isinstance(p, dict))
-    if not text:
-        raise ValueError(f'Gemini empty text (finishReason={candidates[0].get("finishReason")})')
-    return _parse_ranked_ids(text)
+
+    def produce():
+        try:
+            reply = gemini_generate('mentor_rank', model, payload, api_key=api_key)
+        except requests.HTTPError as e:
+            print(f'[MentorMatch] schema call HTTP {e.response.status_code if e.response is not None else "?"}; '
+                  f'retrying plain JSON')
+            plain = dict(payload, generationConfig={
+                k: v for k, v in payload['generationConfig'].items() if k != 'responseSchema'
+            })
+            reply = gemini_generate('mentor_rank', model, plain, api_key=api_key)
+        if not reply['raw'].get('candidates'):
+            raise ValueError(f'Gemini returned no candidates: {reply["raw"].get("promptFeedback")}')
+        if not reply['text']:
+            raise ValueError(f'Gemini empty text (finishReason={reply["finish_reason"]})')
+        return LLMReply(_parse_ranked_ids(reply['text']), reply['input_tokens'], reply['output_tokens'])
+
+    return LLM.call('mentor_rank', {'model': model, 'payload': payload}, produce)
 
 
 _WEAK_PRIMARIES = frozenset({
@@ -355,14 +354,29 @@ def diversify_matches(
     return out
 
 
-def _apply_brand_score(brand: Dict, profile: Dict, interest_niches: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
-    brand_dict = dict(brand)
-    fit = score_brand_for_creator(profile, brand_dict, interest_niches=interest_niches)
+def _stamp_fit(brand_dict: Dict, fit: Dict) -> Dict:
     brand_dict['match_score'] = fit['overall_score']
     brand_dict['fit_tier'] = fit['tier']
     brand_dict['fit_status'] = fit['status']
     brand_dict['fit_label'] = fit['label']
-    return brand_dict, fit
+    return brand_dict
+
+
+def _apply_brand_score(brand: Dict, profile: Dict, interest_niches: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
+    brand_dict = dict(brand)
+    fit = score_brand_for_creator(profile, brand_dict, interest_niches=interest_niches)
+    return _stamp_fit(brand_dict, fit), fit
+
+
+def _apply_brand_scores(
+    brands: List[Dict],
+    profile: Dict,
+    interest_niches: Optional[List[str]] = None,
+) -> List[Tuple[Dict, Dict]]:
+    """Batch _apply_brand_score: one creator parse for the whole list."""
+    brand_dicts = [dict(b) for b in brands]
+    fits = score_brands_for_creator(profile, brand_dicts, interest_niches=interest_niches)
+    return [(_stamp_fit(b, fit), fit) for b, fit in zip(brand_dicts, fits)]
 
 
 def _prefilter_candidates(
@@ -374,8 +388,7 @@ def _prefilter_candidates(
     """Brand-aware gate. Rank by real scores, then diversify the shortlist."""
     interest_niches = interest_niches or []
     scored = []
-    for brand in brands:
-        brand_dict, fit = _apply_brand_score(brand, profile, interest_niches)
+    for brand_dict, fit in _apply_brand_scores(brands, profile, interest_niches):
         if fit['overall_score'] < min_score or fit['tier'] in ('stretch_match', 'not_recommended'):
             continue
         scored.append(brand_dict)
@@ -402,6 +415,11 @@ def _fallback_from_calculator(
     """Rank calculator-approved brands by brand-aware score, then diversify."""
     ranked = []
     usable_lane = _has_usable_scrape_lane(profile)
+    unscored = [
+        b for b in brands
+        if not (b.get('fit_tier') and b.get('match_score') is not None)
+    ]
+    fresh = iter(_apply_brand_scores(unscored, profile, interest_niches))
     for brand in brands:
         b = dict(brand)
         if b.get('fit_tier') and b.get('match_score') is not None:
@@ -410,7 +428,7 @@ def _fallback_from_calculator(
             if fit_tier in ('stretch_match', 'not_recommended') or fit_score < 35:
                 continue
         else:
-            b, fit = _apply_brand_score(b, profile, interest_niches)
+            b, fit = next(fresh)
             if fit['tier'] in ('stretch_match', 'not_recommended') or fit['overall_score'] < 35:
                 continue
         if require_scrape_lane and usable_lane and not _in_scrape_lane(profile, b.get('category') or ''):
@@ -510,9 +528,8 @@ def rank_matches_with_mentor(
     fp = _profile_fingerprint(profile, interest_niches) + ':v5lane'
 
     if creator_id and not force_refresh:
-        cached = _MATCH_CACHE.get(int(creator_id))
-        if cached and cached[0] > time.time() and cached[1] == fp:
-            cached_rows = cached[2] or []
+        cached_rows = MENTOR_MATCH_STORE.get(creator_id, fp)
+        if cached_rows is not None:
             if len(cached_rows) >= 6:
                 print(f"[MentorMatch] cache hit creator={creator_id} n={len(cached_rows)}")
                 return [dict(b) for b in cached_rows]
@@ -572,15 +589,11 @@ Return JSON with every ID from the list:
     )
     print(f"[MentorMatch] ranked {len(ranked)} brands for creator={creator_id}")
     if creator_id and len(ranked) >= 4:
-        _MATCH_CACHE[int(creator_id)] = (
-            time.time() + _CACHE_TTL_SEC,
-            fp,
-            [dict(b) for b in ranked],
-        )
+        MENTOR_MATCH_STORE.set(creator_id, fp, [dict(b) for b in ranked])
     elif creator_id:
-        _MATCH_CACHE.pop(int(creator_id), None)
+        MENTOR_MATCH_STORE.invalidate(creator_id)
     return ranked
 
 
 def invalidate_mentor_matches(creator_id: int) -> None:
-    _MATCH_CACHE.pop(int(creator_id), None)
+    MENTOR_MATCH_STORE.invalidate(creator_id)
@@ -0,0 +1,141 @@
+"""Creator niche parsing: one canonical form for creators.niche / creator_niches / pr_wishlist.
+
+Mirrors the SQL in migrations/add_creator_niche_tags.sql, whose trigger keeps
+creators.niche_tags and creators.niche_tokens current on every write. Change
+both together.
+"""
+
+import json
+import re
+
+# Values the various write paths have stored for "no niche".
+EMPTY_VALUES = frozenset({'null', 'none', 'undefined'})
+# Connectors that carry no meaning as a match token ("food & beverage", "home and decor").
+TOKEN_STOPWORDS = frozenset({'and', 'the', 'for', 'with', 'of', 'in'})
+
+_STRIP_CHARS = ' "\'[]{}\t\r\n'
+_TOKEN_SPLIT = re.compile(r'[^a-z0-9]+')
+_SPACES = re.compile(r'\s+')
+
+_COLUMN_READY = None
+
+
+def _raw_items(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    text = str(value).strip()
+    if not text:
+        return []
+    if text.startswith('['):
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list):
+            # jsonb_array_elements: strings unquoted, anything else as JSON text
+            return [p if isinstance(p, str) else json.dumps(p) for p in parsed]
+    elif text.startswith('{'):
+        # Postgres array literal that ended up in a text column
+        text = text.strip('{}')
+    return text.split(',')
+
+
+def parse_niches(value) -> list:
+    """JSON string, CSV, Postgres array literal, plain text or list -> lowercase niches, first-seen order."""
+    niches = []
+    for item in _raw_items(value):
+        if item is None:
+            continue
+        niche = _SPACES.sub(' ', str(item).strip(_STRIP_CHARS)).lower()
+        if niche and niche not in EMPTY_VALUES and niche not in niches:
+            niches.append(niche)
+    return niches
+
+
+def canonical_niches(niche, creator_niches=None) -> list:
+    """creators.niche_tags: For You selections first, then the signup niche."""
+    return parse_niches([*parse_niches(creator_niches), *parse_niches(niche)])
+
+
+def niche_tokens(*values) -> list:
+    """creators.niche_tokens: sorted word set of every niche in values ("tech & gadgets" -> tech, gadgets)."""
+    tokens = set()
+    for value in values:
+        for niche in parse_niches(value):
+            tokens.update(t for t in _TOKEN_SPLIT.split(niche)
+                          if len(t) > 1 and t not in TOKEN_STOPWORDS)
+    return sorted(tokens)
+
+
+def creator_niche_tags(creator: dict) -> list:
+    """niche_tags from a creators row, parsing the raw columns when it was not selected."""
+    tags = creator.get('niche_tags')
+    if tags is not None:
+        return list(tags)
+    return canonical_niches(creator.get('niche'), creator.get('creator_niches'))
+
+
+def niche_tags_column_exists(conn) -> bool:
+    """Cheap catalog check, cached once the migration has landed."""
+    global _COLUMN_READY
+    if _COLUMN_READY is True:
+        return True
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+              AND table_name = 'creators'
+              AND column_name = 'niche_tokens'
+            LIMIT 1
+            """
+        )
+        _COLUMN_READY = cursor.fetchone() is not None
+        return _COLUMN_READY
+    finally:
+        cursor.close()
+
+
+def niche_filter_sql(niche, alias: str = 'c'):
+    """
+    WHERE fragment + params matching a niche filter value with GIN-indexed array operators.
+    Exact canonical niche, or every word of it among the creator's niche/wishlist tokens.
+    Returns (None, []) when the value has nothing to match on.
+    """
+    tags = parse_niches(niche)
+    if not tags:
+        return None, []
+    tokens = niche_tokens(tags)
+    if not tokens:
+        return f"{alias}.niche_tags && %s::text[]", [tags]
+    return (f"({alias}.niche_tags && %s::text[] OR {alias}.niche_tokens @> %s::text[])",
+            [tags, tokens])
+
+
+def split_compound_niche(niche_str):
+    """
+    Normalize compound niches like "tech & gadgets" into individual components.
+    Returns a list of individual niche terms.
+    Examples:
+        "tech & gadgets" -> ["tech", "gadgets", "tech & gadgets"]
+        "food & beverage" -> ["food", "beverage", "food & beverage"]
+        "fitness" -> ["fitness"]
+    """
+    if not niche_str:
+        return []
+
+    niche_lower = niche_str.lower().strip()
+    result = [niche_lower]  # Always include the original
+
+    # Split by common separators
+    for sep in [' & ', ' and ', '/', ', ', '+']:
+        if sep in niche_lower:
+            parts = [p.strip() for p in niche_lower.split(sep) if p.strip()]
+            result.extend(parts)
+            break
+
+    return list(set(result))  # Dedupe
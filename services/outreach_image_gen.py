@@ -14,9 +14,9 @@ import hashlib
 import logging
 import os
 
-import psycopg2
 import requests
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
 
 logger = logging.getLogger(__name__)
 
@@ -256,7 +256,7 @@ def _make_cache_key(brand_id: int, vertical: str, brand_name: str) -> str:
 # ── DB helpers ──────────────────────────────────────────────────────────────
 
 def _db():
-    return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 def _ensure_schema():
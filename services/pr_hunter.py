@@ -13,23 +13,62 @@ Architecture:
 import os
 import re
 import requests
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from psycopg2.extras import execute_values
+from requests.adapters import HTTPAdapter
+
+from services.rate_limiter import TokenBucket
+
+PR_HUNT_ENRICH_WORKERS = int(os.getenv('PR_HUNT_ENRICH_WORKERS', '8'))
+PR_HUNT_CHUNK_SIZE = int(os.getenv('PR_HUNT_CHUNK_SIZE', '5'))
+
+# Requests/second per provider, shared by every enrichment thread in this process.
+# With several Celery worker processes, keep processes x rate under the plan limit.
+API_LIMITS = {
+    'serpapi': TokenBucket(float(os.getenv('PR_HUNTER_SERPAPI_RATE', '5'))),
+    'hunter': TokenBucket(float(os.getenv('PR_HUNTER_HUNTER_RATE', '10'))),
+    'neverbounce': TokenBucket(float(os.getenv('PR_HUNTER_NEVERBOUNCE_RATE', '10'))),
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http_session():
+    """Keep-alive session shared by all API calls in this process."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PR_HUNT_ENRICH_WORKERS * 2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
 
 class PRHunterService:
     """Main service for automated brand discovery and enrichment"""
 
-    def __init__(self):
+    def __init__(self, api_limits=None):
         # API Keys (from environment variables)
         self.serpapi_key = os.getenv('SERPAPI_API_KEY')
         self.hunter_api_key = os.getenv('HUNTER_API_KEY')
         self.neverbounce_api_key = os.getenv('NEVERBOUNCE_API_KEY')
 
-        # Rate limiting
-        self.request_delay = 1.0  # Seconds between API calls
+        # API endpoints (overridable to point at a local stub)
+        self.serpapi_url = os.getenv('SERPAPI_API_BASE', 'https://serpapi.com').rstrip('/') + '/search'
+        self.hunter_url = os.getenv('HUNTER_API_BASE', 'https://api.hunter.io').rstrip('/') + '/v2/email-finder'
+        self.neverbounce_url = os.getenv('NEVERBOUNCE_API_BASE', 'https://api.neverbounce.com').rstrip('/') + '/v4/single/check'
+
+        # Rate limiting: one token bucket per API instead of fixed sleeps
+        self.api_limits = api_limits or API_LIMITS
 
         # Form Scout: Priority platforms for PR application forms
         self.form_platforms = [
@@ -46,6 +85,11 @@ class PRHunterService:
             'jotform.com'
         ]
 
+    def _api_get(self, api: str, url: str, params: Dict):
+        """GET against a provider API, paced by that provider's token bucket."""
+        self.api_limits[api].acquire()
+        return _http_session().get(url, params=params, timeout=30)
+
     # ============================================================================
     # MODULE A: DISCOVERY (Finding the Brands)
     # ============================================================================
@@ -70,30 +114,25 @@ class PRHunterService:
         # Exclude common article/listicle sites
         exclusions = '-site:amazon.com -site:pinterest.com -site:buzzfeed.com -site:allure.com -site:byrdie.com -site:cosmopolitan.com -site:elle.com -site:vogue.com -site:harpersbazaar.com -site:glamour.com -site:refinery29.com -site:popsugar.com -site:insider.com -site:businessinsider.com -site:forbes.com -site:youtube.com -site:reddit.com -site:quora.com'
 
-        # Strategy 1: Direct brand ambassador/influencer program pages
-        ambassador_query = f'{keyword} brand "ambassador program" OR "influencer program" OR "pr application" {exclusions}'
-        ambassador_brands = self._execute_search(ambassador_query, max_results=results_per_strategy)
-        discovered_brands.extend(ambassador_brands)
-
-        # Strategy 2: Shopify Collabs / GRIN partner brands (indicates active PR)
-        platform_query = f'{keyword} brand (site:collabs.shopify.com OR site:app.grin.co OR site:dovetale.com)'
-        platform_brands = self._execute_search(platform_query, max_results=results_per_strategy)
-        discovered_brands.extend(platform_brands)
-
-        # Strategy 3: Brand websites with press/PR pages
-        press_query = f'{keyword} brand site:*.com/pages/press OR site:*.com/pages/pr OR site:*.com/press {exclusions}'
-        press_brands = self._execute_search(press_query, max_results=results_per_strategy)
-        discovered_brands.extend(press_brands)
-
-        # Strategy 4: Typeform/Google Forms for brand applications
-        form_query = f'{keyword} brand (site:typeform.com OR site:docs.google.com/forms) "ambassador" OR "influencer" OR "pr"'
-        form_brands = self._execute_search(form_query, max_results=results_per_strategy)
-        discovered_brands.extend(form_brands)
+        queries = [
+            # Strategy 1: Direct brand ambassador/influencer program pages
+            f'{keyword} brand "ambassador program" OR "influencer program" OR "pr application" {exclusions}',
+            # Strategy 2: Shopify Collabs / GRIN partner brands (indicates active PR)
+            f'{keyword} brand (site:collabs.shopify.com OR site:app.grin.co OR site:dovetale.com)',
+            # Strategy 3: Brand websites with press/PR pages
+            f'{keyword} brand site:*.com/pages/press OR site:*.com/pages/pr OR site:*.com/press {exclusions}',
+            # Strategy 4: Typeform/Google Forms for brand applications
+            f'{keyword} brand (site:typeform.com OR site:docs.google.com/forms) "ambassador" OR "influencer" OR "pr"',
+            # Strategy 5: Brand websites directly (company domains)
+            f'{keyword} brand official website "contact" OR "about us" {exclusions}',
+        ]
 
-        # Strategy 5: Brand websites directly (company domains)
-        brand_query = f'{keyword} brand official website "contact" OR "about us" {exclusions}'
-        brand_results = self._execute_search(brand_query, max_results=results_per_strategy)
-        discovered_brands.extend(brand_results)
+        # Strategies run concurrently; results keep strategy order
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            for strategy_brands in pool.map(
+                lambda query: self._execute_search(query, max_results=results_per_strategy), queries
+            ):
+                discovered_brands.extend(strategy_brands)
 
         # Filter out article/listicle pages
         filtered_brands = []
@@ -176,7 +215,7 @@ class PRHunterService:
         if not self.serpapi_key:
             raise ValueError("SERPAPI_API_KEY not configured")
 
-        url = "https://serpapi.com/search"
+        url = self.serpapi_url
         params = {
             'q': query,
             'api_key': self.serpapi_key,
@@ -185,7 +224,7 @@ class PRHunterService:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._api_get('serpapi', url, params)
             response.raise_for_status()
             data = response.json()
 
@@ -195,7 +234,6 @@ class PRHunterService:
                 if brand_data:
                     results.append(brand_data)
 
-            time.sleep(self.request_delay)  # Rate limiting
             return results
 
         except Exception as e:
@@ -348,7 +386,7 @@ class PRHunterService:
         # Try each query until we find a valid form
         for query in queries:
             try:
-                url = "https://serpapi.com/search"
+                url = self.serpapi_url
                 params = {
                     'q': query,
                     'api_key': self.serpapi_key,
@@ -356,7 +394,7 @@ class PRHunterService:
                     'engine': 'google'
                 }
 
-                response = requests.get(url, params=params, timeout=30)
+                response = self._api_get('serpapi', url, params)
                 response.raise_for_status()
                 data = response.json()
 
@@ -377,7 +415,6 @@ class PRHunterService:
                             ]
 
                             if any(keyword in title or keyword in snippet for keyword in application_keywords):
-                                time.sleep(self.request_delay)
                                 return {
                                     'application_url': result_url,
                                     'application_method': self._detect_application_method(result_url),
@@ -385,8 +422,6 @@ class PRHunterService:
                                     'found_via': f"Form Scout: {query[:50]}..."
                                 }
 
-                time.sleep(self.request_delay)
-
             except Exception as e:
                 print(f"Form Scout search error for '{query}': {str(e)}")
                 continue
@@ -516,7 +551,7 @@ class PRHunterService:
         # Search for PR-related roles
         query = f'site:linkedin.com/in {brand_name} ("PR Manager" OR "Influencer Marketing" OR "Partnership" OR "Founder")'
 
-        url = "https://serpapi.com/search"
+        url = self.serpapi_url
         params = {
             'q': query,
             'api_key': self.serpapi_key,
@@ -525,7 +560,7 @@ class PRHunterService:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._api_get('serpapi', url, params)
             response.raise_for_status()
             data = response.json()
 
@@ -551,7 +586,6 @@ class PRHunterService:
                         'linkedin_url': linkedin_url
                     }
 
-            time.sleep(self.request_delay)
             return None
 
         except Exception as e:
@@ -573,7 +607,7 @@ class PRHunterService:
         if not self.hunter_api_key:
             return None
 
-        url = "https://api.hunter.io/v2/email-finder"
+        url = self.hunter_url
         params = {
             'domain': domain,
             'first_name': first_name,
@@ -582,20 +616,18 @@ class PRHunterService:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._api_get('hunter', url, params)
             response.raise_for_status()
             data = response.json()
 
             email_data = data.get('data', {})
             if email_data and email_data.get('email'):
-                time.sleep(self.request_delay)
                 return {
                     'email': email_data['email'],
                     'source': 'Hunter',
                     'confidence': email_data.get('confidence', 0)
                 }
 
-            time.sleep(self.request_delay)
             return None
 
         except Exception as e:
@@ -619,14 +651,14 @@ class PRHunterService:
                 'score': 0
             }
 
-        url = "https://api.neverbounce.com/v4/single/check"
+        url = self.neverbounce_url
         params = {
             'key': self.neverbounce_api_key,
             'email': email
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._api_get('neverbounce', url, params)
             response.raise_for_status()
             data = response.json()
 
@@ -653,7 +685,6 @@ class PRHunterService:
                 'invalid': 0
             }
 
-            time.sleep(self.request_delay)
 
             return {
                 'status': status,
@@ -747,3 +778,219 @@ class PRHunterService:
 def chunk_list(items: List, chunk_size: int) -> List[List]:
     """Split list into chunks for batch processing"""
     return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+# ============================================================================
+# HUNT PIPELINE (bulk dedup -> concurrent enrichment -> batched staging)
+# ============================================================================
+
+_DOMAIN_COLUMN_READY = None
+
+CANDIDATE_COLUMNS = (
+    'brand_name', 'website_url', 'domain', 'instagram_handle', 'tiktok_handle',
+    'pr_manager_name', 'pr_manager_linkedin', 'pr_manager_title',
+    'contact_email', 'email_source', 'verification_score', 'verification_status', 'is_catch_all',
+    'application_url', 'application_method', 'form_platform',
+    'logo_url', 'description', 'discovery_source',
+)
+
+
+def website_domain_column_exists(cursor) -> bool:
+    """Cheap catalog check for the indexed website_domain column."""
+    global _DOMAIN_COLUMN_READY
+    if _DOMAIN_COLUMN_READY is True:
+        return True
+    cursor.execute(
+        """
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+          AND table_name = 'pr_brands'
+          AND column_name = 'website_domain'
+        LIMIT 1
+        """
+    )
+    _DOMAIN_COLUMN_READY = cursor.fetchone() is not None
+    return _DOMAIN_COLUMN_READY
+
+
+def filter_new_brands(cursor, brands: List[Dict]) -> List[Dict]:
+    """
+    Drop brands whose domain is already live (pr_brands / brands) or staged
+    in brand_candidates. One query for the whole hunt.
+    """
+    brands = [b for b in brands if b.get('domain')]
+    if not brands:
+        return []
+
+    if website_domain_column_exists(cursor):
+        match_live = 'website_domain = d'
+    else:
+        # Pre-migration fallback: same substring match as before, still one round trip
+        match_live = "website LIKE '%%' || d || '%%'"
+    cursor.execute(f'''
+        SELECT d AS domain
+        FROM unnest(%s::text[]) AS d
+        WHERE EXISTS (SELECT 1 FROM pr_brands WHERE {match_live})
+           OR EXISTS (SELECT 1 FROM brands WHERE {match_live})
+           OR EXISTS (SELECT 1 FROM brand_candidates WHERE domain = d)
+    ''', ([b['domain'] for b in brands],))
+    taken = {row['domain'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+
+    for domain in sorted(taken):
+        print(f"Skipping {domain} - already in brands or candidates")
+    return [b for b in brands if b['domain'] not in taken]
+
+
+def enrich_brands(service: PRHunterService, brands: List[Dict],
+                  workers: int = PR_HUNT_ENRICH_WORKERS, on_progress=None) -> Dict:
+    """
+    Enrich and quality-gate brands concurrently. API pacing comes from the
+    service's token buckets. Returns counts plus the accepted brands in input order.
+    """
+    summary = {'enriched': 0, 'rejected': 0, 'errors': 0, 'accepted': []}
+    if not brands:
+        return summary
+
+    def work(brand):
+        enriched = service.enrich_brand_data(dict(brand))
+        passes, reason = service.quality_gate(enriched)
+        return enriched, passes, reason
+
+    accepted = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(brands)))) as pool:
+        futures = {pool.submit(work, brand): idx for idx, brand in enumerate(brands)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                enriched, passes, reason = future.result()
+            except Exception as e:
+                print(f"Error enriching {brands[idx].get('brand_name', 'Unknown')}: {str(e)}")
+                summary['errors'] += 1
+                continue
+            summary['enriched'] += 1
+            if passes:
+                accepted[idx] = enriched
+                print(f"✅ Accepted: {enriched['brand_name']}")
+            else:
+                summary['rejected'] += 1
+                print(f"❌ Rejected: {enriched['brand_name']} - {reason}")
+            if on_progress:
+                on_progress(summary['enriched'] + summary['errors'], len(brands))
+
+    summary['accepted'] = [accepted[idx] for idx in sorted(accepted)]
+    return summary
+
+
+def candidate_row(brand: Dict, keyword: str) -> Tuple:
+    """brand_candidates values in CANDIDATE_COLUMNS order, truncated to column sizes."""
+    # Helper to safely truncate strings
+    def truncate(value, max_len):
+        if value and isinstance(value, str) and len(value) > max_len:
+            return value[:max_len]
+        return value
+
+    params = {
+        'brand_name': truncate(brand.get('brand_name'), 255),
+        'website_url': truncate(brand.get('website_url'), 255),
+        'domain': truncate(brand.get('domain'), 255),
+        'instagram_handle': truncate(brand.get('instagram_handle'), 255),
+        'tiktok_handle': truncate(brand.get('tiktok_handle'), 255),
+        'pr_manager_name': truncate(brand.get('pr_manager_name'), 255),
+        'pr_manager_linkedin': truncate(brand.get('pr_manager_linkedin'), 255),
+        'pr_manager_title': truncate(brand.get('pr_manager_title'), 255),
+        'contact_email': truncate(brand.get('contact_email'), 255),
+        'email_source': truncate(brand.get('email_source', 'Hunter'), 50),
+        'verification_score': brand.get('verification_score', 0),
+        'verification_status': truncate(brand.get('verification_status', 'unknown'), 20),
+        'is_catch_all': brand.get('is_catch_all', False),
+        'application_url': truncate(brand.get('application_url'), 500),
+        'application_method': truncate(brand.get('application_method', 'EMAIL_ONLY'), 50),
+        'form_platform': truncate(brand.get('form_platform'), 100),
+        'logo_url': truncate(brand.get('logo_url'), 500),
+        'description': brand.get('description'),  # TEXT field, no limit
+        'discovery_source': truncate(f"{keyword} - {brand.get('discovery_source', 'Unknown')}", 100)
+    }
+    return tuple(params[col] for col in CANDIDATE_COLUMNS)
+
+
+def save_candidates(cursor, brands: List[Dict], keyword: str) -> int:
+    """Upsert accepted brands into brand_candidates in one statement. Caller commits."""
+    rows = {}
+    for brand in brands:
+        row = candidate_row(brand, keyword)
+        rows[row[CANDIDATE_COLUMNS.index('domain')]] = row  # one row per domain per statement
+    if not rows:
+        return 0
+    execute_values(cursor, f'''
+        INSERT INTO brand_candidates ({', '.join(CANDIDATE_COLUMNS)}, status)
+        VALUES %s
+        ON CONFLICT (domain) DO UPDATE SET
+            updated_at = CURRENT_TIMESTAMP,
+            verification_score = EXCLUDED.verification_score,
+            verification_status = EXCLUDED.verification_status,
+            application_url = EXCLUDED.application_url,
+            application_method = EXCLUDED.application_method,
+            form_platform = EXCLUDED.form_platform
+    ''', list(rows.values()), template='(' + ', '.join(['%s'] * len(CANDIDATE_COLUMNS)) + ", 'PENDING')")
+    return len(rows)
+
+
+def enrich_and_stage(service: PRHunterService, conn, brands: List[Dict], keyword: str,
+                     workers: int = PR_HUNT_ENRICH_WORKERS, on_progress=None) -> Dict:
+    """Enrich one batch of brands and stage the ones that pass. Returns per-batch counts."""
+    summary = enrich_brands(service, brands, workers=workers, on_progress=on_progress)
+    saved = 0
+    if summary['accepted']:
+        cursor = conn.cursor()
+        try:
+            saved = save_candidates(cursor, summary['accepted'], keyword)
+            conn.commit()
+        except Exception as e:
+            print(f"Error saving {len(summary['accepted'])} candidates: {str(e)}")
+            conn.rollback()
+            summary['errors'] += len(summary['accepted'])
+        finally:
+            cursor.close()
+    return {
+        'enriched': summary['enriched'],
+        'saved': saved,
+        'rejected': summary['rejected'],
+        'errors': summary['errors'],
+    }
+
+
+def run_hunt_inline(service: PRHunterService, conn, keyword: str, max_results: int = 50,
+                    on_progress=None) -> Dict:
+    """Whole hunt in this process: discovery, one dedup query, threaded enrichment, batched saves."""
+    print(f"Starting PR hunt for keyword: {keyword}")
+    discovered_brands = service.search_google_for_brands(keyword, max_results)
+    print(f"Discovered {len(discovered_brands)} brands")
+
+    cursor = conn.cursor()
+    try:
+        unique_brands = filter_new_brands(cursor, discovered_brands)
+    finally:
+        cursor.close()
+    print(f"After deduplication: {len(unique_brands)} unique brands")
+
+    totals = {'enriched': 0, 'saved': 0, 'rejected': 0, 'errors': 0}
+    done = 0
+    for chunk in chunk_list(unique_brands, max(PR_HUNT_CHUNK_SIZE, PR_HUNT_ENRICH_WORKERS)):
+        counts = enrich_and_stage(service, conn, chunk, keyword)
+        for key in totals:
+            totals[key] += counts[key]
+        done += len(chunk)
+        if on_progress:
+            on_progress(done, len(unique_brands), totals)
+
+    return {
+        'keyword': keyword,
+        'discovered': len(discovered_brands),
+        'unique': len(unique_brands),
+        'enriched': totals['enriched'],
+        'saved': totals['saved'],
+        'rejected': totals['rejected'],
+        'completed_at': datetime.utcnow().isoformat()
+    }
+
@@ -22,6 +22,8 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from collections import defaultdict
 
+from services.llm_client import LLM, LLMReply, sdk_usage
+
 # Gemini import
 try:
     from google import genai
@@ -814,6 +816,15 @@ def predict_reply_rate(creator: Dict, brand: Dict, cursor) -> Dict:
     }
 
 
+# Sampling config for the package call (also part of its LLM cache key)
+GEMINI_PACKAGE_CONFIG = {
+    'temperature': 0.65,
+    'top_p': 0.9,
+    'max_output_tokens': 8192,
+    'response_mime_type': "application/json",
+}
+
+
 # =============================================================================
 # MAIN GENERATOR CLASS
 # =============================================================================
@@ -851,7 +862,8 @@ class PRPackageGenerator:
         creator: Dict,
         brand: Dict,
         cursor,  # DB cursor for deterministic queries
-        max_attempts: int = 2
+        max_attempts: int = 2,
+        regenerate: bool = False
     ) -> PRPackageResult:
         """
         Generate complete PR Package.
@@ -861,6 +873,7 @@ class PRPackageGenerator:
             brand: Brand dict with company data
             cursor: Database cursor for deterministic queries
             max_attempts: Max Gemini retries before fallback
+            regenerate: User asked for a new package - bypass cached replies
 
         Returns:
             PRPackageResult with full package or error
@@ -882,7 +895,7 @@ class PRPackageGenerator:
             logger.info(f"Attempting Gemini generation (max {max_attempts} attempts)")
             for attempt in range(max_attempts):
                 try:
-                    gemini_result = self._call_gemini(creator, brand_enriched)
+                    gemini_result = self._call_gemini(creator, brand_enriched, attempt, refresh=regenerate)
 
                     if not gemini_result:
                         continue
@@ -909,6 +922,7 @@ class PRPackageGenerator:
                         logger.warning(
                             f"Scrubber caught issues on attempt {attempt + 1}: {issues}"
                         )
+                        self._forget_gemini(creator, brand_enriched, attempt)
 
                 except Exception as e:
                     logger.error(f"Gemini error on attempt {attempt + 1}: {e}")
@@ -928,8 +942,26 @@ class PRPackageGenerator:
             scrub_failures=scrub_failures
         )
 
-    def _call_gemini(self, creator: Dict, brand: Dict) -> Optional[Dict]:
-        """Call Gemini API with unified prompt."""
+    @staticmethod
+    def _cache_key_material(user_prompt: str, attempt: int) -> Dict:
+        return {
+            'model': "gemini-2.5-flash", 'system': SYSTEM_PROMPT, 'prompt': user_prompt, 'attempt': attempt,
+            'config': GEMINI_PACKAGE_CONFIG,
+        }
+
+    def _forget_gemini(self, creator: Dict, brand: Dict, attempt: int) -> None:
+        """Drop a scrubber-rejected reply so the next generate() samples again instead of replaying it."""
+        LLM.forget('pr_package', self._cache_key_material(build_user_prompt(creator, brand), attempt))
+
+    def _call_gemini(self, creator: Dict, brand: Dict, attempt: int = 0,
+                     refresh: bool = False) -> Optional[Dict]:
+        """
+        Call Gemini API with unified prompt.
+
+        Replies are cached per attempt number, so a retry after a scrubber
+        rejection still samples a fresh package instead of replaying attempt 0.
+        refresh=True samples anew and replaces the cached reply.
+        """
         try:
             user_prompt = build_user_prompt(creator, brand)
             logger.info(f"Calling Gemini for brand: {brand.get('brand_name', 'unknown')}")
@@ -943,37 +975,40 @@ class PRPackageGenerator:
                 thinking_cfg = None
 
             # Build config
-            config_kwargs = dict(
-                system_instruction=SYSTEM_PROMPT,
-                temperature=0.65,
-                top_p=0.9,
-                max_output_tokens=8192,
-                response_mime_type="application/json",
-            )
+            config_kwargs = dict(system_instruction=SYSTEM_PROMPT, **GEMINI_PACKAGE_CONFIG)
             if thinking_cfg is not None:
                 config_kwargs["thinking_config"] = thinking_cfg
 
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=user_prompt,
-                config=types.GenerateContentConfig(**config_kwargs),
-            )
+            def produce():
+                response = self.client.models.generate_content(
+                    model="gemini-2.5-flash",
+                    contents=user_prompt,
+                    config=types.GenerateContentConfig(**config_kwargs),
+                )
 
-            if not response.text:
-                logger.error("Empty Gemini response")
-                return None
+                if not response.text:
+                    logger.error("Empty Gemini response")
+                    return LLMReply(None)
 
-            logger.info(f"Gemini response length: {len(response.text)} chars")
+                logger.info(f"Gemini response length: {len(response.text)} chars")
 
-            # Parse JSON response - handle markdown fences and thinking token wrappers
-            package = self._extract_json(response.text)
+                # Parse JSON response - handle markdown fences and thinking token wrappers
+                try:
+                    package = self._extract_json(response.text)
+                except json.JSONDecodeError:
+                    logger.error(f"Raw response (first 500 chars): {response.text[:500]}")
+                    raise
+                return LLMReply(package, *sdk_usage(response))
+
+            # Same creator + brand inputs -> same prompt -> served from cache
+            package = LLM.call('pr_package', self._cache_key_material(user_prompt, attempt), produce,
+                               refresh=refresh)
             if package:
                 logger.info(f"Successfully parsed Gemini JSON with keys: {list(package.keys())}")
             return package
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse Gemini JSON: {e}")
-            logger.error(f"Raw response (first 500 chars): {response.text[:500] if response and response.text else 'None'}")
             return None
         except Exception as e:
             logger.error(f"Gemini API error: {type(e).__name__}: {e}")
@@ -1,9 +1,6 @@
 """Guard public brand APIs: strip gated fields, slow down obvious scrapers."""
 
-import hashlib
-import os
-import time
-from functools import wraps
+from services.rate_limiter import RateLimitPolicy, ip_key, rate_limit
 
 _SCRAPER_UA_MARKERS = (
     'python-requests',
@@ -36,7 +33,6 @@ _OWN_ORIGINS = (
     'http://localhost:3000',
 )
 
-_rate_hits = {}
 SCRAPER_LIMIT = 30
 SCRAPER_WINDOW = 60
 
@@ -46,14 +42,6 @@ def _headers():
     return request.headers
 
 
-def _client_ip():
-    from flask import request
-    forwarded = request.headers.get('X-Forwarded-For') or ''
-    if forwarded:
-        return forwarded.split(',')[0].strip()
-    return request.headers.get('X-Real-IP') or request.remote_addr or ''
-
-
 def _ua():
     return (_headers().get('User-Agent') or '').lower()
 
@@ -80,37 +68,17 @@ def is_scraper_ua():
     return any(marker in ua for marker in _SCRAPER_UA_MARKERS)
 
 
-def _ip_bucket():
-    ip = _client_ip()
-    salt = os.getenv('IP_HASH_SALT', 'public-brands-salt')
-    return hashlib.sha256(f'{salt}:{ip}'.encode()).hexdigest()[:32]
-
-
-def scraper_rate_limit(view_fn):
-    """Throttle curl/python scrapers. Browsers, our site, and Google pass through."""
-
-    @wraps(view_fn)
-    def wrapped(*args, **kwargs):
-        from flask import jsonify
-        if not is_scraper_ua():
-            return view_fn(*args, **kwargs)
-
-        bucket = _ip_bucket()
-        now = time.time()
-        hits = [t for t in _rate_hits.get(bucket, []) if now - t < SCRAPER_WINDOW]
-        if len(hits) >= SCRAPER_LIMIT:
-            return jsonify({
-                'error': 'Too many requests. Sign up at https://app.newcollab.co to browse brands.',
-            }), 429
-        hits.append(now)
-        _rate_hits[bucket] = hits
-        if len(_rate_hits) > 5000:
-            stale = [k for k, v in _rate_hits.items() if not v or now - v[-1] > SCRAPER_WINDOW]
-            for key in stale[:1000]:
-                _rate_hits.pop(key, None)
-        return view_fn(*args, **kwargs)
-
-    return wrapped
+SCRAPER_POLICY = RateLimitPolicy(
+    'public_brands_scraper',
+    SCRAPER_LIMIT,
+    SCRAPER_WINDOW,
+    key_func=ip_key,
+    applies=is_scraper_ua,
+    message='Too many requests. Sign up at https://app.newcollab.co to browse brands.',
+)
+
+# Throttle curl/python scrapers. Browsers, our site, and Google pass through.
+scraper_rate_limit = rate_limit(SCRAPER_POLICY)
 
 
 def strip_gated_brand_fields(brand):
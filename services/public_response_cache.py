@@ -0,0 +1,184 @@
+"""Cached responses for anonymous public endpoints (brand directory and brand pages).
+
+Entries are keyed on path + normalized query string + a generation number.
+invalidate_public_brand_cache() bumps the generation, which retires every
+entry at once without scanning keys. Redis shares entries and the generation
+across workers; an in-process LRU takes over when Redis is unavailable.
+Responses carry ETag / Last-Modified so browsers, CDNs and crawlers get 304s.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from services.redis_client import get_redis, mark_redis_failed
+
+PUBLIC_BRANDS_CACHE_TTL = int(os.getenv('PUBLIC_BRANDS_CACHE_TTL', '300'))
+_LOCAL_MAX_ENTRIES = int(os.getenv('PUBLIC_CACHE_MAX_ENTRIES', '2000'))
+_GEN_KEY = 'pubcache:gen'
+
+
+class PublicResponseCache:
+    """Response bodies with ETag + build time, TTL and generation-based invalidation."""
+
+    def __init__(self, max_local_entries=_LOCAL_MAX_ENTRIES):
+        self.max_local_entries = max_local_entries
+        self._local = OrderedDict()
+        self._local_gen = 0
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0}
+
+    def count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def generation(self):
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(_GEN_KEY)
+                return int(raw or 0)
+            except Exception:
+                mark_redis_failed()
+        return self._local_gen
+
+    def key(self, namespace, path, args):
+        return f'pubcache:{namespace}:{self.generation()}:{path}?{normalize_query(args)}'
+
+    def get(self, key):
+        raw = None
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception:
+                mark_redis_failed()
+                client = None
+        if client is None:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry and entry[0] > time.time():
+                    self._local.move_to_end(key)
+                    raw = entry[1]
+                elif entry:
+                    self._local.pop(key, None)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+
+    def set(self, key, entry, ttl):
+        raw = json.dumps(entry)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, raw, ex=ttl)
+                return
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            self._local[key] = (time.time() + ttl, raw)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self):
+        self.count('invalidations')
+        with self._lock:
+            self._local_gen += 1
+            self._local.clear()
+        client = get_redis()
+        if client is not None:
+            try:
+                client.incr(_GEN_KEY)
+            except Exception:
+                mark_redis_failed()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data['local_entries'] = len(self._local)
+        return data
+
+
+PUBLIC_CACHE = PublicResponseCache()
+
+
+def normalize_query(args):
+    """Stable query string: sorted keys, trimmed values, empty params dropped."""
+    pairs = []
+    for name in sorted(set(args.keys())):
+        values = sorted(v.strip() for v in args.getlist(name) if v and v.strip())
+        pairs.extend((name, v) for v in values)
+    return '&'.join(f'{k}={v}' for k, v in pairs)
+
+
+def _build_response(entry, max_age):
+    from flask import Response, request
+    response = Response(entry['body'], status=entry['status'], mimetype='application/json')
+    response.set_etag(entry['etag'])
+    response.last_modified = datetime.fromtimestamp(entry['built_at'], tz=timezone.utc)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+def cached_public_response(namespace, ttl=None):
+    """Decorator for anonymous GET views whose JSON depends only on path + query."""
+
+    def decorator(view_fn):
+        @wraps(view_fn)
+        def wrapped(*args, **kwargs):
+            from flask import make_response, request
+            max_age = int(ttl or PUBLIC_BRANDS_CACHE_TTL)
+            if request.method != 'GET':
+                return view_fn(*args, **kwargs)
+            try:
+                key = PUBLIC_CACHE.key(namespace, request.path, request.args)
+                entry = PUBLIC_CACHE.get(key)
+            except Exception as e:
+                print(f"[PublicCache] lookup failed: {e}")
+                return view_fn(*args, **kwargs)
+
+            if entry is not None:
+                PUBLIC_CACHE.count('hits')
+                response = _build_response(entry, max_age)
+                if response.status_code == 304:
+                    PUBLIC_CACHE.count('not_modified')
+                return response
+
+            PUBLIC_CACHE.count('misses')
+            response = make_response(view_fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data(as_text=True)
+            entry = {
+                'status': 200,
+                'body': body,
+                'etag': hashlib.sha1(body.encode()).hexdigest(),
+                'built_at': int(time.time()),
+            }
+            try:
+                PUBLIC_CACHE.set(key, entry, max_age)
+            except Exception as e:
+                print(f"[PublicCache] store failed: {e}")
+            return _build_response(entry, max_age)
+
+        return wrapped
+
+    return decorator
+
+
+def invalidate_public_brand_cache():
+    """Retire every cached public brand response. Call after brand writes commit. Never raises."""
+    try:
+        PUBLIC_CACHE.invalidate()
+    except Exception as e:
+        print(f"[PublicCache] invalidate failed: {e}")
@@ -0,0 +1,289 @@
+"""Per-route rate limits shared across workers.
+
+Sliding-window counter: a check costs O(1) regardless of traffic. The previous
+fixed window's count, weighted by how much of it still overlaps the sliding
+window, plus the current window's count must stay under the limit. Counters
+live in Redis and each check is one atomic Lua call, so limits hold across
+gunicorn workers and serverless instances. An in-process table takes over
+when Redis is down.
+
+    @rate_limit(DISCOVER_POLICY)
+    def view(): ...
+
+TokenBucket paces outbound calls to third-party APIs from inside one process;
+AdaptiveTokenBucket also backs off when the API answers 429.
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from services.redis_client import get_redis, mark_redis_failed
+
+_LOCAL_MAX_KEYS = int(os.getenv('RATE_LIMIT_LOCAL_MAX_KEYS', '20000'))
+
+# KEYS: current window, previous window, stats hash
+# ARGV: limit, window seconds, weight of previous window
+_SLIDING_WINDOW_LUA = """
+local cur = tonumber(redis.call('GET', KEYS[1]) or '0')
+local prev = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local weighted = prev * tonumber(ARGV[3])
+if weighted + cur + 1 > limit then
+    redis.call('HINCRBY', KEYS[3], 'denied', 1)
+    return {0, math.floor(weighted + cur)}
+end
+cur = redis.call('INCR', KEYS[1])
+if cur == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+end
+redis.call('HINCRBY', KEYS[3], 'allowed', 1)
+return {1, math.floor(weighted + cur)}
+"""
+
+_POLICIES = {}
+
+
+def _client_ip():
+    from flask import request
+    forwarded = request.headers.get('X-Forwarded-For') or ''
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.headers.get('X-Real-IP') or request.remote_addr or ''
+
+
+def ip_key():
+    """Salted hash of the client IP (raw IPs never reach Redis)."""
+    salt = os.getenv('IP_HASH_SALT', 'public-brands-salt')
+    return hashlib.sha256(f'{salt}:{_client_ip()}'.encode()).hexdigest()[:32]
+
+
+def _jwt_user_id():
+    try:
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        # Expired or malformed token: the view decides; limit by IP meanwhile
+        return None
+
+
+def user_or_ip_key():
+    """Session user, else JWT identity (what get_creator_id_from_session reads), else client IP."""
+    from flask import session
+    user_id = session.get('user_id') or _jwt_user_id()
+    return f'u:{user_id}' if user_id else ip_key()
+
+
+def _env_limit(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitPolicy:
+    """limit requests per window seconds per key_func() value, when applies() is true."""
+
+    def __init__(self, name, limit, window, key_func=ip_key, applies=None,
+                 message='Too many requests. Please slow down.'):
+        self.name = name
+        self.limit = int(limit)
+        self.window = int(window)
+        self.key_func = key_func
+        self.applies = applies
+        self.message = message
+        _POLICIES[name] = self
+
+
+class RateLimiter:
+    def __init__(self, max_local_keys=_LOCAL_MAX_KEYS):
+        self.max_local_keys = max_local_keys
+        self._local = OrderedDict()  # key -> [window_index, current, previous]
+        self._lock = threading.Lock()
+        self._scripts = {}
+        self._counts = {}
+
+    def _count(self, policy, allowed):
+        with self._lock:
+            counts = self._counts.setdefault(policy.name, {'allowed': 0, 'denied': 0})
+            counts['allowed' if allowed else 'denied'] += 1
+
+    def _script(self, client):
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = client.register_script(_SLIDING_WINDOW_LUA)
+            self._scripts = {id(client): script}
+        return script
+
+    def _hit_redis(self, client, policy, key, index, weight):
+        base = f'rl:{policy.name}:{key}'
+        allowed, _ = self._script(client)(
+            keys=[f'{base}:{index}', f'{base}:{index - 1}', f'rl:stats:{policy.name}'],
+            args=[policy.limit, policy.window, f'{weight:.6f}'],
+        )
+        return bool(int(allowed))
+
+    def _hit_local(self, policy, key, index, weight):
+        local_key = (policy.name, key)
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                entry = [index, 0, 0]
+                self._local[local_key] = entry
+            elif entry[0] != index:
+                # Roll forward: the old current window becomes previous only if adjacent
+                entry[2] = entry[1] if entry[0] == index - 1 else 0
+                entry[1] = 0
+                entry[0] = index
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.max_local_keys:
+                self._local.popitem(last=False)
+            if entry[2] * weight + entry[1] + 1 > policy.limit:
+                return False
+            entry[1] += 1
+            return True
+
+    def hit(self, policy, key, now=None):
+        """Record one request for key. Returns (allowed, retry_after_seconds)."""
+        now = time.time() if now is None else now
+        index = int(now // policy.window)
+        elapsed = now - index * policy.window
+        weight = 1.0 - elapsed / policy.window
+        allowed = None
+        client = get_redis()
+        if client is not None:
+            try:
+                allowed = self._hit_redis(client, policy, key, index, weight)
+            except Exception:
+                mark_redis_failed()
+        if allowed is None:
+            allowed = self._hit_local(policy, key, index, weight)
+        self._count(policy, allowed)
+        retry_after = 0 if allowed else max(1, math.ceil(policy.window - elapsed))
+        return allowed, retry_after
+
+    def stats(self):
+        """Allowed/denied counts per policy: this process, plus all workers via Redis."""
+        with self._lock:
+            data = {name: {'local': dict(counts)} for name, counts in self._counts.items()}
+        client = get_redis()
+        if client is not None:
+            try:
+                for name in _POLICIES:
+                    raw = client.hgetall(f'rl:stats:{name}') or {}
+                    shared = {
+                        (k.decode() if isinstance(k, bytes) else k): int(v)
+                        for k, v in raw.items()
+                    }
+                    if shared:
+                        data.setdefault(name, {})['shared'] = shared
+            except Exception:
+                mark_redis_failed()
+        return data
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests/second, bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = max(float(rate), 0.01)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """TokenBucket that halves its rate on a 429 and creeps back up on success (AIMD).
+
+    ``throttled(retry_after)`` also holds every caller until Retry-After has passed,
+    so a pool of workers backs off together instead of hammering the API.
+    """
+
+    def __init__(self, rate, min_rate=0.2, max_rate=None, increase=0.1):
+        super().__init__(rate, capacity=1)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate or rate)
+        self.increase = float(increase)
+        self.throttle_count = 0
+        self._paused_until = 0.0
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                wait = self._paused_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        super().acquire()
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self, retry_after=None):
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + float(retry_after))
+
+
+LIMITER = RateLimiter()
+
+
+def rate_limit(policy):
+    """Decorator: 429 with Retry-After once the caller exceeds the policy."""
+
+    def decorator(view_fn):
+        @wraps(view_fn)
+        def wrapped(*args, **kwargs):
+            from flask import jsonify
+            if policy.applies is not None and not policy.applies():
+                return view_fn(*args, **kwargs)
+            allowed, retry_after = LIMITER.hit(policy, policy.key_func())
+            if not allowed:
+                response = jsonify({'error': policy.message})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            return view_fn(*args, **kwargs)
+
+        return wrapped
+
+    return decorator
+
+
+def rate_limit_stats():
+    return LIMITER.stats()
+
+
+DISCOVER_POLICY = RateLimitPolicy(
+    'brands_discover',
+    _env_limit('RATE_LIMIT_DISCOVER_PER_MIN', 20), 60,
+    key_func=user_or_ip_key,
+    message='Too many brand searches. Please wait a moment and try again.',
+)
+MEDIA_PROXY_POLICY = RateLimitPolicy(
+    'media_proxy',
+    _env_limit('RATE_LIMIT_MEDIA_PROXY_PER_MIN', 600), 60,
+)
@@ -0,0 +1,165 @@
+"""For You recommendation store shared across workers.
+
+One entry per creator per namespace, tagged with the profile fingerprint it was
+built from. Redis holds entries for every worker; an in-process LRU takes over
+when Redis is unavailable. Pipeline saves, niche edits and new scrapes call
+invalidate_creator_recommendations() so the next load rebuilds.
+"""
+
+import decimal
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+
+from werkzeug.http import http_date
+
+from services.redis_client import get_redis, mark_redis_failed
+
+FOR_YOU_CACHE_TTL = int(os.getenv('FOR_YOU_CACHE_TTL', '1800'))
+MENTOR_MATCH_CACHE_TTL = int(os.getenv('MENTOR_MATCH_CACHE_TTL', '3600'))
+_LOCAL_MAX_ENTRIES = int(os.getenv('RECO_CACHE_MAX_ENTRIES', '2000'))
+
+
+def _json_default(value):
+    # Same encoding Flask's jsonify uses, so cached and fresh responses match.
+    if isinstance(value, (datetime, date)):
+        return http_date(value)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class RecommendationStore:
+    """Per-creator cache entries with TTL, fingerprint check and LRU fallback."""
+
+    def __init__(self, namespace, ttl, max_local_entries=_LOCAL_MAX_ENTRIES):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_local_entries = max_local_entries
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'stale': 0, 'sets': 0, 'invalidations': 0}
+
+    def _key(self, creator_id):
+        return f'reco:{self.namespace}:{int(creator_id)}'
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def get(self, creator_id, fingerprint):
+        """Cached value for this creator, or None when missing/expired/stale."""
+        if not creator_id:
+            return None
+        key = self._key(creator_id)
+        raw = None
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception:
+                mark_redis_failed()
+                client = None
+        if client is None:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry and entry[0] > time.time():
+                    self._local.move_to_end(key)
+                    raw = entry[1]
+                elif entry:
+                    self._local.pop(key, None)
+
+        if raw is None:
+            self._count('misses')
+            return None
+        try:
+            payload = json.loads(raw)
+        except (TypeError, ValueError):
+            self._count('misses')
+            return None
+        if payload.get('fp') != fingerprint:
+            self._count('stale')
+            return None
+        self._count('hits')
+        return payload.get('value')
+
+    def set(self, creator_id, fingerprint, value, ttl=None):
+        if not creator_id:
+            return
+        ttl = int(ttl or self.ttl)
+        key = self._key(creator_id)
+        raw = json.dumps({'fp': fingerprint, 'value': value}, default=_json_default)
+        self._count('sets')
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(key, raw, ex=ttl)
+                return
+            except Exception:
+                mark_redis_failed()
+        with self._lock:
+            self._local[key] = (time.time() + ttl, raw)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def invalidate(self, creator_id):
+        if not creator_id:
+            return
+        key = self._key(creator_id)
+        self._count('invalidations')
+        with self._lock:
+            self._local.pop(key, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.delete(key)
+            except Exception:
+                mark_redis_failed()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._metrics)
+            data['local_entries'] = len(self._local)
+        data['namespace'] = self.namespace
+        return data
+
+
+FOR_YOU_STORE = RecommendationStore('foryou', FOR_YOU_CACHE_TTL)
+MENTOR_MATCH_STORE = RecommendationStore('mentor', MENTOR_MATCH_CACHE_TTL)
+
+
+def invalidate_creator_recommendations(creator_id):
+    """Drop every cached recommendation for a creator. Never raises."""
+    for store in (FOR_YOU_STORE, MENTOR_MATCH_STORE):
+        try:
+            store.invalidate(creator_id)
+        except Exception as e:
+            print(f"[RecoCache] invalidate failed creator={creator_id}: {e}")
+
+
+def invalidate_user_recommendations(conn, user_id):
+    """Same as above when only the user id is known. Call after the write commits."""
+    if not user_id:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id FROM creators WHERE user_id = %s", (user_id,))
+        rows = cursor.fetchall()
+    except Exception as e:
+        print(f"[RecoCache] creator lookup failed user={user_id}: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return
+    finally:
+        cursor.close()
+    for row in rows or []:
+        invalidate_creator_recommendations(row['id'] if isinstance(row, dict) else row[0])
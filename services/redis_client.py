@@ -0,0 +1,62 @@
+"""Shared Redis client for caches and counters. None when Redis is down or unset.
+
+Callers must treat Redis as optional and fall back to in-process state.
+"""
+
+import os
+import threading
+import time
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is in requirements
+    redis = None
+
+# After a failure, skip Redis for a while instead of paying a timeout per call.
+_RETRY_AFTER_SEC = 30
+
+_client = None
+_failed_at = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    global _client
+    if redis is None:
+        return None
+    if _client is not None:
+        return _client
+    if _failed_at and time.time() - _failed_at < _RETRY_AFTER_SEC:
+        return None
+    url = os.getenv('REDIS_URL')
+    if not url:
+        return None
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            kwargs = {
+                'decode_responses': False,
+                'socket_connect_timeout': 2,
+                'socket_timeout': 2,
+                'socket_keepalive': True,
+                'health_check_interval': 30,
+                'retry_on_timeout': True,
+            }
+            if url.startswith('rediss://'):
+                kwargs['ssl_cert_reqs'] = None
+            client = redis.Redis.from_url(url, **kwargs)
+            client.ping()
+            _client = client
+        except Exception as e:
+            print(f"[Redis] unavailable, using in-process fallback: {e}")
+            mark_redis_failed()
+            return None
+    return _client
+
+
+def mark_redis_failed():
+    """Drop the client after a Redis error; the next call retries after a back-off."""
+    global _client, _failed_at
+    _client = None
+    _failed_at = time.time()
@@ -0,0 +1,285 @@
+"""Streaming exports for admin reports.
+
+Rows come off a server-side (named) cursor ``itersize`` at a time and leave as
+CSV or NDJSON text chunks. An export holds one chunk in memory however many
+months it covers. routes/admin_reports.py serves EXPORTS at
+/api/admin/reports/export/<name>. scripts/export_admin_reports.py writes the
+same chunks to disk, either through that endpoint or straight from Postgres.
+"""
+
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from psycopg2.extras import RealDictCursor
+
+EXPORT_ITERSIZE = int(os.getenv('REPORT_EXPORT_ITERSIZE', '2000'))
+EXPORT_CHUNK_ROWS = int(os.getenv('REPORT_EXPORT_CHUNK_ROWS', '500'))
+MAX_EXPORT_DAYS = 3650
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# Shared with the /top-users JSON endpoint, which appends a LIMIT
+TOP_USERS_SQL = """
+    SELECT
+        cp.creator_id,
+        u.email,
+        c.username,
+        COALESCE(c.subscription_tier, 'free') as tier,
+        COUNT(*) as saves,
+        COUNT(cp.pitched_at) as pitches,
+        (
+            SELECT COUNT(*) FROM creator_pipeline cp2
+            WHERE cp2.creator_id = c.id
+            AND cp2.pitched_at >= DATE_TRUNC('week', NOW())
+        ) as pitches_this_week,
+        MAX(COALESCE(cp.pitched_at, cp.created_at)) as last_activity
+    FROM creator_pipeline cp
+    JOIN creators c ON cp.creator_id = c.id
+    JOIN users u ON c.user_id = u.id
+    WHERE DATE(cp.created_at) >= %(start_date)s
+    GROUP BY cp.creator_id, u.email, c.username, c.subscription_tier, c.id
+    ORDER BY
+        CASE WHEN %(metric)s = 'saves' THEN COUNT(*) END DESC,
+        CASE WHEN %(metric)s = 'pitches' THEN COUNT(cp.pitched_at) END DESC,
+        CASE WHEN %(metric)s = 'all' THEN COUNT(*) + COUNT(cp.pitched_at) * 2 END DESC
+"""
+
+# Shared with the /retention JSON endpoint (weeks = 10 there)
+RETENTION_SQL = """
+    WITH signup_cohorts AS (
+        SELECT
+            id as creator_id,
+            DATE_TRUNC('week', created_at) as signup_week
+        FROM creators
+        WHERE created_at >= NOW() - make_interval(weeks => %(weeks)s)
+    ),
+    activity AS (
+        -- Combine saves (created_at) and pitches (pitched_at) as activity signals
+        SELECT creator_id, DATE_TRUNC('week', created_at) as activity_week
+        FROM creator_pipeline
+        WHERE created_at >= NOW() - make_interval(weeks => %(weeks)s + 4)
+        UNION
+        SELECT creator_id, DATE_TRUNC('week', pitched_at) as activity_week
+        FROM creator_pipeline
+        WHERE pitched_at IS NOT NULL AND pitched_at >= NOW() - make_interval(weeks => %(weeks)s + 4)
+    )
+    SELECT
+        sc.signup_week,
+        COUNT(DISTINCT sc.creator_id) as total_users,
+        COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week THEN sc.creator_id END) as week_0,
+        COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '1 week' THEN sc.creator_id END) as week_1,
+        COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '2 weeks' THEN sc.creator_id END) as week_2,
+        COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '3 weeks' THEN sc.creator_id END) as week_3,
+        COUNT(DISTINCT CASE WHEN a.activity_week = sc.signup_week + INTERVAL '4 weeks' THEN sc.creator_id END) as week_4
+    FROM signup_cohorts sc
+    LEFT JOIN activity a ON sc.creator_id = a.creator_id
+    GROUP BY sc.signup_week
+    ORDER BY sc.signup_week DESC
+"""
+
+
+def _int_arg(args, name, default, low, high):
+    raw = args.get(name, default)
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if not low <= value <= high:
+        raise ValueError(f'{name} must be between {low} and {high}')
+    return value
+
+
+def _start_date(args):
+    return date.today() - timedelta(days=_int_arg(args, 'days', 30, 1, MAX_EXPORT_DAYS))
+
+
+class ReportExport:
+    """One streamable dataset: fixed columns, SQL with named params built from query args."""
+
+    def __init__(self, name, description, columns, sql, params):
+        self.name = name
+        self.description = description
+        self.columns = tuple(columns)
+        self._sql = sql
+        self.params = params
+
+    def sql(self, conn):
+        return self._sql(conn) if callable(self._sql) else self._sql
+
+
+def _top_users_params(args):
+    metric = args.get('metric', 'all')
+    if metric not in ('saves', 'pitches', 'all'):
+        raise ValueError("metric must be 'saves', 'pitches' or 'all'")
+    return {'start_date': _start_date(args), 'metric': metric}
+
+
+def _at_limit_sql(conn):
+    from services.pack_credits import pack_credits_column_exists
+    pack_exhausted_sql = "AND COALESCE(c.pack_credits, 0) = 0" if pack_credits_column_exists(conn) else ""
+    return f"""
+        SELECT
+            c.id as creator_id,
+            u.email,
+            c.username,
+            c.followers_count,
+            c.niche,
+            c.unlocks_remaining,
+            (
+                SELECT MAX(bu.unlocked_at)
+                FROM brand_unlocks bu
+                WHERE bu.creator_id = c.id
+            ) as last_unlock_at
+        FROM creators c
+        JOIN users u ON c.user_id = u.id
+        WHERE (c.subscription_tier = 'free' OR c.subscription_tier IS NULL)
+        AND c.unlocks_remaining = 0
+        {pack_exhausted_sql}
+        AND (c.last_any_email_sent IS NULL OR c.last_any_email_sent < NOW() - INTERVAL '48 hours')
+        AND u.unsubscribed_at IS NULL
+        ORDER BY last_unlock_at DESC NULLS LAST
+    """
+
+
+EXPORTS = {export.name: export for export in (
+    ReportExport(
+        'top_users', 'Every creator active in the period, by saves and pitches',
+        ('creator_id', 'email', 'username', 'tier', 'saves', 'pitches',
+         'pitches_this_week', 'last_activity'),
+        TOP_USERS_SQL, _top_users_params,
+    ),
+    ReportExport(
+        'retention', 'Weekly signup cohorts and their activity in weeks 0-4',
+        ('signup_week', 'total_users', 'week_0', 'week_1', 'week_2', 'week_3', 'week_4'),
+        RETENTION_SQL,
+        lambda args: {'weeks': _int_arg(args, 'weeks', 10, 1, 520)},
+    ),
+    ReportExport(
+        'brand_unlocks', 'Every brand unlock in the period',
+        ('id', 'unlocked_at', 'brand_id', 'brand_name', 'category',
+         'creator_id', 'user_email', 'username'),
+        """
+        SELECT bu.id, bu.unlocked_at, pb.id as brand_id, pb.brand_name, pb.category,
+               c.id as creator_id, u.email as user_email, c.username
+        FROM brand_unlocks bu
+        JOIN pr_brands pb ON bu.brand_id = pb.id
+        JOIN creators c ON bu.creator_id = c.id
+        JOIN users u ON c.user_id = u.id
+        WHERE bu.unlocked_at >= %(start_date)s
+        ORDER BY bu.unlocked_at
+        """,
+        lambda args: {'start_date': _start_date(args)},
+    ),
+    ReportExport(
+        'pitches', 'Every pitch sent in the period',
+        ('id', 'pitched_at', 'brand_id', 'brand_name', 'contact_type',
+         'creator_id', 'email', 'username'),
+        """
+        SELECT
+            cp.id,
+            cp.pitched_at,
+            pb.id as brand_id,
+            pb.brand_name,
+            CASE
+                WHEN pb.contact_email IS NOT NULL AND pb.contact_email != '' THEN 'email'
+                WHEN pb.application_form_url IS NOT NULL AND pb.application_form_url != '' THEN 'form'
+                ELSE 'unknown'
+            END as contact_type,
+            c.id as creator_id,
+            u.email,
+            c.username
+        FROM creator_pipeline cp
+        JOIN pr_brands pb ON cp.brand_id = pb.id
+        JOIN creators c ON cp.creator_id = c.id
+        JOIN users u ON c.user_id = u.id
+        WHERE cp.pitched_at >= %(start_date)s
+        ORDER BY cp.pitched_at
+        """,
+        lambda args: {'start_date': _start_date(args)},
+    ),
+    ReportExport(
+        'at_limit_users', 'Founder dashboard hot leads: free users out of unlocks and pack credits',
+        ('creator_id', 'email', 'username', 'followers_count', 'niche',
+         'unlocks_remaining', 'last_unlock_at'),
+        _at_limit_sql,
+        lambda args: {},
+    ),
+)}
+
+
+def iter_rows(conn, sql, params=None, itersize=EXPORT_ITERSIZE):
+    """Rows from a server-side cursor, fetched itersize at a time. conn must not be autocommit."""
+    cursor = conn.cursor(name=f'report_export_{uuid.uuid4().hex[:12]}', cursor_factory=RealDictCursor)
+    cursor.itersize = itersize
+    try:
+        cursor.execute(sql, params)
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def csv_chunks(rows, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Header, then chunk_rows rows per yielded string."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_cell(row.get(column)) for column in columns])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+            pending = 0
+    tail = buf.getvalue()
+    if tail:
+        yield tail
+
+
+def ndjson_chunks(rows, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One JSON object per line, chunk_rows lines per yielded string."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: row.get(column) for column in columns}, default=_json_default))
+        if len(lines) >= chunk_rows:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+_CHUNKERS = {'csv': csv_chunks, 'ndjson': ndjson_chunks}
+
+
+def export_chunks(conn, export, fmt, args, itersize=EXPORT_ITERSIZE, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Text chunks for one export. Args are validated now (ValueError); the query runs on first next()."""
+    if fmt not in _CHUNKERS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    params = export.params(args)
+    rows = iter_rows(conn, export.sql(conn), params, itersize)
+    return _CHUNKERS[fmt](rows, export.columns, chunk_rows)
@@ -0,0 +1,415 @@
+"""Daily rollups behind the founder dashboard and KPI report endpoints.
+
+report_daily_rollups keeps one row of additive counters per closed day, and
+report_window_rollups keeps the distinct-creator counts for each dashboard
+period. Both are written by POST /api/cron/refresh-report-rollups. Each run
+rolls the new days in and re-rolls the last ROLLUP_REWRITE_DAYS to pick up
+late writes.
+
+Readers sum the rolled days and add a live delta for the days since the last
+roll (normally just today), so a period switch costs the same for 7 days as
+for all time. load_report_rollups returns None before the migration, or when
+the rollups are more than MAX_LIVE_DAYS behind. Callers then run their raw
+aggregates.
+"""
+
+import os
+from datetime import date, timedelta
+
+from psycopg2.extras import RealDictCursor
+
+ROLLUP_REWRITE_DAYS = int(os.getenv('REPORT_ROLLUP_REWRITE_DAYS', '3'))
+MAX_LIVE_DAYS = int(os.getenv('REPORT_ROLLUP_MAX_LIVE_DAYS', '3'))
+
+# Dashboard periods; 0 = all time, counted from ALL_TIME_START
+ALL_TIME_START = date(2020, 1, 1)
+PERIOD_DAYS = {'7d': 7, '14d': 14, '30d': 30, '90d': 90, '180d': 180, 'all': 0}
+
+# Additive per-day counters. active_creators is a per-day DISTINCT: it only
+# feeds daily series, never period sums (those come from the window table).
+DAILY_COLUMNS = (
+    'signups',             # creators.created_at
+    'user_signups',        # users.created_at
+    'active_creators',     # DISTINCT creator_pipeline.creator_id
+    'pipeline_saves',      # creator_pipeline rows
+    'unlocks',             # brand_unlocks rows
+    'first_unlockers',     # creators whose 1st unlock fell on the day
+    'third_unlockers',     # creators whose 3rd unlock fell on the day
+    'pro_upgrades',        # subscription_started_at of current pro/elite creators
+    'pack_purchases',
+    'pack_revenue_cents',
+    'pack_packs',
+    'first_pack_buyers',   # creators whose 1st pack purchase fell on the day
+    'second_pack_buyers',  # ... 2nd purchase (all-time repeat buyers)
+)
+WINDOW_COLUMNS = ('active_creators', 'prev_active_creators', 'pack_buyers', 'prev_pack_buyers')
+
+_TABLE_READY = None
+
+# Each query yields (day, counters...) for %(start)s <= ts < %(end)s. The nth
+# unlock/purchase counts look back at most 3 earlier rows per creator.
+_DAY_QUERIES = (
+    """
+    SELECT DATE(created_at) AS day, COUNT(*) AS signups
+    FROM creators
+    WHERE created_at >= %(start)s AND created_at < %(end)s
+    GROUP BY 1
+    """,
+    """
+    SELECT DATE(created_at) AS day, COUNT(*) AS user_signups
+    FROM users
+    WHERE created_at >= %(start)s AND created_at < %(end)s
+    GROUP BY 1
+    """,
+    """
+    SELECT
+        DATE(created_at) AS day,
+        COUNT(DISTINCT creator_id) AS active_creators,
+        COUNT(*) AS pipeline_saves
+    FROM creator_pipeline
+    WHERE created_at >= %(start)s AND created_at < %(end)s
+    GROUP BY 1
+    """,
+    """
+    SELECT
+        DATE(bu.unlocked_at) AS day,
+        COUNT(*) AS unlocks,
+        COUNT(*) FILTER (WHERE prior.n = 0) AS first_unlockers,
+        COUNT(*) FILTER (WHERE prior.n = 2) AS third_unlockers
+    FROM brand_unlocks bu
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS n FROM (
+            SELECT 1 FROM brand_unlocks e
+            WHERE e.creator_id = bu.creator_id
+              AND (e.unlocked_at, e.id) < (bu.unlocked_at, bu.id)
+            LIMIT 3
+        ) earlier
+    ) prior
+    WHERE bu.unlocked_at >= %(start)s AND bu.unlocked_at < %(end)s
+    GROUP BY 1
+    """,
+    """
+    SELECT DATE(subscription_started_at) AS day, COUNT(*) AS pro_upgrades
+    FROM creators
+    WHERE subscription_tier IN ('pro', 'elite')
+      AND subscription_started_at >= %(start)s AND subscription_started_at < %(end)s
+    GROUP BY 1
+    """,
+)
+
+_PACK_DAY_QUERY = """
+    SELECT
+        DATE(pp.created_at) AS day,
+        COUNT(*) AS pack_purchases,
+        COALESCE(SUM(pp.amount_cents), 0) AS pack_revenue_cents,
+        COALESCE(SUM(pp.packs), 0) AS pack_packs,
+        COUNT(*) FILTER (WHERE prior.n = 0) AS first_pack_buyers,
+        COUNT(*) FILTER (WHERE prior.n = 1) AS second_pack_buyers
+    FROM pack_purchases pp
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS n FROM (
+            SELECT 1 FROM pack_purchases e
+            WHERE e.creator_id = pp.creator_id
+              AND (e.created_at, e.id) < (pp.created_at, pp.id)
+            LIMIT 2
+        ) earlier
+    ) prior
+    WHERE pp.created_at >= %(start)s AND pp.created_at < %(end)s
+    GROUP BY 1
+"""
+
+_WINDOW_ACTIVE_SQL = """
+    SELECT
+        COUNT(DISTINCT creator_id) FILTER (WHERE created_at >= %(start)s) AS active_creators,
+        COUNT(DISTINCT creator_id) FILTER (WHERE created_at < %(start)s) AS prev_active_creators
+    FROM creator_pipeline
+    WHERE created_at >= %(prev_start)s AND created_at < %(end)s
+"""
+
+_WINDOW_PACK_SQL = """
+    SELECT
+        COUNT(DISTINCT creator_id) FILTER (WHERE created_at >= %(start)s) AS pack_buyers,
+        COUNT(DISTINCT creator_id) FILTER (WHERE created_at < %(start)s) AS prev_pack_buyers
+    FROM pack_purchases
+    WHERE created_at >= %(prev_start)s AND created_at < %(end)s
+"""
+
+# Creators active since %(live)s with no activity in [%(start)s, %(live)s):
+# what today adds to a window rolled through yesterday.
+_LIVE_NEW_ACTIVE_SQL = """
+    SELECT COUNT(DISTINCT cp.creator_id) AS n
+    FROM creator_pipeline cp
+    WHERE cp.created_at >= %(live)s
+      AND NOT EXISTS (
+          SELECT 1 FROM creator_pipeline e
+          WHERE e.creator_id = cp.creator_id
+            AND e.created_at >= %(start)s AND e.created_at < %(live)s
+      )
+"""
+
+_LIVE_NEW_PACK_BUYERS_SQL = """
+    SELECT COUNT(DISTINCT pp.creator_id) AS n
+    FROM pack_purchases pp
+    WHERE pp.created_at >= %(live)s
+      AND NOT EXISTS (
+          SELECT 1 FROM pack_purchases e
+          WHERE e.creator_id = pp.creator_id
+            AND e.created_at >= %(start)s AND e.created_at < %(live)s
+      )
+"""
+
+
+def period_bounds(period, today):
+    """(start, prev_start, days) for a dashboard period key; the period runs start..today."""
+    days = PERIOD_DAYS[period]
+    if days:
+        start = today - timedelta(days=days)
+    else:
+        start = ALL_TIME_START
+        days = (today - start).days
+    return start, start - timedelta(days=days), days
+
+
+def _table_exists(cursor, name) -> bool:
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS ready", (f'public.{name}',))
+    row = cursor.fetchone()
+    return bool(row and row['ready'])
+
+
+def rollups_table_exists(cursor) -> bool:
+    """Catalog check, cached once the migration has landed."""
+    global _TABLE_READY
+    if _TABLE_READY is not True:
+        _TABLE_READY = _table_exists(cursor, 'report_daily_rollups')
+    return _TABLE_READY
+
+
+def _empty_day():
+    return dict.fromkeys(DAILY_COLUMNS, 0)
+
+
+def compute_day_metrics(cursor, start_day, end_day):
+    """DAILY_COLUMNS per day for start_day <= day < end_day, straight from the source tables."""
+    queries = list(_DAY_QUERIES)
+    if _table_exists(cursor, 'pack_purchases'):
+        queries.append(_PACK_DAY_QUERY)
+    params = {'start': start_day, 'end': end_day}
+    days = {}
+    for sql in queries:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            bucket = days.setdefault(row['day'], _empty_day())
+            for key, value in row.items():
+                if key != 'day':
+                    bucket[key] = int(value or 0)
+    return days
+
+
+def compute_window_counts(cursor, start, prev_start, end, has_packs=None):
+    """Distinct active creators and pack buyers in [start, end) and [prev_start, start)."""
+    params = {'start': start, 'prev_start': prev_start, 'end': end}
+    counts = dict.fromkeys(WINDOW_COLUMNS, 0)
+    cursor.execute(_WINDOW_ACTIVE_SQL, params)
+    counts.update({k: int(v or 0) for k, v in cursor.fetchone().items()})
+    if has_packs is None:
+        has_packs = _table_exists(cursor, 'pack_purchases')
+    if has_packs:
+        cursor.execute(_WINDOW_PACK_SQL, params)
+        counts.update({k: int(v or 0) for k, v in cursor.fetchone().items()})
+    return counts
+
+
+def _first_source_day(cursor):
+    cursor.execute("""
+        SELECT LEAST(
+            (SELECT MIN(created_at) FROM users),
+            (SELECT MIN(created_at) FROM creators)
+        )::date AS first_day
+    """)
+    row = cursor.fetchone()
+    return row['first_day'] if row else None
+
+
+def refresh_report_rollups(conn, full=False, today=None):
+    """Roll closed days up to yesterday into the rollup tables. Commits.
+
+    Incremental runs start at the earlier of the day after the last rolled day
+    and today - ROLLUP_REWRITE_DAYS. full=True re-rolls every day since the
+    first signup, which also absorbs deleted rows.
+    """
+    from psycopg2.extras import execute_values
+
+    today = today or date.today()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        if not rollups_table_exists(cursor):
+            return {'days': 0, 'start': None, 'as_of': None}
+
+        cursor.execute("SELECT MAX(day) AS as_of FROM report_daily_rollups")
+        as_of = cursor.fetchone()['as_of']
+        if full or as_of is None:
+            start = _first_source_day(cursor) or today
+        else:
+            start = min(as_of + timedelta(days=1), today - timedelta(days=ROLLUP_REWRITE_DAYS))
+        start = min(start, today)
+
+        metrics = compute_day_metrics(cursor, start, today)
+        rows = []
+        day = start
+        while day < today:
+            counters = metrics.get(day) or _empty_day()
+            rows.append((day, *(counters[c] for c in DAILY_COLUMNS)))
+            day += timedelta(days=1)
+
+        if rows:
+            columns = ', '.join(DAILY_COLUMNS)
+            updates = ', '.join(f'{c} = EXCLUDED.{c}' for c in DAILY_COLUMNS)
+            execute_values(
+                cursor,
+                f"""
+                INSERT INTO report_daily_rollups (day, {columns})
+                VALUES %s
+                ON CONFLICT (day) DO UPDATE SET {updates}, refreshed_at = NOW()
+                """,
+                rows,
+            )
+
+        has_packs = _table_exists(cursor, 'pack_purchases')
+        window_rows = []
+        for period in PERIOD_DAYS:
+            period_start, prev_start, _ = period_bounds(period, today)
+            counts = compute_window_counts(cursor, period_start, prev_start, today, has_packs)
+            window_rows.append((period, today - timedelta(days=1), *(counts[c] for c in WINDOW_COLUMNS)))
+        execute_values(
+            cursor,
+            f"""
+            INSERT INTO report_window_rollups (period, as_of, {', '.join(WINDOW_COLUMNS)})
+            VALUES %s
+            ON CONFLICT (period) DO UPDATE SET
+                as_of = EXCLUDED.as_of,
+                {', '.join(f'{c} = EXCLUDED.{c}' for c in WINDOW_COLUMNS)},
+                refreshed_at = NOW()
+            """,
+            window_rows,
+        )
+        conn.commit()
+        return {'days': len(rows), 'start': str(start), 'as_of': str(today - timedelta(days=1))}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+class ReportRollups:
+    """Rolled days plus the live days after them, bound to one dashboard period."""
+
+    def __init__(self, cursor, days, as_of, today, period='7d'):
+        self._cursor = cursor
+        self.days = days
+        self.as_of = as_of
+        self.today = today
+        self.period = period
+        self.start, self.prev_start, self.period_days = period_bounds(period, today)
+        self._window = None
+
+    def total(self, metric, start=None, end=None):
+        """Sum of metric over start <= day <= end (either bound optional)."""
+        return sum(
+            counters[metric] for day, counters in self.days.items()
+            if (start is None or day >= start) and (end is None or day <= end)
+        )
+
+    def period_total(self, metric):
+        return self.total(metric, self.start)
+
+    def prev_total(self, metric):
+        return self.total(metric, self.prev_start, self.start - timedelta(days=1))
+
+    def month_total(self, metric):
+        return self.total(metric, self.today.replace(day=1))
+
+    def today_total(self, metric):
+        return self.total(metric, self.today)
+
+    def daily(self, metric, start=None, key='count'):
+        """[{'date', key}] for days >= start (default: the period) with a non-zero value."""
+        start = self.start if start is None else start
+        return [
+            {'date': str(day), key: counters[metric]}
+            for day, counters in sorted(self.days.items())
+            if day >= start and counters[metric]
+        ]
+
+    def window(self):
+        """WINDOW_COLUMNS for the bound period, including today's new creators/buyers."""
+        if self._window is None:
+            self._window = self._load_window()
+        return self._window
+
+    def _load_window(self):
+        cursor = self._cursor
+        has_packs = _table_exists(cursor, 'pack_purchases')
+        row = None
+        if self.as_of == self.today - timedelta(days=1):
+            cursor.execute(
+                f"SELECT {', '.join(WINDOW_COLUMNS)} FROM report_window_rollups"
+                " WHERE period = %s AND as_of = %s",
+                (self.period, self.as_of),
+            )
+            row = cursor.fetchone()
+        if not row:
+            return compute_window_counts(
+                cursor, self.start, self.prev_start, self.today + timedelta(days=1), has_packs
+            )
+
+        counts = {c: int(row[c] or 0) for c in WINDOW_COLUMNS}
+        params = {'live': self.today, 'start': self.start}
+        cursor.execute(_LIVE_NEW_ACTIVE_SQL, params)
+        counts['active_creators'] += int(cursor.fetchone()['n'] or 0)
+        if has_packs:
+            cursor.execute(_LIVE_NEW_PACK_BUYERS_SQL, params)
+            counts['pack_buyers'] += int(cursor.fetchone()['n'] or 0)
+        return counts
+
+
+def load_report_rollups(cursor, period='7d', today=None):
+    """ReportRollups for a period, or None when callers should aggregate the raw tables."""
+    today = today or date.today()
+    if period not in PERIOD_DAYS or not rollups_table_exists(cursor):
+        return None
+
+    cursor.execute(f"SELECT day, {', '.join(DAILY_COLUMNS)} FROM report_daily_rollups ORDER BY day")
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    as_of = rows[-1]['day']
+    live_start = as_of + timedelta(days=1)
+    if (today - live_start).days >= MAX_LIVE_DAYS:
+        print(f"[ReportRollups] Rolled through {as_of}, too far behind; using raw aggregates")
+        return None
+
+    days = {row['day']: {c: int(row[c] or 0) for c in DAILY_COLUMNS} for row in rows}
+    days.update(compute_day_metrics(cursor, live_start, today + timedelta(days=1)))
+    return ReportRollups(cursor, days, as_of, today, period)
+
+
+def rollup_status(cursor, today=None):
+    """Freshness summary for the admin reports endpoint."""
+    today = today or date.today()
+    if not rollups_table_exists(cursor):
+        return {'ready': False, 'as_of': None, 'days': 0, 'lag_days': None}
+    cursor.execute("""
+        SELECT MIN(day) AS first_day, MAX(day) AS as_of, COUNT(*) AS days, MAX(refreshed_at) AS refreshed_at
+        FROM report_daily_rollups
+    """)
+    row = cursor.fetchone()
+    as_of = row['as_of']
+    return {
+        'ready': as_of is not None,
+        'first_day': str(row['first_day']) if row['first_day'] else None,
+        'as_of': str(as_of) if as_of else None,
+        'days': int(row['days'] or 0),
+        'lag_days': (today - as_of).days - 1 if as_of else None,
+        'refreshed_at': row['refreshed_at'].isoformat() if row['refreshed_at'] else None,
+    }
@@ -2,10 +2,20 @@
 
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 
+from services.mail_transport import http_session
+from services.rate_limiter import TokenBucket
+
 RESEND_API_URL = 'https://api.resend.com/emails'
+# Resend takes up to 100 messages per /emails/batch call
+RESEND_BATCH_LIMIT = 100
+# Messages of a 422-rejected batch re-sent one by one to isolate the bad address.
+# The rest go back to the queue: each single send costs a rate-limit token.
+RESEND_SINGLE_FALLBACK_LIMIT = int(os.getenv('RESEND_SINGLE_FALLBACK_LIMIT', '10'))
 DEFAULT_FROM_EMAIL = 'team@newcollab.co'
 DEFAULT_FROM_NAME = 'Newcollab'
 _UNSUBSCRIBE_HREF_RE = re.compile(
@@ -39,37 +49,31 @@ def extract_unsubscribe_url(html_content):
     return match.group(1) if match else None
 
 
-def send_resend_email(
-    to_email,
-    subject,
-    html_content,
-    unsubscribe_url=None,
-    tags=None,
-):
-    """
-    Send one email via Resend.
+def _api_url(path=''):
+    # RESEND_API_BASE lets tests point at a local fake server
+    base = (os.getenv('RESEND_API_BASE') or '').strip().rstrip('/')
+    url = f'{base}/emails' if base else RESEND_API_URL
+    return url + path
 
-    Returns:
-        dict: success, message_id, error, retryable
-    """
-    api_key = (os.getenv('RESEND_API_KEY') or '').strip()
-    if not api_key:
-        return {
-            'success': False,
-            'message_id': None,
-            'error': 'RESEND_API_KEY not set',
-            'retryable': False,
-        }
 
-    to_email = (to_email or '').strip()
-    if not to_email:
-        return {
-            'success': False,
-            'message_id': None,
-            'error': 'Missing recipient',
-            'retryable': False,
-        }
+def _auth_headers(api_key):
+    return {
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json',
+    }
+
+
+def _result(success, message_id=None, error=None, retryable=False, status_code=None):
+    return {
+        'success': success,
+        'message_id': message_id,
+        'error': error,
+        'retryable': retryable,
+        'status_code': status_code,
+    }
 
+
+def _build_payload(to_email, subject, html_content, unsubscribe_url=None, tags=None):
     payload = {
         'from': campaign_from_header(),
         'to': [to_email],
@@ -86,24 +90,55 @@ def send_resend_email(
 
     if tags:
         payload['tags'] = tags
+    return payload
+
+
+def _error_from_response(response):
+    retryable = response.status_code == 429 or response.status_code >= 500
+    error_text = response.text[:500] if response.text else f'HTTP {response.status_code}'
+    try:
+        body = response.json() or {}
+        message = (body.get('message') or body.get('error') or error_text)
+        if isinstance(message, dict):
+            message = message.get('message') or error_text
+        error_text = str(message)[:500]
+    except (ValueError, AttributeError):
+        pass
+    return _result(False, error=error_text, retryable=retryable, status_code=response.status_code)
+
+
+def send_resend_email(
+    to_email,
+    subject,
+    html_content,
+    unsubscribe_url=None,
+    tags=None,
+):
+    """
+    Send one email via Resend.
+
+    Returns:
+        dict: success, message_id, error, retryable
+    """
+    api_key = (os.getenv('RESEND_API_KEY') or '').strip()
+    if not api_key:
+        return _result(False, error='RESEND_API_KEY not set')
+
+    to_email = (to_email or '').strip()
+    if not to_email:
+        return _result(False, error='Missing recipient')
+
+    payload = _build_payload(to_email, subject, html_content, unsubscribe_url, tags)
 
     try:
-        response = requests.post(
-            RESEND_API_URL,
+        response = http_session().post(
+            _api_url(),
             json=payload,
-            headers={
-                'Authorization': f'Bearer {api_key}',
-                'Content-Type': 'application/json',
-            },
+            headers=_auth_headers(api_key),
             timeout=20,
         )
     except requests.RequestException as exc:
-        return {
-            'success': False,
-            'message_id': None,
-            'error': str(exc)[:500],
-            'retryable': True,
-        }
+        return _result(False, error=str(exc)[:500], retryable=True)
 
     if response.status_code in (200, 201):
         data = {}
@@ -111,27 +146,148 @@ def send_resend_email(
             data = response.json() or {}
         except ValueError:
             data = {}
-        return {
-            'success': True,
-            'message_id': data.get('id'),
-            'error': None,
-            'retryable': False,
-        }
+        return _result(True, message_id=data.get('id'))
+
+    return _error_from_response(response)
+
+
+def send_resend_batch(messages):
+    """
+    Send up to RESEND_BATCH_LIMIT emails in one /emails/batch call.
+
+    messages: dicts with to_email, subject, html_content and optional
+    unsubscribe_url / tags. Returns one result dict per message, in order.
+    Resend accepts or rejects the batch as a whole.
+    """
+    if not messages:
+        return []
+    if len(messages) > RESEND_BATCH_LIMIT:
+        raise ValueError(f'Resend batch limit is {RESEND_BATCH_LIMIT} messages')
+
+    api_key = (os.getenv('RESEND_API_KEY') or '').strip()
+    if not api_key:
+        return [_result(False, error='RESEND_API_KEY not set') for _ in messages]
+
+    results = [None] * len(messages)
+    payload = []
+    positions = []
+    for i, msg in enumerate(messages):
+        to_email = (msg.get('to_email') or '').strip()
+        if not to_email:
+            results[i] = _result(False, error='Missing recipient')
+            continue
+        payload.append(_build_payload(
+            to_email, msg.get('subject'), msg.get('html_content'),
+            msg.get('unsubscribe_url'), msg.get('tags'),
+        ))
+        positions.append(i)
+    if not payload:
+        return results
 
-    retryable = response.status_code == 429 or response.status_code >= 500
-    error_text = response.text[:500] if response.text else f'HTTP {response.status_code}'
     try:
-        body = response.json() or {}
-        message = (body.get('message') or body.get('error') or error_text)
-        if isinstance(message, dict):
-            message = message.get('message') or error_text
-        error_text = str(message)[:500]
-    except ValueError:
-        pass
+        response = http_session().post(
+            _api_url('/batch'),
+            json=payload,
+            headers=_auth_headers(api_key),
+            timeout=30,
+        )
+    except requests.RequestException as exc:
+        failed = _result(False, error=str(exc)[:500], retryable=True)
+        for i in positions:
+            results[i] = dict(failed)
+        return results
 
-    return {
-        'success': False,
-        'message_id': None,
-        'error': error_text,
-        'retryable': retryable,
-    }
+    if response.status_code in (200, 201):
+        try:
+            data = (response.json() or {}).get('data') or []
+        except (ValueError, AttributeError):
+            data = []
+        for n, i in enumerate(positions):
+            item = data[n] if n < len(data) and isinstance(data[n], dict) else {}
+            results[i] = _result(True, message_id=item.get('id'))
+        return results
+
+    failed = _error_from_response(response)
+    for i in positions:
+        results[i] = dict(failed)
+    return results
+
+
+# Resend's default team limit is 2 requests/second across every worker thread.
+RESEND_RATE_LIMIT = TokenBucket(float(os.getenv('RESEND_RATE_PER_SEC', '2')))
+
+
+def _out_of_time(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _not_sent(chunk, error):
+    return [_result(False, error=error, retryable=True) for _ in chunk]
+
+
+def _send_chunk(chunk, bucket, max_retries, deadline=None):
+    """One batch call with retry on 429/5xx; per-message sends if Resend rejects the batch (422).
+
+    Nothing new is sent once ``deadline`` (time.monotonic()) has passed; those
+    messages come back retryable so the caller requeues them.
+    """
+    results = []
+    for attempt in range(max_retries):
+        if _out_of_time(deadline):
+            return _not_sent(chunk, 'Send time budget exhausted')
+        bucket.acquire()
+        if len(chunk) == 1:
+            msg = chunk[0]
+            results = [send_resend_email(
+                msg.get('to_email'), msg.get('subject'), msg.get('html_content'),
+                unsubscribe_url=msg.get('unsubscribe_url'), tags=msg.get('tags'),
+            )]
+        else:
+            results = send_resend_batch(chunk)
+        failed = [r for r in results if not r['success']]
+        if not failed or not any(r['retryable'] for r in failed) or attempt >= max_retries - 1:
+            break
+        backoff = attempt + 1
+        print(f"[Resend] batch of {len(chunk)} attempt {attempt + 1} failed: {failed[0]['error']}, waiting {backoff}s...")
+        time.sleep(backoff)
+
+    # A 422 on the batch (one malformed address, say) fails everyone in it.
+    # Retry the first few one by one so the bad ones end up failed alone;
+    # the rest are requeued rather than spending a token each here.
+    if len(chunk) > 1 and results and all(
+        not r['success'] and r.get('status_code') == 422 for r in results
+    ):
+        error = results[0]['error']
+        out = []
+        for n, msg in enumerate(chunk):
+            if n >= RESEND_SINGLE_FALLBACK_LIMIT:
+                out.append(_result(False, error=f'Batch rejected, requeued: {error}'[:500], retryable=True))
+            else:
+                out.extend(_send_chunk([msg], bucket, max_retries, deadline))
+        return out
+    return results
+
+
+def send_resend_bulk(messages, batch_size=RESEND_BATCH_LIMIT, concurrency=2,
+                     max_retries=2, bucket=None, deadline=None):
+    """
+    Send many messages through /emails/batch with a bounded worker pool.
+
+    Yields (chunk, results) as each chunk finishes so callers can persist
+    progress incrementally. Every HTTP call waits on the shared token bucket.
+    Past ``deadline`` (time.monotonic()) no further calls start; the
+    remaining messages are yielded as retryable failures.
+    """
+    if not messages:
+        return
+    bucket = bucket or RESEND_RATE_LIMIT
+    batch_size = max(1, min(int(batch_size), RESEND_BATCH_LIMIT))
+    chunks = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    if len(chunks) == 1 or concurrency <= 1:
+        for chunk in chunks:
+            yield chunk, _send_chunk(chunk, bucket, max_retries, deadline)
+        return
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+        futures = {pool.submit(_send_chunk, chunk, bucket, max_retries, deadline): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,320 @@
+"""Background creator profile scrapes with dedup-by-handle and pollable status.
+
+enqueue_profile_scrape() returns at once with a job record. The scrape runs on
+the Celery worker (tasks/profile_scrape_tasks.py) when the broker is up, else on
+a small thread pool in this process. Only one job per platform+handle is in
+flight; repeat requests get the running job back. Job records live in Redis
+(in-process dict when Redis is down) for SCRAPE_JOB_TTL seconds.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from psycopg2.extras import RealDictCursor
+
+from services.db_pool import get_db_connection
+from services.recommendation_cache import _json_default
+from services.redis_client import get_redis, mark_redis_failed
+
+JOB_TTL = int(os.getenv('SCRAPE_JOB_TTL', '3600'))
+# A job stuck queued/running longer than this is treated as lost.
+INFLIGHT_TTL = int(os.getenv('SCRAPE_JOB_INFLIGHT_TTL', '600'))
+PROFILE_FRESH_DAYS = int(os.getenv('PROFILE_FRESH_DAYS', '7'))
+# 'celery' (default) or 'thread' to skip the broker entirely
+JOB_BACKEND = os.getenv('SCRAPE_JOBS_BACKEND', 'celery').lower()
+_THREAD_WORKERS = int(os.getenv('SCRAPE_JOB_WORKERS', '2'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+_local_jobs = {}      # job_id -> (expires_at, raw json)
+_local_inflight = {}  # inflight key -> (expires_at, job_id)
+_lock = threading.Lock()
+_executor = None
+
+
+def _job_key(job_id):
+    return f'scrape:job:{job_id}'
+
+
+def _inflight_key(platform, handle):
+    return f'scrape:inflight:{(platform or "").lower()}:{(handle or "").lower().lstrip("@")}'
+
+
+def _decode(raw):
+    return raw.decode() if isinstance(raw, bytes) else raw
+
+
+# ============================================
+# JOB STORAGE
+# ============================================
+
+def _save_job(job):
+    raw = json.dumps(job, default=_json_default)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(_job_key(job['job_id']), raw, ex=JOB_TTL)
+            return
+        except Exception:
+            mark_redis_failed()
+    with _lock:
+        _local_jobs[job['job_id']] = (time.time() + JOB_TTL, raw)
+        now = time.time()
+        for key in [k for k, (exp, _) in _local_jobs.items() if exp <= now]:
+            _local_jobs.pop(key, None)
+
+
+def get_job(job_id):
+    """Job record dict, or None when unknown/expired."""
+    if not job_id:
+        return None
+    raw = None
+    client = get_redis()
+    if client is not None:
+        try:
+            raw = client.get(_job_key(job_id))
+        except Exception:
+            mark_redis_failed()
+            client = None
+    if client is None:
+        with _lock:
+            entry = _local_jobs.get(job_id)
+            if entry and entry[0] > time.time():
+                raw = entry[1]
+    if raw is None:
+        return None
+    try:
+        job = json.loads(_decode(raw))
+    except (TypeError, ValueError):
+        return None
+    if job.get('status') in ACTIVE_STATES and time.time() - (job.get('created_at') or 0) > INFLIGHT_TTL:
+        job['status'] = FAILED
+        job['error'] = 'Scrape job timed out'
+    return job
+
+
+def _update_job(job, **fields):
+    job.update(fields)
+    _save_job(job)
+    return job
+
+
+def _claim_inflight(key, job_id):
+    """Register job_id as the in-flight job for key. Returns the id already holding it."""
+    client = get_redis()
+    if client is not None:
+        try:
+            if client.set(key, job_id, nx=True, ex=INFLIGHT_TTL):
+                return None
+            return _decode(client.get(key))
+        except Exception:
+            mark_redis_failed()
+    now = time.time()
+    with _lock:
+        entry = _local_inflight.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        _local_inflight[key] = (now + INFLIGHT_TTL, job_id)
+    return None
+
+
+def _force_inflight(key, job_id):
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(key, job_id, ex=INFLIGHT_TTL)
+            return
+        except Exception:
+            mark_redis_failed()
+    with _lock:
+        _local_inflight[key] = (time.time() + INFLIGHT_TTL, job_id)
+
+
+def _release_inflight(key, job_id):
+    client = get_redis()
+    if client is not None:
+        try:
+            if _decode(client.get(key)) == job_id:
+                client.delete(key)
+        except Exception:
+            mark_redis_failed()
+    with _lock:
+        entry = _local_inflight.get(key)
+        if entry and entry[1] == job_id:
+            _local_inflight.pop(key, None)
+
+
+# ============================================
+# ENQUEUE / DISPATCH
+# ============================================
+
+def _thread_pool():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_THREAD_WORKERS, thread_name_prefix='scrape-job'
+                )
+    return _executor
+
+
+def _dispatch(job_id):
+    if JOB_BACKEND == 'celery' and get_redis() is not None:
+        try:
+            from tasks.profile_scrape_tasks import run_profile_scrape
+            run_profile_scrape.apply_async(args=[job_id], retry=False)
+            return 'celery'
+        except Exception as e:
+            print(f"[ScrapeJobs] Celery unavailable ({e}), running in-process")
+    _thread_pool().submit(run_scrape_job, job_id)
+    return 'thread'
+
+
+def enqueue_profile_scrape(user_id, handle, platform, skip_minimums=False,
+                           skip_follower_floor=False, reason=''):
+    """Queue a scrape_and_enrich_creator run. Returns (job, created)."""
+    handle = (handle or '').strip().lstrip('@')
+    platform = (platform or 'instagram').lower()
+    key = _inflight_key(platform, handle)
+    job_id = uuid.uuid4().hex
+
+    existing_id = _claim_inflight(key, job_id)
+    if existing_id:
+        existing = get_job(existing_id)
+        if existing and existing.get('status') in ACTIVE_STATES:
+            if str(existing.get('user_id')) == str(user_id):
+                return existing, False
+            # Same handle claimed by another account: run separately, don't share status.
+        else:
+            _force_inflight(key, job_id)
+
+    job = {
+        'job_id': job_id,
+        'user_id': str(user_id),
+        'handle': handle,
+        'platform': platform,
+        'skip_minimums': bool(skip_minimums),
+        'skip_follower_floor': bool(skip_follower_floor),
+        'reason': reason,
+        'status': QUEUED,
+        'created_at': time.time(),
+    }
+    _save_job(job)
+    try:
+        job['backend'] = _dispatch(job_id)
+    except Exception as e:
+        _release_inflight(key, job_id)
+        _update_job(job, status=FAILED, error=str(e))
+        raise
+    print(f"[ScrapeJobs] queued {job_id} @{handle} ({platform}) via {job['backend']} reason={reason}")
+    return job, True
+
+
+def run_scrape_job(job_id):
+    """Execute a queued job (Celery worker or thread pool). Never raises."""
+    job = get_job(job_id)
+    if not job or job.get('status') != QUEUED:
+        return job
+    handle, platform = job['handle'], job['platform']
+    _update_job(job, status=RUNNING, started_at=time.time())
+
+    conn = None
+    try:
+        from services.creator_profile_scraper import scrape_and_enrich_creator
+
+        conn = get_db_connection(cursor_factory=RealDictCursor)
+        profile, vision_data = scrape_and_enrich_creator(
+            job['user_id'], handle, platform, db_conn=conn,
+            skip_minimums=job.get('skip_minimums', False),
+            skip_follower_floor=job.get('skip_follower_floor', False),
+        )
+        _update_job(
+            job, status=DONE, finished_at=time.time(),
+            result={'profile': profile, 'vision': vision_data},
+        )
+    except Exception as e:
+        from services.inhouse_social_scraper import InHouseScrapeError
+        from services.onboarding_scrape_errors import onboarding_scrape_user_error
+
+        print(f"[ScrapeJobs] {job_id} @{handle} failed: {e}")
+        try:
+            payload = onboarding_scrape_user_error(e, handle, platform)
+        except Exception:
+            payload = {'success': False, 'error': 'Failed to scrape profile'}
+        _update_job(
+            job, status=FAILED, finished_at=time.time(), error=str(e),
+            invalid=isinstance(e, (ValueError, InHouseScrapeError)),
+            error_payload=payload,
+        )
+    finally:
+        if conn is not None:
+            conn.close()
+        _release_inflight(_inflight_key(platform, handle), job_id)
+    return job
+
+
+def job_status_payload(job):
+    """Public view of a job for status polling (no profile/result internals)."""
+    return {
+        'job_id': job.get('job_id'),
+        'status': job.get('status'),
+        'handle': job.get('handle'),
+        'platform': job.get('platform'),
+        'created_at': job.get('created_at'),
+        'finished_at': job.get('finished_at'),
+        'error': job.get('error') if job.get('status') == FAILED else None,
+    }
+
+
+# ============================================
+# STALE-WHILE-REVALIDATE
+# ============================================
+
+def profile_age_days(cached_profile):
+    """Days since the cached profile was scraped, or None when unknown."""
+    scraped_at = (cached_profile or {}).get('scraped_at')
+    if not scraped_at:
+        return None
+    if isinstance(scraped_at, str):
+        try:
+            scraped_at = datetime.fromisoformat(scraped_at)
+        except ValueError:
+            return None
+    if scraped_at.tzinfo is None:
+        scraped_at = scraped_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - scraped_at).days
+
+
+def profile_is_stale(cached_profile, max_age_days=PROFILE_FRESH_DAYS):
+    age = profile_age_days(cached_profile)
+    return age is None or age > max_age_days
+
+
+def refresh_if_stale(user_id, handle, platform, cached_profile, reason='stale'):
+    """Queue a background refresh when the cached profile is missing or stale.
+
+    Returns the job (new or in-flight) or None when the cache is fresh. Never raises.
+    """
+    if not handle or not platform:
+        return None
+    if cached_profile and not profile_is_stale(cached_profile):
+        return None
+    try:
+        job, _ = enqueue_profile_scrape(
+            user_id, handle, platform,
+            skip_minimums=True, skip_follower_floor=True, reason=reason,
+        )
+        return job
+    except Exception as e:
+        print(f"[ScrapeJobs] refresh enqueue failed for @{handle}: {e}")
+        return None
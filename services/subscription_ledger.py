@@ -0,0 +1,258 @@
+"""Local ledger of Stripe subscriptions behind MRR, active counts and churn.
+
+The subscriptions table (migrations/add_subscriptions_ledger.sql) holds one row
+per Stripe subscription. The Stripe webhooks keep it current through
+record_stripe_event(). POST /api/cron/reconcile-subscriptions pages Stripe
+nightly and corrects any drift, which is the only time Stripe is listed.
+
+subscription_metrics() is a single SQL aggregate. It returns None before the
+migration or while the ledger is empty; the founder dashboard then falls back
+to the live Stripe page-through (utils/stripe_mrr.py).
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+
+from psycopg2.extras import RealDictCursor
+
+from services.db_pool import get_db_connection
+from utils.stripe_mrr import get_pro_price_ids, monthly_amount_cents
+
+# Statuses that still count as a live subscription (Stripe keeps past_due ones billing).
+LIVE_STATUSES = ('active', 'trialing', 'past_due')
+
+_TABLE_READY = None
+
+
+def ledger_table_exists(cursor) -> bool:
+    """Catalog check, cached once the migration has landed."""
+    global _TABLE_READY
+    if _TABLE_READY is not True:
+        cursor.execute("SELECT to_regclass('public.subscriptions') IS NOT NULL AS ready")
+        row = cursor.fetchone()
+        _TABLE_READY = bool(row and row['ready'])
+    return _TABLE_READY
+
+
+def _ts(value):
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value else None
+
+
+def subscription_row(sub):
+    """Ledger columns for a Stripe Subscription object (prices expanded or inline)."""
+    pro_price_ids = get_pro_price_ids()
+    items = (sub.get('items') or {}).get('data') or []
+    pro_items = [item for item in items if (item.get('price') or {}).get('id') in pro_price_ids]
+    priced = pro_items or items[:1]
+    price = (priced[0].get('price') or {}) if priced else {}
+    return {
+        'id': sub['id'],
+        'customer_id': sub.get('customer') if isinstance(sub.get('customer'), str) else (sub.get('customer') or {}).get('id'),
+        'creator_id': int((sub.get('metadata') or {}).get('creator_id') or 0) or None,
+        'status': sub.get('status') or 'incomplete',
+        'is_pro': bool(pro_items),
+        'price_id': price.get('id'),
+        'billing_interval': (price.get('recurring') or {}).get('interval'),
+        'quantity': sum(item.get('quantity') or 1 for item in priced) or 1,
+        'mrr_cents': sum(monthly_amount_cents(item.get('price') or {}, item.get('quantity') or 1) for item in priced),
+        'cancel_at_period_end': bool(sub.get('cancel_at_period_end')),
+        'started_at': _ts(sub.get('start_date') or sub.get('created')),
+        'current_period_end': _ts(sub.get('current_period_end')),
+        'canceled_at': _ts(sub.get('canceled_at')),
+        'ended_at': _ts(sub.get('ended_at')),
+        'livemode': bool(sub.get('livemode')),
+    }
+
+
+_UPSERT_SQL = """
+    INSERT INTO subscriptions (
+        stripe_subscription_id, stripe_customer_id, creator_id, status, is_pro, price_id,
+        billing_interval, quantity, mrr_cents, cancel_at_period_end, started_at,
+        current_period_end, canceled_at, ended_at, livemode, stripe_event_at, updated_at
+    )
+    VALUES (
+        %(id)s, %(customer_id)s,
+        COALESCE(%(creator_id)s, (SELECT id FROM creators WHERE stripe_subscription_id = %(id)s LIMIT 1)),
+        %(status)s, %(is_pro)s, %(price_id)s, %(billing_interval)s, %(quantity)s, %(mrr_cents)s,
+        %(cancel_at_period_end)s, %(started_at)s, %(current_period_end)s, %(canceled_at)s,
+        %(ended_at)s, %(livemode)s, %(event_at)s, NOW()
+    )
+    ON CONFLICT (stripe_subscription_id) DO UPDATE SET
+        stripe_customer_id = COALESCE(EXCLUDED.stripe_customer_id, subscriptions.stripe_customer_id),
+        creator_id = COALESCE(EXCLUDED.creator_id, subscriptions.creator_id),
+        status = EXCLUDED.status,
+        is_pro = EXCLUDED.is_pro,
+        price_id = EXCLUDED.price_id,
+        billing_interval = EXCLUDED.billing_interval,
+        quantity = EXCLUDED.quantity,
+        mrr_cents = EXCLUDED.mrr_cents,
+        cancel_at_period_end = EXCLUDED.cancel_at_period_end,
+        started_at = COALESCE(EXCLUDED.started_at, subscriptions.started_at),
+        current_period_end = EXCLUDED.current_period_end,
+        canceled_at = EXCLUDED.canceled_at,
+        ended_at = EXCLUDED.ended_at,
+        livemode = EXCLUDED.livemode,
+        stripe_event_at = EXCLUDED.stripe_event_at,
+        updated_at = NOW()
+    -- Stripe does not order webhook deliveries; an older snapshot never overwrites a newer one.
+    WHERE subscriptions.stripe_event_at IS NULL OR EXCLUDED.stripe_event_at >= subscriptions.stripe_event_at
+"""
+
+
+def upsert_subscription(cursor, sub, event_at=None):
+    """Write one Stripe Subscription into the ledger. event_at is the event's `created` (epoch)."""
+    row = subscription_row(sub)
+    row['event_at'] = int(event_at or time.time())
+    cursor.execute(_UPSERT_SQL, row)
+    return row
+
+
+def link_checkout(cursor, subscription_id, customer_id, creator_id, status):
+    """
+    Tie a checkout to its creator. Price/MRR arrive with customer.subscription.* (or reconciliation).
+
+    stripe_event_at stays NULL: the checkout carries no subscription state, so a
+    customer.subscription.created delivered after it must still be applied.
+    """
+    cursor.execute("""
+        INSERT INTO subscriptions (stripe_subscription_id, stripe_customer_id, creator_id, status,
+                                   started_at, stripe_event_at, updated_at)
+        VALUES (%s, %s, %s, %s, NOW(), NULL, NOW())
+        ON CONFLICT (stripe_subscription_id) DO UPDATE SET
+            stripe_customer_id = COALESCE(subscriptions.stripe_customer_id, EXCLUDED.stripe_customer_id),
+            creator_id = EXCLUDED.creator_id,
+            updated_at = NOW()
+    """, (subscription_id, customer_id, creator_id, status))
+
+
+def _apply_event(cursor, event_type, obj, event_at):
+    if event_type.startswith('customer.subscription.'):
+        upsert_subscription(cursor, obj, event_at)
+    elif event_type == 'checkout.session.completed':
+        meta = obj.get('metadata') or {}
+        status = 'trialing' if meta.get('trial') == '7' or not obj.get('amount_total') else 'active'
+        link_checkout(cursor, obj['subscription'], obj.get('customer'), int(meta['creator_id']), status)
+    else:  # invoice paid
+        cursor.execute(
+            "UPDATE subscriptions SET last_paid_at = %s, updated_at = NOW() WHERE stripe_subscription_id = %s",
+            (_ts(event_at) or datetime.now(timezone.utc), obj['subscription'])
+        )
+
+
+def record_stripe_event(event):
+    """Apply a verified Stripe webhook event to the ledger. Never raises: the webhook's own work comes first."""
+    event_type = event.get('type') or ''
+    obj = (event.get('data') or {}).get('object') or {}
+    if event_type == 'checkout.session.completed':
+        relevant = bool(obj.get('subscription')) and str((obj.get('metadata') or {}).get('creator_id') or '').isdigit()
+    elif event_type in ('invoice.paid', 'invoice.payment_succeeded'):
+        relevant = bool(obj.get('subscription'))
+    else:
+        relevant = event_type.startswith('customer.subscription.')
+    if not relevant:
+        return False
+
+    try:
+        conn = get_db_connection(cursor_factory=RealDictCursor)
+        try:
+            cursor = conn.cursor()
+            if not ledger_table_exists(cursor):
+                return False
+            _apply_event(cursor, event_type, obj, event.get('created'))
+            conn.commit()
+        finally:
+            conn.close()
+        return True
+    except Exception as e:
+        print(f"[SubscriptionLedger] Failed to record {event_type}: {e}")
+        return False
+
+
+def reconcile_subscriptions(conn, stripe_module=None):
+    """Page every Stripe subscription into the ledger and close rows Stripe no longer reports as live."""
+    secret_key = os.getenv('STRIPE_SECRET_KEY')
+    if stripe_module is None:
+        if not secret_key or not secret_key.startswith('sk_'):
+            return {'skipped': 'STRIPE_SECRET_KEY not set'}
+        import stripe as stripe_module
+        stripe_module.api_key = secret_key
+
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    if not ledger_table_exists(cursor):
+        return {'skipped': 'subscriptions table missing'}
+
+    started = int(time.time())
+    seen = []
+    for sub in stripe_module.Subscription.list(
+        status='all',
+        limit=100,
+        expand=['data.items.data.price'],
+    ).auto_paging_iter():
+        upsert_subscription(cursor, sub, event_at=started)
+        seen.append(sub['id'])
+
+    # Live in the ledger but not in Stripe's list: a missed deletion.
+    cursor.execute("""
+        UPDATE subscriptions
+        SET status = 'canceled', ended_at = COALESCE(ended_at, NOW()), stripe_event_at = %s, updated_at = NOW()
+        WHERE status = ANY(%s) AND NOT (stripe_subscription_id = ANY(%s))
+          AND (stripe_event_at IS NULL OR stripe_event_at < %s)
+    """, (started, list(LIVE_STATUSES), seen, started))
+    closed = cursor.rowcount
+    cursor.execute("""
+        UPDATE subscriptions s
+        SET creator_id = c.id
+        FROM creators c
+        WHERE s.creator_id IS NULL AND c.stripe_subscription_id = s.stripe_subscription_id
+    """)
+    linked = cursor.rowcount
+    cursor.execute("UPDATE subscriptions SET reconciled_at = NOW() WHERE stripe_subscription_id = ANY(%s)", (seen,))
+    conn.commit()
+    return {'seen': len(seen), 'closed': closed, 'linked': linked}
+
+
+def subscription_metrics(cursor, period_start, period_end=None):
+    """Pro MRR, live counts and churn over [period_start, period_end) from the ledger, or None."""
+    if not ledger_table_exists(cursor):
+        return None
+    period_end = period_end or datetime.now(timezone.utc)
+    cursor.execute("""
+        SELECT
+            COUNT(*) AS ledger_rows,
+            COALESCE(SUM(mrr_cents) FILTER (WHERE status = 'active'), 0) AS mrr_cents,
+            COUNT(*) FILTER (WHERE status = 'active') AS active,
+            COUNT(*) FILTER (WHERE status = 'trialing') AS trialing,
+            COUNT(*) FILTER (WHERE status = 'past_due') AS past_due,
+            COUNT(*) FILTER (WHERE status = 'active' AND cancel_at_period_end) AS cancelling,
+            COUNT(*) FILTER (WHERE started_at < %(start)s
+                             AND (ended_at IS NULL OR ended_at >= %(start)s)
+                             AND status <> 'incomplete_expired') AS live_at_start,
+            COUNT(*) FILTER (WHERE ended_at >= %(start)s AND ended_at < %(end)s) AS churned,
+            COALESCE(SUM(mrr_cents) FILTER (WHERE ended_at >= %(start)s AND ended_at < %(end)s), 0) AS churned_mrr_cents,
+            COUNT(*) FILTER (WHERE started_at >= %(start)s AND started_at < %(end)s) AS new_subscriptions,
+            BOOL_OR(livemode) AS live_mode,
+            MAX(reconciled_at) AS reconciled_at,
+            MAX(updated_at) AS updated_at
+        FROM subscriptions
+        WHERE is_pro OR (price_id IS NULL AND status = ANY(%(live)s))
+    """, {'start': period_start, 'end': period_end, 'live': list(LIVE_STATUSES)})
+    row = cursor.fetchone()
+    if not row or not row['ledger_rows']:
+        return None
+    live_at_start = row['live_at_start'] or 0
+    return {
+        'mrr_dollars': round(row['mrr_cents'] / 100, 2),
+        'active_subscriptions': row['active'],
+        'trialing': row['trialing'],
+        'past_due': row['past_due'],
+        'cancelling': row['cancelling'],
+        'new_subscriptions': row['new_subscriptions'],
+        'churned': row['churned'],
+        'churned_mrr_dollars': round(row['churned_mrr_cents'] / 100, 2),
+        'churn_rate': round(row['churned'] / live_at_start * 100, 2) if live_at_start else 0,
+        'source': 'ledger',
+        'live_mode': bool(row['live_mode']),
+        'reconciled_at': row['reconciled_at'].isoformat() if row['reconciled_at'] else None,
+        'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None,
+    }
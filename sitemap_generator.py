@@ -2,8 +2,8 @@
 Sitemap Generator for NewCollab Brand Directory
 Generates XML sitemap for all public brand pages
 """
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -12,7 +12,7 @@ load_dotenv()
 
 def get_db_connection():
     """Connect to PostgreSQL database"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'))
+    return pooled_db_connection()
 
 def generate_sitemap():
     """
@@ -13,6 +13,8 @@ import base64
 from datetime import datetime, timedelta
 from urllib.parse import urlencode, quote
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.geoip import GEOIP
 
 # Import public profile fetcher
 from social_profile_fetcher import fetch_instagram_profile, fetch_tiktok_profile, ProfileFetchError
@@ -100,8 +102,7 @@ social_verification_bp = Blueprint('social_verification', __name__, url_prefix='
 
 def get_db_connection():
     """Get database connection"""
-    import psycopg2
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 def get_creator_id_from_session():
@@ -138,53 +139,31 @@ def get_user_country_from_session():
         except Exception as e:
             print(f"Error fetching user country from DB: {e}")
 
-    # Fallback: Try IP-based geolocation
-    try:
-        # Get client IP (handles proxies/load balancers)
-        client_ip = request.headers.get('X-Forwarded-For', request.headers.get('X-Real-IP', request.remote_addr))
-        print(f"🌍 Client IP detected: {client_ip}")
-
-        if client_ip:
-            # Take first IP if multiple (X-Forwarded-For can be comma-separated)
-            client_ip = client_ip.split(',')[0].strip()
-
-            # Skip localhost/private IPs
-            if client_ip not in ['127.0.0.1', 'localhost', '::1'] and not client_ip.startswith('192.168.') and not client_ip.startswith('10.'):
-                # Use free IP geolocation API
-                geo_response = requests.get(f'http://ip-api.com/json/{client_ip}?fields=countryCode', timeout=3)
-                if geo_response.status_code == 200:
-                    geo_data = geo_response.json()
-                    country_code = geo_data.get('countryCode')
-                    if country_code:
-                        session['user_country'] = country_code
-                        print(f"🌍 IP geolocation: {client_ip} → {country_code}")
-                        return country_code
-            else:
-                print(f"🌍 Skipping localhost/private IP: {client_ip}")
-    except Exception as e:
-        print(f"IP geolocation error: {e}")
+    # Fallback: local GeoIP index (no outbound call on the auth path)
+    client_ip = _client_ip()
+    country_code = GEOIP.country_for_ip(client_ip)
+    if country_code:
+        session['user_country'] = country_code
+        print(f"🌍 IP geolocation: {client_ip} → {country_code}")
+        return country_code
 
     return None
 
 
+def _client_ip():
+    """First hop of X-Forwarded-For / X-Real-IP, else the socket address."""
+    client_ip = request.headers.get('X-Forwarded-For', request.headers.get('X-Real-IP', request.remote_addr))
+    return (client_ip or '').split(',')[0].strip()
+
+
 def detect_country_from_ip(timeout=3):
     """Detect country from current request IP - standalone function for callbacks.
 
     Returns None for localhost/private IPs and on lookup failure (fail-open).
+    ``timeout`` only applies to the ip-api fallback used before a GeoIP index is deployed.
     """
     try:
-        client_ip = request.headers.get('X-Forwarded-For', request.headers.get('X-Real-IP', request.remote_addr))
-        if client_ip:
-            client_ip = client_ip.split(',')[0].strip()
-            # Skip localhost/private IPs
-            if client_ip in ['127.0.0.1', 'localhost', '::1'] or client_ip.startswith(('192.168.', '10.', '172.')):
-                return None
-            geo_response = requests.get(
-                f'http://ip-api.com/json/{client_ip}?fields=countryCode',
-                timeout=timeout,
-            )
-            if geo_response.status_code == 200:
-                return geo_response.json().get('countryCode')
+        return GEOIP.country_for_ip(_client_ip(), timeout=timeout)
     except Exception as e:
         print(f"⚠️ detect_country_from_ip error: {e}")
     return None
@@ -13,6 +13,9 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
+from services.db_pool import get_db_connection as pooled_db_connection
+from services.creator_context import invalidate_creator_context
+from services.subscription_ledger import record_stripe_event
 
 # GA4 Measurement Protocol configuration
 GA4_MEASUREMENT_ID = os.getenv('GA4_MEASUREMENT_ID', 'G-XXXXXXXXXX')  # e.g., G-ABC123XYZ
@@ -160,14 +163,7 @@ stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
 
 def get_db_connection():
     """Get database connection"""
-    import psycopg2
-    return psycopg2.connect(
-        host=os.getenv('DB_HOST'),
-        port=os.getenv('DB_PORT', 5432),
-        database=os.getenv('DB_NAME'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD')
-    )
+    return pooled_db_connection(source='env')
 
 def get_creator_id_from_session():
     """Get creator ID from session or JWT"""
@@ -380,6 +376,8 @@ def _fulfill_pack_checkout(creator_id, checkout_session):
         result = grant_pack_bundle(conn, creator_id, checkout_session.id)
     finally:
         conn.close()
+    if result.get('granted'):
+        invalidate_creator_context(creator_id)
     return result, None
 
 
@@ -574,6 +572,7 @@ def create_portal_session():
                 conn.commit()
                 cursor.close()
                 conn.close()
+                invalidate_creator_context(creator_id)
                 print(f"✅ Cleared invalid test-mode Stripe data for creator {creator_id}")
             except Exception as db_error:
                 print(f"❌ Error clearing Stripe data: {db_error}")
@@ -656,6 +655,7 @@ def confirm_checkout():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_creator_context(creator_id)
 
         print(f"✅ Activated {tier} subscription for creator {creator_id}")
 
@@ -773,6 +773,9 @@ def stripe_webhook():
 
     print(f"📨 Received Stripe webhook: {event['type']}")
 
+    # Keep the local subscriptions ledger (MRR/churn) in step; never fails the webhook.
+    record_stripe_event(event)
+
     try:
         # Handle successful checkout
         if event['type'] == 'checkout.session.completed':
@@ -819,6 +822,7 @@ def stripe_webhook():
             conn.commit()
             cursor.close()
             conn.close()
+            invalidate_creator_context(creator_id)
 
             print(f"✅ Updated creator {creator_id} to {tier} tier")
 
@@ -860,10 +864,14 @@ def stripe_webhook():
                     subscription_status = 'canceled',
                     subscription_ends_at = NOW()
                 WHERE stripe_subscription_id = %s
+                RETURNING id
             ''', (subscription_id,))
+            changed_ids = [row[0] for row in cursor.fetchall()]
             conn.commit()
             cursor.close()
             conn.close()
+            for changed_id in changed_ids:
+                invalidate_creator_context(changed_id)
 
             print(f"✅ Downgraded creator to free tier")
 
@@ -884,16 +892,21 @@ def stripe_webhook():
                         subscription_status = %s,
                         subscription_ends_at = NOW()
                     WHERE stripe_subscription_id = %s
+                    RETURNING id
                 ''', (status, subscription_id))
+                changed_ids = [row[0] for row in cursor.fetchall()]
             else:
                 cursor.execute('''
                     UPDATE creators
                     SET subscription_status = %s
                     WHERE stripe_subscription_id = %s
                 ''', (status, subscription_id))
+                changed_ids = []
             conn.commit()
             cursor.close()
             conn.close()
+            for changed_id in changed_ids:
+                invalidate_creator_context(changed_id)
 
         return jsonify({'success': True}), 200
 
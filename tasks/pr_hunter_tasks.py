@@ -5,21 +5,31 @@ Handles background processing of brand discovery and enrichment
 
 import sys
 import os
-from celery import Celery
+from celery import Celery, chord, group
+from celery.exceptions import Ignore
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.pr_hunter import PRHunterService
+from services.pr_hunter import (
+    PR_HUNT_CHUNK_SIZE,
+    PRHunterService,
+    chunk_list,
+    enrich_and_stage,
+    filter_new_brands,
+    run_hunt_inline,
+    save_candidates,
+)
+from services.redis_client import get_redis, mark_redis_failed
 from psycopg2.extras import RealDictCursor
-import psycopg2
+from services.db_pool import get_db_connection as pooled_db_connection
 
 # Don't import from app - causes circular import
 # Define get_db_connection here to avoid circular dependency
 def get_db_connection():
     """Get database connection"""
-    return psycopg2.connect(os.getenv('DATABASE_URL'), cursor_factory=RealDictCursor)
+    return pooled_db_connection(cursor_factory=RealDictCursor)
 
 
 # Initialize Celery
@@ -42,7 +52,8 @@ if redis_url.startswith('rediss://'):
 celery_app = Celery(
     'pr_hunter',
     broker=redis_url,
-    backend=redis_url
+    backend=redis_url,
+    include=['tasks.profile_scrape_tasks'],
 )
 
 celery_app.conf.update(
@@ -56,11 +67,18 @@ celery_app.conf.update(
 )
 
 
+PR_HUNT_FANOUT = os.getenv('PR_HUNT_FANOUT', '1') == '1'
+
+
 @celery_app.task(name='pr_hunter.run_hunt', bind=True)
 def run_pr_hunt(self, keyword: str, max_results: int = 50):
     """
     Main Celery task: Discover and enrich brands for a given keyword
 
+    Discovery and dedup run here; enrichment fans out as a chord of
+    enrich_candidates batches and finish_pr_hunt reports the totals under
+    this task's id.
+
     Args:
         keyword: Search keyword (e.g., "Clean Beauty", "K-Beauty")
         max_results: Maximum brands to discover
@@ -75,99 +93,51 @@ def run_pr_hunt(self, keyword: str, max_results: int = 50):
         # Update task state
         self.update_state(state='PROGRESS', meta={'step': 'Discovering brands', 'progress': 0})
 
+        conn = get_db_connection()
+
+        if not PR_HUNT_FANOUT or self.request.is_eager:
+            def report(done, total, totals):
+                self.update_state(state='PROGRESS', meta={
+                    'step': 'Enriching brands',
+                    'progress': 20 + int(done / max(total, 1) * 70),
+                    'enriched': totals['enriched'],
+                    'saved': totals['saved'],
+                })
+
+            result = run_hunt_inline(service, conn, keyword, max_results, on_progress=report)
+            print(f"PR Hunt completed: {result}")
+            return result
+
         # Step 1: Discovery
         print(f"Starting PR hunt for keyword: {keyword}")
         discovered_brands = service.search_google_for_brands(keyword, max_results)
         print(f"Discovered {len(discovered_brands)} brands")
 
-        # Update progress
+        # Step 2: Filter out duplicates (live + staging) in one query
+        cursor = conn.cursor()
+        unique_brands = filter_new_brands(cursor, discovered_brands)
+        cursor.close()
+        print(f"After deduplication: {len(unique_brands)} unique brands")
+
+        if not unique_brands:
+            return finish_pr_hunt([], keyword, len(discovered_brands), 0)
+
+        # Step 3: Enrich in parallel batches
+        batches = chunk_list(unique_brands, PR_HUNT_CHUNK_SIZE)
         self.update_state(
             state='PROGRESS',
-            meta={'step': 'Enriching brands', 'progress': 20, 'discovered': len(discovered_brands)}
+            meta={'step': 'Enriching brands', 'progress': 20,
+                  'discovered': len(discovered_brands), 'unique': len(unique_brands)}
         )
+        hunt = chord(
+            group(enrich_candidates.s(batch, keyword, self.request.id, len(unique_brands)) for batch in batches),
+            finish_pr_hunt.s(keyword, len(discovered_brands), len(unique_brands)),
+        )
+        # The chord callback inherits this task id, so /pr-hunt/status keeps working
+        return self.replace(hunt)
 
-        # Step 2: Filter out duplicates (check both live and staging)
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        unique_brands = []
-        for brand in discovered_brands:
-            domain = brand.get('domain')
-            if not domain:
-                continue
-
-            # Check if already exists in live brands table
-            cursor.execute('SELECT id FROM brands WHERE website LIKE %s', (f'%{domain}%',))
-            if cursor.fetchone():
-                print(f"Skipping {domain} - already in live brands")
-                continue
-
-            # Check if already in staging
-            cursor.execute('SELECT id FROM brand_candidates WHERE domain = %s', (domain,))
-            if cursor.fetchone():
-                print(f"Skipping {domain} - already in candidates")
-                continue
-
-            unique_brands.append(brand)
-
-        print(f"After deduplication: {len(unique_brands)} unique brands")
-
-        # Step 3: Enrich each brand
-        enriched_count = 0
-        saved_count = 0
-        rejected_count = 0
-
-        for idx, brand in enumerate(unique_brands):
-            try:
-                # Update progress
-                progress = 20 + int((idx / len(unique_brands)) * 70)
-                self.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'step': f'Enriching {brand["brand_name"]}',
-                        'progress': progress,
-                        'enriched': enriched_count,
-                        'saved': saved_count
-                    }
-                )
-
-                # Enrich brand data
-                enriched_brand = service.enrich_brand_data(brand)
-                enriched_count += 1
-
-                # Apply quality gate
-                passes_quality, rejection_reason = service.quality_gate(enriched_brand)
-
-                if passes_quality:
-                    # Save to brand_candidates
-                    save_candidate_to_db(cursor, enriched_brand, keyword)
-                    saved_count += 1
-                    print(f"✅ Saved: {enriched_brand['brand_name']}")
-                else:
-                    rejected_count += 1
-                    print(f"❌ Rejected: {enriched_brand['brand_name']} - {rejection_reason}")
-
-                # Commit after each brand to avoid losing progress
-                conn.commit()
-
-            except Exception as e:
-                print(f"Error enriching {brand.get('brand_name', 'Unknown')}: {str(e)}")
-                conn.rollback()
-                continue
-
-        # Final state
-        result = {
-            'keyword': keyword,
-            'discovered': len(discovered_brands),
-            'unique': len(unique_brands),
-            'enriched': enriched_count,
-            'saved': saved_count,
-            'rejected': rejected_count,
-            'completed_at': datetime.utcnow().isoformat()
-        }
-
-        print(f"PR Hunt completed: {result}")
-        return result
+    except Ignore:
+        raise
 
     except Exception as e:
         print(f"PR Hunt failed: {str(e)}")
@@ -178,6 +148,71 @@ def run_pr_hunt(self, keyword: str, max_results: int = 50):
             conn.close()
 
 
+@celery_app.task(name='pr_hunter.enrich_candidates', bind=True)
+def enrich_candidates(self, brands: list, keyword: str, hunt_id: str = None, hunt_total: int = 0):
+    """One chord batch: enrich brands concurrently and stage the ones that pass. Never raises."""
+    service = PRHunterService()
+    conn = None
+    try:
+        conn = get_db_connection()
+        counts = enrich_and_stage(service, conn, brands, keyword)
+    except Exception as e:
+        print(f"PR Hunt batch failed: {str(e)}")
+        counts = {'enriched': 0, 'saved': 0, 'rejected': 0, 'errors': len(brands)}
+    finally:
+        if conn:
+            conn.close()
+
+    if hunt_id:
+        _report_batch_progress(self, hunt_id, hunt_total, len(brands), counts)
+    return counts
+
+
+def _report_batch_progress(task, hunt_id, hunt_total, batch_size, counts):
+    """Aggregate batch counts in Redis and publish them as the hunt's PROGRESS meta."""
+    client = get_redis()
+    if client is None:
+        return
+    key = f'prhunt:{hunt_id}'
+    try:
+        pipe = client.pipeline()
+        pipe.hincrby(key, 'done', batch_size)
+        pipe.hincrby(key, 'enriched', counts['enriched'])
+        pipe.hincrby(key, 'saved', counts['saved'])
+        pipe.expire(key, 86400)
+        done, enriched, saved, _ = pipe.execute()
+        task.update_state(task_id=hunt_id, state='PROGRESS', meta={
+            'step': 'Enriching brands',
+            'progress': 20 + int(done / max(hunt_total, 1) * 70),
+            'enriched': enriched,
+            'saved': saved,
+        })
+    except Exception as e:
+        mark_redis_failed()
+        print(f"PR Hunt progress update failed: {e}")
+
+
+@celery_app.task(name='pr_hunter.finish_hunt')
+def finish_pr_hunt(batch_results: list, keyword: str, discovered: int, unique: int):
+    """Chord callback: total the batch counts into the hunt summary."""
+    totals = {'enriched': 0, 'saved': 0, 'rejected': 0}
+    for counts in batch_results or []:
+        for key in totals:
+            totals[key] += (counts or {}).get(key, 0)
+
+    result = {
+        'keyword': keyword,
+        'discovered': discovered,
+        'unique': unique,
+        'enriched': totals['enriched'],
+        'saved': totals['saved'],
+        'rejected': totals['rejected'],
+        'completed_at': datetime.utcnow().isoformat()
+    }
+    print(f"PR Hunt completed: {result}")
+    return result
+
+
 def save_candidate_to_db(cursor, brand: dict, keyword: str):
     """
     Save enriched brand candidate to database
@@ -187,59 +222,7 @@ def save_candidate_to_db(cursor, brand: dict, keyword: str):
         brand: Enriched brand data
         keyword: Search keyword used
     """
-    query = '''
-        INSERT INTO brand_candidates (
-            brand_name, website_url, domain, instagram_handle, tiktok_handle,
-            pr_manager_name, pr_manager_linkedin, pr_manager_title,
-            contact_email, email_source, verification_score, verification_status, is_catch_all,
-            application_url, application_method, form_platform,
-            logo_url, description, status, discovery_source
-        ) VALUES (
-            %(brand_name)s, %(website_url)s, %(domain)s, %(instagram_handle)s, %(tiktok_handle)s,
-            %(pr_manager_name)s, %(pr_manager_linkedin)s, %(pr_manager_title)s,
-            %(contact_email)s, %(email_source)s, %(verification_score)s, %(verification_status)s, %(is_catch_all)s,
-            %(application_url)s, %(application_method)s, %(form_platform)s,
-            %(logo_url)s, %(description)s, 'PENDING', %(discovery_source)s
-        )
-        ON CONFLICT (domain) DO UPDATE SET
-            updated_at = CURRENT_TIMESTAMP,
-            verification_score = EXCLUDED.verification_score,
-            verification_status = EXCLUDED.verification_status,
-            application_url = EXCLUDED.application_url,
-            application_method = EXCLUDED.application_method,
-            form_platform = EXCLUDED.form_platform
-        RETURNING id
-    '''
-
-    # Helper to safely truncate strings
-    def truncate(value, max_len):
-        if value and isinstance(value, str) and len(value) > max_len:
-            return value[:max_len]
-        return value
-
-    params = {
-        'brand_name': truncate(brand.get('brand_name'), 255),
-        'website_url': truncate(brand.get('website_url'), 255),
-        'domain': truncate(brand.get('domain'), 255),
-        'instagram_handle': truncate(brand.get('instagram_handle'), 255),
-        'tiktok_handle': truncate(brand.get('tiktok_handle'), 255),
-        'pr_manager_name': truncate(brand.get('pr_manager_name'), 255),
-        'pr_manager_linkedin': truncate(brand.get('pr_manager_linkedin'), 255),
-        'pr_manager_title': truncate(brand.get('pr_manager_title'), 255),
-        'contact_email': truncate(brand.get('contact_email'), 255),
-        'email_source': truncate(brand.get('email_source', 'Hunter'), 50),
-        'verification_score': brand.get('verification_score', 0),
-        'verification_status': truncate(brand.get('verification_status', 'unknown'), 20),
-        'is_catch_all': brand.get('is_catch_all', False),
-        'application_url': truncate(brand.get('application_url'), 500),
-        'application_method': truncate(brand.get('application_method', 'EMAIL_ONLY'), 50),
-        'form_platform': truncate(brand.get('form_platform'), 100),
-        'logo_url': truncate(brand.get('logo_url'), 500),
-        'description': brand.get('description'),  # TEXT field, no limit
-        'discovery_source': truncate(f"{keyword} - {brand.get('discovery_source', 'Unknown')}", 100)
-    }
-
-    cursor.execute(query, params)
+    save_candidates(cursor, [brand], keyword)
 
 
 @celery_app.task(name='pr_hunter.reverify_email')
@@ -0,0 +1,28 @@
+"""
+Celery Tasks for background creator profile scrapes
+Job records and dedup live in services/scrape_jobs.py; this only runs them.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasks.pr_hunter_tasks import celery_app
+from services.scrape_jobs import run_scrape_job
+
+
+@celery_app.task(name='profile_scrape.run')
+def run_profile_scrape(job_id: str):
+    """
+    Run a queued profile scrape job
+
+    Args:
+        job_id: Job id from enqueue_profile_scrape()
+
+    Returns:
+        Final job status
+    """
+    job = run_scrape_job(job_id) or {}
+    return {'job_id': job_id, 'status': job.get('status')}
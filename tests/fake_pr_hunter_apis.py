@@ -0,0 +1,102 @@
+"""Local stand-in for SerpApi, Hunter and NeverBounce, with fixed per-call latency.
+
+Point SERPAPI_API_BASE, HUNTER_API_BASE and NEVERBOUNCE_API_BASE at server.url.
+Every brand gets a Typeform ambassador form, a LinkedIn PR manager, a Hunter
+email and a 'valid' verification. Records calls per API and peak concurrency.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakePRHunterAPIs:
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.calls = {'serpapi': 0, 'hunter': 0, 'neverbounce': 0}
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._httpd.server_address[1]}'
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def env(self):
+        return {
+            'SERPAPI_API_BASE': self.url,
+            'HUNTER_API_BASE': self.url,
+            'NEVERBOUNCE_API_BASE': self.url,
+        }
+
+    def _search(self, query):
+        if 'site:linkedin.com/in' in query:
+            return {'organic_results': [{
+                'title': 'Jane Doe - PR Manager', 'link': 'https://linkedin.com/in/janedoe',
+            }]}
+        if query.startswith('site:') and '/pages/ambassador' in query:
+            domain = query.split()[0][len('site:'):]
+            return {'organic_results': [{
+                'title': 'Ambassador application', 'snippet': 'Apply to join',
+                'link': f'https://form.typeform.com/to/{domain.split(".")[0]}',
+            }]}
+        return {'organic_results': []}
+
+    def _handle(self, path, params):
+        with self._lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            time.sleep(self.latency)
+            if path == '/search':
+                api, payload = 'serpapi', self._search(params.get('q', ''))
+            elif path == '/v2/email-finder':
+                first, last = params.get('first_name', ''), params.get('last_name', '')
+                api, payload = 'hunter', {'data': {
+                    'email': f"{first}.{last}@{params.get('domain')}".lower(), 'confidence': 92,
+                }}
+            elif path == '/v4/single/check':
+                api, payload = 'neverbounce', {'result': 'valid', 'flags': ['has_dns_mx']}
+            else:
+                return 404, {'error': 'not found'}
+            with self._lock:
+                self.calls[api] += 1
+            return 200, payload
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                status, payload = server._handle(parsed.path, params)
+                raw = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,79 @@
+"""Local stand-in for the Resend API (/emails and /emails/batch).
+
+Point RESEND_API_BASE at server.url. Records every request; set
+fail_next_statuses (e.g. [429]) or reject_emails to inject errors.
+"""
+
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeResendServer:
+    def __init__(self):
+        self.requests = []
+        self.fail_next_statuses = []
+        self.reject_emails = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._httpd.server_address[1]}'
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def sent_to(self):
+        """Every recipient accepted so far."""
+        out = []
+        for path, body, status in self.requests:
+            if status != 200:
+                continue
+            items = body if isinstance(body, list) else [body]
+            out.extend(addr for item in items for addr in item['to'])
+        return out
+
+    def _handle(self, path, body):
+        with self._lock:
+            if self.fail_next_statuses:
+                status = self.fail_next_statuses.pop(0)
+                self.requests.append((path, body, status))
+                return status, {'message': f'injected {status}'}
+            items = body if isinstance(body, list) else [body]
+            if any(addr in self.reject_emails for item in items for addr in item['to']):
+                self.requests.append((path, body, 422))
+                return 422, {'message': 'Invalid `to` field'}
+            self.requests.append((path, body, 200))
+        ids = [{'id': uuid.uuid4().hex} for _ in items]
+        return 200, ({'data': ids} if path.endswith('/batch') else ids[0])
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'null')
+                if self.path not in ('/emails', '/emails/batch'):
+                    status, payload = 404, {'message': 'not found'}
+                else:
+                    status, payload = server._handle(self.path, body)
+                raw = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
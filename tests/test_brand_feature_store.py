@@ -0,0 +1,187 @@
+"""Brand feature store: stored records, array snapshot, fingerprint fallback, background reload."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.brand_feature_store as store
+import services.fit_score_calculator as fit
+from services.brand_feature_store import (
+    BrandFeatureSnapshot,
+    BrandFeatureStore,
+    compute_brand_features,
+    price_tier,
+    upsert_brand_features,
+)
+
+BRANDS = [
+    {'id': 1, 'brand_name': 'Glow Lab', 'category': 'Skincare',
+     'description': 'Vitamin C serum and SPF moisturizer', 'hero_product': 'Glow serum',
+     'price_point': 38, 'min_followers': 5000, 'max_followers': None},
+    {'id': 2, 'brand_name': 'By Far', 'category': 'lifestyle',
+     'description': 'Luxury designer handbags', 'price_point': 450, 'min_followers': 20000},
+    {'id': 3, 'brand_name': 'Calm Leaf', 'category': 'wellness',
+     'description': 'CBD gummies for sleep', 'price_point': None, 'min_followers': 0},
+    {'id': 4, 'brand_name': 'Curl Co', 'category': 'haircare',
+     'description': 'Curl cream and wigs', 'hero_product': 'lace wig', 'price_point': 12},
+]
+
+PROFILE = {
+    'primary_niche': 'beauty',
+    'secondary_niches': ['wellness', 'lifestyle'],
+    'content_themes': ['skincare routine', 'serum reviews'],
+    'raw_bio': 'Mom of two sharing affordable skincare finds',
+    'engagement_rate': 2.1,
+    'posting_cadence_per_week': 4,
+    'follower_count': 12000,
+}
+
+
+def _loaded_store(brands=BRANDS):
+    records = [compute_brand_features(b) for b in brands]
+    feature_store = BrandFeatureStore(ttl=3600, loader=lambda: records)
+    feature_store.warm()
+    return feature_store
+
+
+class TestRecord(unittest.TestCase):
+    def test_price_tiers(self):
+        self.assertEqual([price_tier(p) for p in (None, 0, 'x', 12, 38, 120, 450)], [0, 0, 0, 1, 2, 3, 4])
+
+    def test_snapshot_round_trips_parsed_features(self):
+        snapshot = BrandFeatureSnapshot([compute_brand_features(b) for b in BRANDS])
+        self.assertEqual(len(snapshot), 4)
+        for brand in BRANDS:
+            parsed = fit.compute_brand_text_features(brand)
+            stored = snapshot.features(brand['id'], fit.brand_fingerprint(brand))
+            self.assertEqual({k: stored[k] for k in parsed}, parsed)
+        glow = snapshot.features(1)
+        self.assertEqual((glow['price_tier'], glow['min_followers'], glow['max_followers']), (2, 5000, None))
+        self.assertEqual(glow['dna'], tuple(fit.get_brand_dna('skincare')['weights'][k] for k in store.DNA_WEIGHT_KEYS))
+        self.assertIsNone(snapshot.features(1, 'another-fingerprint'))
+        self.assertIsNone(snapshot.features(99))
+
+    def test_name_alias_shares_fingerprint(self):
+        aliased = dict(BRANDS[0], name=BRANDS[0]['brand_name'])
+        del aliased['brand_name']
+        self.assertEqual(fit.brand_fingerprint(aliased), fit.brand_fingerprint(BRANDS[0]))
+
+
+class TestUpsert(unittest.TestCase):
+    def test_one_statement_with_flag_bits(self):
+        cursor = MagicMock()
+        with patch.object(store, '_TABLE_READY', True), \
+                patch('psycopg2.extras.execute_values') as execute_values:
+            self.assertEqual(upsert_brand_features(cursor, BRANDS + [{'brand_name': 'no id'}]), 4)
+        execute_values.assert_called_once()
+        sql, rows = execute_values.call_args.args[1:]
+        self.assertIn('ON CONFLICT (brand_id) DO UPDATE', sql)
+        by_far = dict(zip(store.FEATURE_COLUMNS, rows[1]))
+        luxury_bit = 1 << fit.BRAND_FEATURE_FLAGS.index('ctx_luxury')
+        self.assertTrue(by_far['flags'] & luxury_bit)
+        self.assertEqual(by_far['version'], fit.BRAND_FEATURE_VERSION)
+
+    def test_missing_table_writes_nothing(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (False,)
+        with patch.object(store, '_TABLE_READY', None), \
+                patch('psycopg2.extras.execute_values') as execute_values:
+            self.assertEqual(upsert_brand_features(cursor, BRANDS), 0)
+        execute_values.assert_not_called()
+
+
+class TestScoringFromSnapshot(unittest.TestCase):
+    def test_scores_match_and_brand_text_is_not_reparsed(self):
+        parsed_scores = fit.score_brands_for_creator(PROFILE, BRANDS)
+        feature_store = _loaded_store()
+        with patch('services.brand_feature_store.BRAND_FEATURES', feature_store), \
+                patch.object(fit, 'compute_brand_text_features') as parse:
+            stored_scores = fit.score_brands_for_creator(PROFILE, BRANDS)
+        parse.assert_not_called()
+        self.assertEqual(stored_scores, parsed_scores)
+        self.assertEqual(feature_store.stats()['hits'], 4)
+
+    def test_edited_or_unknown_brand_falls_back_to_parsing(self):
+        feature_store = _loaded_store(BRANDS[:1])
+        edited = dict(BRANDS[0], description='Luxury designer eyewear frames')
+        with patch('services.brand_feature_store.BRAND_FEATURES', feature_store):
+            fits = fit.score_brands_for_creator(PROFILE, [edited, BRANDS[1]])
+        self.assertEqual(fits, fit.score_brands_for_creator(PROFILE, [edited, BRANDS[1]]))
+        stats = feature_store.stats()
+        self.assertEqual((stats['hits'], stats['stale'], stats['misses']), (0, 1, 1))
+
+
+def _baseline_features(brand):
+    """How scoring parsed a brand before the feature store: both name fields."""
+    return fit._brand_text_features(
+        fit._flatten_text(brand.get('name'), brand.get('brand_name'),
+                          brand.get('description'), brand.get('category')),
+        fit._flatten_text(brand.get('name'), brand.get('brand_name'), brand.get('description'),
+                          brand.get('hero_product'), brand.get('product_sku_name')),
+        (brand.get('category') or '').lower().strip(),
+    )
+
+
+class TestNameFields(unittest.TestCase):
+    # name != brand_name: both feed the features, as scoring always read them
+    RENAMED = [
+        dict(BRANDS[0], name='Glow Lab Optical Frames'),
+        dict(BRANDS[1], name='By Far Serum Studio'),
+        dict(BRANDS[3], name='Curl Co Skincare'),
+    ]
+
+    def test_scores_match_baseline_scoring(self):
+        with patch.object(fit, '_brand_features', _baseline_features):
+            baseline = [fit.score_brand_for_creator(PROFILE, b) for b in self.RENAMED]
+        parsed = [fit.score_brand_for_creator(PROFILE, b) for b in self.RENAMED]
+        with patch('services.brand_feature_store.BRAND_FEATURES', _loaded_store(self.RENAMED)):
+            stored = [fit.score_brand_for_creator(PROFILE, b) for b in self.RENAMED]
+        self.assertEqual(parsed, baseline)
+        self.assertEqual(stored, baseline)
+        # The extra name text does move scores, so dropping it would show up here
+        plain = [fit.score_brand_for_creator(PROFILE, b) for b in BRANDS[:2] + BRANDS[3:]]
+        self.assertNotEqual([f['overall_score'] for f in plain], [f['overall_score'] for f in baseline])
+
+    def test_row_without_the_extra_name_is_not_served_for_it(self):
+        feature_store = _loaded_store(BRANDS[:1])
+        with patch('services.brand_feature_store.BRAND_FEATURES', feature_store):
+            fits = fit.score_brand_for_creator(PROFILE, self.RENAMED[0])
+        with patch.object(fit, '_brand_features', _baseline_features):
+            self.assertEqual(fits, fit.score_brand_for_creator(PROFILE, self.RENAMED[0]))
+        self.assertEqual(feature_store.stats()['stale'], 1)
+
+
+class TestReload(unittest.TestCase):
+    def test_cold_store_never_loads_on_request_path(self):
+        loader = MagicMock(return_value=[])
+        self.assertIsNone(BrandFeatureStore(loader=loader).lookup(BRANDS[0]))
+        loader.assert_not_called()
+
+    def test_stale_snapshot_reloads_in_background(self):
+        records = [compute_brand_features(b) for b in BRANDS[:1]]
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return records if len(loads) == 1 else [compute_brand_features(b) for b in BRANDS]
+
+        feature_store = BrandFeatureStore(ttl=3600, loader=loader)
+        feature_store.warm()
+        self.assertIsNone(feature_store.lookup(BRANDS[1]))
+        feature_store.invalidate()
+        feature_store.lookup(BRANDS[0])  # still served from the old snapshot
+        deadline = time.time() + 2
+        while feature_store.stats()['builds'] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(loads), 2)
+        self.assertIsNotNone(feature_store.lookup(BRANDS[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""For You hot section and public directory read brand_popularity_stats."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.brand_popularity as brand_popularity
+from services.brand_popularity import popularity_join_sql, refresh_brand_popularity
+
+
+def _conn_with_table(exists):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value = cursor
+    cursor.fetchone.side_effect = [(1,) if exists else None, (42,)]
+    return conn, cursor
+
+
+class TestPopularityJoin(unittest.TestCase):
+    def setUp(self):
+        brand_popularity._TABLE_READY = None
+
+    def test_joins_stats_table_when_migrated(self):
+        conn, _ = _conn_with_table(True)
+        sql = popularity_join_sql(conn)
+        self.assertEqual(sql, 'LEFT JOIN brand_popularity_stats ps ON ps.brand_id = b.id')
+
+    def test_falls_back_to_inline_aggregate_before_migration(self):
+        conn, _ = _conn_with_table(False)
+        sql = popularity_join_sql(conn)
+        self.assertIn('FROM creator_pipeline', sql)
+        self.assertIn('pitched_creators_30d', sql)
+        self.assertIn('pitch_count', sql)
+        self.assertIn('response_count', sql)
+        self.assertNotIn('%', sql)  # safe to splice into parameterized queries
+
+    def test_table_check_is_cached_once_present(self):
+        conn, cursor = _conn_with_table(True)
+        popularity_join_sql(conn)
+        popularity_join_sql(conn)
+        self.assertEqual(cursor.execute.call_count, 1)
+
+
+class TestRefresh(unittest.TestCase):
+    def setUp(self):
+        brand_popularity._TABLE_READY = None
+
+    def test_refresh_all_returns_row_count(self):
+        conn, cursor = _conn_with_table(True)
+        self.assertEqual(refresh_brand_popularity(conn), 42)
+        cursor.execute.assert_called_with('SELECT refresh_all_brand_popularity_stats() AS refreshed')
+        conn.commit.assert_called_once()
+
+    def test_refresh_one_brand(self):
+        conn, cursor = _conn_with_table(True)
+        self.assertEqual(refresh_brand_popularity(conn, brand_id=7), 1)
+        cursor.execute.assert_called_with('SELECT refresh_brand_popularity_stats(%s)', (7,))
+
+    def test_noop_before_migration(self):
+        conn, _ = _conn_with_table(False)
+        self.assertEqual(refresh_brand_popularity(conn), 0)
+        conn.commit.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
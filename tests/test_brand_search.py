@@ -0,0 +1,93 @@
+"""Brand autocomplete index: ranking, prefix/substring matching, refresh on brand writes."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.brand_search as brand_search
+from services.brand_search import (
+    BrandAutocomplete,
+    BrandAutocompleteIndex,
+    brand_name_match_params,
+    brand_name_match_sql,
+)
+
+
+def _rows():
+    # Already in rank order: curated first, then search_count
+    return [
+        {'id': 1, 'brand_name': 'Glossier', 'logo_url': 'g.png', 'category': 'beauty', 'source': 'curated'},
+        {'id': 2, 'brand_name': 'La Roche-Posay', 'logo_url': None, 'category': 'skincare', 'source': 'curated'},
+        {'id': 3, 'brand_name': 'Posh Glow', 'logo_url': None, 'category': 'beauty', 'source': 'discovered'},
+        {'id': 4, 'brand_name': 'Gloss Lab', 'logo_url': None, 'category': 'beauty', 'source': None},
+    ]
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = BrandAutocompleteIndex(_rows())
+
+    def test_prefix_matches_full_name_and_words(self):
+        self.assertEqual([s['id'] for s in self.index.suggest('glo')], [1, 3, 4])
+        self.assertEqual([s['id'] for s in self.index.suggest('la roche')], [2])
+        self.assertEqual([s['id'] for s in self.index.suggest('posay')], [2])
+        self.assertEqual(self.index.suggest('gloss lab')[0]['source'], 'curated')
+
+    def test_substring_fills_remaining_slots_in_rank_order(self):
+        self.assertEqual([s['id'] for s in self.index.suggest('oss')], [1, 4])
+        self.assertEqual([s['id'] for s in self.index.suggest('glo', limit=1)], [1])
+        self.assertEqual(self.index.suggest('zzz'), [])
+
+
+class TestAutocompleteRefresh(unittest.TestCase):
+    def setUp(self):
+        self.generation = 0
+        patcher = patch.object(brand_search.PUBLIC_CACHE, 'generation', side_effect=lambda: self.generation)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loader = MagicMock(return_value=_rows())
+
+    def test_rebuilds_when_brand_generation_moves(self):
+        auto = BrandAutocomplete(ttl=600, loader=self.loader)
+        auto.suggest('glo')
+        auto.suggest('glo')
+        self.assertEqual(self.loader.call_count, 1)
+
+        self.generation = 1
+        self.loader.return_value = _rows()[:1]
+        with patch.object(brand_search, '_GENERATION_CHECK_SEC', 0):
+            self.assertEqual([s['id'] for s in auto.suggest('glo')], [1])
+        self.assertEqual(auto.stats()['builds'], 2)
+
+    def test_none_when_index_cannot_build(self):
+        self.loader.side_effect = RuntimeError('db down')
+        auto = BrandAutocomplete(loader=self.loader)
+        self.assertIsNone(auto.suggest('glo'))
+        self.assertEqual(auto.stats()['build_errors'], 1)
+
+    def test_keeps_serving_old_index_when_rebuild_fails(self):
+        auto = BrandAutocomplete(loader=self.loader)
+        auto.suggest('glo')
+        auto.invalidate()
+        self.loader.side_effect = RuntimeError('db down')
+        self.assertEqual(len(auto.suggest('glo')), 3)
+
+
+class TestMatchSql(unittest.TestCase):
+    def test_uses_search_name_once_migrated(self):
+        with patch.object(brand_search, '_COLUMN_READY', True):
+            self.assertIn('search_name LIKE', brand_name_match_sql(MagicMock()))
+        with patch.object(brand_search, '_COLUMN_READY', None):
+            conn = MagicMock()
+            conn.cursor.return_value.fetchone.return_value = None
+            self.assertIn("REPLACE(brand_name, ' ', '')", brand_name_match_sql(conn))
+        self.assertEqual(brand_name_match_params("L'Oréal Paris"), ('%loralparis%', "%L'Oréal Paris%"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""Bulk AI enrichment: concurrent calls, 429 backoff, multi-brand prompts, batched writes, checkpoints."""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.bulk_ai_enricher as enricher
+from services.bulk_ai_enricher import (
+    EnrichmentCheckpoint,
+    assign_unique_slugs,
+    build_brand_update,
+    bulk_enrich_follower_requirements,
+    call_claude,
+)
+from services.rate_limiter import AdaptiveTokenBucket
+
+
+def _reply(status=200, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = {'content': [{'text': json.dumps(payload or {})}]}
+    return response
+
+
+def _brands(n):
+    return [{'id': i + 1, 'brand_name': f'Brand {i + 1}', 'website': f'https://brand{i + 1}.com',
+             'category': 'skincare', 'min_followers': None, 'micro_friendly': None} for i in range(n)]
+
+
+class _EnricherCase(unittest.TestCase):
+    def setUp(self):
+        for patcher in (
+            patch.object(enricher, 'ANTHROPIC_API_KEY', 'test-key'),
+            patch.object(enricher, 'ANTHROPIC_LIMIT', AdaptiveTokenBucket(10000, max_rate=10000)),
+            patch.object(enricher, 'get_redis', return_value=None),
+            patch.object(EnrichmentCheckpoint, '_local', {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestCallClaude(_EnricherCase):
+    def test_429_backs_off_then_retries(self):
+        replies = [_reply(429, headers={'retry-after': '0'}), _reply(payload={'ok': True})]
+        with patch.object(enricher.requests, 'post', side_effect=replies) as post:
+            text = call_claude('hi', max_tokens=10, timeout=5)
+        self.assertEqual(json.loads(text), {'ok': True})
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(enricher.ANTHROPIC_LIMIT.throttle_count, 1)
+
+    def test_gives_up_after_max_retries(self):
+        with patch.object(enricher.requests, 'post', return_value=_reply(529, headers={'retry-after': '0'})), \
+                patch.object(enricher, 'ANTHROPIC_MAX_RETRIES', 2):
+            with self.assertRaises(enricher.requests.RequestException):
+                call_claude('hi', max_tokens=10, timeout=5)
+
+
+class TestBrandUpdate(unittest.TestCase):
+    def test_only_fills_empty_fields_and_clamps(self):
+        brand = {'id': 1, 'brand_name': 'Glow', 'description': 'Kept', 'tone': None, 'contact_email': 'pr@glow.com'}
+        enriched = {'description': 'New', 'tone': ' Playful ', 'min_followers': 250000, 'response_rate': 99,
+                    'instagram_handle': '@glow', 'tiktok_handle': 'null', 'category': 'skincare'}
+        fields = build_brand_update(brand, enriched, cover_image_url='https://glow.com/hero.jpg')
+        self.assertEqual(fields, {
+            'cover_image_url': 'https://glow.com/hero.jpg', 'tone': 'playful', 'min_followers': 50000,
+            'instagram_handle': 'glow', 'category': 'skincare',
+        })
+
+    def test_slugs_unique_against_table_and_batch(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [{'slug': 'bala'}, {'slug': 'bala-1'}]
+        slugs = assign_unique_slugs(cursor, [
+            {'id': 1, 'brand_name': 'Bala'}, {'id': 2, 'brand_name': 'BALA'}, {'id': 3, 'brand_name': 'Glow'},
+        ])
+        self.assertEqual(slugs, {1: 'bala-2', 2: 'bala-3', 3: 'glow'})
+        cursor.execute.assert_called_once()
+
+
+class TestFollowerJob(_EnricherCase):
+    def _run(self, brands, answer, **kwargs):
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = brands
+        with patch.dict(os.environ, {'DATABASE_URL': 'postgres://test'}), \
+                patch('services.db_pool.get_db_connection', return_value=conn), \
+                patch('psycopg2.extras.execute_values') as execute_values, \
+                patch.object(enricher, 'call_claude', side_effect=answer) as call:
+            stats = bulk_enrich_follower_requirements(limit=100, **kwargs)
+        return stats, conn, execute_values, call
+
+    @staticmethod
+    def _answer(prompt, **kwargs):
+        ids = [int(part.split('\n')[0]) for part in prompt.split('### id=')[1:]]
+        if not ids:
+            return json.dumps({'min_followers': 5000, 'micro_friendly': True})
+        return json.dumps({str(i): {'min_followers': 1000 * i, 'micro_friendly': i % 2 == 0} for i in ids})
+
+    def test_multi_brand_prompts_and_one_update_per_batch(self):
+        stats, conn, execute_values, call = self._run(_brands(30), self._answer, prompt_batch=10, workers=3)
+        self.assertEqual(call.call_count, 3)
+        self.assertEqual((stats['processed'], stats['updated'], stats['errors']), (30, 30, 0))
+        self.assertEqual(stats['last_id'], 30)
+        rows = [row for c in execute_values.call_args_list for row in c.args[2]]
+        self.assertEqual([row[0] for row in rows], list(range(1, 31)))
+        self.assertEqual(rows[1], (2, 2000, True))
+        self.assertEqual(execute_values.call_count, conn.commit.call_count)
+
+    def test_brands_missing_from_batch_reply_fall_back_to_single_prompt(self):
+        def answer(prompt, **kwargs):
+            if '### id=' in prompt:
+                return json.dumps({'1': {'min_followers': 2000, 'micro_friendly': True}})
+            return json.dumps({'min_followers': 9000, 'micro_friendly': False})
+
+        stats, _, execute_values, call = self._run(_brands(3), answer, prompt_batch=3)
+        self.assertEqual(call.call_count, 3)
+        self.assertEqual(stats['updated'], 3)
+        self.assertEqual(execute_values.call_args.args[2][2], (3, 9000, False))
+
+    def test_resume_starts_after_checkpoint(self):
+        EnrichmentCheckpoint('followers:null').save(40)
+        stats, conn, _, _ = self._run(_brands(5), self._answer, resume=True, prompt_batch=5)
+        self.assertEqual(conn.cursor.return_value.execute.call_args.args[1], (40, 100, 0))
+        # Fewer rows than the limit: the pass is finished and the checkpoint cleared
+        self.assertEqual(EnrichmentCheckpoint('followers:null').load(), 0)
+
+    def test_dry_run_writes_nothing(self):
+        stats, conn, execute_values, _ = self._run(_brands(4), self._answer, dry_run=True, prompt_batch=2)
+        self.assertEqual(stats['updated'], 4)
+        execute_values.assert_not_called()
+        conn.commit.assert_not_called()
+
+    def test_concurrent_prompts_beat_serial(self):
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def slow_answer(prompt, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.03)
+            with lock:
+                in_flight[0] -= 1
+            return self._answer(prompt)
+
+        started = time.perf_counter()
+        self._run(_brands(24), slow_answer, prompt_batch=1, workers=1)
+        serial_sec = time.perf_counter() - started
+        started = time.perf_counter()
+        stats, _, _, _ = self._run(_brands(24), slow_answer, prompt_batch=1, workers=8)
+        parallel_sec = time.perf_counter() - started
+        self.assertEqual(stats['updated'], 24)
+        self.assertGreater(peak[0], 1)
+        self.assertLess(parallel_sec * 3, serial_sec)
+
+
+class TestBrandJob(_EnricherCase):
+    def test_one_update_and_progress_report_per_batch(self):
+        brands = [dict(b, slug=None, cover_image_url='x', description=None) for b in _brands(6)]
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.side_effect = [brands, [], []]
+        progress = []
+        enriched = {'description': 'Makes serums.', 'category': 'skincare'}
+        with patch.dict(os.environ, {'DATABASE_URL': 'postgres://test'}), \
+                patch('services.db_pool.get_db_connection', return_value=conn), \
+                patch('psycopg2.extras.execute_values') as execute_values, \
+                patch.object(enricher, 'enrich_brand_with_ai', return_value=enriched), \
+                patch('services.brand_feature_store.upsert_brand_features') as upsert_features:
+            count = enricher.bulk_enrich_brands([b['id'] for b in brands], batch_size=3,
+                                                on_progress=progress.append)
+        self.assertEqual(count, 6)
+        self.assertEqual(execute_values.call_count, 2)
+        # Fit features recomputed from the enriched rows, in the same transaction
+        self.assertEqual(upsert_features.call_count, 2)
+        self.assertEqual(upsert_features.call_args_list[0].args[1][0]['description'], 'Makes serums.')
+        sql = execute_values.call_args.args[1]
+        self.assertIn('description = COALESCE(v.description, b.description)', sql)
+        first_row = execute_values.call_args_list[0].args[2][0]
+        self.assertEqual(first_row[:4], (1, 'brand-1', None, 'Makes serums.'))
+        self.assertEqual([p['processed'] for p in progress], [3, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
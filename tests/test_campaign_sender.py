@@ -0,0 +1,157 @@
+"""Batched campaign sends: one already-sent lookup, Resend batch calls, bulk status writes."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import routes.admin_email as admin_email
+import services.resend_mail as resend_mail
+from services.resend_mail import TokenBucket, send_resend_batch, send_resend_bulk
+from tests.fake_resend_server import FakeResendServer
+
+
+def _recipient(i, email=None):
+    return {
+        'id': i, 'user_id': 100 + i, 'creator_id': 200 + i,
+        'email': email or f'creator{i}@example.com', 'first_name': f'C{i}',
+        'username': f'c{i}', 'niche': 'beauty', 'followers_count': 1500, 'tier': 'free',
+        'pitches_this_week': 1, 'pitches_total': 4, 'brands_saved': 2,
+    }
+
+
+class _FakeResendCase(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeResendServer().start()
+        self.addCleanup(self.server.stop)
+        for patcher in (
+            patch.dict('os.environ', {'RESEND_API_KEY': 're_test', 'RESEND_API_BASE': self.server.url}),
+            patch.object(resend_mail, 'RESEND_RATE_LIMIT', TokenBucket(1000)),
+            patch.object(resend_mail.time, 'sleep'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestResendBatch(_FakeResendCase):
+    def test_batch_returns_one_result_per_message(self):
+        results = send_resend_batch([
+            {'to_email': 'a@x.com', 'subject': 'Hi', 'html_content': '<p>a</p>'},
+            {'to_email': '', 'subject': 'Hi', 'html_content': '<p>b</p>'},
+            {'to_email': 'c@x.com', 'subject': 'Hi', 'html_content': '<p>c</p>',
+             'unsubscribe_url': 'https://api/unsub?uid=3'},
+        ])
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        path, body, _ = self.server.requests[0]
+        self.assertEqual(path, '/emails/batch')
+        self.assertEqual(len(body), 2)
+        self.assertIn('List-Unsubscribe', body[1]['headers'])
+
+    def test_rate_limited_chunk_is_retried(self):
+        self.server.fail_next_statuses = [429]
+        messages = [{'to_email': f'{i}@x.com', 'subject': 's', 'html_content': 'h'} for i in range(3)]
+        out = list(send_resend_bulk(messages, batch_size=100))
+        self.assertTrue(all(r['success'] for r in out[0][1]))
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_rejected_batch_falls_back_to_single_sends(self):
+        self.server.reject_emails = {'bad@x.com'}
+        messages = [{'to_email': e, 'subject': 's', 'html_content': 'h'}
+                    for e in ('a@x.com', 'bad@x.com', 'b@x.com')]
+        (_, results), = send_resend_bulk(messages)
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertFalse(results[1]['retryable'])
+        self.assertEqual(sorted(self.server.sent_to()), ['a@x.com', 'b@x.com'])
+
+    def test_only_a_422_falls_back_to_single_sends(self):
+        self.server.fail_next_statuses = [403]
+        messages = [{'to_email': f'{i}@x.com', 'subject': 's', 'html_content': 'h'} for i in range(3)]
+        (_, results), = send_resend_bulk(messages)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual([r['status_code'] for r in results], [403, 403, 403])
+
+    def test_single_send_fallback_is_capped(self):
+        self.server.reject_emails = {'bad@x.com'}
+        messages = [{'to_email': e, 'subject': 's', 'html_content': 'h'}
+                    for e in ('bad@x.com', 'a@x.com', 'b@x.com', 'c@x.com')]
+        with patch.object(resend_mail, 'RESEND_SINGLE_FALLBACK_LIMIT', 2):
+            (_, results), = send_resend_bulk(messages)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual([r['success'] for r in results], [False, True, False, False])
+        self.assertEqual([r['retryable'] for r in results], [False, False, True, True])
+        self.assertEqual(self.server.sent_to(), ['a@x.com'])
+
+    def test_nothing_starts_after_the_deadline(self):
+        messages = [{'to_email': f'{i}@x.com', 'subject': 's', 'html_content': 'h'} for i in range(150)]
+        # The budget runs out while the first chunk is in flight
+        with patch.object(resend_mail, '_out_of_time', side_effect=[False, True]):
+            chunks = list(send_resend_bulk(messages, batch_size=100, concurrency=1, deadline=50.0))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(all(r['success'] for r in chunks[0][1]))
+        self.assertTrue(all(not r['success'] and r['retryable'] for r in chunks[1][1]))
+
+    def test_chunks_run_concurrently_and_cover_everyone(self):
+        messages = [{'to_email': f'{i}@x.com', 'subject': 's', 'html_content': 'h'} for i in range(250)]
+        chunks = list(send_resend_bulk(messages, batch_size=100, concurrency=3))
+        self.assertEqual(sorted(len(c) for c, _ in chunks), [50, 100, 100])
+        self.assertEqual(len(self.server.sent_to()), 250)
+
+
+class TestCampaignBatch(_FakeResendCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(admin_email, '_build_unsubscribe_url',
+                               side_effect=lambda uid: f'https://api/unsub?uid={uid}')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, recipients, logged=()):
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = [recipients, [{'email': e} for e in logged]]
+        conn = MagicMock()
+        with patch.object(admin_email, 'execute_values') as ev:
+            stats = admin_email._send_campaign_batch(
+                cursor, 7, 'Hi {{first_name}}', '<p>{{niche}} {{unsubscribe_url}}</p>', 50, conn=conn
+            )
+        return stats, cursor, ev
+
+    def test_skips_logged_and_sends_the_rest_in_one_batch(self):
+        recipients = [_recipient(1), _recipient(2, 'Done@Example.com'), _recipient(3)]
+        stats, cursor, ev = self._run(recipients, logged=['done@example.com'])
+
+        self.assertEqual((stats['sent'], stats['failed'], stats['already_sent']), (3, 0, 1))
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(len(self.server.requests), 1)
+        body = self.server.requests[0][1]
+        self.assertEqual([m['to'] for m in body], [['creator1@example.com'], ['creator3@example.com']])
+        self.assertEqual(body[0]['subject'], 'Hi C1')
+        self.assertIn('unsub?uid=101', body[0]['html'])
+
+        lookup_sql, lookup_args = cursor.execute.call_args_list[1].args
+        self.assertIn('= ANY(%s)', lookup_sql)
+        self.assertEqual(lookup_args[1], ['creator1@example.com', 'creator3@example.com', 'done@example.com'])
+
+        writes = [call.args[2] for call in ev.call_args_list]
+        self.assertEqual(writes[0], [(2, 'sent', None)])
+        self.assertEqual(writes[1], [(1, 'sent', None), (3, 'sent', None)])
+        self.assertEqual(writes[2], [(7, 101, 201, 'creator1@example.com'), (7, 103, 203, 'creator3@example.com')])
+
+    def test_failures_are_classified(self):
+        self.server.reject_emails = {'creator2@example.com'}
+        stats, _, ev = self._run([_recipient(1), _recipient(2)])
+        self.assertEqual((stats['sent'], stats['failed']), (1, 1))
+        statuses = dict((rid, status) for rid, status, _ in ev.call_args_list[0].args[2])
+        self.assertEqual(statuses, {1: 'sent', 2: 'failed_perm'})
+
+    def test_wrapper_keeps_tuple_contract(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = []
+        self.assertEqual(admin_email._process_campaign_batch(cursor, 7, 's', 'h', 10), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Creator context: one query per request, short cross-request cache, invalidation."""
+
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.creator_context as creator_context
+from services.creator_context import (
+    CreatorContext,
+    CreatorContextCache,
+    get_creator_context,
+    invalidate_creator_context,
+)
+
+
+def _row(**fields):
+    row = {
+        'creator_id': 7, 'user_id': 70, 'subscription_tier': 'free', 'unlocks_tier': 'free',
+        'unlocks_remaining': 2, 'unlocks_reset_at': datetime.now() + timedelta(days=5),
+        'creator_niches': ['beauty', 'skincare'], 'niche': 'beauty', 'pack_credits': 3,
+    }
+    row.update(fields)
+    return row
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+class TestUnlockBalance(unittest.TestCase):
+    def test_free_balance_counts_packs(self):
+        balance = CreatorContext.from_row(_row()).unlock_balance(3)
+        self.assertEqual(balance['remaining'], 5)
+        self.assertEqual(balance['used'], 1)
+        self.assertEqual(balance['pack_credits'], 3)
+        self.assertFalse(balance['is_unlimited'])
+
+    def test_expired_reset_counts_full_allowance(self):
+        ctx = CreatorContext.from_row(_row(unlocks_remaining=0, pack_credits=0,
+                                           unlocks_reset_at=datetime.now() - timedelta(days=1)))
+        self.assertEqual(ctx.unlock_balance(3)['remaining'], 3)
+
+    def test_paid_tiers_are_unlimited(self):
+        ctx = CreatorContext.from_row(_row(subscription_tier='elite'))
+        self.assertTrue(ctx.is_premium)
+        self.assertEqual(ctx.unlock_balance(3)['remaining'], None)
+        legacy = CreatorContext.from_row(_row(unlocks_tier='pro'))
+        self.assertFalse(legacy.is_premium)
+        self.assertTrue(legacy.unlock_balance(3)['is_unlimited'])
+
+    def test_niches_fall_back_to_single_niche(self):
+        ctx = CreatorContext.from_row(_row(creator_niches=None, niche='fitness'))
+        self.assertEqual(ctx.niches, ['fitness'])
+
+
+class _ContextCase(unittest.TestCase):
+    redis = None
+
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value
+        self.cursor.fetchone.return_value = _row()
+        for patcher in (
+            patch.object(creator_context, 'get_redis', return_value=self.redis),
+            patch.object(creator_context, 'CONTEXT_CACHE', CreatorContextCache(ttl=60)),
+            patch.object(creator_context, 'get_db_connection', return_value=self.conn),
+            patch.object(creator_context, 'pack_credits_select_sql',
+                         return_value='COALESCE(pack_credits, 0) AS pack_credits'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.app = Flask(__name__)
+
+
+class TestRequestScope(_ContextCase):
+    def test_one_query_per_request(self):
+        with self.app.test_request_context('/'):
+            by_user = get_creator_context(user_id=70)
+            self.assertIs(get_creator_context(7), by_user)
+            self.assertEqual(get_creator_context(7).niches, ['beauty', 'skincare'])
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_next_request_uses_shared_cache_until_invalidated(self):
+        with self.app.test_request_context('/'):
+            get_creator_context(7)
+        with self.app.test_request_context('/'):
+            self.assertEqual(get_creator_context(user_id=70).creator_id, 7)
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+        self.cursor.fetchone.return_value = _row(subscription_tier='pro')
+        with self.app.test_request_context('/'):
+            self.assertEqual(get_creator_context(7).tier, 'free')
+            invalidate_creator_context(7)
+            self.assertEqual(get_creator_context(7).tier, 'pro')
+        self.assertEqual(self.cursor.execute.call_count, 2)
+
+    def test_missing_creator_is_not_cached(self):
+        self.cursor.fetchone.return_value = None
+        with self.app.test_request_context('/'):
+            self.assertIsNone(get_creator_context(user_id=999))
+            self.assertIsNone(get_creator_context(user_id=999))
+        self.assertEqual(self.cursor.execute.call_count, 2)
+
+
+class TestRedisCache(_ContextCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        super().setUp()
+
+    def test_round_trip_and_invalidate_both_keys(self):
+        with self.app.test_request_context('/'):
+            get_creator_context(7)
+        self.assertEqual(set(self.redis.data), {'creatorctx:id:7', 'creatorctx:user:70'})
+        with self.app.test_request_context('/'):
+            ctx = get_creator_context(user_id=70)
+        self.assertIsInstance(ctx.unlocks_reset_at, datetime)
+        self.assertEqual(ctx.unlock_balance(3)['remaining'], 5)
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+        invalidate_creator_context(7)
+        self.assertEqual(self.redis.data, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
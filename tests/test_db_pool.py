@@ -0,0 +1,214 @@
+"""Shared DB pool: warm reuse, overflow caps, stale-socket checks, request scope."""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import psycopg2.extensions
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.db_pool import ConnectionPool, PoolTimeout, init_app, release_request_connections
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+        self.conn.executed.append(sql)
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    """Mirrors PooledConnection: close() goes back to the pool."""
+
+    _pool = None
+    _lease = 0
+    _owner = None
+    _created_at = 0.0
+    _last_used = 0.0
+
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.cursor_factory = None
+        self.broken = False
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.putconn(self)
+        else:
+            self.closed = 1
+
+    def discard(self):
+        self._pool = None
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConn()
+        created.append(conn)
+        return conn
+
+    kwargs.setdefault('ping_after', None)
+    return ConnectionPool(connect, **kwargs), created
+
+
+class TestPoolReuse(unittest.TestCase):
+    def test_close_returns_connection_for_reuse(self):
+        pool, created = make_pool(size=2, max_overflow=0)
+        first = pool.getconn()
+        first.close()
+        second = pool.getconn()
+        self.assertIs(first, second)
+        self.assertEqual(len(created), 1)
+        self.assertFalse(second.closed)
+
+    def test_return_rolls_back_open_transaction_and_resets_settings(self):
+        pool, _ = make_pool(size=1, max_overflow=0)
+        conn = pool.getconn(cursor_factory=dict, autocommit=True)
+        self.assertTrue(conn.autocommit)
+        self.assertIs(conn.cursor_factory, dict)
+        conn.status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+        conn.close()
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertFalse(conn.autocommit)
+        self.assertIsNone(conn.cursor_factory)
+
+    def test_double_close_is_harmless(self):
+        pool, _ = make_pool(size=1, max_overflow=0)
+        conn = pool.getconn()
+        conn.close()
+        conn.close()
+        self.assertEqual(pool.stats()['idle'], 1)
+        self.assertEqual(pool.stats()['in_use'], 0)
+
+    def test_overflow_connections_are_closed_on_return(self):
+        pool, created = make_pool(size=1, max_overflow=1)
+        a = pool.getconn()
+        b = pool.getconn()
+        a.close()
+        b.close()
+        self.assertEqual(len(created), 2)
+        self.assertEqual(pool.stats()['idle'], 1)
+        self.assertEqual(sum(1 for c in created if c.closed), 1)
+
+
+class TestPoolLimits(unittest.TestCase):
+    def test_times_out_when_exhausted(self):
+        pool, _ = make_pool(size=1, max_overflow=0, timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiter_gets_released_connection_and_records_wait(self):
+        pool, created = make_pool(size=1, max_overflow=0, timeout=2)
+        held = pool.getconn()
+        got = []
+
+        def worker():
+            conn = pool.getconn()
+            got.append(conn)
+            conn.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        held.close()
+        thread.join(2)
+        self.assertEqual(got, [held])
+        self.assertEqual(len(created), 1)
+        stats = pool.stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['wait_ms_max'], 0)
+
+
+    def test_close_from_another_thread_frees_the_slot(self):
+        pool, created = make_pool(size=1, max_overflow=0, timeout=0.2)
+        conn = pool.getconn()
+        thread = threading.Thread(target=conn.close)
+        thread.start()
+        thread.join(2)
+        self.assertTrue(conn.closed)
+        self.assertEqual((pool.stats()['in_use'], pool.stats()['discarded']), (0, 1))
+        self.assertIsNot(pool.getconn(), conn)
+        self.assertEqual(len(created), 2)
+
+
+class TestHealthCheck(unittest.TestCase):
+    def test_stale_socket_is_replaced(self):
+        pool, created = make_pool(size=1, max_overflow=0, ping_after=0)
+        conn = pool.getconn()
+        conn.close()
+        conn.broken = True
+        fresh = pool.getconn()
+        self.assertIsNot(fresh, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['failed_pings'], 1)
+
+    def test_recycles_old_connections(self):
+        pool, created = make_pool(size=1, max_overflow=0, recycle=0.01)
+        conn = pool.getconn()
+        conn.close()
+        time.sleep(0.02)
+        self.assertIsNot(pool.getconn(), conn)
+        self.assertEqual(len(created), 2)
+
+
+class TestRequestScope(unittest.TestCase):
+    def test_teardown_returns_leaked_connections(self):
+        from flask import Flask
+
+        app = Flask(__name__)
+        init_app(app)
+        pool, _ = make_pool(size=2, max_overflow=0)
+        with app.app_context():
+            pool.getconn()  # handler forgot conn.close()
+            self.assertEqual(pool.stats()['in_use'], 1)
+        self.assertEqual(pool.stats()['in_use'], 0)
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_teardown_skips_connections_already_reused(self):
+        from flask import Flask
+
+        app = Flask(__name__)
+        pool, _ = make_pool(size=1, max_overflow=0)
+        with app.app_context():
+            conn = pool.getconn()
+            conn.close()
+            again = pool.getconn()
+            self.assertIs(again, conn)
+            release_request_connections()
+        stats = pool.stats()
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['idle'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Tier 2 email discovery: concurrent domain/page fetches, early exit, result caching."""
+
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.email_discovery as discovery
+from services.email_discovery import DiscoveryCache, resolve_brand_domain, tier2_web_scrape
+
+
+def _response(status=200, url=None, text=''):
+    response = MagicMock()
+    response.status_code = status
+    response.url = url
+    response.text = text
+    return response
+
+
+class _Site:
+    """Fake network: live domains answer HEAD, pages map URL -> HTML."""
+
+    def __init__(self, live, pages):
+        self.live = live
+        self.pages = pages
+        self.heads = []
+        self.gets = []
+        self._lock = threading.Lock()
+
+    def head(self, url, timeout=None, allow_redirects=True):
+        with self._lock:
+            self.heads.append(url)
+        host = url.split('://', 1)[1]
+        if host in self.live:
+            return _response(url=f'https://www.{host.replace("www.", "")}/')
+        raise ConnectionError('dead')
+
+    def get(self, url, timeout=None, headers=None):
+        with self._lock:
+            self.gets.append(url)
+        if url in self.pages:
+            return _response(text=self.pages[url])
+        return _response(status=404)
+
+
+class _DiscoveryCase(unittest.TestCase):
+    def setUp(self):
+        self.site = _Site(
+            live={'glowco.com'},
+            pages={
+                'https://www.glowco.com/': '<p>Questions? hello@glowco.com</p>',
+                'https://www.glowco.com/contact': '<a href="mailto:support@glowco.com">Support</a>',
+                'https://www.glowco.com/press': '<p>Press: press@glowco.com</p>',
+            },
+        )
+        session = MagicMock()
+        session.get.side_effect = self.site.get
+        for patcher in (
+            patch.object(discovery, 'get_redis', return_value=None),
+            patch.object(discovery, 'DISCOVERY_CACHE', DiscoveryCache()),
+            patch.object(discovery.requests, 'head', side_effect=self.site.head),
+            patch.object(discovery, '_host_session', return_value=session),
+            patch.object(discovery, '_EXECUTOR', ThreadPoolExecutor(max_workers=8)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: discovery._EXECUTOR.shutdown(wait=True))
+
+    def _settle(self):
+        """Wait for fetches an early exit left running, so request counts are stable."""
+        discovery._EXECUTOR.shutdown(wait=True)
+        discovery._EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+
+class TestResolveDomain(_DiscoveryCase):
+    def test_first_live_candidate_in_list_order_wins(self):
+        self.site.live = {'glowco.com', 'shopglowco.com'}
+        url = resolve_brand_domain(['dead.com', 'shopglowco.com', 'glowco.com'])
+        self.assertEqual(url, 'https://www.shopglowco.com/')
+
+    def test_dead_domains_are_negatively_cached(self):
+        self.assertIsNone(resolve_brand_domain(['dead.com', 'gone.co']))
+        probes = len(self.site.heads)
+        self.assertEqual(probes, 4)  # https + http each
+        self.assertIsNone(resolve_brand_domain(['dead.com', 'gone.co']))
+        self.assertEqual(len(self.site.heads), probes)
+
+
+class TestTier2(_DiscoveryCase):
+    def test_finds_best_pr_email_and_source_page(self):
+        result = tier2_web_scrape('Glow Co')
+        self.assertTrue(result['found'])
+        self.assertEqual(result['email'], 'press@glowco.com')
+        self.assertEqual(result['domain'], 'glowco.com')
+        self.assertEqual(result['source_url'], 'https://www.glowco.com/press')
+
+    def test_repeat_search_makes_no_requests(self):
+        first = tier2_web_scrape('Glow Co')
+        self._settle()
+        heads, gets = len(self.site.heads), len(self.site.gets)
+        self.assertEqual(tier2_web_scrape('glow co'), first)
+        self.assertEqual((len(self.site.heads), len(self.site.gets)), (heads, gets))
+
+    def test_site_cache_shared_across_brand_spellings(self):
+        tier2_web_scrape('Glow Co')
+        self._settle()
+        gets = len(self.site.gets)
+        result = tier2_web_scrape('Glow Co', known_domain='glowco.com')
+        self.assertEqual(result['email'], 'press@glowco.com')
+        self.assertEqual(len(self.site.gets), gets)
+
+    def test_unknown_brand_is_cached_as_not_found(self):
+        self.assertFalse(tier2_web_scrape('Nowhere Brand')['found'])
+        heads = len(self.site.heads)
+        self.assertFalse(tier2_web_scrape('Nowhere Brand')['found'])
+        self.assertEqual(len(self.site.heads), heads)
+
+
+class TestEarlyExit(_DiscoveryCase):
+    def test_returns_without_waiting_for_slow_pages(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        fast = self.site.get
+
+        def get(url, timeout=None, headers=None):
+            if not url.endswith('/press'):
+                release.wait(5)
+            return fast(url, timeout, headers)
+
+        discovery._host_session.return_value.get.side_effect = get
+        pages = discovery.crawl_site_for_emails('https://www.glowco.com/', 'glowco.com')
+        self.assertFalse(release.is_set())
+        self.assertEqual(pages, [('https://www.glowco.com/press', ['press@glowco.com'])])
+        # Closed only after the pages still in flight finish
+        session = discovery._host_session.return_value
+        session.close.assert_not_called()
+        release.set()
+        self._settle()
+        session.close.assert_called_once()
+
+    def test_session_closed_after_a_full_crawl(self):
+        discovery.crawl_site_for_emails('https://www.glowco.com/', 'glowco.com', paths=['/contact'])
+        discovery._host_session.return_value.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Feature-flag registry: one load per TTL, Redis version stamp, stale-on-error, engine wrappers."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import lifecycle_email_engine
+import services.feature_flags as feature_flags
+from services.feature_flags import FeatureFlagRegistry
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+
+class _FlagsCase(unittest.TestCase):
+    redis = None
+
+    def setUp(self):
+        self.rows = [('email_onboarding_v2', True), ('email_weekly_digest_v2', False)]
+        self.connections = []
+        self.now = [1000.0]
+        patches = [
+            patch.object(feature_flags, 'get_db_connection', side_effect=self._connect),
+            patch.object(feature_flags, 'get_redis', side_effect=lambda: self.redis),
+            patch.object(feature_flags.time, 'monotonic', side_effect=lambda: self.now[0]),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.registry = FeatureFlagRegistry('email_feature_flags', ttl=30)
+
+    def _connect(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.side_effect = lambda: list(self.rows)
+        cursor.rowcount = 1
+        self.connections.append(conn)
+        return conn
+
+    def _selects(self):
+        return sum(1 for conn in self.connections
+                   if 'SELECT flag_name' in conn.cursor.return_value.execute.call_args.args[0])
+
+
+class TestRegistry(_FlagsCase):
+    def test_checks_are_served_from_one_load_until_ttl(self):
+        for _ in range(50):
+            self.assertTrue(self.registry.is_enabled('email_onboarding_v2'))
+            self.assertFalse(self.registry.is_enabled('email_weekly_digest_v2'))
+            self.assertFalse(self.registry.is_enabled('missing'))
+        self.assertEqual(self._selects(), 1)
+        self.rows = [('email_onboarding_v2', False)]
+        self.now[0] += 31
+        self.assertFalse(self.registry.is_enabled('email_onboarding_v2'))
+        self.assertEqual(self._selects(), 2)
+
+    def test_failed_reload_keeps_last_snapshot(self):
+        self.registry.is_enabled('email_onboarding_v2')
+        self.now[0] += 31
+        with patch.object(feature_flags, 'get_db_connection', side_effect=RuntimeError('db down')):
+            self.assertTrue(self.registry.is_enabled('email_onboarding_v2'))
+            self.assertTrue(self.registry.is_enabled('email_onboarding_v2'))
+        self.assertEqual(self.registry.stats()['load_errors'], 1)
+
+    def test_no_snapshot_and_no_db_reads_off(self):
+        with patch.object(feature_flags, 'get_db_connection', side_effect=RuntimeError('db down')):
+            self.assertFalse(self.registry.is_enabled('email_onboarding_v2'))
+
+    def test_set_invalidates_local_snapshot(self):
+        self.registry.is_enabled('email_weekly_digest_v2')
+        self.rows = [('email_weekly_digest_v2', True)]
+        self.assertTrue(self.registry.set('email_weekly_digest_v2', True))
+        self.connections[-1].commit.assert_called_once()
+        self.assertTrue(self.registry.is_enabled('email_weekly_digest_v2'))
+
+
+class TestVersionStamp(_FlagsCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        super().setUp()
+
+    def test_unchanged_version_skips_the_reload(self):
+        self.registry.is_enabled('email_onboarding_v2')
+        self.now[0] += 31
+        self.registry.is_enabled('email_onboarding_v2')
+        self.assertEqual(self._selects(), 1)
+        self.assertEqual(self.registry.stats()['version_checks'], 1)
+
+    def test_write_on_another_worker_is_picked_up_after_ttl(self):
+        other = FeatureFlagRegistry('email_feature_flags', ttl=30)
+        self.assertFalse(self.registry.is_enabled('email_weekly_digest_v2'))
+        self.rows = [('email_weekly_digest_v2', True)]
+        other.set('email_weekly_digest_v2', True)
+        self.assertEqual(self.redis.data['flags:email_feature_flags:version'], 1)
+        self.assertFalse(self.registry.is_enabled('email_weekly_digest_v2'))  # within TTL
+        self.now[0] += 31
+        self.assertTrue(self.registry.is_enabled('email_weekly_digest_v2'))
+
+
+class TestEngineWrappers(_FlagsCase):
+    def test_engine_uses_shared_registry(self):
+        with patch.object(lifecycle_email_engine, 'EMAIL_FEATURE_FLAGS', self.registry):
+            self.assertTrue(lifecycle_email_engine.is_feature_enabled('email_onboarding_v2'))
+            self.assertTrue(lifecycle_email_engine.is_feature_enabled('email_onboarding_v2'))
+            self.assertEqual(lifecycle_email_engine.get_all_feature_flags(),
+                             {'email_onboarding_v2': True, 'email_weekly_digest_v2': False})
+        self.assertEqual(self._selects(), 2)  # admin listing reads fresh
+
+
+if __name__ == '__main__':
+    unittest.main()
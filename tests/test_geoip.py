@@ -0,0 +1,166 @@
+"""Offline GeoIP: index build from CSV, mmap bisect lookups, LRU, private IPs, no outbound call."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.geoip as geoip
+import social_verification_routes
+from services.geoip import GeoIPResolver, build_index, read_geolite_csv, read_range_csv
+
+RANGES = """start_ip,end_ip,country
+1.0.0.0,1.0.0.255,AU
+8.8.4.0,8.8.4.255,US
+8.8.8.0,8.8.8.255,US
+49.36.0.0,49.36.255.255,IN
+81.2.69.0,81.2.69.255,GB
+2001:4860::,2001:4860:ffff:ffff:ffff:ffff:ffff:ffff,US
+"""
+
+LOCATIONS = """geoname_id,locale_code,continent_code,continent_name,country_iso_code,country_name,is_in_european_union
+2635167,en,EU,Europe,GB,"United Kingdom",0
+1269750,en,AS,Asia,IN,India,0
+6255148,en,EU,Europe,,Europe,0
+"""
+
+BLOCKS = """network,geoname_id,registered_country_geoname_id,represented_country_geoname_id,is_anonymous_proxy,is_satellite_provider
+81.2.69.0/24,2635167,2635167,,0,0
+81.2.70.0/24,2635167,2635167,,0,0
+49.36.0.0/16,,1269750,,0,0
+5.0.0.0/24,6255148,6255148,,0,0
+"""
+
+
+class _IndexCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.index_path = os.path.join(self.dir, 'country-ip.idx')
+
+    def _write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def _resolver(self, **kwargs):
+        kwargs.setdefault('lru_size', 16)
+        return GeoIPResolver(path=self.index_path, **kwargs)
+
+
+class TestIndex(_IndexCase):
+    def setUp(self):
+        super().setUp()
+        self.counts = build_index(read_range_csv(self._write('ranges.csv', RANGES)), self.index_path)
+
+    def test_lookups_at_range_edges_and_gaps(self):
+        resolver = self._resolver()
+        cases = {
+            '1.0.0.0': 'AU', '1.0.0.255': 'AU', '1.0.1.0': None,
+            '8.8.8.8': 'US', '8.8.5.1': None, '49.36.200.7': 'IN', '81.2.69.160': 'GB',
+            '223.255.255.255': None, '2001:4860:4860::8888': 'US', '2606:4700::1111': None,
+            '::ffff:81.2.69.1': 'GB',
+        }
+        with patch.object(geoip.requests, 'get') as get:
+            self.assertEqual({ip: resolver.country_for_ip(ip) for ip in cases}, cases)
+        get.assert_not_called()
+        # Adjacent/duplicate US ranges do not merge across the 8.8.5.0 gap.
+        self.assertEqual(self.counts, {'v4': 10, 'v6': 2, 'countries': 4})
+
+    def test_private_and_garbage_skip_the_index(self):
+        resolver = self._resolver()
+        for value in ('127.0.0.1', '10.1.2.3', '172.16.0.9', '192.168.1.1', '::1', 'fe80::1', 'localhost', '', None):
+            self.assertIsNone(resolver.country_for_ip(value))
+        self.assertEqual(resolver.stats()['lookups'], 0)
+
+    def test_lru_serves_hot_ips_and_evicts_oldest(self):
+        resolver = self._resolver(lru_size=2)
+        for ip in ('8.8.8.8', '8.8.8.8', '1.0.0.1', '81.2.69.1', '8.8.8.8'):
+            resolver.country_for_ip(ip)
+        stats = resolver.stats()
+        self.assertEqual((stats['lookups'], stats['lru_hits'], stats['index_hits'], stats['lru_entries']),
+                         (5, 1, 4, 2))
+        self.assertEqual(stats['index']['ranges'], {'v4': 10, 'v6': 2})
+
+    def test_rebuild_replaces_file_in_place(self):
+        build_index(read_range_csv(self._write('more.csv', '16843008,16843263,fr\n')), self.index_path)
+        resolver = self._resolver()
+        self.assertEqual(resolver.country_for_ip('1.1.1.1'), 'FR')
+        self.assertIsNone(resolver.country_for_ip('8.8.8.8'))
+        self.assertFalse(os.path.exists(self.index_path + '.tmp'))
+
+
+class TestGeoLiteCsv(_IndexCase):
+    def test_country_or_registered_country(self):
+        blocks = self._write('blocks.csv', BLOCKS)
+        locations = self._write('locations.csv', LOCATIONS)
+        counts = build_index(read_geolite_csv([blocks], locations), self.index_path)
+        resolver = self._resolver()
+        self.assertEqual(resolver.country_for_ip('81.2.70.9'), 'GB')
+        self.assertEqual(resolver.country_for_ip('49.36.1.1'), 'IN')
+        self.assertIsNone(resolver.country_for_ip('5.0.0.1'))  # continent-only row
+        self.assertEqual(counts['countries'], 2)
+
+
+class TestFallback(_IndexCase):
+    def _response(self, code):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'countryCode': code}
+        return response
+
+    def test_remote_only_without_index(self):
+        resolver = self._resolver()
+        with patch.object(geoip.requests, 'get', return_value=self._response('NG')) as get:
+            self.assertEqual(resolver.country_for_ip('41.58.0.1', timeout=1.0), 'NG')
+            self.assertEqual(resolver.country_for_ip('41.58.0.1'), 'NG')
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(get.call_args.kwargs['timeout'], 1.0)
+        self.assertIsNone(resolver.stats()['index'])
+
+    def test_remote_failure_fails_open_and_is_not_cached(self):
+        resolver = self._resolver()
+        with patch.object(geoip.requests, 'get', side_effect=geoip.requests.Timeout()):
+            self.assertIsNone(resolver.country_for_ip('41.58.0.1'))
+        self.assertEqual(resolver.stats()['lru_entries'], 0)
+        off = self._resolver(remote_fallback=False)
+        with patch.object(geoip.requests, 'get') as get:
+            self.assertIsNone(off.country_for_ip('41.58.0.1'))
+        get.assert_not_called()
+
+
+class TestRegionGate(_IndexCase):
+    def setUp(self):
+        super().setUp()
+        build_index(read_range_csv(self._write('ranges.csv', RANGES)), self.index_path)
+        patcher = patch.object(social_verification_routes, 'GEOIP', self._resolver())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = Flask(__name__)
+        self.app.secret_key = 'test'
+
+    def test_forwarded_ip_drives_the_gate(self):
+        with self.app.test_request_context(headers={'X-Forwarded-For': '49.36.5.5, 10.0.0.1'}):
+            self.assertEqual(social_verification_routes.detect_country_from_ip(), 'IN')
+            self.assertTrue(social_verification_routes.should_block_auth_for_region(None))
+            self.assertFalse(social_verification_routes.should_block_auth_for_region('United Kingdom'))
+        with self.app.test_request_context(environ_base={'REMOTE_ADDR': '127.0.0.1'}):
+            self.assertFalse(social_verification_routes.is_request_from_restricted_region())
+
+    def test_session_country_is_cached(self):
+        with self.app.test_request_context(headers={'X-Real-IP': '81.2.69.1'}):
+            self.assertEqual(social_verification_routes.get_user_country_from_session(), 'GB')
+            self.assertEqual(social_verification_routes.session['user_country'], 'GB')
+
+
+if __name__ == '__main__':
+    unittest.main()
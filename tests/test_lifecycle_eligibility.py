@@ -0,0 +1,165 @@
+"""Set-based lifecycle eligibility: one load per batch, same checks as the per-creator path."""
+
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import lifecycle_email_engine as engine
+
+
+def _creator(cid, **fields):
+    row = {
+        'id': cid, 'email': f'c{cid}@x.com', 'created_at': datetime.now() - timedelta(days=10),
+        'days_since_signup': 10, 'days_since_login': 1, 'total_unlocks': 0, 'has_pipeline': False,
+        'subscription_tier': 'free', 'total_replies_received': 0, 'first_pr_box_received_at': None,
+        'daily_unlocks_used': 0, 'lifecycle_state': 'explorer',
+        'lifecycle_emails_sent_today': 0, 'lifecycle_emails_sent_this_week': 0,
+        'lifecycle_last_email_date': None, 'lifecycle_week_start_date': date.today(),
+    }
+    row.update(fields)
+    return row
+
+
+def _template(slug, priority, trigger_type='day_based', **fields):
+    row = {
+        'slug': slug, 'priority': priority, 'trigger_type': trigger_type,
+        'trigger_conditions': {}, 'feature_flag': None, 'required_user_state': None,
+        'excluded_tiers': None, 'exempt_from_daily_cap': False, 'exempt_from_weekly_cap': False,
+    }
+    row.update(fields)
+    return row
+
+
+class _FakeCursor:
+    """Answers each batch query by matching its SQL."""
+
+    def __init__(self, creators, templates, history=(), flags=None, dedup=()):
+        self.answers = {
+            'EXISTS (SELECT 1 FROM creator_pipeline': creators,
+            'FROM lifecycle_email_sends\n        WHERE creator_id = ANY(%s)\n        GROUP BY': list(history),
+            'FROM lifecycle_email_templates': templates,
+            'FROM email_feature_flags': [{'flag_name': k, 'enabled': v} for k, v in (flags or {}).items()],
+            'dedup_key = ANY': list(dedup),
+        }
+        self.queries = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        self._rows = next((rows for key, rows in self.answers.items() if key in sql), [])
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+def _conn(cursor):
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn
+
+
+class TestTriggerMet(unittest.TestCase):
+    def test_one_time_and_sequence_use_history(self):
+        tpl = _template('edu_pitch', 1, trigger_conditions={
+            'days_after_signup': 9, 'one_time': True, 'requires_previous': 'edu_60sec'})
+        creator = _creator(1)
+        self.assertFalse(engine._trigger_met(creator, tpl, {}))
+        self.assertTrue(engine._trigger_met(creator, tpl, {'edu_60sec': {}}))
+        self.assertFalse(engine._trigger_met(creator, tpl, {'edu_60sec': {}, 'edu_pitch': {}}))
+
+    def test_has_activity_accepts_pipeline_without_unlocks(self):
+        tpl = _template('nudge', 1, trigger_conditions={'days_after_signup': 10, 'condition': 'has_activity'})
+        self.assertFalse(engine._trigger_met(_creator(1), tpl, {}))
+        self.assertTrue(engine._trigger_met(_creator(1, has_pipeline=True), tpl, {}))
+
+    def test_days_after_previous(self):
+        tpl = _template('winback_2', 1, 'state_based', trigger_conditions={
+            'requires_previous': 'winback_1', 'days_after_previous': 5})
+        recent = {'winback_1': {'last_sent_at': datetime.now() - timedelta(days=2)}}
+        older = {'winback_1': {'last_sent_at': datetime.now() - timedelta(days=6)}}
+        self.assertFalse(engine._trigger_met(_creator(1), tpl, recent))
+        self.assertTrue(engine._trigger_met(_creator(1), tpl, older))
+
+    def test_quota_backfill_once_a_month(self):
+        tpl = _template('max_quota_hit', 1, 'action_based')
+        maximizer = _creator(1, lifecycle_state='maximizer')
+        self.assertTrue(engine._trigger_met(maximizer, tpl, {}))
+        self.assertFalse(engine._trigger_met(maximizer, tpl, {'max_quota_hit': {'sent_this_month': True}}))
+
+
+class TestThrottle(unittest.TestCase):
+    def test_stale_counters_reset(self):
+        today = date(2026, 3, 11)  # Wednesday
+        creator = _creator(1, lifecycle_emails_sent_today=1, lifecycle_last_email_date=date(2026, 3, 10),
+                           lifecycle_emails_sent_this_week=2, lifecycle_week_start_date=date(2026, 3, 2))
+        self.assertEqual(engine._effective_throttle_counts(creator, today), (0, 0))
+        creator['lifecycle_last_email_date'] = today
+        creator['lifecycle_week_start_date'] = date(2026, 3, 9)
+        tpl = _template('x', 1)
+        self.assertEqual(engine._throttle_allows(creator, tpl, today)[0], False)
+        tpl['exempt_from_daily_cap'] = tpl['exempt_from_weekly_cap'] = True
+        self.assertEqual(engine._throttle_allows(creator, tpl, today), (True, 'OK'))
+
+
+class TestBatchEvaluation(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('psycopg2.extras.execute_values')
+        self.execute_values = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fixed_query_count_for_any_batch_size(self):
+        templates = [
+            _template('flagged', 9, feature_flag='beta', trigger_conditions={'days_after_signup': 10}),
+            _template('welcome_d10', 5, trigger_conditions={'days_after_signup': 10}),
+        ]
+        creators = [_creator(i) for i in range(1, 51)]
+        creators[0]['lifecycle_emails_sent_today'] = 1
+        creators[0]['lifecycle_last_email_date'] = date.today()
+        cursor = _FakeCursor(creators, templates, flags={'beta': False})
+
+        result = engine.evaluate_eligibility(_conn(cursor), [c['id'] for c in creators])
+
+        # facts, history, templates, flags, daily reset, weekly reset
+        self.assertEqual(len(cursor.queries), 6)
+        self.assertEqual(result[1]['eligible'], [])
+        self.assertEqual(result[1]['skip_reasons']['feature_flag'], ['flagged'])
+        self.assertTrue(result[1]['skip_reasons']['throttle'][0].startswith('welcome_d10'))
+        self.assertEqual([t['slug'] for t in result[2]['eligible']], ['welcome_d10'])
+
+    def test_state_changes_written_in_one_statement(self):
+        creators = [_creator(1, total_replies_received=2), _creator(2)]
+        cursor = _FakeCursor(creators, [])
+        result = engine.evaluate_eligibility(_conn(cursor), [1, 2])
+        self.assertEqual(result[1]['creator']['lifecycle_state'], 'winner')
+        self.execute_values.assert_called_once()
+        self.assertEqual(self.execute_values.call_args.args[2], [(1, 'winner')])
+
+    def test_plan_resolves_dedup_and_quiet_hours(self):
+        templates = [
+            _template('welcome_d10', 5, trigger_conditions={'days_after_signup': 10, 'one_time': True}),
+        ]
+        creators = [_creator(1), _creator(2)]
+        cursor = _FakeCursor(creators, templates, dedup=[{'creator_id': 2, 'dedup_key': 'welcome_d10_2'}])
+        with patch.object(engine, 'is_quiet_hours', return_value=False):
+            plan = engine.plan_lifecycle_sends(_conn(cursor), [1, 2])
+        self.assertIsNone(plan[1]['skip'])
+        self.assertEqual(plan[1]['dedup_key'], 'welcome_d10_1')
+        self.assertEqual(plan[2]['skip'], 'already_sent')
+
+        cursor = _FakeCursor(creators, templates)
+        with patch.object(engine, 'is_quiet_hours', return_value=True):
+            plan = engine.plan_lifecycle_sends(_conn(cursor), [1])
+        self.assertEqual(plan[1]['skip'], 'quiet_hours')
+
+
+if __name__ == '__main__':
+    unittest.main()
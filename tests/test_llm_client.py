@@ -0,0 +1,255 @@
+"""Shared LLM client: content-hash cache tiers, coalescing, retries, per-call-type metrics."""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.llm_client as llm_client
+from services.llm_client import CALL_TYPES, LLMClient, LLMReply, content_key, gemini_generate
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+
+def _response(status=200, text='{"ok": true}', headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = {
+        'candidates': [{'content': {'parts': [{'text': text}]}, 'finishReason': 'STOP'}],
+        'usageMetadata': {'promptTokenCount': 120, 'candidatesTokenCount': 30},
+    }
+    if status >= 400:
+        response.raise_for_status.side_effect = llm_client.requests.HTTPError(response=response)
+    return response
+
+
+class _ClientCase(unittest.TestCase):
+    redis = None
+
+    def setUp(self):
+        patcher = patch.object(llm_client, 'get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = LLMClient()
+        self.client._pg_ready = False
+
+
+class TestContentKey(unittest.TestCase):
+    def test_key_ignores_dict_order_and_tracks_inputs(self):
+        call_type = CALL_TYPES['ai_depth']
+        a = content_key(call_type, {'model': 'm', 'prompt': 'creator 1 x brand 2'})
+        b = content_key(call_type, {'prompt': 'creator 1 x brand 2', 'model': 'm'})
+        c = content_key(call_type, {'model': 'm', 'prompt': 'creator 1 x brand 3'})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertTrue(a.startswith('llm:ai_depth:'))
+
+
+class TestLocalCache(_ClientCase):
+    def test_identical_prompt_is_billed_once(self):
+        produce = MagicMock(return_value=LLMReply({'reasons': ['a']}, 100, 20))
+        first = self.client.call('ai_depth', {'prompt': 'p'}, produce)
+        first['reasons'].append('mutated by caller')
+        second = self.client.call('ai_depth', {'prompt': 'p'}, produce)
+        self.assertEqual(second, {'reasons': ['a']})
+        produce.assert_called_once()
+        stats = self.client.stats()['call_types']['ai_depth']
+        self.assertEqual((stats['calls'], stats['hits'], stats['misses']), (2, 1, 1))
+        self.assertEqual((stats['input_tokens'], stats['output_tokens']), (100, 20))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_none_and_errors_are_not_cached(self):
+        self.assertIsNone(self.client.call('pitch', {'prompt': 'p'}, lambda: LLMReply(None)))
+        with self.assertRaises(ValueError):
+            self.client.call('pitch', {'prompt': 'p'}, MagicMock(side_effect=ValueError('bad json')))
+        self.assertEqual(self.client.call('pitch', {'prompt': 'p'}, lambda: LLMReply({'ok': 1})), {'ok': 1})
+        self.assertEqual(self.client.stats()['call_types']['pitch']['errors'], 1)
+
+    def test_concurrent_identical_calls_coalesce(self):
+        calls = []
+        release = threading.Event()
+
+        def produce():
+            calls.append(1)
+            release.wait(2)
+            return LLMReply([3, 1, 2])
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.client.call('mentor_rank', {'prompt': 'same'}, produce))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[3, 1, 2]] * 5)
+        self.assertEqual(self.client.stats()['call_types']['mentor_rank']['coalesced'], 4)
+
+
+class TestRedisTier(_ClientCase):
+    redis = _FakeRedis()
+
+    def setUp(self):
+        self.redis.data.clear()
+        super().setUp()
+
+    def test_entries_shared_through_redis_with_ttl_per_type(self):
+        with patch.object(self.redis, 'set', wraps=self.redis.set) as redis_set:
+            self.client.call('text_analysis', {'prompt': 'bio'}, lambda: LLMReply({'niche': 'skincare'}))
+        ttl = [c.kwargs['ex'] for c in redis_set.call_args_list if not c.kwargs.get('nx')]
+        self.assertEqual(ttl, [CALL_TYPES['text_analysis'].ttl])
+        other_worker = LLMClient()
+        other_worker._pg_ready = False
+        produce = MagicMock()
+        self.assertEqual(other_worker.call('text_analysis', {'prompt': 'bio'}, produce), {'niche': 'skincare'})
+        produce.assert_not_called()
+        self.assertFalse([k for k in self.redis.data if k.endswith(':lock')])
+
+    def test_follower_worker_waits_for_lock_holder(self):
+        key = content_key(CALL_TYPES['pitch'], {'prompt': 'p'})
+        self.redis.data[f'{key}:lock'] = '1'
+
+        def leader_finishes():
+            time.sleep(0.1)
+            self.redis.data[key] = '{"subject": "hi"}'
+
+        threading.Thread(target=leader_finishes).start()
+        produce = MagicMock()
+        with patch.object(llm_client, '_LOCK_POLL', 0.02):
+            self.assertEqual(self.client.call('pitch', {'prompt': 'p'}, produce), {'subject': 'hi'})
+        produce.assert_not_called()
+
+
+class TestPostgresTier(_ClientCase):
+    def test_postgres_hit_backfills_fast_tier(self):
+        self.client._pg_ready = True
+        with patch.object(self.client, '_get_pg', return_value=({'package': 1}, 600)) as get_pg:
+            produce = MagicMock()
+            self.assertEqual(self.client.call('pr_package', {'prompt': 'p'}, produce), {'package': 1})
+            self.assertEqual(self.client.call('pr_package', {'prompt': 'p'}, produce), {'package': 1})
+        get_pg.assert_called_once()
+        produce.assert_not_called()
+        stats = self.client.stats()['call_types']['pr_package']
+        self.assertEqual((stats['pg_hits'], stats['hits']), (1, 1))
+
+    def test_only_persistent_types_write_postgres(self):
+        with patch.object(self.client, '_set_pg') as set_pg:
+            self.client.call('mentor_rank', {'prompt': 'p'}, lambda: LLMReply([1]))
+            self.client.call('ai_depth', {'prompt': 'p'}, lambda: LLMReply({'a': 1}, 5, 6))
+        set_pg.assert_called_once()
+        self.assertEqual(set_pg.call_args.args[1].name, 'ai_depth')
+
+
+class TestForgetRejected(_ClientCase):
+    redis = _FakeRedis()
+
+    def setUp(self):
+        self.redis.data.clear()
+        super().setUp()
+
+    def test_rejected_reply_is_not_served_again(self):
+        self.client._pg_ready = True
+        replies = iter([LLMReply({'body': 'banned phrase'}), LLMReply({'body': 'clean'})])
+        with patch.object(self.client, '_get_pg', return_value=None), \
+                patch.object(self.client, '_set_pg'), \
+                patch.object(self.client, '_pg') as pg:
+            call = lambda: self.client.call('pr_package', {'prompt': 'p'}, lambda: next(replies))
+            self.assertEqual(call(), {'body': 'banned phrase'})
+            self.client.forget('pr_package', {'prompt': 'p'})
+            self.assertEqual(call(), {'body': 'clean'})
+            self.assertEqual(call(), {'body': 'clean'})
+        cursor = MagicMock()
+        pg.call_args.args[0](cursor)
+        self.assertIn('DELETE FROM llm_response_cache', cursor.execute.call_args.args[0])
+        self.assertEqual(self.client.stats()['call_types']['pr_package']['misses'], 2)
+
+    def test_ai_depth_forgets_what_validation_rejected(self):
+        import services.ai_depth_generator as depth
+        texts = iter(['{"reasons": ["generic"]}', '{"reasons": ["specific"]}'])
+        generate = MagicMock(side_effect=lambda *a, **k: {'text': next(texts), 'input_tokens': 1, 'output_tokens': 1})
+        with patch.object(depth, 'LLM', self.client), patch.object(depth, 'gemini_generate', generate), \
+                patch.object(depth, 'GEMINI_API_KEY', 'k'):
+            self.assertEqual(depth.call_gemini('prompt')['reasons'], ['generic'])
+            depth.forget_gemini_reply('prompt')
+            self.assertEqual(depth.call_gemini('prompt')['reasons'], ['specific'])
+            self.assertEqual(depth.call_gemini('prompt')['reasons'], ['specific'])
+        self.assertEqual(generate.call_count, 2)
+
+
+class TestRegenerate(_ClientCase):
+    def test_refresh_skips_the_cached_reply_and_replaces_it(self):
+        replies = iter([LLMReply({'pitch': 'first'}), LLMReply({'pitch': 'second'})])
+        produce = lambda: next(replies)
+        with patch.object(self.client, '_get_pg', return_value=None), \
+                patch.object(self.client, '_set_pg') as set_pg:
+            self.assertEqual(self.client.call('pr_package', {'prompt': 'p'}, produce), {'pitch': 'first'})
+            self.assertEqual(self.client.call('pr_package', {'prompt': 'p'}, produce, refresh=True),
+                             {'pitch': 'second'})
+            self.assertEqual(self.client.call('pr_package', {'prompt': 'p'}, produce), {'pitch': 'second'})
+        self.assertEqual(set_pg.call_count, 2)
+        self.assertEqual(self.client.stats()['call_types']['pr_package']['misses'], 2)
+
+    def test_pr_package_regenerate_reaches_the_cache(self):
+        import services.pr_package_generator as pr_package
+        generator = object.__new__(pr_package.PRPackageGenerator)
+        generator.client = MagicMock()
+        llm = MagicMock()
+        llm.call.return_value = {'pitch_short_subject': 's'}
+        with patch.object(pr_package, 'LLM', llm), \
+                patch.object(pr_package, 'build_user_prompt', return_value='prompt'), \
+                patch.object(pr_package, 'compute_optimal_send_time',
+                             return_value={'day': 'Tuesday', 'time_range': '2-5pm'}), \
+                patch.object(pr_package, 'predict_reply_rate', return_value={'brand_avg': 0.1}), \
+                patch.object(pr_package, 'scrub_pr_package', return_value=[]), \
+                patch.object(generator, '_finalize_package', side_effect=lambda pkg, *a: pkg):
+            generator.generate({'id': 1}, {'id': 2}, cursor=None)
+            generator.generate({'id': 1}, {'id': 2}, cursor=None, regenerate=True)
+        self.assertEqual([c.kwargs['refresh'] for c in llm.call.call_args_list], [False, True])
+
+
+class TestGeminiTransport(unittest.TestCase):
+    def test_retries_429_then_returns_text_and_usage(self):
+        replies = [_response(429, headers={'retry-after': '0'}), _response()]
+        with patch.object(llm_client.requests, 'post', side_effect=replies) as post:
+            reply = gemini_generate('ai_depth', 'gemini-2.5-flash', {'contents': []}, api_key='k')
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(post.call_args.kwargs['timeout'], CALL_TYPES['ai_depth'].timeout)
+        self.assertEqual((reply['text'], reply['input_tokens'], reply['output_tokens']), ('{"ok": true}', 120, 30))
+
+    def test_client_errors_are_not_retried(self):
+        with patch.object(llm_client.requests, 'post', return_value=_response(400)) as post:
+            with self.assertRaises(llm_client.requests.HTTPError):
+                gemini_generate('ai_depth', 'm', {}, api_key='k')
+        post.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
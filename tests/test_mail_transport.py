@@ -0,0 +1,97 @@
+"""Shared mail transport: SMTP session reuse, cached templates, bulk user id lookup."""
+
+import smtplib
+import sys
+import unittest
+from email.mime.text import MIMEText
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.mail_transport as mail_transport
+from services.mail_transport import SMTPPool
+
+
+def _msg(to='a@x.com'):
+    msg = MIMEText('<p>hi</p>', 'html')
+    msg['To'] = to
+    return msg
+
+
+class TestSMTPPool(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(mail_transport.smtplib, 'SMTP')
+        self.smtp = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.smtp.side_effect = lambda *a, **k: MagicMock()
+
+    def _send(self, pool, to='a@x.com'):
+        pool.sendmail('smtp.test', 587, 'team@x.com', 'pw', 'team@x.com', [to], 'body')
+
+    def test_logs_in_once_for_many_messages(self):
+        pool = SMTPPool()
+        for i in range(5):
+            self._send(pool, f'{i}@x.com')
+        self.assertEqual(self.smtp.call_count, 1)
+        self.assertEqual(pool.stats, {'connects': 1, 'reuses': 4, 'messages': 5})
+
+    def test_dropped_idle_session_is_replaced(self):
+        pool = SMTPPool()
+        self._send(pool)
+        stale = pool._idle[('smtp.test', 587, 'team@x.com')][0][0]
+        stale.sendmail.side_effect = smtplib.SMTPServerDisconnected('gone')
+        self._send(pool)
+        self.assertEqual(self.smtp.call_count, 2)
+        self.assertEqual(pool.stats['messages'], 2)
+
+    def test_refused_recipient_keeps_session(self):
+        pool = SMTPPool()
+        self._send(pool)
+        server = pool._idle[('smtp.test', 587, 'team@x.com')][0][0]
+        server.sendmail.side_effect = smtplib.SMTPRecipientsRefused({'b@x.com': (550, b'no')})
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            self._send(pool, 'b@x.com')
+        self.assertEqual(len(pool._idle[('smtp.test', 587, 'team@x.com')]), 1)
+
+    def test_expired_and_full_sessions_are_not_reused(self):
+        pool = SMTPPool(max_messages=2)
+        self._send(pool)
+        self._send(pool)
+        self._send(pool)
+        self.assertEqual(self.smtp.call_count, 2)
+        with patch.object(mail_transport.time, 'time', return_value=mail_transport.time.time() + 3600):
+            self._send(pool)
+        self.assertEqual(self.smtp.call_count, 3)
+
+    def test_send_smtp_message_defaults_to_env(self):
+        with patch.object(mail_transport, 'SMTP_POOL') as pool, \
+                patch.dict('os.environ', {'SMTP_USERNAME': 'team@x.com', 'SMTP_PASSWORD': 'pw'}, clear=True):
+            mail_transport.send_smtp_message(_msg('c@x.com'))
+        args = pool.sendmail.call_args.args
+        self.assertEqual(args[:6], ('smtp.gmail.com', 587, 'team@x.com', 'pw', 'team@x.com', ['c@x.com']))
+
+
+class TestTemplatesAndLookups(unittest.TestCase):
+    def test_template_env_is_shared(self):
+        self.assertIs(mail_transport.get_template_env(), mail_transport.get_template_env())
+
+    def test_lookup_user_id_one_query_then_cached(self):
+        mail_transport._user_ids.clear()
+        conn = MagicMock()
+        conn.cursor.return_value.fetchone.side_effect = [(1,), None]
+        self.assertEqual(mail_transport.lookup_user_id(' A@x.com', conn=conn), 1)
+        sql, params = conn.cursor.return_value.execute.call_args.args
+        self.assertIn('WHERE email = %s', sql)  # indexable, unlike LOWER(email)
+        self.assertEqual(params, ('a@x.com',))
+        self.assertIsNone(mail_transport.lookup_user_id('b@x.com', conn=conn))
+
+        self.assertEqual(mail_transport.lookup_user_id('a@x.com', conn=conn), 1)
+        self.assertIsNone(mail_transport.lookup_user_id('b@x.com', conn=conn))
+        self.assertEqual(conn.cursor.return_value.execute.call_count, 2)
+        conn.close.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
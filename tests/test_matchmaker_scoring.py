@@ -10,6 +10,8 @@ if str(ROOT) not in sys.path:
 
 from services.fit_score_calculator import (
     score_brand_for_creator,
+    score_brands_for_creator,
+    score_creators_for_brand,
     scrape_agrees_with_intent,
     check_brand_context_mismatch,
 )
@@ -324,5 +326,42 @@ class TestBeautyBabyParentingFeed(unittest.TestCase):
         self.assertNotEqual(by_name['Starface'], by_name['Fancii'])
 
 
+class TestBatchScoring(unittest.TestCase):
+    def _brands(self):
+        return [
+            _brand(1, 'Glow Lab', 'beauty', 'Vitamin C serum and glow skincare.', hero_product='Glow Serum'),
+            _brand(2, 'Theory', 'fashion', 'Contemporary luxury tailored outfits.'),
+            _brand(3, 'Briogeo', 'haircare', 'Clean haircare for scalp and curls.'),
+            _brand(4, 'Calm Hemp', 'wellness', 'CBD gummies for sleep.'),
+            _brand(5, 'Glow Lab', 'beauty', 'Vitamin C serum and glow skincare.', hero_product='Glow Serum'),
+            {},
+        ]
+
+    def test_batch_matches_single_brand_scores(self):
+        profile = _yasia_profile()
+        interests = ['beauty', 'wellness']
+        brands = self._brands()
+        batch = score_brands_for_creator(profile, brands, interest_niches=interests)
+        single = [score_brand_for_creator(profile, b, interest_niches=interests) for b in brands]
+        self.assertEqual(batch, single)
+
+    def test_batch_results_are_independent_dicts(self):
+        brands = self._brands()
+        batch = score_brands_for_creator(_yasia_profile(), brands)
+        batch[0]['overall_score'] = -1
+        self.assertNotEqual(batch[4]['overall_score'], -1)
+
+    def test_creators_for_brand_matches_single(self):
+        brand = self._brands()[0]
+        profiles = [_yasia_profile(), _yasia_profile(primary_niche='tech', match_intent_lanes=['tech'])]
+        niches = [['beauty'], None]
+        batch = score_creators_for_brand(profiles, brand, interest_niches=niches)
+        self.assertEqual(batch, [
+            score_brand_for_creator(profiles[0], brand, interest_niches=['beauty']),
+            score_brand_for_creator(profiles[1], brand),
+        ])
+        self.assertGreater(batch[0]['overall_score'], batch[1]['overall_score'])
+
+
 if __name__ == '__main__':
     unittest.main()
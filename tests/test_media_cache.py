@@ -0,0 +1,247 @@
+"""Media proxy cache: disk LRU by bytes, Redis tier, revalidation, coalescing, pass-through, routes."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import media_proxy_routes
+import services.media_cache as media_cache
+from services.media_cache import MediaCache, MediaTooLarge, MediaUnavailable, thumbnail_width
+
+URL = 'https://scontent.cdninstagram.com/v/t51/photo.jpg?sig=abc'
+
+
+def _upstream(status=200, body=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = dict(headers or {})
+    response.iter_content.side_effect = lambda size: iter([body[i:i + size] for i in range(0, len(body), size)])
+    return response
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def hgetall(self, key):
+        return {k.encode(): v.encode() if isinstance(v, str) else v for k, v in self.data.get(key, {}).items()}
+
+    def pipeline(self):
+        pipe = MagicMock()
+        pipe.hset.side_effect = lambda key, mapping: self.data.__setitem__(key, dict(mapping))
+        return pipe
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class _CacheCase(unittest.TestCase):
+    redis = None
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        patcher = patch.object(media_cache, 'get_redis', side_effect=lambda: self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = self._cache()
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault('max_bytes', 10_000)
+        kwargs.setdefault('max_entry_bytes', 4_000)
+        return MediaCache(directory=self.dir, **kwargs)
+
+    def _get(self, cache=None, url=URL, **kwargs):
+        return (cache or self.cache).get('media', url, headers={'Referer': 'https://www.instagram.com/'}, **kwargs)
+
+
+class TestLocalTier(_CacheCase):
+    def test_miss_then_hit_survives_restart(self):
+        with patch.object(media_cache.requests, 'get',
+                          return_value=_upstream(body=b'jpeg-bytes', headers={'Content-Type': 'image/jpeg'})) as get:
+            first = self._get()
+            second = self._get()
+            third = self._get(cache=self._cache())
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual([r.status for r in (first, second, third)], ['MISS', 'HIT', 'HIT'])
+        self.assertEqual(third.entry.body, b'jpeg-bytes')
+        self.assertEqual(third.content_type, 'image/jpeg')
+        self.assertEqual(get.call_args.kwargs['headers'], {'Referer': 'https://www.instagram.com/'})
+
+    def test_lru_evicts_by_bytes(self):
+        with patch.object(media_cache.requests, 'get', side_effect=lambda *a, **k: _upstream(body=b'x' * 3_000)):
+            for i in range(3):
+                self._get(url=f'{URL}&n={i}')
+            self._get(url=f'{URL}&n=0')  # touch: n=1 is now the oldest
+            self._get(url=f'{URL}&n=3')
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['evictions']), (3, 9_000, 1))
+        self.assertEqual(len([n for n in os.listdir(self.dir) if n.endswith('.bin')]), 3)
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(body=b'x' * 3_000)) as get:
+            self._get(url=f'{URL}&n=0')
+            self._get(url=f'{URL}&n=1')
+        self.assertEqual(get.call_count, 1)
+
+
+class TestRevalidation(_CacheCase):
+    def _stale_entry(self):
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(
+                body=b'v1', headers={'ETag': '"up-1"', 'Last-Modified': 'Tue, 03 Mar 2026 10:00:00 GMT'})):
+            self._get(fresh_for=-1)
+
+    def test_not_modified_renews_entry(self):
+        self._stale_entry()
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(status=304)) as get:
+            result = self._get(fresh_for=3600)
+            again = self._get(fresh_for=3600)
+        headers = get.call_args.kwargs['headers']
+        self.assertEqual((headers['If-None-Match'], headers['If-Modified-Since']),
+                         ('"up-1"', 'Tue, 03 Mar 2026 10:00:00 GMT'))
+        self.assertEqual((result.status, result.entry.body, again.status), ('REVALIDATED', b'v1', 'HIT'))
+        self.assertEqual(get.call_count, 1)
+
+    def test_stale_served_when_upstream_is_down(self):
+        self._stale_entry()
+        with patch.object(media_cache.requests, 'get', side_effect=media_cache.requests.ConnectionError()):
+            self.assertEqual(self._get().status, 'STALE')
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(status=503)):
+            self.assertEqual(self._get().entry.body, b'v1')
+
+    def test_gone_upstream_drops_entry(self):
+        self._stale_entry()
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(status=404)):
+            with self.assertRaises(MediaUnavailable):
+                self._get()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+class TestFetchPaths(_CacheCase):
+    def test_concurrent_misses_share_one_fetch(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_get(*args, **kwargs):
+            calls.append(1)
+            release.wait(2)
+            return _upstream(body=b'img')
+
+        results = []
+        with patch.object(media_cache.requests, 'get', side_effect=slow_get):
+            threads = [threading.Thread(target=lambda: results.append(self._get())) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            deadline = time.time() + 2
+            while not calls and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join(2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(r.status for r in results), ['COALESCED'] * 3 + ['MISS'])
+        self.assertEqual(self.cache.stats()['coalesced'], 3)
+
+    def test_large_body_streams_through_uncached(self):
+        body = bytes(range(256)) * 40  # 10 KB > max_entry_bytes
+        upstream = _upstream(body=body)
+        with patch.object(media_cache.requests, 'get', return_value=upstream):
+            result = self._get()
+        self.assertEqual(result.status, 'PASS')
+        self.assertEqual(b''.join(result.stream), body)
+        upstream.close.assert_called()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_declared_large_body_streams_and_undeclared_oversize_is_refused(self):
+        body = bytes(range(256)) * 40
+        upstream = _upstream(body=body, headers={'Content-Length': str(len(body))})
+        with patch.object(media_cache.requests, 'get', return_value=upstream):
+            result = self._get()
+        self.assertEqual(b''.join(result.stream), body)
+        # No Content-Length: refused before a single byte is served, never truncated under a 200
+        upstream = _upstream(body=body)
+        with patch.object(media_cache.requests, 'get', return_value=upstream):
+            with self.assertRaises(MediaTooLarge):
+                self._get(max_bytes=6_000)
+        upstream.close.assert_called()
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(body=body)):
+            with self.assertRaises(MediaTooLarge):
+                self._get(max_bytes=3_000)  # under max_entry_bytes too
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_declared_oversize_is_refused(self):
+        with patch.object(media_cache.requests, 'get',
+                          return_value=_upstream(body=b'x', headers={'Content-Length': '9000000'})):
+            with self.assertRaises(MediaTooLarge):
+                self._get()
+
+    def test_thumbnail_widths_and_pillow_fallback(self):
+        self.assertEqual([thumbnail_width(w) for w in ('100', '512', '4000', 'abc', None, '-5')],
+                         [128, 512, None, None, None, None])
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(body=b'img')):
+            result = self._get()
+        with patch.object(media_cache, 'Image', None):
+            self.assertIs(self.cache.thumbnail('media', URL, result, 128), result)
+
+
+class TestRedisTier(_CacheCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        super().setUp()
+
+    def test_other_worker_is_served_from_redis(self):
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(body=b'shared')) as get:
+            self._get()
+            other_dir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, other_dir, True)
+            other = MediaCache(directory=other_dir)
+            result = self._get(cache=other)
+            again = self._get(cache=other)
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual((result.entry.body, other.stats()['redis_hits'], again.status), (b'shared', 1, 'HIT'))
+
+
+class TestProxyRoute(_CacheCase):
+    def setUp(self):
+        super().setUp()
+        app = Flask(__name__)
+        app.register_blueprint(media_proxy_routes.media_proxy)
+        self.client = app.test_client()
+        patcher = patch.object(media_proxy_routes, 'MEDIA_CACHE', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _proxy(self, **headers):
+        return self.client.get('/api/media-proxy', query_string={'url': URL}, headers=headers)
+
+    def test_etag_and_conditional_304(self):
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(body=b'jpeg')) as get:
+            first = self._proxy()
+            second = self._proxy(**{'If-None-Match': first.headers['ETag']})
+        self.assertEqual((first.status_code, first.data, first.headers['X-Media-Cache']), (200, b'jpeg', 'MISS'))
+        self.assertEqual(first.headers['Content-Type'], 'image/jpeg')
+        self.assertEqual(first.headers['Cross-Origin-Resource-Policy'], 'cross-origin')
+        self.assertEqual((second.status_code, second.headers['X-Media-Cache']), (304, 'HIT'))
+        self.assertEqual(get.call_count, 1)
+
+    def test_upstream_404_and_oversize(self):
+        with patch.object(media_cache.requests, 'get', return_value=_upstream(status=404)):
+            self.assertEqual(self._proxy().status_code, 404)
+        with patch.object(media_cache.requests, 'get',
+                          return_value=_upstream(headers={'Content-Length': str(6 * 1024 * 1024)})):
+            self.assertEqual(self._proxy().status_code, 413)
+
+
+if __name__ == '__main__':
+    unittest.main()
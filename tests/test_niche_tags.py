@@ -0,0 +1,92 @@
+"""Canonical creator niches: shared parser, token set, indexed filter SQL, SQL/Python rule parity."""
+
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.niche_tags as niche_tags
+from services.niche_tags import (
+    EMPTY_VALUES,
+    TOKEN_STOPWORDS,
+    canonical_niches,
+    creator_niche_tags,
+    niche_filter_sql,
+    niche_tags_column_exists,
+    niche_tokens,
+    parse_niches,
+)
+
+MIGRATION = (ROOT / 'migrations' / 'add_creator_niche_tags.sql').read_text()
+
+
+class TestParseNiches(unittest.TestCase):
+    def test_every_stored_format(self):
+        cases = {
+            '["Beauty", "Skin  Care", "beauty"]': ['beauty', 'skin care'],
+            'Fitness, Food & Beverage ,': ['fitness', 'food & beverage'],
+            '{lifestyle,"home decor"}': ['lifestyle', 'home decor'],
+            '  Tech  ': ['tech'],
+            '[beauty, fashion': ['beauty', 'fashion'],  # truncated JSON falls back to CSV
+            '[1, null, "none"]': ['1'],
+            'null': [],
+            '': [],
+            None: [],
+        }
+        for raw, expected in cases.items():
+            self.assertEqual(parse_niches(raw), expected, raw)
+
+    def test_lists_are_cleaned_not_split(self):
+        self.assertEqual(parse_niches(['"Beauty"', None, '[Fashion]', 'food, drink']),
+                         ['beauty', 'fashion', 'food, drink'])
+
+    def test_canonical_puts_for_you_first(self):
+        self.assertEqual(canonical_niches('["Fitness", "Beauty"]', ['beauty', 'Parenting']),
+                         ['beauty', 'parenting', 'fitness'])
+        self.assertEqual(creator_niche_tags({'niche': 'Tech', 'creator_niches': None}), ['tech'])
+        self.assertEqual(creator_niche_tags({'niche': 'Tech', 'niche_tags': ['gaming']}), ['gaming'])
+
+    def test_tokens_drop_connectors_and_short_words(self):
+        self.assertEqual(niche_tokens(['tech & gadgets', 'self-care'], '["Home and Decor", "a"]'),
+                         ['care', 'decor', 'gadgets', 'home', 'self', 'tech'])
+
+
+class TestFilterSql(unittest.TestCase):
+    def test_overlap_or_all_tokens(self):
+        sql, params = niche_filter_sql('Beauty & Skincare')
+        self.assertEqual(sql, '(c.niche_tags && %s::text[] OR c.niche_tokens @> %s::text[])')
+        self.assertEqual(params, [['beauty & skincare'], ['beauty', 'skincare']])
+        self.assertEqual(niche_filter_sql('&', alias='cr'), ('cr.niche_tags && %s::text[]', [['&']]))
+        self.assertEqual(niche_filter_sql('null'), (None, []))
+
+    def test_column_check_cached_once_present(self):
+        niche_tags._COLUMN_READY = None
+        conn = MagicMock()
+        conn.cursor.return_value.fetchone.side_effect = [None, (1,)]
+        self.assertFalse(niche_tags_column_exists(conn))
+        self.assertTrue(niche_tags_column_exists(conn))
+        self.assertTrue(niche_tags_column_exists(conn))
+        self.assertEqual(conn.cursor.return_value.execute.call_count, 2)
+        niche_tags._COLUMN_READY = None
+
+
+class TestMigrationParity(unittest.TestCase):
+    def test_sql_uses_the_same_word_lists(self):
+        empties = re.search(r"niche NOT IN \(([^)]*)\)", MIGRATION).group(1)
+        stopwords = re.search(r"tok NOT IN \(([^)]*)\)", MIGRATION).group(1)
+        self.assertEqual(set(re.findall(r"'(\w+)'", empties)), set(EMPTY_VALUES))
+        self.assertEqual(set(re.findall(r"'(\w+)'", stopwords)), set(TOKEN_STOPWORDS))
+
+    def test_trigger_covers_every_niche_column(self):
+        self.assertIn('BEFORE INSERT OR UPDATE OF niche, creator_niches, pr_wishlist ON creators', MIGRATION)
+        self.assertIn('USING GIN (niche_tags)', MIGRATION)
+        self.assertIn('USING GIN (niche_tokens)', MIGRATION)
+
+
+if __name__ == '__main__':
+    unittest.main()
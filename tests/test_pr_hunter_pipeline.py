@@ -0,0 +1,127 @@
+"""PR Hunter pipeline: one dedup query, concurrent enrichment under token buckets, batched staging."""
+
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.pr_hunter as pr_hunter
+from services.pr_hunter import (
+    CANDIDATE_COLUMNS,
+    PRHunterService,
+    enrich_brands,
+    filter_new_brands,
+    run_hunt_inline,
+    save_candidates,
+)
+from services.rate_limiter import TokenBucket
+from tests.fake_pr_hunter_apis import FakePRHunterAPIs
+
+
+def _brands(n):
+    return [
+        {'brand_name': f'Brand {i}', 'domain': f'brand{i}.com', 'website_url': f'https://brand{i}.com',
+         'discovery_source': 'Google Search: test'}
+        for i in range(n)
+    ]
+
+
+def _fast_limits():
+    return {api: TokenBucket(10000, 10000) for api in ('serpapi', 'hunter', 'neverbounce')}
+
+
+class TestDedup(unittest.TestCase):
+    def test_one_query_for_the_whole_hunt(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [{'domain': 'brand1.com'}, {'domain': 'brand3.com'}]
+        brands = _brands(5) + [{'brand_name': 'No domain'}]
+        with patch.object(pr_hunter, '_DOMAIN_COLUMN_READY', True):
+            unique = filter_new_brands(cursor, brands)
+        self.assertEqual([b['domain'] for b in unique], ['brand0.com', 'brand2.com', 'brand4.com'])
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args.args
+        self.assertIn('website_domain = d', sql)
+        self.assertEqual(params, ([f'brand{i}.com' for i in range(5)],))
+
+    def test_falls_back_to_substring_match_before_migration(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        cursor.fetchall.return_value = []
+        with patch.object(pr_hunter, '_DOMAIN_COLUMN_READY', None):
+            filter_new_brands(cursor, _brands(2))
+        self.assertIn("website LIKE '%%' || d || '%%'", cursor.execute.call_args.args[0])
+
+
+class TestSaveCandidates(unittest.TestCase):
+    def test_single_statement_one_row_per_domain(self):
+        brands = _brands(3) + [dict(_brands(1)[0], brand_name='Brand 0 again')]
+        with patch.object(pr_hunter, 'execute_values') as execute_values:
+            self.assertEqual(save_candidates(MagicMock(), brands, 'K-Beauty'), 3)
+        execute_values.assert_called_once()
+        rows = execute_values.call_args.args[2]
+        names = [row[CANDIDATE_COLUMNS.index('brand_name')] for row in rows]
+        self.assertEqual(sorted(names), ['Brand 0 again', 'Brand 1', 'Brand 2'])
+        self.assertEqual(rows[0][CANDIDATE_COLUMNS.index('discovery_source')], 'K-Beauty - Google Search: test')
+        self.assertIn("'PENDING'", execute_values.call_args.kwargs['template'])
+
+
+class TestEnrichmentAgainstStub(unittest.TestCase):
+    def setUp(self):
+        self.server = FakePRHunterAPIs(latency=0.02).start()
+        self.addCleanup(self.server.stop)
+        env = patch.dict(os.environ, dict(self.server.env(), SERPAPI_API_KEY='k',
+                                          HUNTER_API_KEY='k', NEVERBOUNCE_API_KEY='k'))
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_concurrent_enrichment_is_faster_with_same_results(self):
+        brands = _brands(16)
+
+        started = time.perf_counter()
+        serial = enrich_brands(PRHunterService(_fast_limits()), brands, workers=1)
+        serial_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        parallel = enrich_brands(PRHunterService(_fast_limits()), brands, workers=8)
+        parallel_sec = time.perf_counter() - started
+
+        self.assertEqual(parallel['accepted'], serial['accepted'])
+        self.assertEqual(len(parallel['accepted']), 16)
+        self.assertEqual(parallel['accepted'][0]['contact_email'], 'jane.doe@brand0.com')
+        self.assertEqual(parallel['accepted'][0]['form_platform'], 'Typeform')
+        self.assertGreater(self.server.peak_in_flight, 1)
+        self.assertLess(parallel_sec * 3, serial_sec)
+
+    def test_token_bucket_paces_each_api(self):
+        limits = _fast_limits()
+        limits['hunter'] = TokenBucket(20, 1)
+        started = time.perf_counter()
+        enrich_brands(PRHunterService(limits), _brands(6), workers=6)
+        # 6 Hunter calls at 20/s with no burst: at least 5 gaps of 50ms
+        self.assertGreaterEqual(time.perf_counter() - started, 0.24)
+        self.assertEqual(self.server.calls['hunter'], 6)
+
+    def test_inline_hunt_saves_in_batches(self):
+        service = PRHunterService(_fast_limits())
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [{'domain': 'brand2.com'}]
+        with patch.object(service, 'search_google_for_brands', return_value=_brands(10)), \
+                patch.object(pr_hunter, '_DOMAIN_COLUMN_READY', True), \
+                patch.object(pr_hunter, 'PR_HUNT_ENRICH_WORKERS', 4), \
+                patch.object(pr_hunter, 'PR_HUNT_CHUNK_SIZE', 4), \
+                patch.object(pr_hunter, 'execute_values') as execute_values:
+            result = run_hunt_inline(service, conn, 'K-Beauty', 10)
+        self.assertEqual((result['discovered'], result['unique']), (10, 9))
+        self.assertEqual((result['enriched'], result['saved'], result['rejected']), (9, 9, 0))
+        self.assertEqual(execute_values.call_count, 3)  # batches of 4, 4, 1
+        self.assertEqual(conn.commit.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
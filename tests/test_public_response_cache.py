@@ -0,0 +1,111 @@
+"""Public brand response cache: normalized keys, conditional 304s, generation invalidation."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from flask import Flask, jsonify, request
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.public_response_cache as public_cache
+from services.public_response_cache import (
+    PublicResponseCache,
+    cached_public_response,
+    invalidate_public_brand_cache,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+class _CacheCase(unittest.TestCase):
+    redis = None
+
+    def setUp(self):
+        for patcher in (
+            patch.object(public_cache, 'get_redis', return_value=self.redis),
+            patch.object(public_cache, 'PUBLIC_CACHE', PublicResponseCache()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.calls = []
+        app = Flask(__name__)
+
+        @app.route('/brands')
+        @cached_public_response('brands', ttl=60)
+        def brands():
+            self.calls.append(dict(request.args))
+            return jsonify({'page': request.args.get('page', '1'), 'n': len(self.calls)}), 200
+
+        @app.route('/brands/<slug>')
+        @cached_public_response('brand', ttl=60)
+        def brand(slug):
+            self.calls.append(slug)
+            return jsonify({'error': 'Brand not found'}), 404
+
+        self.client = app.test_client()
+
+
+class TestLocalCache(_CacheCase):
+    def test_equivalent_queries_share_an_entry(self):
+        first = self.client.get('/brands?page=2&category=beauty&search=')
+        second = self.client.get('/brands?category=beauty&page=2')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first.get_json(), second.get_json())
+        self.assertEqual(second.headers['Cache-Control'], 'public, max-age=60')
+        self.client.get('/brands?page=3')
+        self.assertEqual(len(self.calls), 2)
+
+    def test_conditional_requests_get_304(self):
+        first = self.client.get('/brands')
+        etag = first.headers['ETag']
+        self.assertEqual(self.client.get('/brands', headers={'If-None-Match': etag}).status_code, 304)
+        since = first.headers['Last-Modified']
+        self.assertEqual(self.client.get('/brands', headers={'If-Modified-Since': since}).status_code, 304)
+        self.assertEqual(public_cache.PUBLIC_CACHE.stats()['not_modified'], 2)
+
+    def test_invalidate_rebuilds(self):
+        self.client.get('/brands')
+        invalidate_public_brand_cache()
+        self.assertEqual(self.client.get('/brands').get_json()['n'], 2)
+
+    def test_errors_are_not_cached(self):
+        self.client.get('/brands/missing')
+        self.assertEqual(self.client.get('/brands/missing').status_code, 404)
+        self.assertEqual(self.calls, ['missing', 'missing'])
+
+
+class TestRedisCache(_CacheCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        super().setUp()
+
+    def test_generation_bump_retires_shared_entries(self):
+        self.client.get('/brands?page=1')
+        self.assertIn('pubcache:brands:0:/brands?page=1', self.redis.data)
+        self.client.get('/brands?page=1')
+        self.assertEqual(len(self.calls), 1)
+        invalidate_public_brand_cache()
+        self.assertEqual(self.redis.data['pubcache:gen'], 1)
+        self.client.get('/brands?page=1')
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Sliding-window rate limits: Redis Lua path, local fallback, decorator responses."""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.rate_limiter as rate_limiter
+from services.public_brand_guard import scraper_rate_limit
+from services.rate_limiter import AdaptiveTokenBucket, RateLimiter, RateLimitPolicy, rate_limit
+
+
+class _LocalCase(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(rate_limiter, 'get_redis', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestLocalSlidingWindow(_LocalCase):
+    def test_limit_within_one_window(self):
+        limiter = RateLimiter()
+        policy = RateLimitPolicy('t_local', 3, 60)
+        results = [limiter.hit(policy, 'k', now=600.0 + i)[0] for i in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(limiter.hit(policy, 'other', now=604.0)[0], True)
+        self.assertEqual(limiter.stats()['t_local']['local'], {'allowed': 4, 'denied': 1})
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        limiter = RateLimiter()
+        policy = RateLimitPolicy('t_weight', 4, 60)
+        for i in range(4):
+            limiter.hit(policy, 'k', now=600.0 + i)
+        # 15s into the next window: 4 * 0.75 = 3 still count, one slot free
+        self.assertTrue(limiter.hit(policy, 'k', now=675.0)[0])
+        allowed, retry_after = limiter.hit(policy, 'k', now=676.0)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 44)
+        # Two windows later the old hits are gone
+        self.assertTrue(limiter.hit(policy, 'k', now=790.0)[0])
+
+    def test_local_table_is_bounded(self):
+        limiter = RateLimiter(max_local_keys=10)
+        policy = RateLimitPolicy('t_bound', 5, 60)
+        for i in range(50):
+            limiter.hit(policy, f'k{i}', now=600.0)
+        self.assertEqual(len(limiter._local), 10)
+
+
+class TestRedisPath(unittest.TestCase):
+    def test_one_atomic_script_call_per_check(self):
+        client = MagicMock()
+        script = client.register_script.return_value
+        script.return_value = [0, 7]
+        limiter = RateLimiter()
+        policy = RateLimitPolicy('t_redis', 5, 60)
+        with patch.object(rate_limiter, 'get_redis', return_value=client):
+            allowed, retry_after = limiter.hit(policy, 'abc', now=630.0)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 30)
+        kwargs = script.call_args.kwargs
+        self.assertEqual(kwargs['keys'], ['rl:t_redis:abc:10', 'rl:t_redis:abc:9', 'rl:stats:t_redis'])
+        self.assertEqual(kwargs['args'][:2], [5, 60])
+
+    def test_redis_error_falls_back_to_local(self):
+        client = MagicMock()
+        client.register_script.return_value.side_effect = ConnectionError('down')
+        limiter = RateLimiter()
+        policy = RateLimitPolicy('t_fallback', 1, 60)
+        with patch.object(rate_limiter, 'get_redis', side_effect=[client, None, None]), \
+                patch.object(rate_limiter, 'mark_redis_failed') as failed:
+            self.assertTrue(limiter.hit(policy, 'k', now=600.0)[0])
+            self.assertFalse(limiter.hit(policy, 'k', now=601.0)[0])
+        failed.assert_called_once()
+
+
+class TestDecorator(_LocalCase):
+    def setUp(self):
+        super().setUp()
+        limiter = patch.object(rate_limiter, 'LIMITER', RateLimiter())
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        self.app = Flask(__name__)
+        policy = RateLimitPolicy('t_route', 2, 60)
+
+        @self.app.route('/limited')
+        @rate_limit(policy)
+        def limited():
+            return 'ok'
+
+        @self.app.route('/brands')
+        @scraper_rate_limit
+        def brands():
+            return 'brands'
+
+    def test_429_with_retry_after(self):
+        client = self.app.test_client()
+        self.assertEqual(client.get('/limited').status_code, 200)
+        self.assertEqual(client.get('/limited').status_code, 200)
+        response = client.get('/limited')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+
+    def test_scraper_policy_only_counts_scrapers(self):
+        client = self.app.test_client()
+        browser = {'User-Agent': 'Mozilla/5.0 (Macintosh)'}
+        for _ in range(40):
+            self.assertEqual(client.get('/brands', headers=browser).status_code, 200)
+        bot = {'User-Agent': 'python-requests/2.31.0'}
+        codes = [client.get('/brands', headers=bot).status_code for _ in range(31)]
+        self.assertEqual(codes.count(200), 30)
+        self.assertEqual(codes[-1], 429)
+
+
+class TestUserKey(unittest.TestCase):
+    def setUp(self):
+        from flask_jwt_extended import JWTManager
+        self.app = Flask(__name__)
+        self.app.config.update(SECRET_KEY='s', JWT_SECRET_KEY='jwt-secret-key-for-tests-only-32b')
+        JWTManager(self.app)
+
+    def _key(self, headers=None, key_func=rate_limiter.user_or_ip_key):
+        with self.app.test_request_context('/brands/discover', headers=headers or {},
+                                           environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            return key_func()
+
+    def test_jwt_callers_are_limited_per_user(self):
+        from flask_jwt_extended import create_access_token
+        with self.app.app_context():
+            token = create_access_token(identity='42')
+        self.assertEqual(self._key({'Authorization': f'Bearer {token}'}), 'u:42')
+
+    def test_anonymous_or_bad_token_falls_back_to_ip(self):
+        ip = self._key(key_func=rate_limiter.ip_key)
+        self.assertEqual(self._key(), ip)
+        self.assertEqual(self._key({'Authorization': 'Bearer not-a-jwt'}), ip)
+
+
+class TestAdaptiveTokenBucket(unittest.TestCase):
+    def test_halves_on_throttle_and_recovers_additively(self):
+        bucket = AdaptiveTokenBucket(4, min_rate=1, max_rate=5, increase=0.5)
+        bucket.throttled()
+        bucket.throttled()
+        bucket.throttled()
+        self.assertEqual((bucket.rate, bucket.throttle_count), (1, 3))
+        for _ in range(10):
+            bucket.succeeded()
+        self.assertEqual(bucket.rate, 5)
+
+    def test_retry_after_holds_every_caller(self):
+        bucket = AdaptiveTokenBucket(1000)
+        bucket.throttled(retry_after=0.05)
+        started = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.045)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Per-creator For You / mentor match store with fingerprint check and invalidation."""
+
+import sys
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.recommendation_cache as recommendation_cache
+from services.recommendation_cache import RecommendationStore
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestLocalFallback(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(recommendation_cache, 'get_redis', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit_requires_matching_fingerprint(self):
+        store = RecommendationStore('t', ttl=60)
+        store.set(7, 'fp-a', {'brands': [1, 2]})
+        self.assertEqual(store.get(7, 'fp-a'), {'brands': [1, 2]})
+        self.assertIsNone(store.get(7, 'fp-b'))
+        self.assertEqual(store.stats()['stale'], 1)
+
+    def test_expired_entries_are_dropped(self):
+        store = RecommendationStore('t', ttl=60)
+        with patch.object(recommendation_cache.time, 'time', return_value=1000.0):
+            store.set(7, 'fp', {'x': 1})
+        with patch.object(recommendation_cache.time, 'time', return_value=1061.0):
+            self.assertIsNone(store.get(7, 'fp'))
+        self.assertEqual(store.stats()['local_entries'], 0)
+
+    def test_lru_evicts_oldest(self):
+        store = RecommendationStore('t', ttl=60, max_local_entries=2)
+        store.set(1, 'fp', 'a')
+        store.set(2, 'fp', 'b')
+        store.get(1, 'fp')
+        store.set(3, 'fp', 'c')
+        self.assertEqual(store.get(1, 'fp'), 'a')
+        self.assertIsNone(store.get(2, 'fp'))
+
+    def test_encodes_like_jsonify(self):
+        store = RecommendationStore('t', ttl=60)
+        store.set(7, 'fp', {'at': datetime(2024, 1, 2, 3, 4, 5), 'score': Decimal('1.5')})
+        value = store.get(7, 'fp')
+        self.assertEqual(value['at'], 'Tue, 02 Jan 2024 03:04:05 GMT')
+        self.assertEqual(value['score'], '1.5')
+
+
+class TestRedisBacked(unittest.TestCase):
+    def test_shared_entries_and_invalidation(self):
+        fake = _FakeRedis()
+        with patch.object(recommendation_cache, 'get_redis', return_value=fake):
+            store = RecommendationStore('t', ttl=60)
+            store.set(7, 'fp', [1])
+            self.assertIn('reco:t:7', fake.data)
+            self.assertEqual(store.get(7, 'fp'), [1])
+            store.invalidate(7)
+            self.assertIsNone(store.get(7, 'fp'))
+
+    def test_redis_error_falls_back_to_local(self):
+        broken = MagicMock()
+        broken.set.side_effect = ConnectionError('down')
+        with patch.object(recommendation_cache, 'get_redis', side_effect=[broken, None]), \
+                patch.object(recommendation_cache, 'mark_redis_failed') as failed:
+            store = RecommendationStore('t', ttl=60)
+            store.set(7, 'fp', 'v')
+            self.assertEqual(store.get(7, 'fp'), 'v')
+        failed.assert_called_once()
+
+
+class TestInvalidateUser(unittest.TestCase):
+    def test_invalidates_every_creator_of_user(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [{'id': 3}, {'id': 4}]
+        with patch.object(recommendation_cache, 'invalidate_creator_recommendations') as inv:
+            recommendation_cache.invalidate_user_recommendations(conn, 9)
+        self.assertEqual([c.args[0] for c in inv.call_args_list], [3, 4])
+        cursor.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Streaming admin exports: named cursors, chunked CSV/NDJSON, constant memory, streamed route."""
+
+import csv
+import io
+import json
+import sys
+import tracemalloc
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import routes.admin_reports as admin_reports
+from services.report_export import EXPORTS, csv_chunks, export_chunks, iter_rows, ndjson_chunks
+
+COLUMNS = ('id', 'pitched_at', 'brand_name', 'meta')
+
+
+def _rows(n):
+    for i in range(n):
+        yield {'id': i, 'pitched_at': datetime(2026, 3, 1, 12, 0), 'brand_name': f'Brand, "{i}"',
+               'meta': {'tier': 'pro'} if i % 2 else None, 'ignored': 'x'}
+
+
+def _conn(rows):
+    conn = MagicMock()
+    conn.cursor.return_value.__iter__.side_effect = lambda: iter(rows)
+    return conn
+
+
+class TestChunks(unittest.TestCase):
+    def test_csv_header_quoting_and_chunking(self):
+        chunks = list(csv_chunks(_rows(5), COLUMNS, chunk_rows=2))
+        self.assertEqual(len(chunks), 3)
+        parsed = list(csv.reader(io.StringIO(''.join(chunks))))
+        self.assertEqual(parsed[0], list(COLUMNS))
+        self.assertEqual(parsed[1], ['0', '2026-03-01 12:00:00', 'Brand, "0"', ''])
+        self.assertEqual(json.loads(parsed[2][3]), {'tier': 'pro'})
+        self.assertEqual(len(parsed), 6)
+
+    def test_empty_csv_still_has_header(self):
+        self.assertEqual(list(csv_chunks(iter(()), COLUMNS)), ['id,pitched_at,brand_name,meta\r\n'])
+
+    def test_ndjson_lines_only_carry_declared_columns(self):
+        rows = [{'id': 1, 'pitched_at': datetime(2026, 3, 1), 'brand_name': 'Glow', 'meta': Decimal('1.5')}]
+        line = ''.join(ndjson_chunks(rows, COLUMNS))
+        self.assertEqual(json.loads(line), {'id': 1, 'pitched_at': '2026-03-01 00:00:00',
+                                            'brand_name': 'Glow', 'meta': 1.5})
+
+    def test_memory_stays_flat_with_row_count(self):
+        def peak(n):
+            tracemalloc.start()
+            for _ in csv_chunks(_rows(n), COLUMNS, chunk_rows=500):
+                pass
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak_bytes
+
+        small, large = peak(2000), peak(100000)
+        self.assertLess(large, small * 2)
+
+
+class TestServerSideCursor(unittest.TestCase):
+    def test_named_cursor_with_itersize(self):
+        conn = _conn([{'id': 1}, {'id': 2}])
+        self.assertEqual(list(iter_rows(conn, 'SELECT 1', {'a': 1}, itersize=300)), [{'id': 1}, {'id': 2}])
+        cursor = conn.cursor.return_value
+        self.assertTrue(conn.cursor.call_args.kwargs['name'].startswith('report_export_'))
+        self.assertEqual(cursor.itersize, 300)
+        cursor.execute.assert_called_once_with('SELECT 1', {'a': 1})
+        cursor.close.assert_called_once()
+
+    def test_args_validated_before_any_query(self):
+        conn = MagicMock()
+        for export, args in ((EXPORTS['pitches'], {'days': 'abc'}), (EXPORTS['pitches'], {'days': 0}),
+                             (EXPORTS['top_users'], {'metric': 'x'})):
+            with self.assertRaises(ValueError):
+                export_chunks(conn, export, 'csv', args)
+        with self.assertRaises(ValueError):
+            export_chunks(conn, EXPORTS['pitches'], 'xlsx', {})
+        conn.cursor.assert_not_called()
+
+    def test_retention_export_takes_weeks(self):
+        conn = _conn([])
+        list(export_chunks(conn, EXPORTS['retention'], 'csv', {'weeks': '26'}))
+        self.assertEqual(conn.cursor.return_value.execute.call_args.args[1], {'weeks': 26})
+
+
+class TestExportRoute(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(admin_reports.admin_reports_bp)
+        self.client = app.test_client()
+        self.headers = {'X-Admin-Token': 'pr-hunter-admin-2026'}
+
+    def _get(self, path, conn):
+        with patch.object(admin_reports, 'get_db_connection', return_value=conn):
+            response = self.client.get(path, headers=self.headers)
+            body = response.get_data(as_text=True)
+        return response, body
+
+    def test_streams_csv_attachment_and_returns_connection(self):
+        rows = [{'id': i, 'pitched_at': datetime(2026, 3, 1), 'brand_id': 7, 'brand_name': 'Glow',
+                 'contact_type': 'email', 'creator_id': 3, 'email': 'a@b.co', 'username': 'ana'}
+                for i in range(3)]
+        conn = _conn(rows)
+        response, body = self._get('/api/admin/reports/export/pitches?days=400', conn)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="pitches_', response.headers['Content-Disposition'])
+        self.assertEqual(len(body.strip().splitlines()), 4)
+        conn.close.assert_called_once()
+
+    def test_bad_args_and_unknown_export(self):
+        conn = MagicMock()
+        response, _ = self._get('/api/admin/reports/export/pitches?format=xml', conn)
+        self.assertEqual(response.status_code, 400)
+        conn.close.assert_called_once()
+        response, _ = self._get('/api/admin/reports/export/nope', conn)
+        self.assertEqual(response.status_code, 404)
+
+    def test_query_error_is_a_json_500(self):
+        conn = MagicMock()
+        conn.cursor.return_value.execute.side_effect = RuntimeError('relation missing')
+        response, body = self._get('/api/admin/reports/export/brand_unlocks?format=ndjson', conn)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('relation missing', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
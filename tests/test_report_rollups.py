@@ -0,0 +1,255 @@
+"""Report rollups: incremental refresh, rolled + live reads, period windows, dashboard wiring."""
+
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import routes.admin_reports as admin_reports
+import services.report_rollups as report_rollups
+from services.report_rollups import (
+    DAILY_COLUMNS,
+    WINDOW_COLUMNS,
+    load_report_rollups,
+    period_bounds,
+    refresh_report_rollups,
+)
+
+TODAY = date(2026, 3, 10)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _day(day, **counters):
+    row = dict.fromkeys(DAILY_COLUMNS, 0)
+    row.update(counters)
+    row['day'] = day
+    return row
+
+
+class FakeCursor:
+    """Answers each execute() from the first handler whose key appears in the SQL."""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.executed = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        for key, rows in self.handlers:
+            if key in sql:
+                self._rows = rows(params) if callable(rows) else rows
+                return
+        self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+    def ran(self, key):
+        return [params for sql, params in self.executed if key in sql]
+
+
+def _handlers(rolled, live=(), window=None, packs=True, **extra):
+    def regclass(params):
+        ready = params[0] != 'public.pack_purchases' or packs
+        return [{'ready': ready}]
+
+    return [
+        ('to_regclass', regclass),
+        ('FROM report_window_rollups', [window] if window else []),
+        ('MAX(day) AS as_of', [{'as_of': rolled[-1]['day'] if rolled else None}]),
+        ('FROM report_daily_rollups ORDER BY day', rolled),
+        ('AS signups', list(live)),
+        *extra.items(),
+    ]
+
+
+class TestPeriods(unittest.TestCase):
+    def test_bounds(self):
+        self.assertEqual(period_bounds('7d', TODAY), (date(2026, 3, 3), date(2026, 2, 24), 7))
+        start, prev_start, days = period_bounds('all', TODAY)
+        self.assertEqual((start, days), (date(2020, 1, 1), (TODAY - date(2020, 1, 1)).days))
+        self.assertEqual(prev_start, start - timedelta(days=days))
+
+
+class TestRefresh(unittest.TestCase):
+    def setUp(self):
+        report_rollups._TABLE_READY = None
+
+    def _refresh(self, rolled, full=False):
+        cursor = FakeCursor(_handlers(rolled, live=[_day(TODAY - timedelta(days=2), signups=4)]) + [
+            ('DISTINCT creator_id) FILTER', [{'active_creators': 9, 'prev_active_creators': 5}]),
+            ('first_day', [{'first_day': date(2026, 3, 1)}]),
+        ])
+        cursor.handlers.insert(5, ('AS pack_buyers', [{'pack_buyers': 2, 'prev_pack_buyers': 1}]))
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        with patch('psycopg2.extras.execute_values') as execute_values:
+            result = refresh_report_rollups(conn, full=full, today=TODAY)
+        conn.commit.assert_called_once()
+        return cursor, execute_values, result
+
+    def test_incremental_rerolls_trailing_days_including_empty_ones(self):
+        cursor, execute_values, result = self._refresh([_day(YESTERDAY)])
+        self.assertEqual(result, {'days': 3, 'start': '2026-03-07', 'as_of': '2026-03-09'})
+        self.assertEqual(cursor.ran('AS signups')[0], {'start': date(2026, 3, 7), 'end': TODAY})
+        daily_sql, daily_rows = execute_values.call_args_list[0].args[1:]
+        self.assertIn('ON CONFLICT (day) DO UPDATE', daily_sql)
+        self.assertEqual([row[0] for row in daily_rows], [date(2026, 3, 7), date(2026, 3, 8), YESTERDAY])
+        self.assertEqual(daily_rows[1][1 + DAILY_COLUMNS.index('signups')], 4)
+        self.assertEqual(daily_rows[0][1:], (0,) * len(DAILY_COLUMNS))
+
+        window_rows = execute_values.call_args_list[1].args[2]
+        self.assertEqual([row[0] for row in window_rows], list(report_rollups.PERIOD_DAYS))
+        self.assertEqual(window_rows[0][1:], (YESTERDAY, 9, 5, 2, 1))
+
+    def test_catches_up_from_last_rolled_day(self):
+        _, _, result = self._refresh([_day(date(2026, 2, 20))])
+        self.assertEqual((result['start'], result['days']), ('2026-02-21', 17))
+
+    def test_full_rebuild_starts_at_first_signup(self):
+        _, _, result = self._refresh([_day(YESTERDAY)], full=True)
+        self.assertEqual((result['start'], result['days']), ('2026-03-01', 9))
+
+    def test_noop_before_migration(self):
+        cursor = FakeCursor([('to_regclass', [{'ready': False}])])
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        self.assertEqual(refresh_report_rollups(conn, today=TODAY)['days'], 0)
+        conn.commit.assert_not_called()
+
+
+class TestLoad(unittest.TestCase):
+    def setUp(self):
+        report_rollups._TABLE_READY = None
+
+    def _rolled(self):
+        return [
+            _day(date(2026, 2, 25), signups=10, unlocks=4, first_unlockers=3),
+            _day(date(2026, 3, 1), signups=2, unlocks=1, third_unlockers=1),
+            _day(date(2026, 3, 4), signups=5, active_creators=6),
+            _day(YESTERDAY, signups=0, unlocks=7, first_unlockers=1),
+        ]
+
+    def test_sums_rolled_days_plus_today_live(self):
+        cursor = FakeCursor(_handlers(self._rolled(), live=[_day(TODAY, signups=3)]))
+        rollups = load_report_rollups(cursor, '7d', today=TODAY)
+        self.assertEqual(cursor.ran('AS signups')[0], {'start': TODAY, 'end': TODAY + timedelta(days=1)})
+        self.assertEqual(rollups.total('signups'), 20)
+        self.assertEqual(rollups.period_total('signups'), 8)
+        self.assertEqual(rollups.prev_total('signups'), 12)
+        self.assertEqual(rollups.month_total('unlocks'), 8)
+        self.assertEqual(rollups.today_total('signups'), 3)
+        self.assertEqual(rollups.total('first_unlockers'), 4)
+        self.assertEqual(rollups.daily('signups'), [
+            {'date': '2026-03-04', 'count': 5}, {'date': '2026-03-10', 'count': 3},
+        ])
+        self.assertEqual(rollups.daily('active_creators', date(2026, 1, 1), key='active_users'),
+                         [{'date': '2026-03-04', 'active_users': 6}])
+
+    def test_period_switch_runs_the_same_queries(self):
+        def queries(period):
+            report_rollups._TABLE_READY = None
+            cursor = FakeCursor(_handlers(self._rolled()))
+            load_report_rollups(cursor, period, today=TODAY)
+            return cursor.executed
+
+        self.assertEqual(queries('7d'), queries('all'))
+        self.assertEqual(queries('180d'), queries('all'))
+
+    def test_missing_stale_or_unknown_period_means_raw(self):
+        cursor = FakeCursor([('to_regclass', [{'ready': False}])])
+        self.assertIsNone(load_report_rollups(cursor, '7d', today=TODAY))
+        report_rollups._TABLE_READY = None
+        stale = FakeCursor(_handlers([_day(TODAY - timedelta(days=5))]))
+        self.assertIsNone(load_report_rollups(stale, '7d', today=TODAY))
+        self.assertIsNone(load_report_rollups(stale, 'custom', today=TODAY))
+
+    def test_window_adds_todays_new_creators_to_stored_counts(self):
+        window = {'active_creators': 40, 'prev_active_creators': 30, 'pack_buyers': 4, 'prev_pack_buyers': 2}
+        cursor = FakeCursor(_handlers(self._rolled(), window=window) + [
+            ('COUNT(DISTINCT cp.creator_id) AS n', [{'n': 3}]),
+            ('COUNT(DISTINCT pp.creator_id) AS n', [{'n': 1}]),
+        ])
+        rollups = load_report_rollups(cursor, '30d', today=TODAY)
+        self.assertEqual(rollups.window(), {'active_creators': 43, 'prev_active_creators': 30,
+                                            'pack_buyers': 5, 'prev_pack_buyers': 2})
+        self.assertEqual(cursor.ran('FROM report_window_rollups')[0], ('30d', YESTERDAY))
+        self.assertEqual(cursor.ran('creator_id) AS n')[0], {'live': TODAY, 'start': date(2026, 2, 8)})
+        rollups.window()
+        self.assertEqual(len(cursor.ran('FROM report_window_rollups')), 1)
+
+    def test_window_without_stored_row_is_computed(self):
+        cursor = FakeCursor(_handlers(self._rolled(), packs=False) + [
+            ('DISTINCT creator_id) FILTER', [{'active_creators': 7, 'prev_active_creators': 6}]),
+        ])
+        rollups = load_report_rollups(cursor, '7d', today=TODAY)
+        self.assertEqual(rollups.window(), dict(dict.fromkeys(WINDOW_COLUMNS, 0),
+                                                active_creators=7, prev_active_creators=6))
+        self.assertEqual(cursor.ran('DISTINCT creator_id) FILTER')[0]['end'], TODAY + timedelta(days=1))
+
+
+class TestDashboardWiring(unittest.TestCase):
+    def setUp(self):
+        report_rollups._TABLE_READY = None
+        rolled = [
+            _day(date(2026, 2, 28), pack_purchases=2, pack_revenue_cents=1800, pack_packs=6,
+                 first_pack_buyers=2, pro_upgrades=1),
+            _day(date(2026, 3, 5), signups=4, unlocks=2, pack_purchases=1, pack_revenue_cents=900,
+                 pack_packs=3, second_pack_buyers=1, active_creators=2),
+            _day(YESTERDAY),
+        ]
+        window = {'active_creators': 5, 'prev_active_creators': 3, 'pack_buyers': 1, 'prev_pack_buyers': 2}
+        self.cursor = FakeCursor(_handlers(rolled, window=window) + [
+            ('creator_id) AS n', [{'n': 0}]),
+            ('AS buyers', [{'buyers': 1}]),
+            ('information_schema.tables', [{'?column?': 1}]),
+            ('ORDER BY pp.created_at DESC', []),
+        ])
+        self.rollups = load_report_rollups(self.cursor, '7d', today=TODAY)
+
+    def test_health_block(self):
+        health = admin_reports._rollup_health_metrics(self.rollups)
+        self.assertEqual(health['signups'], {'this_week': 4, 'last_week': 0, 'change': 4,
+                                             'daily': [{'date': '2026-03-05', 'count': 4}]})
+        self.assertEqual(health['active_creators']['this_week'], 5)
+        self.assertEqual(health['upgrades']['last_week'], 1)
+
+    def test_pack_stats_skip_raw_aggregates(self):
+        stats = admin_reports.fetch_pack_report_stats(self.cursor, None, None, None, None, rollups=self.rollups)
+        self.assertEqual(stats['all_time'], {'purchases': 3, 'buyers': 2, 'revenue_cents': 2700,
+                                             'packs': 9, 'repeat_buyers': 1})
+        self.assertEqual(stats['period']['buyers'], 1)
+        self.assertEqual(stats['prev_period']['purchases'], 2)
+        self.assertEqual(stats['this_month']['revenue_cents'], 900)
+        self.assertEqual(stats['daily'], [{'date': '2026-03-05', 'count': 1, 'revenue_cents': 900}])
+        self.assertFalse(self.cursor.ran('HAVING COUNT(*) > 1'))
+
+    def test_signups_endpoint_reads_rollups(self):
+        app = Flask(__name__)
+        app.register_blueprint(admin_reports.admin_reports_bp)
+        conn = MagicMock()
+        conn.cursor.return_value = self.cursor
+        with patch.object(admin_reports, 'get_db_connection', return_value=conn), \
+                patch.object(admin_reports, 'load_report_rollups', return_value=self.rollups):
+            response = app.test_client().get('/api/admin/reports/signups?days=400',
+                                             headers={'X-Admin-Token': 'pr-hunter-admin-2026'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['total_period'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
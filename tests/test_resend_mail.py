@@ -35,8 +35,9 @@ class TestResendMail(unittest.TestCase):
         self.assertFalse(result['retryable'])
         self.assertIn('RESEND_API_KEY', result['error'])
 
-    @patch('services.resend_mail.requests.post')
-    def test_sends_payload_with_unsubscribe_headers(self, mock_post):
+    @patch('services.resend_mail.http_session')
+    def test_sends_payload_with_unsubscribe_headers(self, mock_session):
+        mock_post = mock_session.return_value.post
         mock_post.return_value = MagicMock(status_code=200, text='{"id":"re_1"}')
         mock_post.return_value.json.return_value = {'id': 're_1'}
         html = '<a href="https://api.newcollab.co/api/public/unsubscribe?uid=9&token=z">Unsub</a>'
@@ -52,8 +53,9 @@ class TestResendMail(unittest.TestCase):
         self.assertIn('List-Unsubscribe', payload['headers'])
         self.assertIn('unsubscribe?uid=9', payload['headers']['List-Unsubscribe'])
 
-    @patch('services.resend_mail.requests.post')
-    def test_rate_limit_is_retryable(self, mock_post):
+    @patch('services.resend_mail.http_session')
+    def test_rate_limit_is_retryable(self, mock_session):
+        mock_post = mock_session.return_value.post
         mock_post.return_value = MagicMock(status_code=429, text='Too many')
         mock_post.return_value.json.return_value = {'message': 'Rate limit exceeded'}
         with patch.dict('os.environ', {'RESEND_API_KEY': 're_test'}, clear=True):
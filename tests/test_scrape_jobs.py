@@ -0,0 +1,121 @@
+"""Background profile scrapes: dedup by handle, status, stale-while-revalidate."""
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.scrape_jobs as scrape_jobs
+from services.profile_quality import ProfileQualityError
+
+
+class _JobTestCase(unittest.TestCase):
+    def setUp(self):
+        scrape_jobs._local_jobs.clear()
+        scrape_jobs._local_inflight.clear()
+        for target, value in (
+            ('get_redis', None),
+            ('_dispatch', 'thread'),
+        ):
+            patcher = patch.object(scrape_jobs, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestEnqueue(_JobTestCase):
+    def test_same_handle_reuses_inflight_job(self):
+        first, created = scrape_jobs.enqueue_profile_scrape(1, '@Glow', 'instagram')
+        second, created_again = scrape_jobs.enqueue_profile_scrape(1, 'glow', 'Instagram')
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first['job_id'], second['job_id'])
+        self.assertEqual(scrape_jobs._dispatch.call_count, 1)
+
+    def test_other_account_gets_its_own_job(self):
+        first, _ = scrape_jobs.enqueue_profile_scrape(1, 'glow', 'instagram')
+        other, created = scrape_jobs.enqueue_profile_scrape(2, 'glow', 'instagram')
+        self.assertTrue(created)
+        self.assertNotEqual(first['job_id'], other['job_id'])
+
+    def test_finished_job_frees_the_handle(self):
+        first, _ = scrape_jobs.enqueue_profile_scrape(1, 'glow', 'instagram')
+        with patch('services.creator_profile_scraper.scrape_and_enrich_creator',
+                   return_value=({'follower_count': 900}, None)), \
+                patch.object(scrape_jobs, 'get_db_connection', return_value=MagicMock()):
+            scrape_jobs.run_scrape_job(first['job_id'])
+        second, created = scrape_jobs.enqueue_profile_scrape(1, 'glow', 'instagram')
+        self.assertTrue(created)
+        self.assertNotEqual(first['job_id'], second['job_id'])
+
+
+class TestRunJob(_JobTestCase):
+    def test_success_stores_result_and_closes_connection(self):
+        job, _ = scrape_jobs.enqueue_profile_scrape('u1', 'glow', 'tiktok', skip_minimums=True)
+        conn = MagicMock()
+        with patch('services.creator_profile_scraper.scrape_and_enrich_creator',
+                   return_value=({'follower_count': 900, 'scraped_at': datetime(2024, 1, 2)},
+                                 {'primary_niche': 'beauty'})) as scrape, \
+                patch.object(scrape_jobs, 'get_db_connection', return_value=conn):
+            scrape_jobs.run_scrape_job(job['job_id'])
+        scrape.assert_called_once_with(
+            'u1', 'glow', 'tiktok', db_conn=conn,
+            skip_minimums=True, skip_follower_floor=False,
+        )
+        conn.close.assert_called_once()
+        stored = scrape_jobs.get_job(job['job_id'])
+        self.assertEqual(stored['status'], scrape_jobs.DONE)
+        self.assertEqual(stored['result']['profile']['follower_count'], 900)
+        self.assertEqual(stored['result']['vision'], {'primary_niche': 'beauty'})
+
+    def test_quality_failure_keeps_user_facing_payload(self):
+        job, _ = scrape_jobs.enqueue_profile_scrape('u1', 'glow', 'instagram')
+        error = ProfileQualityError('below_follower_min', 'glow', follower_count=120)
+        with patch('services.creator_profile_scraper.scrape_and_enrich_creator', side_effect=error), \
+                patch.object(scrape_jobs, 'get_db_connection', return_value=MagicMock()):
+            scrape_jobs.run_scrape_job(job['job_id'])
+        stored = scrape_jobs.get_job(job['job_id'])
+        self.assertEqual(stored['status'], scrape_jobs.FAILED)
+        self.assertTrue(stored['invalid'])
+        self.assertEqual(stored['error_payload']['error_code'], 'below_follower_min')
+        self.assertIsNone(scrape_jobs.job_status_payload({'status': 'running', 'error': 'x'})['error'])
+
+    def test_only_queued_jobs_run(self):
+        job, _ = scrape_jobs.enqueue_profile_scrape('u1', 'glow', 'instagram')
+        scrape_jobs._update_job(job, status=scrape_jobs.RUNNING)
+        with patch('services.creator_profile_scraper.scrape_and_enrich_creator') as scrape:
+            scrape_jobs.run_scrape_job(job['job_id'])
+        scrape.assert_not_called()
+
+    def test_lost_job_reports_failed(self):
+        job, _ = scrape_jobs.enqueue_profile_scrape('u1', 'glow', 'instagram')
+        scrape_jobs._update_job(job, created_at=job['created_at'] - scrape_jobs.INFLIGHT_TTL - 1)
+        self.assertEqual(scrape_jobs.get_job(job['job_id'])['status'], scrape_jobs.FAILED)
+
+
+class TestStaleWhileRevalidate(_JobTestCase):
+    def _profile(self, days_old):
+        return {'scraped_at': datetime.now(timezone.utc) - timedelta(days=days_old)}
+
+    def test_fresh_profile_is_served_without_refresh(self):
+        self.assertIsNone(scrape_jobs.refresh_if_stale('u1', 'glow', 'instagram', self._profile(2)))
+        scrape_jobs._dispatch.assert_not_called()
+
+    def test_stale_or_missing_profile_queues_refresh(self):
+        job = scrape_jobs.refresh_if_stale('u1', 'glow', 'instagram', self._profile(9))
+        self.assertEqual(job['status'], scrape_jobs.QUEUED)
+        self.assertTrue(job['skip_follower_floor'])
+        self.assertIsNotNone(scrape_jobs.refresh_if_stale('u2', 'other', 'tiktok', None))
+
+    def test_naive_timestamps_are_utc(self):
+        naive = {'scraped_at': datetime.utcnow() - timedelta(days=3)}
+        self.assertEqual(scrape_jobs.profile_age_days(naive), 3)
+        self.assertTrue(scrape_jobs.profile_is_stale({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
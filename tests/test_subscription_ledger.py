@@ -0,0 +1,189 @@
+"""Subscriptions ledger: Stripe object mapping, webhook events, reconciliation, MRR/churn aggregate."""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.subscription_ledger as ledger
+from services.subscription_ledger import (
+    reconcile_subscriptions,
+    record_stripe_event,
+    subscription_metrics,
+    subscription_row,
+)
+from utils.stripe_mrr import GRANDFATHERED_PRO_PRICE_ID
+
+PRO_PRICE = 'price_pro_19'
+
+
+def _sub(sub_id='sub_1', price=PRO_PRICE, amount=1900, interval='month', status='active', **fields):
+    sub = {
+        'id': sub_id, 'customer': 'cus_1', 'status': status, 'livemode': False,
+        'start_date': 1767225600, 'current_period_end': 1769904000, 'cancel_at_period_end': False,
+        'items': {'data': [{'quantity': 1, 'price': {
+            'id': price, 'unit_amount': amount, 'recurring': {'interval': interval}}}]},
+    }
+    sub.update(fields)
+    return sub
+
+
+class FakeCursor:
+    def __init__(self, ready=True, metrics=None):
+        self.ready = ready
+        self.metrics = metrics
+        self.executed = []
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if 'to_regclass' in sql:
+            self._rows = [{'ready': self.ready}]
+        elif 'AS ledger_rows' in sql:
+            self._rows = [self.metrics] if self.metrics else []
+        else:
+            self._rows = []
+            self.rowcount = 1
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def ran(self, key):
+        return [params for sql, params in self.executed if key in sql]
+
+
+class _LedgerCase(unittest.TestCase):
+    def setUp(self):
+        ledger._TABLE_READY = None
+        patcher = patch.dict('os.environ', {'STRIPE_PRICE_ID_PRO': PRO_PRICE})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestSubscriptionRow(_LedgerCase):
+    def test_pro_price_and_yearly_normalisation(self):
+        row = subscription_row(_sub(amount=19000, interval='year', metadata={'creator_id': '42'}))
+        self.assertEqual((row['is_pro'], row['mrr_cents'], row['billing_interval'], row['creator_id']),
+                         (True, 1583, 'year', 42))
+        self.assertEqual(row['started_at'], datetime.fromisoformat('2026-01-01T00:00:00+00:00'))
+        grandfathered = subscription_row(_sub(price=GRANDFATHERED_PRO_PRICE_ID, amount=1200, customer={'id': 'cus_9'}))
+        self.assertEqual((grandfathered['is_pro'], grandfathered['mrr_cents'], grandfathered['customer_id']),
+                         (True, 1200, 'cus_9'))
+
+    def test_other_prices_are_kept_but_not_pro(self):
+        row = subscription_row(_sub(price='price_elite', amount=4900))
+        self.assertEqual((row['is_pro'], row['price_id'], row['mrr_cents']), (False, 'price_elite', 4900))
+
+
+class TestWebhookEvents(_LedgerCase):
+    def _record(self, event, cursor=None):
+        cursor = cursor or FakeCursor()
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        with patch.object(ledger, 'get_db_connection', return_value=conn) as connect:
+            recorded = record_stripe_event(event)
+        return recorded, cursor, conn, connect
+
+    def test_subscription_update_upserts_with_event_time(self):
+        event = {'type': 'customer.subscription.updated', 'created': 1770000000,
+                 'data': {'object': _sub(status='past_due', cancel_at_period_end=True)}}
+        recorded, cursor, conn, _ = self._record(event)
+        self.assertTrue(recorded)
+        params = cursor.ran('ON CONFLICT (stripe_subscription_id)')[0]
+        self.assertEqual((params['status'], params['event_at'], params['cancel_at_period_end']),
+                         ('past_due', 1770000000, True))
+        self.assertIn('EXCLUDED.stripe_event_at >= subscriptions.stripe_event_at',
+                      cursor.executed[-1][0])
+        conn.commit.assert_called_once()
+
+    def test_checkout_links_creator(self):
+        event = {'type': 'checkout.session.completed', 'created': 1770000000, 'data': {'object': {
+            'subscription': 'sub_9', 'customer': 'cus_9', 'amount_total': 0,
+            'metadata': {'creator_id': '7', 'tier': 'pro', 'trial': '7'}}}}
+        recorded, cursor, _, _ = self._record(event)
+        self.assertTrue(recorded)
+        self.assertEqual(cursor.executed[-1][1], ('sub_9', 'cus_9', 7, 'trialing'))
+
+    def test_checkout_before_subscription_created_still_gets_price(self):
+        # Stripe delivered checkout.session.completed before the (older) subscription.created
+        checkout = {'type': 'checkout.session.completed', 'created': 1770000100, 'data': {'object': {
+            'subscription': 'sub_9', 'customer': 'cus_9', 'amount_total': 1900, 'metadata': {'creator_id': '7'}}}}
+        _, cursor, _, _ = self._record(checkout)
+        sql, params = cursor.executed[-1]
+        self.assertIn('NOW(), NULL, NOW())', sql)  # no event time: nothing for the guard to compare against
+        self.assertNotIn(1770000100, params)
+
+        created = {'type': 'customer.subscription.created', 'created': 1770000000,
+                   'data': {'object': _sub('sub_9', customer='cus_9')}}
+        _, cursor, _, _ = self._record(created)
+        sql, params = cursor.executed[-1]
+        self.assertIn('WHERE subscriptions.stripe_event_at IS NULL OR', sql)
+        self.assertEqual((params['id'], params['price_id'], params['mrr_cents'], params['is_pro']),
+                         ('sub_9', PRO_PRICE, 1900, True))
+
+    def test_irrelevant_events_skip_the_database(self):
+        for event in ({'type': 'payment_intent.succeeded', 'data': {'object': {}}},
+                      {'type': 'checkout.session.completed', 'data': {'object': {'metadata': {'product': 'packs'}}}},
+                      {'type': 'invoice.payment_succeeded', 'data': {'object': {'subscription': None}}}):
+            recorded, _, _, connect = self._record(event)
+            self.assertFalse(recorded)
+            connect.assert_not_called()
+
+    def test_missing_table_or_db_error_never_raises(self):
+        event = {'type': 'customer.subscription.deleted', 'data': {'object': _sub(status='canceled')}}
+        recorded, cursor, conn, _ = self._record(event, FakeCursor(ready=False))
+        self.assertFalse(recorded)
+        conn.commit.assert_not_called()
+        with patch.object(ledger, 'get_db_connection', side_effect=RuntimeError('pool exhausted')):
+            self.assertFalse(record_stripe_event(event))
+
+
+class TestReconcile(_LedgerCase):
+    def test_upserts_everything_and_closes_missing(self):
+        stripe = MagicMock()
+        stripe.Subscription.list.return_value.auto_paging_iter.return_value = iter(
+            [_sub('sub_1'), _sub('sub_2', status='canceled', ended_at=1768000000)])
+        cursor = FakeCursor()
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        result = reconcile_subscriptions(conn, stripe_module=stripe)
+        self.assertEqual(result, {'seen': 2, 'closed': 1, 'linked': 1})
+        self.assertEqual(stripe.Subscription.list.call_args.kwargs['status'], 'all')
+        self.assertEqual([p['id'] for p in cursor.ran('ON CONFLICT (stripe_subscription_id)')], ['sub_1', 'sub_2'])
+        close = cursor.ran("SET status = 'canceled'")[0]
+        self.assertEqual((close[1], close[2]), (list(ledger.LIVE_STATUSES), ['sub_1', 'sub_2']))
+        conn.commit.assert_called_once()
+
+    def test_skips_without_stripe_key(self):
+        with patch.dict('os.environ', {'STRIPE_SECRET_KEY': ''}):
+            self.assertIn('skipped', reconcile_subscriptions(MagicMock()))
+
+
+class TestMetrics(_LedgerCase):
+    def test_mrr_and_churn_from_one_query(self):
+        cursor = FakeCursor(metrics={
+            'ledger_rows': 30, 'mrr_cents': 47500, 'active': 25, 'trialing': 3, 'past_due': 1, 'cancelling': 2,
+            'live_at_start': 20, 'churned': 2, 'churned_mrr_cents': 3800, 'new_subscriptions': 6,
+            'live_mode': True, 'reconciled_at': datetime(2026, 3, 9, 3, 0), 'updated_at': None,
+        })
+        stats = subscription_metrics(cursor, datetime(2026, 3, 3), datetime(2026, 3, 10))
+        self.assertEqual((stats['mrr_dollars'], stats['active_subscriptions'], stats['churn_rate']),
+                         (475.0, 25, 10.0))
+        self.assertEqual((stats['churned_mrr_dollars'], stats['source'], stats['reconciled_at']),
+                         (38.0, 'ledger', '2026-03-09T03:00:00'))
+        self.assertEqual(len(cursor.ran('FROM subscriptions')), 1)
+
+    def test_empty_or_missing_ledger_means_fallback(self):
+        self.assertIsNone(subscription_metrics(FakeCursor(metrics={'ledger_rows': 0}), datetime(2026, 3, 3)))
+        ledger._TABLE_READY = None
+        self.assertIsNone(subscription_metrics(FakeCursor(ready=False), datetime(2026, 3, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
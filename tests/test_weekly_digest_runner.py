@@ -0,0 +1,168 @@
+"""Weekly digest runner: keyset checkpoints, batch prefetch, in-memory brand picks, time budget."""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import lifecycle_email_engine as engine
+from lifecycle_email_engine import load_weekly_digest_data, pick_for_you_brands
+
+CATALOG = [
+    {'id': 10, 'name': 'Glow', 'description': 'Clean skincare', 'category': 'beauty', 'created_at': datetime(2025, 1, 1)},
+    {'id': 11, 'name': 'Lash', 'description': 'Mascara ' * 12, 'category': 'beauty', 'created_at': datetime(2025, 2, 1)},
+    {'id': 12, 'name': 'Trail', 'description': '', 'category': 'outdoors', 'created_at': None},
+    {'id': 13, 'name': 'Brew', 'description': 'Coffee', 'category': 'food', 'created_at': datetime(2024, 6, 1)},
+]
+
+
+class FakeCursor:
+    """Answers each execute() from the first handler whose key appears in the SQL."""
+
+    def __init__(self, creators, checkpoint=None, ready=True):
+        self.creators = creators
+        self.checkpoint = checkpoint
+        self.ready = ready
+        self.executed = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if 'to_regclass' in sql:
+            rows = [{'ready': self.ready}]
+        elif 'SELECT last_creator_id' in sql:
+            rows = [{'last_creator_id': self.checkpoint}] if self.checkpoint is not None else []
+        elif 'AND c.id > %s' in sql:
+            after, take = params
+            rows = [{'id': cid} for cid in sorted(self.creators) if cid > after][:take]
+        elif 'FROM pr_brands' in sql:
+            rows = CATALOG
+        elif 'WHERE c.id = ANY' in sql:
+            rows = [self.creators[cid] for cid in params[0] if cid in self.creators]
+        elif 'FROM creator_profile_data' in sql:
+            rows = [{'user_id': uid, 'handle': f'h{uid}'} for uid in params[0]]
+        elif 'FROM portfolio_posts' in sql:
+            rows = [{'creator_id': cid, 'post_count': 2} for cid in params[0]]
+        elif 'FROM brand_unlocks' in sql:
+            rows = [{'creator_id': cid, 'brand_id': 10} for cid in params[0] if cid % 2]
+        else:
+            rows = []
+        self._rows = rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def ran(self, key):
+        return [params for sql, params in self.executed if key in sql]
+
+
+def _creator(cid, niches=('beauty',)):
+    return {'id': cid, 'user_id': cid + 100, 'email': f'c{cid}@example.com', 'first_name': f'C{cid}',
+            'creator_niches': list(niches), 'kit_published': True, 'subscription_tier': 'free',
+            'unlocks_remaining': 1}
+
+
+class TestBrandPick(unittest.TestCase):
+    def test_matches_niche_excludes_unlocked_and_rotates(self):
+        picks = pick_for_you_brands(1, ['Beauty '], {10}, CATALOG, week_number=1)
+        self.assertEqual([b['name'] for b in picks], ['Lash'])
+        self.assertTrue(picks[0]['description'].endswith('...'))
+        self.assertLessEqual(len(picks[0]['description']), 60)
+        # Offset for creator 1 in week 1 is 24: Glow (34) sorts before Lash (35).
+        self.assertEqual([b['name'] for b in pick_for_you_brands(1, '["beauty"]', (), CATALOG, week_number=1)],
+                         ['Glow', 'Lash'])
+
+    def test_no_niche_match_falls_back_to_all_brands(self):
+        picks = pick_for_you_brands(1, ['gaming'], (), CATALOG, limit=3, week_number=1)
+        self.assertEqual([b['name'] for b in picks], ['Glow', 'Lash', 'Trail'])
+        self.assertEqual(len(pick_for_you_brands(1, None, (), CATALOG, week_number=1)), 3)
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_batch_is_four_queries(self):
+        cursor = FakeCursor({cid: _creator(cid) for cid in (1, 2)})
+        data = load_weekly_digest_data(cursor, [1, 2, 99])
+        self.assertEqual(len(cursor.executed), 4)
+        self.assertEqual(sorted(data), [1, 2])
+        self.assertEqual(data[1]['scrape']['handle'], 'h101')
+        self.assertEqual((data[1]['post_count'], data[1]['unlocked_ids'], data[2]['unlocked_ids']), (2, {10}, set()))
+
+
+class TestRunner(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            patch.object(engine, 'is_feature_enabled', return_value=True),
+            patch.object(engine, 'send_lifecycle_email', side_effect=self._send),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sent = []
+
+    def _send(self, to_email, template_slug, context, creator_id, dedup_key=None, **kwargs):
+        self.sent.append((creator_id, dedup_key, context))
+        if creator_id == 4:
+            return False, 'Email already sent'
+        if creator_id == 5:
+            raise RuntimeError('smtp down')
+        return True, 'msg-id'
+
+    def _run(self, cursor, **kwargs):
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        with patch.object(engine, 'get_db_connection', return_value=conn):
+            stats = engine.process_weekly_digest(skip_day_check=True, **kwargs)
+        return conn, stats
+
+    def test_resumes_from_checkpoint_and_records_progress(self):
+        cursor = FakeCursor({cid: _creator(cid) for cid in range(1, 8)}, checkpoint=2)
+        conn, stats = self._run(cursor, batch_size=2)
+        self.assertEqual(cursor.ran('AND c.id > %s'), [(2, 2), (4, 2), (6, 2)])
+        self.assertEqual(sorted(cid for cid, _, _ in self.sent), [3, 4, 5, 6, 7])
+        self.assertEqual((stats['processed'], stats['sent'], stats['skipped'], stats['errors']), (5, 3, 1, 1))
+        self.assertTrue(stats['completed'])
+        self.assertEqual(stats['last_creator_id'], 7)
+        self.assertEqual([(b['first_id'], b['last_id']) for b in stats['batches']], [(3, 4), (5, 6), (7, 7)])
+
+        saves = cursor.ran('INSERT INTO weekly_digest_checkpoints')
+        self.assertEqual([(p[1], p[2], p[-1]) for p in saves], [(4, 2, False), (6, 2, False), (7, 1, True)])
+        self.assertEqual(saves[0][0], engine._digest_week_key())
+        self.assertEqual(conn.commit.call_count, 3)
+        self.assertEqual(len(cursor.ran('FROM pr_brands')), 1)
+
+        _, dedup_key, context = next(s for s in self.sent if s[0] == 3)
+        self.assertEqual(dedup_key, f"weekly_digest_3_{datetime.now().strftime('%Y-W%W')}")
+        self.assertEqual(context['unlocks_used'], 2)
+        self.assertEqual([b['name'] for b in context['new_brands']], ['Lash'])  # odd ids unlocked Glow
+
+    def test_limit_and_dry_run_leave_checkpoint_alone(self):
+        cursor = FakeCursor({cid: _creator(cid) for cid in range(1, 8)})
+        _, stats = self._run(cursor, batch_size=2, limit=3, dry_run=True)
+        self.assertEqual(cursor.ran('AND c.id > %s'), [(0, 2), (2, 1)])
+        self.assertEqual((stats['processed'], stats['sent'], stats['completed']), (3, 3, False))
+        self.assertFalse(self.sent)
+        self.assertFalse(cursor.ran('INSERT INTO weekly_digest_checkpoints'))
+
+    def test_time_budget_stops_before_next_batch(self):
+        cursor = FakeCursor({cid: _creator(cid) for cid in range(1, 8)}, checkpoint=0)
+        _, stats = self._run(cursor, batch_size=2, time_budget=0)
+        self.assertEqual((stats['processed'], stats['stopped'], stats['completed']), (2, 'time_budget', False))
+
+    def test_without_checkpoint_table_pages_from_start(self):
+        cursor = FakeCursor({cid: _creator(cid) for cid in (1, 2)}, ready=False)
+        _, stats = self._run(cursor, batch_size=5)
+        self.assertEqual(cursor.ran('AND c.id > %s'), [(0, 5)])
+        self.assertFalse(cursor.ran('weekly_digest_checkpoints WHERE'))
+        self.assertEqual(stats['sent'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
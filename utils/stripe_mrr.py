@@ -1,9 +1,35 @@
 """
 Fetch live MRR from Stripe active subscriptions (Pro price).
 Falls back to None if Stripe is not configured or the API call fails.
+
+The founder dashboard reads the local ledger (services/subscription_ledger.py)
+first; this full page-through is its fallback before the ledger is populated.
 """
 import os
 
+# Old $12 price ID (grandfathered subscribers)
+GRANDFATHERED_PRO_PRICE_ID = 'price_1TN7n9EYev1UAuLgQcLAr73g'
+
+
+def get_pro_price_ids():
+    """Pro price IDs: current STRIPE_PRICE_ID_PRO plus the grandfathered $12 price."""
+    pro_price_ids = {GRANDFATHERED_PRO_PRICE_ID}
+    current_price = os.getenv('STRIPE_PRICE_ID_PRO')
+    if current_price:
+        pro_price_ids.add(current_price)
+    return pro_price_ids
+
+
+def monthly_amount_cents(price, quantity=1):
+    """Monthly-normalised amount of a Stripe price: monthly as-is, yearly / 12, others 0."""
+    amount = (price.get('unit_amount') or 0) * quantity
+    interval = (price.get('recurring') or {}).get('interval', 'month')
+    if interval == 'month':
+        return amount
+    if interval == 'year':
+        return int(amount / 12)
+    return 0
+
 
 def fetch_stripe_mrr():
     """
@@ -11,14 +37,7 @@ def fetch_stripe_mrr():
     or None on missing config / API error.
     """
     secret_key = os.getenv('STRIPE_SECRET_KEY')
-
-    # Support both old $12 and new $19 price IDs for grandfathered subscribers
-    pro_price_ids = set()
-    current_price = os.getenv('STRIPE_PRICE_ID_PRO')
-    if current_price:
-        pro_price_ids.add(current_price)
-    # Old $12 price ID (grandfathered subscribers)
-    pro_price_ids.add('price_1TN7n9EYev1UAuLgQcLAr73g')
+    pro_price_ids = get_pro_price_ids()
 
     if not secret_key or not secret_key.startswith('sk_'):
         return None
@@ -48,15 +67,7 @@ def fetch_stripe_mrr():
                 if pro_price_ids and price_id not in pro_price_ids:
                     continue
 
-                amount = price.get('unit_amount') or 0
-                recurring = price.get('recurring') or {}
-                interval = recurring.get('interval', 'month')
-                qty = item.get('quantity') or 1
-
-                if interval == 'month':
-                    mrr_cents += amount * qty
-                elif interval == 'year':
-                    mrr_cents += int((amount * qty) / 12)
+                mrr_cents += monthly_amount_cents(price, item.get('quantity') or 1)
                 matched = True
 
             if matched: